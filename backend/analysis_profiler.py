@@ -0,0 +1,223 @@
+"""
+Analysis Profiler Module
+Per-stage timing, memory and work counters for the graph analysis pipeline,
+reported in summary.profile and exported as Prometheus metrics
+"""
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:
+    # Unix-only (no getrusage on Windows): RSS figures are reported as None
+    resource = None
+
+
+def _max_rss_bytes() -> Optional[int]:
+    """Process high-water RSS (ru_maxrss is KiB on Linux, bytes on macOS; None without resource)"""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class StageProfiler:
+    """
+    Collects per-stage wall time, memory deltas and work counters of one analysis
+
+    Stage names may repeat (per-account work) and nest (centrality runs inside
+    risk_scoring); repeated stages accumulate. Memory is always tracked as the
+    growth of the process RSS high-water mark; with trace_memory the
+    tracemalloc peak above the stage's starting allocation is recorded too.
+    """
+
+    def __init__(self, enabled: bool = True, trace_memory: bool = False):
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+        self._started = time.perf_counter()
+        self._owns_tracing = False
+        # [allocated at stage start, peak seen so far] of the stages currently open
+        self._open: List[List[int]] = []
+
+    def __enter__(self) -> "StageProfiler":
+        if self.enabled and self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        self.total_seconds = time.perf_counter() - self._started
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+        return False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one call of stage `name`"""
+        if not self.enabled:
+            yield
+            return
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        frame = None
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            # reset_peak() below would hide the enclosing stages' peak so far
+            for open_frame in self._open:
+                open_frame[1] = max(open_frame[1], peak)
+            frame = [current, current]
+            self._open.append(frame)
+            tracemalloc.reset_peak()
+        rss_start = _max_rss_bytes()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = self.stages.setdefault(
+                name, {"seconds": 0.0, "calls": 0, "rss_peak_delta_bytes": 0}
+            )
+            record["seconds"] += time.perf_counter() - started
+            record["calls"] += 1
+            if rss_start is None:
+                record["rss_peak_delta_bytes"] = None
+            else:
+                record["rss_peak_delta_bytes"] += _max_rss_bytes() - rss_start
+            if frame is not None:
+                self._open.pop()
+                peak_delta = max(frame[1], tracemalloc.get_traced_memory()[1]) - frame[0]
+                record["traced_peak_bytes"] = max(record.get("traced_peak_bytes", 0), peak_delta)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Add to a work counter (cycles enumerated, paths explored, ...)"""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        The summary.profile block
+
+        Returns:
+            Dict with total_seconds, per-stage seconds/calls/memory (in pipeline
+            order), counters, and the process max RSS (RSS figures are None
+            where the resource module is unavailable)
+        """
+        total = getattr(self, "total_seconds", time.perf_counter() - self._started)
+        return {
+            "total_seconds": round(total, 6),
+            "stages": {
+                name: {
+                    key: round(value, 6) if isinstance(value, float) else value
+                    for key, value in record.items()
+                }
+                for name, record in self.stages.items()
+            },
+            "counters": dict(self.counters),
+            "max_rss_bytes": _max_rss_bytes(),
+            "memory_traced": self.trace_memory
+        }
+
+
+# Shared no-op profiler for detection functions called without one
+NULL_PROFILER = StageProfiler(enabled=False)
+
+
+class AnalysisMetrics:
+    """
+    Process-wide aggregate of every analysis, rendered in Prometheus text format
+
+    Stage seconds and counters are cumulative counters; the last run's
+    duration and per-stage peaks are gauges.
+    """
+
+    def __init__(self, namespace: str = "aml_analysis"):
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.stage_seconds: Dict[str, float] = {}
+        self.stage_calls: Dict[str, int] = {}
+        self.stage_last_seconds: Dict[str, float] = {}
+        self.stage_rss_delta: Dict[str, int] = {}
+        self.stage_traced_peak: Dict[str, int] = {}
+        self.counters: Dict[str, int] = {}
+        self.last_total_seconds = 0.0
+
+    def observe(self, profiler: StageProfiler, run: bool = True) -> None:
+        """Fold one profiler's stages and counters in (run=False for extra stages of a counted run)"""
+        if not profiler.enabled:
+            return
+        with self._lock:
+            if run:
+                self.runs += 1
+                self.last_total_seconds = getattr(profiler, "total_seconds", 0.0)
+            for name, record in profiler.stages.items():
+                self.stage_seconds[name] = self.stage_seconds.get(name, 0.0) + record["seconds"]
+                self.stage_calls[name] = self.stage_calls.get(name, 0) + record["calls"]
+                self.stage_last_seconds[name] = record["seconds"]
+                if record["rss_peak_delta_bytes"] is not None:
+                    self.stage_rss_delta[name] = record["rss_peak_delta_bytes"]
+                if "traced_peak_bytes" in record:
+                    self.stage_traced_peak[name] = record["traced_peak_bytes"]
+            for name, amount in profiler.counters.items():
+                self.counters[name] = self.counters.get(name, 0) + amount
+
+    def render(self) -> str:
+        """Prometheus text exposition (version 0.0.4)"""
+        ns = self.namespace
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str, samples: List[str]) -> None:
+            lines.append(f"# HELP {ns}_{name} {help_text}")
+            lines.append(f"# TYPE {ns}_{name} {kind}")
+            lines.extend(samples)
+
+        def labelled(name: str, label: str, values: Dict[str, Any]) -> List[str]:
+            return [
+                f'{ns}_{name}{{{label}="{_escape(key)}"}} {_number(value)}'
+                for key, value in sorted(values.items())
+            ]
+
+        with self._lock:
+            family("runs_total", "counter", "Completed transaction analyses.",
+                   [f"{ns}_runs_total {self.runs}"])
+            family("last_duration_seconds", "gauge", "Wall time of the most recent analysis.",
+                   [f"{ns}_last_duration_seconds {_number(self.last_total_seconds)}"])
+            family("stage_seconds_total", "counter", "Cumulative wall time per pipeline stage.",
+                   labelled("stage_seconds_total", "stage", self.stage_seconds))
+            family("stage_calls_total", "counter", "Cumulative calls per pipeline stage.",
+                   labelled("stage_calls_total", "stage", self.stage_calls))
+            family("stage_last_seconds", "gauge", "Wall time per stage in the most recent analysis.",
+                   labelled("stage_last_seconds", "stage", self.stage_last_seconds))
+            if self.stage_rss_delta:
+                family("stage_rss_peak_delta_bytes", "gauge",
+                       "Growth of the process max RSS during the stage (most recent analysis).",
+                       labelled("stage_rss_peak_delta_bytes", "stage", self.stage_rss_delta))
+            if self.stage_traced_peak:
+                family("stage_traced_peak_bytes", "gauge",
+                       "tracemalloc peak above the stage's starting allocation (most recent profiled analysis).",
+                       labelled("stage_traced_peak_bytes", "stage", self.stage_traced_peak))
+            family("work_total", "counter", "Cumulative work counters (cycles, paths, nodes explored).",
+                   labelled("work_total", "counter", self.counters))
+        max_rss = _max_rss_bytes()
+        if max_rss is not None:
+            family("process_max_rss_bytes", "gauge", "Process high-water resident set size.",
+                   [f"{ns}_process_max_rss_bytes {max_rss}"])
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: Any) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# Metrics of every analysis in this process (served by /metrics)
+ANALYSIS_METRICS = AnalysisMetrics()
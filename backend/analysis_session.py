@@ -0,0 +1,466 @@
+"""
+Analysis Session Module
+Incremental money mule analysis: holds the transaction graph and detector
+state, accepts appended transaction batches (optionally expiring edges that
+fall out of a time window) and re-runs detection only in the region a batch
+can change
+"""
+import hashlib
+import heapq
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import networkx as nx
+import pandas as pd
+
+from graph_analyzer import (
+    DEFAULT_BUDGETS,
+    HIGH_VELOCITY_DEGREE,
+    SHELL_SEARCH_SOURCES,
+    DetectorBudget,
+    account_centrality,
+    add_transactions,
+    apply_false_positive_controls,
+    cycles_through_edge,
+    generate_fraud_rings,
+    is_smurfing,
+    parse_transactions,
+    score_account,
+    shell_chains_from,
+    smurfing_patterns,
+    transform_to_required_format,
+    validate_transactions,
+)
+from windowed_graph import WindowedGraph
+
+
+class AnalysisSession:
+    """
+    Graph, detector results and scores of a growing transaction history
+
+    Detection only depends on the graph's edges, so a batch matters only
+    through its new sender -> receiver edges (repeat transfers just add to
+    an edge's amount and count). For each batch the session:
+
+    - finds rings through the new edges only (every new cycle uses one);
+    - re-runs the shell chain search of the sources whose previous search
+      reached an account that gained an edge, and of accounts that entered
+      the top-degree source list (degrees only grow, so an account can only
+      stop being dormant, never start);
+    - re-scores the accounts that gained an edge or joined / left a ring or
+      chain; smurfing and velocity are per-account degree checks.
+
+    Work is proportional to the batch and its neighbourhood, not to the
+    history. The exception is betweenness centrality, a global measure that
+    is recomputed only by refresh_centrality(); scores between refreshes use
+    the last computed values (0 for accounts added since).
+
+    With window_seconds the graph is a WindowedGraph: edge totals cover the
+    window only and an edge is removed once none of its transactions are
+    inside it; accounts left without edges are dropped, which keeps memory
+    bounded. Expired edges remove the rings through them and re-run the
+    shell searches that reached their accounts; the top-degree source list
+    is then re-ranked in full.
+    """
+
+    def __init__(
+        self,
+        budgets: Optional[Dict[str, DetectorBudget]] = None,
+        window_seconds: Optional[float] = None
+    ):
+        self.window = WindowedGraph(window_seconds) if window_seconds else None
+        self.G = self.window.G if self.window else nx.DiGraph()
+        self.budgets = {name: (budgets or {}).get(name, default) for name, default in DEFAULT_BUDGETS.items()}
+        self.transactions = 0
+        self.appends = 0
+        # Chained hash of every appended batch (stable analysis ID of the session)
+        self.digest = hashlib.sha256()
+        # Graph order of each account (ring rotation and source tie-breaks)
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+
+        # Rings as tuples rotated to their earliest account, in discovery order
+        self.rings: Dict[Tuple[str, ...], None] = {}
+        self._rings_of: Dict[str, List[Tuple[str, ...]]] = {}
+
+        # Shell chain search: top-degree sources, their chains and what each search reached
+        self._sources: List[str] = []
+        self._source_chains: Dict[str, List[Tuple[str, ...]]] = {}
+        self._source_reach: Dict[str, Set[str]] = {}
+        self._reached_by: Dict[str, Set[str]] = {}
+        self._chains_of: Dict[str, int] = {}
+
+        # Work a budget cut short, retried on the next append
+        self._pending_edges: List[Tuple[str, str]] = []
+        self._pending_sources: Set[str] = set()
+
+        self.centrality: Dict[str, float] = {}
+        self.centrality_stale = False
+        self.risk_scores: Dict[str, int] = {}
+        self.account_patterns: Dict[str, List[str]] = {}
+        self.flagged: Set[str] = set()
+
+    def append(self, csv_data: bytes, input_format: str = "csv") -> Dict[str, Any]:
+        """
+        Append a transaction CSV (or Parquet / Arrow) batch (same columns as analyze_transactions)
+
+        Returns:
+            The delta: see append_frame
+        """
+        df = parse_transactions(csv_data, input_format)
+        self.digest.update(hashlib.sha256(csv_data).digest())
+        return self.append_frame(df)
+
+    def append_records(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Append transaction dicts (sender_id, receiver_id, amount, optional timestamp)
+
+        Returns:
+            The delta: see append_frame
+        """
+        for record in records:
+            self.digest.update(repr(sorted(record.items())).encode("utf-8"))
+        return self.append_frame(pd.DataFrame(records))
+
+    def append_frame(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Append a batch of transactions (sender_id, receiver_id, amount rows)
+
+        Returns:
+            Dict with:
+            - accounts: accounts whose score, patterns or flag changed
+              (account_id, suspicion_score, detected_patterns, flagged,
+              previously_flagged)
+            - rings_added, rings_removed, chains_added, chains_removed: member lists
+            - expired_edges, flagged_total, truncated_detectors, counts and timing
+        """
+        started = time.time()
+        if len(df):
+            validate_transactions(df)
+        accounts_before = self.G.number_of_nodes()
+        if self.window:
+            new_edges = self.window.add(df, WindowedGraph.timestamps(df))
+        else:
+            new_edges = add_transactions(self.G, df)
+        # Accounts enter the graph with their first edge, so this is graph order
+        for edge in new_edges:
+            for node in edge:
+                if node not in self._order:
+                    self._order[node] = self._next_order
+                    self._next_order += 1
+        self.transactions += len(df)
+        self.appends += 1
+
+        touched = {node for edge in new_edges for node in edge}
+        expired = self.window.advance() if self.window else []
+        rings_removed = self._drop_rings(expired)
+        expired_touched = {node for edge in expired for node in edge}
+        touched |= expired_touched
+        affected = set(touched)
+        for ring in rings_removed:
+            affected.update(ring)
+        if new_edges or expired:
+            self.centrality_stale = True
+        # Each budget runs from just before its detector until it returns
+        budgets = {"cycles": self.budgets["cycles"].start()}
+        rings_added = self._add_rings(self._pending_edges + new_edges, budgets["cycles"])
+        budgets["cycles"].stop()
+        for ring in rings_added:
+            affected.update(ring)
+
+        # Accounts left without edges leave the graph (and the source ranking)
+        isolated = [node for node in expired_touched if self.G.degree(node) == 0]
+        self.G.remove_nodes_from(isolated)
+        for node in isolated:
+            del self._order[node]
+            self.centrality.pop(node, None)
+
+        budgets["shell_networks"] = self.budgets["shell_networks"].start()
+        chains_added, chains_removed = self._update_chains(
+            touched, budgets["shell_networks"], rerank=bool(expired)
+        )
+        budgets["shell_networks"].stop()
+        for chain in chains_added + chains_removed:
+            affected.update(chain)
+
+        changed = self._rescore(affected)
+        truncated = [name for name, budget in budgets.items() if budget.exhausted]
+        for name in truncated:
+            print(f"⚠️ {name} detector truncated at {budgets[name].exhausted}: resumed on the next append")
+
+        return {
+            "transactions_appended": len(df),
+            "new_accounts": self.G.number_of_nodes() - accounts_before,
+            "new_edges": len(new_edges),
+            "expired_edges": len(expired),
+            "accounts": changed,
+            "rings_added": [list(ring) for ring in rings_added],
+            "rings_removed": [list(ring) for ring in rings_removed],
+            "chains_added": [list(chain) for chain in chains_added],
+            "chains_removed": [list(chain) for chain in chains_removed],
+            "flagged_total": len(self.flagged),
+            "truncated_detectors": truncated,
+            "detector_coverage": {name: budget.report() for name, budget in budgets.items()},
+            "processing_time_seconds": round(time.time() - started, 4)
+        }
+
+    def refresh_centrality(self) -> List[Dict[str, Any]]:
+        """
+        Recompute betweenness centrality over the whole graph and re-score
+
+        This is the one O(history) step; run it when scores must match a
+        full analyze_transactions run exactly.
+
+        Returns:
+            The accounts whose score or flag changed (as in append's delta)
+        """
+        self.centrality = account_centrality(self.G)
+        self.centrality_stale = False
+        return self._rescore(set(self.risk_scores))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        The full result in analyze_transactions' output format
+
+        Building it walks every ring, chain and flagged account, so call it
+        when the complete picture is needed rather than after every append.
+        """
+        started = time.time()
+        smurfing_accounts = [node for node in self.G.nodes() if is_smurfing(self.G, node)]
+        layered_chains = [
+            list(chain) for source in self._sources for chain in self._source_chains.get(source, [])
+        ]
+        fraud_rings, account_to_ring = generate_fraud_rings(
+            [list(ring) for ring in self.rings], smurfing_accounts, layered_chains,
+            self.flagged, self.risk_scores
+        )
+        output = transform_to_required_format(
+            suspicious_accounts=self.flagged,
+            account_patterns=self.account_patterns,
+            risk_scores={account: self.risk_scores[account] for account in self.flagged},
+            account_to_ring=account_to_ring,
+            fraud_rings=fraud_rings,
+            total_accounts=self.G.number_of_nodes(),
+            total_transactions=self.G.number_of_edges(),
+            processing_time=round(time.time() - started, 2)
+        )
+        truncated = []
+        if self._pending_edges:
+            truncated.append("cycles")
+        if self._pending_sources:
+            truncated.append("shell_networks")
+        output["summary"]["truncated_detectors"] = truncated
+        output["summary"]["session"] = {
+            "appends": self.appends,
+            "transactions_appended": self.transactions,
+            "centrality_stale": self.centrality_stale,
+            "window_seconds": self.window.window_seconds if self.window else None,
+            "expired_edges": self.window.expired_edges if self.window else 0,
+            "late_transactions": self.window.late_transactions if self.window else 0
+        }
+        return output
+
+    @property
+    def analysis_id(self) -> str:
+        return self.digest.hexdigest()[:16]
+
+    def _drop_rings(self, edges: Iterable[Tuple[str, str]]) -> List[Tuple[str, ...]]:
+        """Forget the rings that run through any of the (removed) edges"""
+        removed = []
+        for sender, receiver in edges:
+            for ring in list(self._rings_of.get(sender, ())):
+                position = ring.index(sender)
+                if ring[(position + 1) % len(ring)] != receiver:
+                    continue
+                del self.rings[ring]
+                for account in ring:
+                    self._rings_of[account].remove(ring)
+                    if not self._rings_of[account]:
+                        del self._rings_of[account]
+                removed.append(ring)
+        return removed
+
+    def _add_rings(self, edges: List[Tuple[str, str]], budget: DetectorBudget) -> List[Tuple[str, ...]]:
+        """New rings through the given edges (edges left when the budget runs out stay pending)"""
+        added = []
+        # Pending edges may have expired meanwhile
+        edges = [edge for edge in edges if self.G.has_edge(*edge)]
+        for index, (sender, receiver) in enumerate(edges):
+            if budget.exhausted:
+                self._pending_edges = edges[index:]
+                return added
+            for ring in self._rings_through(sender, receiver, budget):
+                if ring in self.rings:
+                    continue
+                self.rings[ring] = None
+                for account in ring:
+                    self._rings_of.setdefault(account, []).append(ring)
+                added.append(ring)
+            if budget.exhausted:
+                # This edge's search was cut short as well
+                self._pending_edges = edges[index:]
+                return added
+        self._pending_edges = []
+        return added
+
+    def _rings_through(self, sender: str, receiver: str, budget: DetectorBudget) -> List[Tuple[str, ...]]:
+        """Every 3-5 account cycle using the edge sender -> receiver, rotated"""
+        return [self._rotate(cycle) for cycle in cycles_through_edge(self.G, sender, receiver, budget)]
+
+    def _rotate(self, path: List[str]) -> Tuple[str, ...]:
+        """A cycle rotated to start at its earliest account, as detect_mule_rings reports it"""
+        start = min(range(len(path)), key=lambda i: self._order[path[i]])
+        return tuple(path[start:] + path[:start])
+
+    def _source_key(self, node: str) -> Tuple[int, int]:
+        # shell_search_sources order: degree descending, ties in graph order
+        return (-self.G.degree(node), self._order[node])
+
+    def _update_chains(
+        self,
+        touched: Set[str],
+        budget: DetectorBudget,
+        rerank: bool = False
+    ) -> Tuple[List[Tuple[str, ...]], List[Tuple[str, ...]]]:
+        """
+        Re-search the shell chains the touched accounts can affect
+
+        Args:
+            touched: Accounts that gained or lost an edge (removed ones included)
+            budget: Running shell_networks budget
+            rerank: Rank every account for the source list; needed once degrees
+                have dropped, otherwise only touched accounts can overtake a source
+
+        Returns:
+            (chains added, chains removed)
+        """
+        previous = set(self._sources)
+        candidates = self.G.nodes() if rerank else (previous | touched)
+        self._sources = heapq.nsmallest(SHELL_SEARCH_SOURCES, candidates, key=self._source_key)
+        current = set(self._sources)
+
+        added: List[Tuple[str, ...]] = []
+        removed: List[Tuple[str, ...]] = []
+        for source in previous - current:
+            removed.extend(self._drop_source(source))
+        self._pending_sources &= current
+
+        rerun = (current - previous) | self._pending_sources
+        for node in touched:
+            rerun.update(self._reached_by.get(node, ()))
+        rerun &= current
+
+        for source in self._sources:
+            if source not in rerun:
+                continue
+            if budget.exhausted:
+                self._pending_sources.add(source)
+                continue
+            old_chains = set(self._drop_source(source))
+            reach: Set[str] = set()
+            chains = [tuple(chain) for chain in shell_chains_from(self.G, source, budget, reached=reach)]
+            if budget.exhausted:
+                self._pending_sources.add(source)
+            else:
+                self._pending_sources.discard(source)
+            self._source_chains[source] = chains
+            self._source_reach[source] = reach
+            for node in reach:
+                self._reached_by.setdefault(node, set()).add(source)
+            for chain in chains:
+                for account in chain:
+                    self._chains_of[account] = self._chains_of.get(account, 0) + 1
+            added.extend(chain for chain in chains if chain not in old_chains)
+            removed.extend(old_chains.difference(chains))
+        return added, removed
+
+    def _drop_source(self, source: str) -> List[Tuple[str, ...]]:
+        """Forget a source's chains and reach; returns the chains"""
+        chains = self._source_chains.pop(source, [])
+        for node in self._source_reach.pop(source, ()):
+            sources = self._reached_by.get(node)
+            if sources is not None:
+                sources.discard(source)
+                if not sources:
+                    del self._reached_by[node]
+        for chain in chains:
+            for account in chain:
+                self._chains_of[account] -= 1
+                if not self._chains_of[account]:
+                    del self._chains_of[account]
+        return chains
+
+    def _rescore(self, accounts: Set[str]) -> List[Dict[str, Any]]:
+        """Recompute patterns, score and flag of accounts; returns those that changed"""
+        changed = []
+        for account in accounts:
+            before = (self.risk_scores.get(account), self.account_patterns.get(account), account in self.flagged)
+            if account in self.G:
+                degree = self.G.degree(account)
+                in_ring = account in self._rings_of
+                smurfing = is_smurfing(self.G, account)
+                chain_count = self._chains_of.get(account, 0)
+                high_velocity = degree >= HIGH_VELOCITY_DEGREE
+            else:
+                in_ring = smurfing = high_velocity = False
+                degree = chain_count = 0
+
+            if not (in_ring or smurfing or chain_count or high_velocity):
+                self.risk_scores.pop(account, None)
+                self.account_patterns.pop(account, None)
+                self.flagged.discard(account)
+            else:
+                # Same pattern order as track_patterns_per_account
+                patterns = [f"cycle_length_{len(ring)}" for ring in self._rings_of.get(account, [])]
+                if smurfing:
+                    patterns.extend(smurfing_patterns(self.G, account))
+                patterns.extend(["layered_network"] * chain_count)
+                if high_velocity:
+                    patterns.append("high_velocity")
+                score = score_account(in_ring, smurfing, chain_count > 0, degree, self.centrality.get(account, 0))
+                self.risk_scores[account] = score
+                self.account_patterns[account] = patterns
+                if apply_false_positive_controls({account}, {account: patterns}, {account: score}, self.G):
+                    self.flagged.add(account)
+                else:
+                    self.flagged.discard(account)
+
+            after = (self.risk_scores.get(account), self.account_patterns.get(account), account in self.flagged)
+            if after != before:
+                changed.append({
+                    "account_id": account,
+                    "suspicion_score": float(after[0] or 0),
+                    "detected_patterns": after[1] or [],
+                    "flagged": after[2],
+                    "previously_flagged": before[2]
+                })
+        changed.sort(key=lambda entry: entry["suspicion_score"], reverse=True)
+        return changed
+
+
+def delta_events(delta: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Live events for one append's delta
+
+    - fraud_ring: a new cycle or shell chain (pattern_type cycle / layered_network)
+    - ring_cleared: a ring or chain that expired or no longer qualifies
+    - suspicious_account: an account whose entry changed and that is flagged
+      or over the fan-in / fan-out threshold
+    - account_cleared: a previously flagged account that no longer is
+    """
+    events = []
+    for pattern_type, added_key, removed_key in (
+        ("cycle", "rings_added", "rings_removed"),
+        ("layered_network", "chains_added", "chains_removed"),
+    ):
+        for members in delta[added_key]:
+            events.append({"event": "fraud_ring", "pattern_type": pattern_type, "member_accounts": members})
+        for members in delta[removed_key]:
+            events.append({"event": "ring_cleared", "pattern_type": pattern_type, "member_accounts": members})
+    for account in delta["accounts"]:
+        smurfing = any(pattern in ("fan_in", "fan_out") for pattern in account["detected_patterns"])
+        if account["flagged"] or smurfing:
+            events.append({"event": "suspicious_account", **account})
+        elif account["previously_flagged"]:
+            events.append({"event": "account_cleared", **account})
+    return events
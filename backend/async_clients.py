@@ -0,0 +1,243 @@
+"""
+Async Clients Module
+Non-blocking algod, KMD and IPFS HTTP API clients over pooled keep-alive
+connections (httpx), with per-call timeouts and bounded concurrency
+"""
+import asyncio
+import base64
+from typing import Any, Dict, List, Optional
+
+import httpx
+from algosdk import encoding, transaction
+from algosdk import error as algod_error
+
+from blob_store import BlobStore
+
+
+class _PooledHTTPClient:
+    """
+    Shared plumbing: one httpx.AsyncClient per service (connection pool with
+    keep-alive) and a semaphore capping in-flight requests
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 10.0,
+        max_connections: int = 20,
+        max_concurrency: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self._http = httpx.AsyncClient(
+            base_url=base_url.rstrip("/"),
+            headers=headers or {},
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ),
+            transport=transport
+        )
+        self._slots = asyncio.Semaphore(max_concurrency or max_connections)
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> httpx.Response:
+        request_kwargs = dict(kwargs)
+        if timeout is not None:
+            request_kwargs["timeout"] = timeout
+        async with self._slots:
+            return await self._http.request(method, path, **request_kwargs)
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+
+class AsyncAlgodClient(_PooledHTTPClient):
+    """
+    Async counterpart of algod.AlgodClient for the calls the backend makes
+
+    Method names and return shapes follow the SDK client, and HTTP errors are
+    raised as algosdk's AlgodHTTPError, so callers handle both the same way.
+    """
+
+    def __init__(self, algod_token: str, algod_address: str, **kwargs):
+        super().__init__(
+            f"{algod_address.rstrip('/')}/v2",
+            headers={"X-Algo-API-Token": algod_token} if algod_token else {},
+            **kwargs
+        )
+
+    async def algod_request(
+        self,
+        method: str,
+        requrl: str,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Call an algod v2 endpoint and return its JSON body"""
+        response = await self._send(
+            method, requrl, timeout=timeout, params=params, content=data, headers=headers
+        )
+        if response.status_code >= 400:
+            try:
+                message = response.json().get("message", response.text)
+            except ValueError:
+                message = response.text
+            raise algod_error.AlgodHTTPError(message, code=response.status_code)
+        return response.json()
+
+    async def status(self) -> Dict[str, Any]:
+        return await self.algod_request("GET", "/status")
+
+    async def status_after_block(self, block_num: int, timeout: Optional[float] = 60.0) -> Dict[str, Any]:
+        """Long-poll until the round after block_num (slow by design, so its own timeout)"""
+        return await self.algod_request("GET", f"/status/wait-for-block-after/{block_num}", timeout=timeout)
+
+    async def suggested_params(self) -> transaction.SuggestedParams:
+        res = await self.algod_request("GET", "/transactions/params")
+        return transaction.SuggestedParams(
+            res["fee"],
+            res["last-round"],
+            res["last-round"] + 1000,
+            res["genesis-hash"],
+            res["genesis-id"],
+            False,
+            res["consensus-version"],
+            res["min-fee"],
+        )
+
+    async def send_transactions(self, txns: List[transaction.GenericSignedTransaction]) -> str:
+        """Broadcast signed transactions (one group); returns the first transaction ID"""
+        raw = b"".join(base64.b64decode(encoding.msgpack_encode(txn)) for txn in txns)
+        response = await self.algod_request(
+            "POST", "/transactions", data=raw, headers={"Content-Type": "application/x-binary"}
+        )
+        return response["txId"]
+
+    async def pending_transaction_info(self, txid: str) -> Dict[str, Any]:
+        return await self.algod_request("GET", f"/transactions/pending/{txid}")
+
+    async def application_box_by_name(self, application_id: int, box_name: bytes) -> Dict[str, Any]:
+        return await self.algod_request(
+            "GET",
+            f"/applications/{application_id}/box",
+            params={"name": "b64:" + base64.b64encode(box_name).decode()}
+        )
+
+    async def block_info(self, block_num: int) -> Dict[str, Any]:
+        return await self.algod_request("GET", f"/blocks/{block_num}", params={"format": "json"})
+
+    async def wait_for_confirmation(self, txid: str, wait_rounds: int = 0) -> Dict[str, Any]:
+        """Async version of transaction.wait_for_confirmation"""
+        last_round = (await self.status())["last-round"]
+        current_round = last_round + 1
+        while True:
+            txinfo = await self.pending_transaction_info(txid)
+            if txinfo.get("confirmed-round", 0) > 0:
+                return txinfo
+            if txinfo.get("pool-error"):
+                raise algod_error.TransactionRejectedError(txid, txinfo["pool-error"])
+            if wait_rounds and current_round > last_round + wait_rounds:
+                raise algod_error.ConfirmationTimeoutError(
+                    f"Wait for transaction id {txid} timed out"
+                )
+            await self.status_after_block(current_round)
+            current_round += 1
+
+
+class AsyncKMDClient(_PooledHTTPClient):
+    """Async counterpart of kmd.KMDClient for reading the LocalNet default wallet"""
+
+    def __init__(self, kmd_token: str, kmd_address: str, **kwargs):
+        super().__init__(
+            f"{kmd_address.rstrip('/')}/v1",
+            headers={"X-KMD-API-Token": kmd_token},
+            **kwargs
+        )
+
+    async def kmd_request(self, method: str, requrl: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        response = await self._send(method, requrl, json=data)
+        body = response.json()
+        if response.status_code >= 400 or body.get("error"):
+            raise algod_error.KMDHTTPError(body.get("message", response.text))
+        return body
+
+    async def list_wallets(self) -> List[Dict[str, Any]]:
+        return (await self.kmd_request("GET", "/wallets")).get("wallets", [])
+
+    async def init_wallet_handle(self, wallet_id: str, password: str) -> str:
+        response = await self.kmd_request(
+            "POST", "/wallet/init", {"wallet_id": wallet_id, "wallet_password": password}
+        )
+        return response["wallet_handle_token"]
+
+    async def release_wallet_handle(self, handle: str) -> None:
+        await self.kmd_request("POST", "/wallet/release", {"wallet_handle_token": handle})
+
+    async def list_keys(self, handle: str) -> List[str]:
+        return (await self.kmd_request("POST", "/key/list", {"wallet_handle_token": handle})).get("addresses", [])
+
+    async def export_key(self, handle: str, password: str, address: str) -> str:
+        response = await self.kmd_request(
+            "POST",
+            "/key/export",
+            {"wallet_handle_token": handle, "wallet_password": password, "address": address}
+        )
+        return response["private_key"]
+
+
+class AsyncIPFSClient(_PooledHTTPClient, BlobStore):
+    """
+    Async client for the IPFS (Kubo) HTTP RPC API
+
+    add_json() encodes exactly like ipfshttpclient (sorted keys, compact
+    separators), so the same document still produces the same CID.
+    """
+
+    backend = "ipfs"
+
+    def __init__(self, api_url: str = "http://127.0.0.1:5001", **kwargs):
+        self.api_url = api_url.rstrip("/")
+        super().__init__(f"{self.api_url}/api/v0", **kwargs)
+
+    @property
+    def location(self) -> str:
+        return self.api_url
+
+    async def _rpc(self, command: str, timeout: Optional[float] = None, **kwargs) -> httpx.Response:
+        response = await self._send("POST", f"/{command}", timeout=timeout, **kwargs)
+        response.raise_for_status()
+        return response
+
+    async def version(self) -> Dict[str, Any]:
+        return (await self._rpc("version")).json()
+
+    async def add_bytes(self, data: bytes) -> str:
+        """Add raw bytes; returns the CID"""
+        response = await self._rpc("add", files={"file": ("data", data, "application/octet-stream")})
+        return response.json()["Hash"]
+
+    async def cat(self, cid: str) -> bytes:
+        return (await self._rpc("cat", params={"arg": cid})).content
+
+    async def contains(self, cid: str) -> bool:
+        """
+        Whether the node still pins a CID (`ipfs add` pins recursively)
+
+        pin/ls only consults the local pin set, unlike block/stat, which
+        would go looking for a missing block on the network. Unpinned
+        content can be garbage collected at any time, so it counts as gone.
+        """
+        response = await self._send("POST", "/pin/ls", params={"arg": cid, "type": "recursive"})
+        if response.status_code == 500 and "not pinned" in response.text:
+            return False
+        response.raise_for_status()
+        return cid in response.json().get("Keys", {})
@@ -0,0 +1,445 @@
+"""
+Graph Analyzer Benchmark
+Runs analyze_transactions on seeded synthetic data, records per-stage time,
+peak memory and planted-mule recall, and fails on regressions against the
+stored baselines. Baselines cover 1K and 10K rows: from 100K rows exact
+betweenness centrality takes hours, and the 50 shell search sources no
+longer reach the planted cycles. Larger sizes still run via --sizes but are
+not gated
+
+Usage:
+    python benchmark_analyzer.py --sizes 1000 10000 --check
+    python benchmark_analyzer.py --sizes 1000 10000 --update-baselines
+    python benchmark_analyzer.py --sizes 100000 1000000 --edge-insertion
+    python benchmark_analyzer.py --sizes 5000000 --parse
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from io import StringIO
+from typing import Any, Dict, Iterator, List, Optional
+
+import networkx as nx
+import pandas as pd
+
+import graph_analyzer
+from synthetic_transactions import generate_transactions, planted_mules, traps
+
+
+DEFAULT_SIZES = (1_000, 10_000)
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baselines.json")
+
+# graph_analyzer functions timed as stages; parsing and graph building happen
+# inline in analyze_transactions and are reported as "parse_and_build_graph"
+STAGES = (
+    "detect_mule_rings",
+    "detect_smurfing",
+    "detect_shell_networks",
+    "detect_high_velocity",
+    "track_patterns_per_account",
+    "account_centrality",
+    "calculate_risk_score",
+    "apply_false_positive_controls",
+    "generate_fraud_rings",
+    "prepare_graph_visualization",
+    "transform_to_required_format",
+)
+PARSE_STAGE = "parse_and_build_graph"
+
+# Stages faster than this are too noisy to gate on
+MIN_GATED_SECONDS = 0.05
+
+# Share of planted mules every gated size must flag, on top of not flagging
+# fewer than its baseline (the default density flags all of them at 1K-10K)
+MIN_PLANTED_RECALL = 0.8
+
+
+@contextmanager
+def record_stages(trace_memory: bool = False) -> Iterator[Dict[str, Dict[str, float]]]:
+    """
+    Time (and optionally trace peak memory of) every graph_analyzer stage
+
+    Wraps the module-level stage functions for the duration of the block, so
+    analyze_transactions runs unchanged. Stages called repeatedly (per
+    account) accumulate time and keep their largest peak.
+
+    Yields:
+        Dict stage -> {"seconds", "calls", "peak_mb"}; "peak_mb" is filled
+        only with trace_memory (tracemalloc must be running)
+    """
+    stats = {stage: {"seconds": 0.0, "calls": 0, "peak_mb": 0.0} for stage in STAGES}
+    stats["_overall_peak"] = {"peak_mb": 0.0}
+    originals = {stage: getattr(graph_analyzer, stage) for stage in STAGES}
+
+    def wrap(stage, function):
+        def timed(*args, **kwargs):
+            if trace_memory:
+                # Peak so far covers parsing/graph building before the first stage
+                stats["_overall_peak"]["peak_mb"] = max(
+                    stats["_overall_peak"]["peak_mb"], tracemalloc.get_traced_memory()[1] / 2**20
+                )
+                tracemalloc.reset_peak()
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                stats[stage]["seconds"] += time.perf_counter() - started
+                stats[stage]["calls"] += 1
+                if trace_memory:
+                    peak = tracemalloc.get_traced_memory()[1] / 2**20
+                    stats[stage]["peak_mb"] = max(stats[stage]["peak_mb"], peak)
+                    stats["_overall_peak"]["peak_mb"] = max(stats["_overall_peak"]["peak_mb"], peak)
+        return timed
+
+    for stage, function in originals.items():
+        setattr(graph_analyzer, stage, wrap(stage, function))
+    try:
+        yield stats
+    finally:
+        for stage, function in originals.items():
+            setattr(graph_analyzer, stage, function)
+
+
+def run_benchmark(rows: int, seed: int = 0, density: float = 1.0, memory: bool = True) -> Dict[str, Any]:
+    """
+    Benchmark analyze_transactions on one synthetic dataset
+
+    Args:
+        rows: Transactions to generate
+        seed: Generator seed
+        density: Average transactions per background account
+        memory: Also run once under tracemalloc for per-stage peak memory
+
+    Returns:
+        Dict with total_seconds, peak_mb, per-stage seconds/peak_mb and how many
+        planted mules / traps were flagged
+    """
+    df, ground_truth = generate_transactions(rows, seed=seed, density=density)
+    csv_data = df.to_csv(index=False).encode("utf-8")
+    del df
+
+    with record_stages() as timings:
+        started = time.perf_counter()
+        output, _ = graph_analyzer.analyze_transactions(csv_data)
+        total_seconds = time.perf_counter() - started
+
+    stages = {
+        stage: {"seconds": round(timings[stage]["seconds"], 4), "calls": timings[stage]["calls"]}
+        for stage in STAGES
+    }
+    stages[PARSE_STAGE] = {
+        "seconds": round(total_seconds - sum(timings[stage]["seconds"] for stage in STAGES), 4),
+        "calls": 1
+    }
+
+    peak_mb = None
+    if memory:
+        tracemalloc.start()
+        try:
+            with record_stages(trace_memory=True) as traced:
+                graph_analyzer.analyze_transactions(csv_data)
+                final_peak = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+        for stage in STAGES:
+            stages[stage]["peak_mb"] = round(traced[stage]["peak_mb"], 2)
+        peak_mb = round(max(traced["_overall_peak"]["peak_mb"], final_peak), 2)
+
+    flagged = {account["account_id"] for account in output["suspicious_accounts"]}
+    mules = planted_mules(ground_truth)
+    planted_flagged = len(flagged.intersection(mules))
+    return {
+        "rows": rows,
+        "seed": seed,
+        "density": density,
+        "total_seconds": round(total_seconds, 4),
+        "peak_mb": peak_mb,
+        "stages": stages,
+        "planted_mules": len(mules),
+        "planted_flagged": planted_flagged,
+        "planted_recall": round(planted_flagged / len(mules), 4) if mules else None,
+        "traps_flagged": len(flagged.intersection(traps(ground_truth))),
+        "flagged": len(flagged),
+    }
+
+
+def run_edge_insertion_benchmark(rows: int, seed: int = 0, density: float = 1.0) -> Dict[str, Any]:
+    """
+    Per-edge cost of ring discovery on a live stream
+    
+    Inserts the synthetic transactions one by one and times
+    cycles_through_edge for every new edge, as AnalysisSession does.
+    
+    Returns:
+        Dict with edge count, mean / p50 / p99 / max microseconds per edge and rings found
+    """
+    df, _ = generate_transactions(rows, seed=seed, density=density)
+    G = nx.DiGraph()
+    timings = []
+    rings = 0
+    for sender, receiver in zip(df["sender_id"], df["receiver_id"]):
+        if G.has_edge(sender, receiver):
+            continue
+        G.add_edge(sender, receiver)
+        started = time.perf_counter()
+        rings += len(graph_analyzer.cycles_through_edge(G, sender, receiver))
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return {
+        "rows": rows,
+        "edges": len(timings),
+        "mean_us": round(sum(timings) / len(timings) * 1e6, 2),
+        "p50_us": round(timings[len(timings) // 2] * 1e6, 2),
+        "p99_us": round(timings[int(len(timings) * 0.99)] * 1e6, 2),
+        "max_us": round(timings[-1] * 1e6, 2),
+        "rings": rings,
+    }
+
+
+def run_parse_benchmark(rows: int, seed: int = 0, density: float = 1.0) -> Dict[str, Any]:
+    """
+    CSV parse time: the previous parser against read_csv_transactions
+    
+    "legacy" decodes the bytes and lets pd.read_csv infer every column,
+    then parses the timestamps; "pandas" and "pyarrow" are
+    read_csv_transactions' two engines (pyarrow only when installed).
+    All three yield the same IDs, amounts and timestamps.
+    
+    Returns:
+        Dict with the CSV size and, per parser, seconds and speedup over legacy
+    """
+    df, _ = generate_transactions(rows, seed=seed, density=density)
+    csv_data = df.to_csv(index=False).encode()
+    del df
+    
+    def legacy() -> None:
+        parsed = pd.read_csv(StringIO(csv_data.decode('utf-8')))
+        pd.to_datetime(parsed['timestamp'], errors='coerce', utc=True)
+    
+    parsers = {"legacy": legacy, "pandas": lambda: graph_analyzer.read_csv_transactions(csv_data, use_pyarrow=False)}
+    try:
+        import pyarrow  # noqa: F401
+        parsers["pyarrow"] = lambda: graph_analyzer.read_csv_transactions(csv_data)
+    except ImportError:
+        pass
+    
+    timings = {}
+    for name, parse in parsers.items():
+        started = time.perf_counter()
+        parse()
+        timings[name] = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "csv_mb": round(len(csv_data) / 1e6, 1),
+        "parsers": {
+            name: {"seconds": round(seconds, 3), "speedup": round(timings["legacy"] / seconds, 2)}
+            for name, seconds in timings.items()
+        },
+    }
+
+
+def _benchmark_worker(queue, rows: int, seed: int, density: float, memory: bool) -> None:
+    try:
+        queue.put(run_benchmark(rows, seed=seed, density=density, memory=memory))
+    except BaseException as e:
+        queue.put({"rows": rows, "error": f"{type(e).__name__}: {e}"})
+
+
+def run_isolated(rows: int, timeout: float, seed: int = 0, density: float = 1.0, memory: bool = True) -> Dict[str, Any]:
+    """Run one size in a child process (fresh heap, killable); {"timed_out": True} past timeout"""
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_benchmark_worker, args=(queue, rows, seed, density, memory))
+    process.start()
+    try:
+        return queue.get(timeout=timeout)
+    except Exception:
+        return {"rows": rows, "timed_out": True, "timeout_seconds": timeout}
+    finally:
+        process.kill()
+        process.join()
+
+
+def compare(
+    results: List[Dict[str, Any]],
+    baselines: Dict[str, Any],
+    time_tolerance: float = 0.3,
+    memory_tolerance: float = 0.2,
+    min_recall: float = MIN_PLANTED_RECALL
+) -> List[str]:
+    """
+    Regressions of results against baselines (keyed by row count)
+
+    A size regresses if it no longer finishes, its total or any gated stage
+    time exceeds the baseline by more than time_tolerance, its peak memory by
+    more than memory_tolerance, it flags fewer planted mules than the
+    baseline (same seed and density only), or less than min_recall of them.
+
+    Returns:
+        Human-readable regression messages (empty if none)
+    """
+    regressions = []
+    for result in results:
+        baseline = baselines.get(str(result["rows"]))
+        if not baseline or baseline.get("timed_out") or baseline.get("error"):
+            continue
+        label = f"{result['rows']:,} rows"
+        if result.get("timed_out") or result.get("error"):
+            regressions.append(f"{label}: did not finish ({result.get('error') or 'timed out'})")
+            continue
+
+        limit = baseline["total_seconds"] * (1 + time_tolerance)
+        if result["total_seconds"] > limit:
+            regressions.append(
+                f"{label}: total {result['total_seconds']:.3f}s > {limit:.3f}s "
+                f"(baseline {baseline['total_seconds']:.3f}s)"
+            )
+        for stage, stats in baseline.get("stages", {}).items():
+            if stats["seconds"] < MIN_GATED_SECONDS or stage not in result["stages"]:
+                continue
+            limit = stats["seconds"] * (1 + time_tolerance)
+            if result["stages"][stage]["seconds"] > limit:
+                regressions.append(
+                    f"{label}: {stage} {result['stages'][stage]['seconds']:.3f}s > {limit:.3f}s"
+                )
+        if baseline.get("peak_mb") and result.get("peak_mb") is not None:
+            limit = baseline["peak_mb"] * (1 + memory_tolerance)
+            if result["peak_mb"] > limit:
+                regressions.append(f"{label}: peak memory {result['peak_mb']:.1f} MB > {limit:.1f} MB")
+        same_data = all(
+            result.get(key, default) == baseline.get(key, default) for key, default in (("seed", 0), ("density", 1.0))
+        )
+        if same_data and result["planted_flagged"] < baseline.get("planted_flagged", 0):
+            regressions.append(
+                f"{label}: flagged {result['planted_flagged']} planted mules "
+                f"(baseline {baseline['planted_flagged']})"
+            )
+        if result.get("planted_mules") and result["planted_flagged"] < min_recall * result["planted_mules"]:
+            regressions.append(
+                f"{label}: flagged {result['planted_flagged']}/{result['planted_mules']} planted mules "
+                f"(minimum recall {min_recall:.0%})"
+            )
+    return regressions
+
+
+def load_baselines(path: str = BASELINES_PATH) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f).get("sizes", {})
+
+
+def save_baselines(results: List[Dict[str, Any]], path: str = BASELINES_PATH) -> None:
+    """Merge results into the baseline file (other sizes are kept)"""
+    sizes = load_baselines(path)
+    for result in results:
+        sizes[str(result["rows"])] = result
+    document = {
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "updated": time.strftime("%Y-%m-%d"),
+        "sizes": dict(sorted(sizes.items(), key=lambda item: int(item[0])))
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
+        f.write("\n")
+
+
+def _print_result(result: Dict[str, Any]) -> None:
+    if result.get("timed_out"):
+        print(f"⏱️  {result['rows']:>12,} rows: timed out after {result['timeout_seconds']:g}s")
+        return
+    if result.get("error"):
+        print(f"❌ {result['rows']:>12,} rows: {result['error']}")
+        return
+    peak = f"{result['peak_mb']:.1f} MB" if result["peak_mb"] is not None else "n/a"
+    print(
+        f"✅ {result['rows']:>12,} rows: {result['total_seconds']:.3f}s, peak {peak}, "
+        f"seed {result['seed']}, planted mules flagged {result['planted_flagged']}/{result['planted_mules']}, "
+        f"traps flagged {result['traps_flagged']}"
+    )
+    slowest = sorted(result["stages"].items(), key=lambda item: item[1]["seconds"], reverse=True)
+    for stage, stats in slowest:
+        stage_peak = f", peak {stats['peak_mb']:.1f} MB" if "peak_mb" in stats else ""
+        print(f"     {stage:<32} {stats['seconds']:>10.4f}s  x{stats['calls']}{stage_peak}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark graph_analyzer on synthetic transactions")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Generator seed (default: each size's baseline seed, else 0)")
+    parser.add_argument("--density", type=float, default=None,
+                        help="Transactions per background account (default: each size's baseline density, else 1.0)")
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds per size before giving up")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--baselines", default=BASELINES_PATH)
+    parser.add_argument("--check", action="store_true", help="Exit 1 on regressions against the baselines")
+    parser.add_argument("--update-baselines", action="store_true")
+    parser.add_argument("--edge-insertion", action="store_true",
+                        help="Time per-edge ring discovery (cycles_through_edge) instead of full analyses")
+    parser.add_argument("--parse", action="store_true",
+                        help="Time CSV parsing (previous parser vs read_csv_transactions) instead of full analyses")
+    parser.add_argument("--time-tolerance", type=float, default=0.3)
+    parser.add_argument("--memory-tolerance", type=float, default=0.2)
+    parser.add_argument("--min-recall", type=float, default=MIN_PLANTED_RECALL,
+                        help="Share of planted mules each size must flag under --check")
+    args = parser.parse_args(argv)
+    baselines = load_baselines(args.baselines)
+
+    def dataset(rows: int) -> Dict[str, Any]:
+        """Seed and density for a size: the CLI's, else the ones its baseline was recorded with"""
+        baseline = baselines.get(str(rows), {})
+        return {
+            "seed": args.seed if args.seed is not None else baseline.get("seed", 0),
+            "density": args.density if args.density is not None else baseline.get("density", 1.0),
+        }
+
+    if args.edge_insertion:
+        for rows in sorted(args.sizes):
+            result = run_edge_insertion_benchmark(rows, **dataset(rows))
+            print(
+                f"✅ {rows:>12,} rows: {result['edges']:,} edges, {result['mean_us']:.1f}µs mean, "
+                f"p50 {result['p50_us']:.1f}µs, p99 {result['p99_us']:.1f}µs, max {result['max_us']:.0f}µs, "
+                f"{result['rings']} rings"
+            )
+        return 0
+
+    if args.parse:
+        for rows in sorted(args.sizes):
+            result = run_parse_benchmark(rows, **dataset(rows))
+            timings = ", ".join(
+                f"{name} {stats['seconds']:.2f}s ({stats['speedup']:.1f}x)" for name, stats in result["parsers"].items()
+            )
+            print(f"✅ {rows:>12,} rows ({result['csv_mb']:.0f} MB CSV): {timings}")
+        return 0
+
+    results = []
+    for rows in sorted(args.sizes):
+        result = run_isolated(rows, args.timeout, memory=not args.no_memory, **dataset(rows))
+        results.append(result)
+        _print_result(result)
+        if result.get("timed_out"):
+            # Larger inputs will not finish either
+            break
+
+    if args.update_baselines:
+        save_baselines(results, args.baselines)
+        print(f"✅ Baselines written to {args.baselines}")
+
+    if args.check:
+        regressions = compare(results, baselines, args.time_tolerance, args.memory_tolerance, args.min_recall)
+        for regression in regressions:
+            print(f"❌ Regression: {regression}")
+        if regressions:
+            return 1
+        print("✅ No regressions against baselines")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
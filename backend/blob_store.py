@@ -0,0 +1,231 @@
+"""
+Blob Store Module
+Pluggable content-addressed storage for off-chain evidence: the IPFS HTTP
+client or a local disk store that computes the same CIDv0 as `ipfs add`
+(default chunker and balanced DAG) and serves reads through mmap
+"""
+import asyncio
+import hashlib
+from abc import ABC, abstractmethod
+import json
+import mmap
+import os
+import tempfile
+from typing import Any, Dict, List, Tuple
+
+from profile_codec import SHA256_MULTIHASH_PREFIX, base58_encode, cid_to_multihash
+
+
+# `ipfs add` defaults (CIDv0): size-262144 chunker, balanced layout with at most
+# 174 links per node, dag-pb/UnixFS leaves (no raw leaves)
+CHUNK_SIZE = 256 * 1024
+MAX_LINKS = 174
+UNIXFS_FILE = 2
+
+
+class BlobStore(ABC):
+    """
+    Content-addressed storage backend
+
+    Implementations provide location/add_bytes/cat/contains/version; JSON
+    documents are encoded the same way everywhere (sorted keys, compact
+    separators), so one document has one CID whichever backend stores it.
+    """
+
+    backend = "unknown"
+
+    @property
+    @abstractmethod
+    def location(self) -> str:
+        """Where this backend keeps its blobs (API URL, directory)"""
+
+    @property
+    def store_id(self) -> str:
+        """Backend kind and location, e.g. "ipfs:http://127.0.0.1:5001" (what was uploaded where)"""
+        return f"{self.backend}:{self.location}"
+
+    @abstractmethod
+    async def version(self) -> Dict[str, Any]:
+        """Probe the backend; raises if it is unreachable"""
+
+    @abstractmethod
+    async def add_bytes(self, data: bytes) -> str:
+        """Store raw bytes; returns the CID"""
+
+    @abstractmethod
+    async def cat(self, cid: str) -> bytes:
+        """Bytes stored under a CID"""
+
+    @abstractmethod
+    async def contains(self, cid: str) -> bool:
+        """Whether the backend still holds a CID (without fetching it from elsewhere)"""
+
+    async def add_json(self, json_obj: Any) -> str:
+        """Store a JSON document; returns the CID"""
+        encoded = json.dumps(
+            json_obj, sort_keys=True, ensure_ascii=False, separators=(",", ":"), allow_nan=False
+        ).encode("utf-8")
+        return await self.add_bytes(encoded)
+
+    async def get_json(self, cid: str) -> Any:
+        return json.loads(await self.cat(cid))
+
+    async def aclose(self) -> None:
+        pass
+
+
+def _varint(value: int) -> bytes:
+    encoded = bytearray()
+    while value > 0x7F:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def _field(tag: int, payload: bytes) -> bytes:
+    """Length-delimited protobuf field"""
+    return _varint(tag) + _varint(len(payload)) + payload
+
+
+def _unixfs_file(data: bytes, filesize: int, blocksizes: List[int]) -> bytes:
+    """UnixFS Data message of a file node (leaf: data only, internal: blocksizes only)"""
+    message = _varint(0x08) + _varint(UNIXFS_FILE)
+    if data:
+        message += _field(0x12, data)
+    message += _varint(0x18) + _varint(filesize)
+    for size in blocksizes:
+        message += _varint(0x20) + _varint(size)
+    return message
+
+
+def _dag_pb_node(links: List[Tuple[bytes, int]], unixfs: bytes) -> bytes:
+    """dag-pb PBNode: links (multihash, tsize) with empty names, then the UnixFS data"""
+    node = b""
+    for multihash, tsize in links:
+        link = _field(0x0A, multihash) + _field(0x12, b"") + _varint(0x18) + _varint(tsize)
+        node += _field(0x12, link)
+    return node + _field(0x0A, unixfs)
+
+
+def _multihash(block: bytes) -> bytes:
+    return SHA256_MULTIHASH_PREFIX + hashlib.sha256(block).digest()
+
+
+def compute_cid(data: bytes) -> str:
+    """
+    CIDv0 that `ipfs add` (default settings) assigns to a file's content
+
+    Args:
+        data: File content
+
+    Returns:
+        "Qm..." root CID
+    """
+    # Level 0: one UnixFS leaf per chunk -> (multihash, tsize, file bytes covered)
+    view = memoryview(data)
+    nodes = []
+    for offset in range(0, max(len(data), 1), CHUNK_SIZE):
+        chunk = bytes(view[offset:offset + CHUNK_SIZE])
+        block = _dag_pb_node([], _unixfs_file(chunk, len(chunk), []))
+        nodes.append((_multihash(block), len(block), len(chunk)))
+
+    # Balanced layout: group MAX_LINKS children per parent until one root remains
+    while len(nodes) > 1:
+        parents = []
+        for start in range(0, len(nodes), MAX_LINKS):
+            children = nodes[start:start + MAX_LINKS]
+            filesize = sum(size for _, _, size in children)
+            block = _dag_pb_node(
+                [(multihash, tsize) for multihash, tsize, _ in children],
+                _unixfs_file(b"", filesize, [size for _, _, size in children])
+            )
+            parents.append((_multihash(block), len(block) + sum(tsize for _, tsize, _ in children), filesize))
+        nodes = parents
+
+    return base58_encode(nodes[0][0])
+
+
+class LocalBlobStore(BlobStore):
+    """
+    Disk-backed content-addressed store, a drop-in for the IPFS client
+
+    Each blob is written once to <root>/<cid[-2:]>/<cid> (atomic rename) and
+    read back through a memory map, so no daemon is needed for offline runs
+    and load tests while CIDs stay identical to the ones IPFS would assign.
+    """
+
+    backend = "local"
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    @property
+    def location(self) -> str:
+        return os.path.abspath(self.root)
+
+    def _path(self, cid: str) -> str:
+        return os.path.join(self.root, cid[-2:], cid)
+
+    async def version(self) -> Dict[str, Any]:
+        return {"Version": "local", "Root": self.root}
+
+    async def add_bytes(self, data: bytes) -> str:
+        if len(data) > CHUNK_SIZE:
+            # Hashing many chunks is CPU-bound; keep it off the event loop
+            return await asyncio.to_thread(self.put, data)
+        return self.put(data)
+
+    async def cat(self, cid: str) -> bytes:
+        with self.open(cid) as mapped:
+            return mapped[:]
+
+    async def contains(self, cid: str) -> bool:
+        return self.has(cid)
+
+    def put(self, data: bytes) -> str:
+        """Synchronous add: store bytes unless already present, return the CID"""
+        cid = compute_cid(data)
+        path = self._path(cid)
+        if os.path.exists(path):
+            return cid
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return cid
+
+    def open(self, cid: str):
+        """
+        Read-only memory map of a stored blob (use as a context manager)
+
+        Raises:
+            ValueError: if the CID is not a CIDv0
+            FileNotFoundError: if the blob is not in this store
+        """
+        cid_to_multihash(cid)
+        with open(self._path(cid), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # mmap cannot map empty files
+                return _EmptyMap()
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def has(self, cid: str) -> bool:
+        return os.path.exists(self._path(cid))
+
+
+class _EmptyMap(bytes):
+    """Stand-in for mmap of an empty blob"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
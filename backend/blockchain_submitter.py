@@ -0,0 +1,499 @@
+"""
+Bulk Blockchain Submission Module
+Signs and submits many register_wallet calls concurrently, then confirms them together
+"""
+import base64
+import copy
+import socket
+import time
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from algosdk import error as algod_error
+from algosdk.atomic_transaction_composer import (
+    AtomicTransactionComposer,
+    AccountTransactionSigner
+)
+from algosdk.abi import Contract, Method
+from algosdk.v2client import algod
+
+from profile_codec import COMPACT_PROFILE_SIZE, cid_to_multihash
+
+
+# register_wallets_batch: wallets per call (one profile box reference each)
+MAX_BATCH_SIZE = 8
+
+# Algorand protocol limits
+MAX_GROUP_SIZE = AtomicTransactionComposer.MAX_GROUP_SIZE  # 16 transactions per atomic group
+MAX_TX_REFERENCES = 8  # accounts + assets + apps + boxes per app call, pooled across the group
+BOX_IO_QUOTA = 1024  # bytes of box read/write granted to the group per box reference
+
+# HTTP status codes from algod that are worth retrying
+TRANSIENT_HTTP_CODES = {429, 500, 502, 503, 504}
+
+
+def register_wallet_fee() -> int:
+    """
+    Flat fee for a register_wallet call
+
+    Fee = base + (2500 + 400*size) for the wallet's single compact profile box
+    (the CID is stored inside it, so its length no longer matters)
+    """
+    return 1000 + (2500 + 400 * COMPACT_PROFILE_SIZE)
+
+
+def register_wallets_batch_fee(count: int) -> int:
+    """Flat fee for a register_wallets_batch call covering `count` wallets"""
+    return 1000 + count * (2500 + 400 * COMPACT_PROFILE_SIZE)
+
+
+def check_group_resources(call_specs: List[Dict[str, Any]]) -> None:
+    """
+    Check a group's app calls against the pooled resource limits
+
+    References are shared across an atomic group: its calls may reference
+    at most MAX_TX_REFERENCES resources per transaction in total, and box
+    I/O is one budget of BOX_IO_QUOTA bytes per box reference anywhere in
+    the group.
+
+    Raises:
+        ValueError: if the group would be rejected for either limit
+    """
+    references = sum(len(spec["boxes"]) for spec in call_specs)
+    if references > MAX_TX_REFERENCES * len(call_specs):
+        raise ValueError(
+            f"{references} references exceed the group's pooled limit of "
+            f"{MAX_TX_REFERENCES * len(call_specs)}"
+        )
+    box_bytes = sum(spec["box_bytes"] for spec in call_specs)
+    if box_bytes > BOX_IO_QUOTA * references:
+        raise ValueError(
+            f"{box_bytes} bytes of box writes exceed the group's box I/O quota of {BOX_IO_QUOTA * references}"
+        )
+
+
+def is_transient_error(exc: Exception) -> bool:
+    """
+    Check whether a failed algod call is worth retrying
+    (network errors, timeouts, rate limiting, node-side 5xx)
+    """
+    if isinstance(exc, algod_error.AlgodHTTPError):
+        return exc.code in TRANSIENT_HTTP_CODES
+    return isinstance(exc, (urllib.error.URLError, socket.timeout, ConnectionError, TimeoutError))
+
+
+class BulkFlagSubmitter:
+    """
+    Submission engine for flagging many accounts at once
+
+    Pipeline:
+    1. Fetch suggested params ONCE for the whole batch (or take them from a
+       shared SuggestedParamsProvider)
+    2. Pack accounts into app calls (up to MAX_BATCH_SIZE per
+       register_wallets_batch call when the deployed app routes it), pack calls into atomic groups of up to 16
+       (pooled fees) and sign every group up front
+    3. Submit all signed groups concurrently (bounded in-flight limit)
+    4. Confirm everything with a single wait loop over the pending txids
+
+    Algorand has no account nonces, so every transaction signed against the
+    same suggested params is independent and can be in flight at once.
+    """
+
+    def __init__(
+        self,
+        algod_client: algod.AlgodClient,
+        contract: Contract,
+        app_id: int,
+        sender_addr: str,
+        sender_sk: str,
+        max_in_flight: int = 32,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        max_wait_rounds: int = 10,
+        group_size: int = MAX_GROUP_SIZE,
+        on_confirmed: Optional[Callable[[List[str]], None]] = None,
+        params_provider=None
+    ):
+        self.algod_client = algod_client
+        self.contract = contract
+        self.app_id = app_id
+        self.sender_addr = sender_addr
+        self.signer = AccountTransactionSigner(sender_sk)
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff = retry_backoff
+        self.max_wait_rounds = max_wait_rounds
+        self.group_size = min(max(1, group_size), MAX_GROUP_SIZE)
+        # Called with the hashed IDs whose registration just confirmed
+        self.on_confirmed = on_confirmed
+        # Shared cached params; rounds seen while confirming are reported back to it
+        self.params_provider = params_provider
+        self.register_method: Method = contract.get_method_by_name("register_wallet")
+        # Older deployments only have register_wallet - fall back to one account per call
+        try:
+            self.batch_method: Optional[Method] = contract.get_method_by_name("register_wallets_batch")
+        except KeyError:
+            self.batch_method = None
+        # Whether the deployed approval program routes batch_method (None = not checked yet)
+        self._batch_routed: Optional[bool] = None
+
+    def flag_accounts(
+        self,
+        flag_requests: List[Dict[str, Any]],
+        on_signed: Optional[Callable[[List[Dict[str, Any]], List[str], list], None]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Flag a batch of accounts on-chain
+
+        Args:
+            flag_requests: List of dicts with keys:
+                account_id, hashed_id (hex), risk_score,
+                transaction_count, flagged_connections, ipfs_hash
+            on_signed: Called with (requests, txid per request, signed group)
+                right before each group is sent, so a journal can record it
+
+        Returns:
+            One result per request (same order) with status "flagged" or "failed",
+            plus transaction_id / confirmed_round / group_size or error
+        """
+        results = [
+            {
+                "account_id": req.get("account_id"),
+                "hashed_id": req["hashed_id"],
+                "status": "failed",
+                "transaction_id": None,
+                "error": None
+            }
+            for req in flag_requests
+        ]
+        if not flag_requests:
+            return results
+
+        # 1. Suggested params once per batch
+        try:
+            if self.params_provider:
+                sp = self._call_with_retry(self.params_provider.get)
+            else:
+                sp = self._call_with_retry(self.algod_client.suggested_params)
+        except Exception as e:
+            for result in results:
+                result["error"] = f"Could not fetch suggested params: {e}"
+            return results
+        sp.flat_fee = True
+
+        # 2. Pack into app calls and atomic groups, sign everything up front
+        first_index_by_hash = {}
+        indices = []
+        for idx, req in enumerate(flag_requests):
+            # Same hashed_id twice would produce the same txid - flag it once
+            if req["hashed_id"] in first_index_by_hash:
+                results[idx]["error"] = "Duplicate hashed_id in batch"
+                continue
+            try:
+                cid_to_multihash(req.get("ipfs_hash") or "")
+            except ValueError as e:
+                results[idx]["error"] = str(e)
+                continue
+            first_index_by_hash[req["hashed_id"]] = idx
+            indices.append(idx)
+
+        calls = self._pack_calls(flag_requests, indices)
+        groups = [
+            [idx for call in calls[i:i + self.group_size] for idx in call]
+            for i in range(0, len(calls), self.group_size)
+        ]
+        signed_groups = []
+        for group in groups:
+            try:
+                signed_groups.append((group, self._sign_group(sp, flag_requests, group)))
+            except Exception as e:
+                for idx in group:
+                    results[idx]["error"] = f"Signing failed: {e}"
+
+        # 3. Submit concurrently (rejected groups are split to isolate bad calls)
+        pending = {}  # first txid of a submitted group -> result indices
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as pool:
+            futures = [
+                pool.submit(self._submit_group, sp, flag_requests, group, signed, on_signed)
+                for group, signed in signed_groups
+            ]
+            for future in futures:
+                for group, txids, error in future.result():
+                    for position, idx in enumerate(group):
+                        results[idx]["group_size"] = len(group)
+                        if txids:
+                            results[idx]["transaction_id"] = txids[position]
+                        else:
+                            results[idx]["error"] = error
+                    if txids:
+                        pending.setdefault(txids[0], []).extend(group)
+
+            # 4. One confirmation loop for the whole batch
+            confirmed = self._wait_for_confirmations(pool, pending, sp.last)
+
+        # Groups are atomic - every member shares the outcome of its group
+        for txid, group in pending.items():
+            outcome = confirmed.get(txid)
+            for idx in group:
+                if outcome and outcome.get("confirmed-round"):
+                    results[idx]["status"] = "flagged"
+                    results[idx]["confirmed_round"] = outcome["confirmed-round"]
+                else:
+                    results[idx]["error"] = (outcome or {}).get("error", "Transaction not confirmed")
+
+        if self.on_confirmed:
+            confirmed_ids = [result["hashed_id"] for result in results if result["status"] == "flagged"]
+            if confirmed_ids:
+                self.on_confirmed(confirmed_ids)
+
+        return results
+
+    def _pack_calls(self, flag_requests: List[Dict[str, Any]], indices: List[int]) -> List[List[int]]:
+        """
+        Split accounts into app calls
+
+        Consecutive accounts sharing an IPFS hash go into one
+        register_wallets_batch call (up to MAX_BATCH_SIZE), otherwise
+        each account gets its own register_wallet call
+        """
+        per_call = MAX_BATCH_SIZE if self._batch_enabled() else 1
+        calls = []
+        for idx in indices:
+            ipfs_hash = flag_requests[idx].get("ipfs_hash") or ""
+            if (
+                calls
+                and len(calls[-1]) < per_call
+                and (flag_requests[calls[-1][0]].get("ipfs_hash") or "") == ipfs_hash
+            ):
+                calls[-1].append(idx)
+            else:
+                calls.append([idx])
+        return calls
+
+    def _batch_enabled(self) -> bool:
+        """
+        Check whether register_wallets_batch calls can be used
+
+        The ABI spec listing the method is not enough: an app deployed from
+        older artifacts rejects the selector, and every batch call would cost
+        a failed round trip before the split fallback reaches single calls.
+        The deployed approval program is read once and must contain the
+        method's selector; until it can be read, accounts go one per call.
+        """
+        if self.batch_method is None:
+            return False
+        if self._batch_routed is None:
+            try:
+                info = self._call_with_retry(self.algod_client.application_info, self.app_id)
+                program = base64.b64decode(info["params"]["approval-program"])
+            except Exception as e:
+                print(f"⚠️ Could not read the approval program, registering one wallet per call: {e}")
+                return False
+            self._batch_routed = self.batch_method.get_selector() in program
+            if not self._batch_routed:
+                print("⚠️ Deployed app does not route register_wallets_batch, registering one wallet per call")
+        return self._batch_routed
+
+    def _sign_group(
+        self,
+        sp,
+        flag_requests: List[Dict[str, Any]],
+        group: List[int]
+    ) -> Tuple[list, List[int]]:
+        """
+        Build one atomic group of registration calls and sign it
+
+        Fee pooling: the first call pays for the whole group, the rest pay 0
+
+        Returns:
+            (signed transactions, index of the transaction carrying each account)
+        """
+        calls = self._pack_calls(flag_requests, group)
+        if len(calls) > MAX_GROUP_SIZE:
+            raise ValueError(f"{len(calls)} calls do not fit in one atomic group")
+
+        call_specs = [self._call_spec(flag_requests, call) for call in calls]
+        check_group_resources(call_specs)
+        group_fee = sum(spec["fee"] for spec in call_specs)
+
+        atc = AtomicTransactionComposer()
+        txn_positions = []
+        for position, (call, spec) in enumerate(zip(calls, call_specs)):
+            call_sp = copy.copy(sp)
+            call_sp.fee = group_fee if position == 0 else 0
+            call_sp.flat_fee = True
+
+            atc.add_method_call(
+                app_id=self.app_id,
+                method=spec["method"],
+                sender=self.sender_addr,
+                sp=call_sp,
+                signer=self.signer,
+                method_args=spec["args"],
+                boxes=spec["boxes"]
+            )
+            txn_positions.extend([position] * len(call))
+        return atc.gather_signatures(), txn_positions
+
+    def _call_spec(self, flag_requests: List[Dict[str, Any]], call: List[int]) -> Dict[str, Any]:
+        """Method, arguments, box references and fee for one app call"""
+        reqs = [flag_requests[idx] for idx in call]
+        ipfs_multihash = cid_to_multihash(reqs[0].get("ipfs_hash") or "")
+        hashed_ids = [bytes.fromhex(req["hashed_id"]) for req in reqs]
+
+        if len(reqs) == 1:
+            req = reqs[0]
+            return {
+                "method": self.register_method,
+                "args": [
+                    hashed_ids[0],
+                    int(req.get("risk_score", 0)),
+                    int(req.get("transaction_count", 0)),
+                    int(req.get("flagged_connections", 0)),
+                    ipfs_multihash
+                ],
+                "boxes": [(self.app_id, hashed_ids[0])],
+                "box_bytes": COMPACT_PROFILE_SIZE,
+                "fee": register_wallet_fee()
+            }
+
+        return {
+            "method": self.batch_method,
+            "args": [
+                hashed_ids,
+                [int(req.get("risk_score", 0)) for req in reqs],
+                [int(req.get("transaction_count", 0)) for req in reqs],
+                [int(req.get("flagged_connections", 0)) for req in reqs],
+                ipfs_multihash
+            ],
+            "boxes": [(self.app_id, hashed_id) for hashed_id in hashed_ids],
+            "box_bytes": len(reqs) * COMPACT_PROFILE_SIZE,
+            "fee": register_wallets_batch_fee(len(reqs))
+        }
+
+    def _submit_group(
+        self,
+        sp,
+        flag_requests: List[Dict[str, Any]],
+        group: List[int],
+        signed: Tuple[list, List[int]],
+        on_signed=None
+    ) -> List[Tuple[List[int], Optional[List[str]], Optional[str]]]:
+        """
+        Send one signed group
+
+        A rejected group fails atomically, so it is split in half, re-signed and
+        resent until the failing accounts are isolated. Every account then gets
+        its own result instead of inheriting the error of its neighbours.
+
+        Returns:
+            List of (result indices, txid per account or None, error or None)
+        """
+        stxns, txn_positions = signed
+        txids = [stxn.get_txid() for stxn in stxns]
+        account_txids = [txids[position] for position in txn_positions]
+        if on_signed:
+            on_signed([flag_requests[idx] for idx in group], account_txids, stxns)
+
+        error = self._send_with_retry(stxns)
+        if error is None:
+            return [(group, account_txids, None)]
+        if len(group) == 1:
+            return [(group, None, error)]
+
+        outcomes = []
+        mid = len(group) // 2
+        for half in (group[:mid], group[mid:]):
+            try:
+                half_signed = self._sign_group(sp, flag_requests, half)
+            except Exception as e:
+                outcomes.append((half, None, f"Signing failed: {e}"))
+                continue
+            outcomes.extend(self._submit_group(sp, flag_requests, half, half_signed, on_signed))
+        return outcomes
+
+    def _call_with_retry(self, fn, *args):
+        """Call an algod method, retrying transient failures with backoff"""
+        attempt = 0
+        while True:
+            try:
+                return fn(*args)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_transient_error(e):
+                    raise
+                time.sleep(self.retry_backoff * (2 ** attempt))
+                attempt += 1
+
+    def _send_with_retry(self, stxns: list) -> Optional[str]:
+        """
+        Send one signed transaction group
+
+        Returns:
+            None on success, error message on failure
+        """
+        try:
+            self._call_with_retry(self.algod_client.send_transactions, stxns)
+            return None
+        except Exception as e:
+            # A retried send can race its own earlier attempt
+            if "already in ledger" in str(e).lower():
+                return None
+            return str(e)
+
+    def _wait_for_confirmations(
+        self,
+        pool: ThreadPoolExecutor,
+        pending: Dict[str, int],
+        last_valid_round: int
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Wait for all pending txids in one loop (one round at a time)
+
+        Returns:
+            txid -> {"confirmed-round": int} or {"error": str}
+        """
+        outcomes = {}
+        waiting = set(pending)
+        if not waiting:
+            return outcomes
+
+        try:
+            current_round = self._call_with_retry(self.algod_client.status)["last-round"]
+        except Exception as e:
+            return {txid: {"error": f"Could not read node status: {e}"} for txid in waiting}
+
+        last_round = min(last_valid_round, current_round + self.max_wait_rounds)
+        while waiting and current_round <= last_round:
+            txids = list(waiting)
+            infos = pool.map(self._pending_info, txids)
+            for txid, info in zip(txids, infos):
+                if info is None:
+                    continue
+                if info.get("confirmed-round", 0) > 0:
+                    outcomes[txid] = {"confirmed-round": info["confirmed-round"]}
+                    waiting.discard(txid)
+                elif info.get("pool-error"):
+                    outcomes[txid] = {"error": info["pool-error"]}
+                    waiting.discard(txid)
+
+            if not waiting:
+                break
+            try:
+                status = self._call_with_retry(self.algod_client.status_after_block, current_round)
+                if self.params_provider:
+                    self.params_provider.observe_round(status["last-round"])
+            except Exception as e:
+                print(f"⚠️ status_after_block failed: {e}")
+            current_round += 1
+
+        for txid in waiting:
+            outcomes[txid] = {"error": f"Transaction not confirmed by round {last_round}"}
+        return outcomes
+
+    def _pending_info(self, txid: str) -> Optional[Dict[str, Any]]:
+        """Pending transaction info, or None if it could not be read this round"""
+        try:
+            return self._call_with_retry(self.algod_client.pending_transaction_info, txid)
+        except Exception:
+            return None
@@ -0,0 +1,210 @@
+"""
+Evidence Store Module
+Content-addressed IPFS evidence bundles: documents are serialized as
+canonical JSON so identical evidence always has the same CID, and a local
+CID cache skips uploads whose content is already on IPFS
+"""
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from blob_store import BlobStore
+
+BUNDLE_VERSION = 1
+
+
+def canonical_json(document: Any) -> bytes:
+    """
+    Deterministic JSON encoding of a document
+
+    Sorted keys, compact separators, UTF-8, no NaN/Infinity - the same bytes
+    AsyncIPFSClient.add_json() uploads, so the same document maps to one CID.
+    """
+    return json.dumps(
+        document, sort_keys=True, ensure_ascii=False, separators=(",", ":"), allow_nan=False
+    ).encode("utf-8")
+
+
+def ring_bundle(ring: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Evidence document for one fraud ring
+
+    Leaves out the analysis-local ring_id and sorts the members, so the same
+    ring found by another analysis (or another process) yields the same bundle.
+    """
+    return {
+        "kind": "aml_fraud_ring",
+        "version": BUNDLE_VERSION,
+        "pattern_type": ring.get("pattern_type"),
+        "member_accounts": sorted(ring.get("member_accounts", [])),
+        "risk_score": ring.get("risk_score")
+    }
+
+
+def analysis_bundle(suspicious_accounts: List[Dict[str, Any]], ring_cids: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Evidence document for one analysis: every mule, pointing at its ring bundle by CID
+
+    Args:
+        suspicious_accounts: The analysis' suspicious_accounts entries
+        ring_cids: ring_id -> CID of that ring's bundle
+
+    Returns:
+        Bundle with mules and rings in a fixed order (account ID / CID)
+    """
+    mules = [
+        {
+            "account_id": acc.get("account_id"),
+            "risk_score": acc.get("suspicion_score"),
+            "patterns": sorted(acc.get("detected_patterns", [])),
+            "transaction_count": acc.get("transaction_count", 0),
+            "flagged_connections": acc.get("flagged_connections", 0),
+            "ring": ring_cids.get(acc.get("ring_id"))
+        }
+        for acc in suspicious_accounts
+    ]
+    mules.sort(key=lambda mule: mule["account_id"])
+    return {
+        "kind": "aml_analysis",
+        "version": BUNDLE_VERSION,
+        "mules": mules,
+        "rings": sorted(set(ring_cids.values()))
+    }
+
+
+class EvidenceStore:
+    """
+    Uploads evidence documents to IPFS at most once
+
+    Every document is keyed by the backend's store_id (kind and endpoint or
+    path) plus the SHA-256 of its canonical encoding, so switching
+    BLOB_STORE or IPFS_API_URL never serves a CID the new backend was not
+    given. The map lives in SQLite (":memory:" or a file that survives
+    restarts), and concurrent puts of the same content share one upload.
+    A cached CID is only trusted after the backend confirms it still holds
+    it (a node can be wiped or garbage collected); otherwise the entry is
+    dropped and the document uploaded again.
+    """
+
+    def __init__(self, ipfs_client: BlobStore, db_path: str = ":memory:"):
+        self.ipfs_client = ipfs_client
+        self.store_id = ipfs_client.store_id
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Lock] = {}
+        self.uploads = 0
+        self.hits = 0
+        # Cached CIDs the backend no longer held (re-uploaded)
+        self.evictions = 0
+
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(evidence)")}
+        if columns and "store" not in columns:
+            # Rows from before entries were scoped to a backend: nothing says
+            # where they were uploaded, so they are dropped (re-uploaded once)
+            self._db.execute("DROP TABLE evidence")
+        self._db.executescript(
+            "PRAGMA journal_mode=WAL;"
+            "CREATE TABLE IF NOT EXISTS evidence ("
+            " store TEXT NOT NULL, digest TEXT NOT NULL, cid TEXT NOT NULL, kind TEXT,"
+            " size INTEGER, created_at REAL, PRIMARY KEY (store, digest));"
+        )
+        self._db.commit()
+
+    def lookup(self, document: Any) -> Optional[str]:
+        """CID of a document already uploaded through this store, else None (not re-verified)"""
+        return self._cached(hashlib.sha256(canonical_json(document)).hexdigest())
+
+    async def put(self, document: Any) -> Tuple[str, bool]:
+        """
+        Store a document on IPFS unless identical content is already there
+
+        Returns:
+            (CID, True if this call uploaded it / False if served from the cache)
+        """
+        encoded = canonical_json(document)
+        digest = hashlib.sha256(encoded).hexdigest()
+
+        lock = self._inflight.setdefault(digest, asyncio.Lock())
+        try:
+            async with lock:
+                cid = self._cached(digest)
+                if cid is not None:
+                    if await self._still_stored(cid):
+                        self.hits += 1
+                        return cid, False
+                    self.evictions += 1
+                    with self._lock:
+                        self._db.execute(
+                            "DELETE FROM evidence WHERE store = ? AND digest = ?", (self.store_id, digest)
+                        )
+                        self._db.commit()
+
+                cid = await self.ipfs_client.add_bytes(encoded)
+                kind = document.get("kind") if isinstance(document, dict) else None
+                with self._lock:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO evidence (store, digest, cid, kind, size, created_at)"
+                        " VALUES (?, ?, ?, ?, ?, ?)",
+                        (self.store_id, digest, cid, kind, len(encoded), time.time())
+                    )
+                    self._db.commit()
+                self.uploads += 1
+                return cid, True
+        finally:
+            if not lock.locked():
+                self._inflight.pop(digest, None)
+
+    async def publish_analysis(self, analysis_result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Publish the ring bundles and the analysis bundle of one analysis
+
+        Ring bundles go first so the analysis bundle can reference them by CID;
+        anything already published (by this or an earlier analysis) is reused.
+
+        Returns:
+            Dict with the analysis bundle "cid", "ring_cids" (ring_id -> CID),
+            and how many bundles were "uploaded" vs "reused"
+        """
+        uploaded = 0
+        ring_cids = {}
+        for ring in analysis_result.get("fraud_rings", []):
+            cid, fresh = await self.put(ring_bundle(ring))
+            ring_cids[ring.get("ring_id")] = cid
+            uploaded += fresh
+
+        cid, fresh = await self.put(
+            analysis_bundle(analysis_result.get("suspicious_accounts", []), ring_cids)
+        )
+        uploaded += fresh
+        return {
+            "cid": cid,
+            "ring_cids": ring_cids,
+            "uploaded": uploaded,
+            "reused": len(ring_cids) + 1 - uploaded
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stored = self._db.execute(
+                "SELECT COUNT(*) FROM evidence WHERE store = ?", (self.store_id,)
+            ).fetchone()[0]
+        return {"documents": stored, "uploads": self.uploads, "hits": self.hits, "evictions": self.evictions}
+
+    async def _still_stored(self, cid: str) -> bool:
+        """Check a cached CID against the backend; a failed check counts as missing (re-upload)"""
+        try:
+            return await self.ipfs_client.contains(cid)
+        except Exception as e:
+            print(f"⚠️ Could not check {cid} on the blob store, uploading again: {e}")
+            return False
+
+    def _cached(self, digest: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT cid FROM evidence WHERE store = ? AND digest = ?", (self.store_id, digest)
+            ).fetchone()
+        return row[0] if row else None
@@ -0,0 +1,504 @@
+"""
+Flag Outbox Module
+Durable SQLite queue of on-chain flag operations, drained by a background
+worker so analysis responses never wait for blockchain confirmations
+"""
+import base64
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from algosdk import encoding
+
+from profile_codec import FLAG_THRESHOLD, is_compact
+from registry_reader import read_box, read_wallet_profile
+
+
+# Statuses that still need work from the worker
+OPEN_STATUSES = ("pending", "submitted")
+
+
+class FlagOutbox:
+    """
+    Persistent journal of register_wallet operations
+
+    - One row per (hashed_id, analysis_id): enqueueing the same analysis
+      again only retries its failed rows, so retries never double-flag
+    - Rows are grouped into a batch (one per analysis) that clients poll
+    - Status: pending -> submitted (txid + signed group journaled before
+      sending) -> confirmed | failed; skipped when the wallet's box already
+      holds the same payload
+    - The signed bytes of every submitted group are kept until it resolves,
+      so recovery re-sends the exact same transactions (same txids) and a
+      fee can never be paid twice
+    """
+
+    def __init__(self, db_path: str = ":memory:"):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        if db_path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=FULL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS flag_ops ("
+            " hashed_id TEXT NOT NULL, analysis_id TEXT NOT NULL, batch_id TEXT NOT NULL,"
+            " account_id TEXT, risk_score INTEGER, transaction_count INTEGER,"
+            " flagged_connections INTEGER, ipfs_hash TEXT,"
+            " status TEXT NOT NULL DEFAULT 'pending', transaction_id TEXT, error TEXT,"
+            " confirmed_round INTEGER, created_at REAL, updated_at REAL,"
+            " PRIMARY KEY (hashed_id, analysis_id));"
+            "CREATE INDEX IF NOT EXISTS flag_ops_status ON flag_ops (status, created_at);"
+            "CREATE INDEX IF NOT EXISTS flag_ops_batch ON flag_ops (batch_id);"
+            "CREATE TABLE IF NOT EXISTS signed_groups ("
+            " group_txid TEXT PRIMARY KEY, signed BLOB NOT NULL, last_valid INTEGER NOT NULL);"
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(flag_ops)")}
+        if "group_txid" not in columns:
+            self._db.execute("ALTER TABLE flag_ops ADD COLUMN group_txid TEXT")
+        # Outboxes written before submissions were journaled used "flagged"
+        self._db.execute("UPDATE flag_ops SET status = 'confirmed' WHERE status = 'flagged'")
+        self._db.commit()
+
+    def enqueue(self, analysis_id: str, flag_requests: List[Dict[str, Any]]) -> str:
+        """
+        Queue flag operations for one analysis
+
+        Args:
+            analysis_id: Stable ID of the analysis run (e.g. hash of the uploaded CSV)
+            flag_requests: Same dicts BulkFlagSubmitter.flag_accounts takes
+
+        Returns:
+            Batch ID to poll with batch_status()
+        """
+        batch_id = analysis_id
+        now = time.time()
+        with self._lock:
+            # Existing rows are kept as they are, except failed ones, which are retried
+            self._db.executemany(
+                "INSERT INTO flag_ops (hashed_id, analysis_id, batch_id, account_id, risk_score,"
+                " transaction_count, flagged_connections, ipfs_hash, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (hashed_id, analysis_id) DO UPDATE SET status = 'pending', error = NULL,"
+                " updated_at = excluded.updated_at WHERE flag_ops.status = 'failed'",
+                [
+                    (
+                        req["hashed_id"], analysis_id, batch_id, req.get("account_id"),
+                        req["risk_score"], req["transaction_count"], req["flagged_connections"],
+                        req.get("ipfs_hash", ""), now, now
+                    )
+                    for req in flag_requests
+                ]
+            )
+            self._db.commit()
+        return batch_id
+
+    def claim_pending(self, limit: int) -> List[Dict[str, Any]]:
+        """Oldest pending operations, at most one per hashed_id (none whose wallet has a submission in flight)"""
+        with self._lock:
+            in_flight = {
+                row[0] for row in self._db.execute("SELECT hashed_id FROM flag_ops WHERE status = 'submitted'")
+            }
+            rows = self._db.execute(
+                "SELECT hashed_id, analysis_id, account_id, risk_score, transaction_count,"
+                " flagged_connections, ipfs_hash FROM flag_ops WHERE status = 'pending'"
+                " ORDER BY created_at"
+            ).fetchall()
+
+        claimed = []
+        seen = set(in_flight)
+        for row in rows:
+            # A later analysis of the same wallet waits for the next pass
+            if row[0] in seen:
+                continue
+            seen.add(row[0])
+            claimed.append({
+                "hashed_id": row[0],
+                "analysis_id": row[1],
+                "account_id": row[2],
+                "risk_score": row[3],
+                "transaction_count": row[4],
+                "flagged_connections": row[5],
+                "ipfs_hash": row[6] or ""
+            })
+            if len(claimed) >= limit:
+                break
+        return claimed
+
+    def mark_submitted(self, operations: List[Dict[str, Any]], txids: List[str], signed_group: list) -> None:
+        """
+        Journal a signed group BEFORE it is sent (called from the submitter's on_signed hook)
+
+        Args:
+            operations: Outbox operations carried by the group
+            txids: Transaction ID carrying each operation
+            signed_group: The signed transactions, kept for exact re-sending
+        """
+        group_txid = signed_group[0].get_txid()
+        raw = b"".join(base64.b64decode(encoding.msgpack_encode(stxn)) for stxn in signed_group)
+        last_valid = max(stxn.transaction.last_valid_round for stxn in signed_group)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO signed_groups (group_txid, signed, last_valid) VALUES (?, ?, ?)",
+                (group_txid, raw, last_valid)
+            )
+            self._db.executemany(
+                "UPDATE flag_ops SET status = 'submitted', transaction_id = ?, group_txid = ?, error = NULL,"
+                " updated_at = ? WHERE hashed_id = ? AND analysis_id = ?",
+                [
+                    (txid, group_txid, now, op["hashed_id"], op["analysis_id"])
+                    for op, txid in zip(operations, txids)
+                ]
+            )
+            self._db.commit()
+
+    def record_results(self, operations: List[Dict[str, Any]], results: List[Dict[str, Any]]) -> None:
+        """
+        Store submitter results for claimed operations (same order)
+
+        Accepted but unconfirmed transactions stay "submitted" for
+        recovery to resolve - marking them failed could pay for them twice.
+        """
+        now = time.time()
+        updates = []
+        for op, result in zip(operations, results):
+            if result["status"] == "flagged":
+                status = "confirmed"
+            elif result.get("transaction_id"):
+                status = "submitted"
+            else:
+                status = "failed"
+            updates.append((
+                status, result.get("error"), result.get("confirmed_round"), now,
+                op["hashed_id"], op["analysis_id"]
+            ))
+        with self._lock:
+            self._db.executemany(
+                "UPDATE flag_ops SET status = ?, error = ?, confirmed_round = ?, updated_at = ?"
+                " WHERE hashed_id = ? AND analysis_id = ?",
+                updates
+            )
+            self._release_resolved_groups()
+            self._db.commit()
+
+    def set_status(
+        self,
+        operation: Dict[str, Any],
+        status: str,
+        error: Optional[str] = None,
+        confirmed_round: Optional[int] = None
+    ) -> None:
+        """Resolve one operation (recovery / skip paths)"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE flag_ops SET status = ?, error = ?, confirmed_round = ?, updated_at = ?"
+                + (", transaction_id = NULL, group_txid = NULL" if status == "pending" else "")
+                + " WHERE hashed_id = ? AND analysis_id = ?",
+                (status, error, confirmed_round, time.time(), operation["hashed_id"], operation["analysis_id"])
+            )
+            self._release_resolved_groups()
+            self._db.commit()
+
+    def submitted(self) -> List[Dict[str, Any]]:
+        """Operations whose transaction was sent (or was about to be) but is not resolved yet"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT o.hashed_id, o.analysis_id, o.risk_score, o.transaction_count, o.flagged_connections,"
+                " o.ipfs_hash, o.transaction_id, o.group_txid, g.signed, g.last_valid"
+                " FROM flag_ops o LEFT JOIN signed_groups g ON g.group_txid = o.group_txid"
+                " WHERE o.status = 'submitted' ORDER BY o.updated_at"
+            ).fetchall()
+        return [
+            {
+                "hashed_id": row[0],
+                "analysis_id": row[1],
+                "risk_score": row[2],
+                "transaction_count": row[3],
+                "flagged_connections": row[4],
+                "ipfs_hash": row[5] or "",
+                "transaction_id": row[6],
+                "group_txid": row[7],
+                "signed": row[8],
+                "last_valid": row[9]
+            }
+            for row in rows
+        ]
+
+    def batch_status(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """Progress of one batch, or None if it does not exist"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT account_id, hashed_id, status, transaction_id, error, confirmed_round"
+                " FROM flag_ops WHERE batch_id = ? ORDER BY created_at, account_id",
+                (batch_id,)
+            ).fetchall()
+        if not rows:
+            return None
+
+        counts = {"pending": 0, "submitted": 0, "confirmed": 0, "skipped": 0, "failed": 0}
+        accounts = []
+        for account_id, hashed_id, status, txid, error, confirmed_round in rows:
+            counts[status] = counts.get(status, 0) + 1
+            accounts.append({
+                "account": account_id,
+                "hashed_id": hashed_id,
+                "status": status,
+                "txid": txid,
+                "confirmed_round": confirmed_round,
+                "error": error
+            })
+        return {
+            "batch_id": batch_id,
+            "total": len(rows),
+            "complete": counts["pending"] == 0 and counts["submitted"] == 0,
+            **counts,
+            "accounts": accounts
+        }
+
+    def open_count(self, batch_id: Optional[str] = None) -> int:
+        """Operations still pending or submitted (optionally within one batch)"""
+        placeholders = ",".join("?" * len(OPEN_STATUSES))
+        query = f"SELECT COUNT(*) FROM flag_ops WHERE status IN ({placeholders})"
+        params: List[Any] = list(OPEN_STATUSES)
+        if batch_id is not None:
+            query += " AND batch_id = ?"
+            params.append(batch_id)
+        with self._lock:
+            return self._db.execute(query, params).fetchone()[0]
+
+    def close(self) -> None:
+        """Close the SQLite connection (stop() the worker first)"""
+        with self._lock:
+            self._db.close()
+
+    def _release_resolved_groups(self) -> None:
+        """Drop stored signed bytes once no operation of the group is still submitted"""
+        self._db.execute(
+            "DELETE FROM signed_groups WHERE group_txid NOT IN"
+            " (SELECT group_txid FROM flag_ops WHERE status = 'submitted' AND group_txid IS NOT NULL)"
+        )
+
+
+def box_matches(algod_client, app_id: int, operation: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Check whether the wallet's box already holds exactly what this operation would write
+
+    Returns:
+        The on-chain profile if it matches (so no transaction is needed), else None
+    """
+    profile = read_wallet_profile(algod_client, app_id, operation["hashed_id"])
+    ipfs_hash = operation.get("ipfs_hash") or ""
+    if profile is None or (
+        profile["risk_score"] != operation["risk_score"]
+        or profile["transaction_count"] != operation["transaction_count"]
+        or profile["flagged_connections"] != operation["flagged_connections"]
+        or profile["is_flagged"] != (operation["risk_score"] >= FLAG_THRESHOLD)
+        or profile["ipfs_hash_length"] != len(ipfs_hash.encode())
+    ):
+        return None
+    if is_compact(profile):
+        return profile if profile["ipfs_hash"] == ipfs_hash else None
+
+    # Legacy layout: the CID sits in a separate _ipfs box
+    box = read_box(algod_client, app_id, bytes.fromhex(operation["hashed_id"]) + b"_ipfs")
+    stored = box[0] if box else b""
+    return profile if stored == ipfs_hash.encode() else None
+
+
+def matching_profiles(
+    algod_client,
+    app_id: int,
+    operations: List[Dict[str, Any]],
+    max_workers: int = 16
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Run box_matches for many operations, several at a time
+
+    Each check costs one or two box reads, so they overlap on a bounded
+    thread pool instead of adding up one round trip after another.
+
+    Returns:
+        box_matches' result per operation, in input order
+    """
+    if not operations:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(operations)))) as pool:
+        return list(pool.map(lambda op: box_matches(algod_client, app_id, op), operations))
+
+
+class FlagWorker:
+    """
+    Background thread that drains the outbox through the bulk submitter
+
+    Each pass first resolves submitted-but-unresolved operations (this is
+    what resumes an interrupted run after a restart), then skips pending
+    wallets whose boxes already hold the same payload, then submits the rest.
+
+    get_submitter is called on every pass, so the worker picks up the sender
+    account once it is resolved (and idles while blockchain is not configured).
+    """
+
+    def __init__(
+        self,
+        outbox: FlagOutbox,
+        get_submitter: Callable[[], Any],
+        batch_size: int = 256,
+        poll_interval: float = 2.0,
+        max_box_reads: int = 16
+    ):
+        self.outbox = outbox
+        self.get_submitter = get_submitter
+        self.batch_size = max(1, batch_size)
+        # Concurrent box_matches checks per pass
+        self.max_box_reads = max(1, max_box_reads)
+        self.poll_interval = poll_interval
+        self._drain_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def recover(self) -> int:
+        """
+        Resolve operations left in "submitted"
+
+        - Box already holds the payload, or algod reports the txn confirmed -> confirmed
+        - Past its last valid round and not on chain -> pending (it can never land)
+        - Otherwise -> re-send the journaled signed group (same txids, no new fee)
+
+        Returns:
+            Number of operations resolved
+        """
+        submitter = self.get_submitter()
+        if submitter is None:
+            return 0
+        operations = self.outbox.submitted()
+        if not operations:
+            return 0
+
+        algod_client = submitter.algod_client
+        current_round = algod_client.status()["last-round"]
+        confirmed_rounds = [self._confirmed_round(algod_client, op["transaction_id"]) for op in operations]
+        unconfirmed = [op for op, confirmed_round in zip(operations, confirmed_rounds) if confirmed_round is None]
+        profiles = matching_profiles(algod_client, submitter.app_id, unconfirmed, self.max_box_reads)
+        profile_by_op = {id(op): profile for op, profile in zip(unconfirmed, profiles)}
+
+        resolved = 0
+        resent = set()
+        for op, confirmed_round in zip(operations, confirmed_rounds):
+            profile = profile_by_op.get(id(op))
+            if profile is not None:
+                confirmed_round = profile.get("round") or current_round
+            if confirmed_round is not None:
+                self.outbox.set_status(op, "confirmed", confirmed_round=confirmed_round)
+                resolved += 1
+            elif op["last_valid"] is None or current_round > op["last_valid"]:
+                self.outbox.set_status(op, "pending")
+                resolved += 1
+            elif op["group_txid"] not in resent:
+                resent.add(op["group_txid"])
+                try:
+                    algod_client.send_raw_transaction(base64.b64encode(op["signed"]))
+                except Exception as e:
+                    # Already in ledger / pool is fine - anything else is retried next pass
+                    if "already in ledger" not in str(e).lower():
+                        print(f"⚠️ Re-send of {op['group_txid'][:12]}... failed: {e}")
+        if resolved:
+            print(f"🔁 Flag outbox recovery: resolved {resolved}/{len(operations)} submitted operations")
+        return resolved
+
+    def run_once(self) -> int:
+        """Recover, then submit one chunk of pending operations; returns how many were processed"""
+        with self._drain_lock:
+            submitter = self.get_submitter()
+            if submitter is None:
+                return 0
+            self.recover()
+            operations = self.outbox.claim_pending(self.batch_size)
+            if not operations:
+                return 0
+
+            to_submit = []
+            profiles = matching_profiles(
+                submitter.algod_client, submitter.app_id, operations, self.max_box_reads
+            )
+            for op, profile in zip(operations, profiles):
+                if profile is not None:
+                    self.outbox.set_status(op, "skipped", confirmed_round=profile.get("round"))
+                else:
+                    to_submit.append(op)
+
+            if to_submit:
+                print(f"🔗 Flag worker: submitting {len(to_submit)} queued flags "
+                      f"({len(operations) - len(to_submit)} already on-chain)...")
+                results = submitter.flag_accounts(to_submit, on_signed=self.outbox.mark_submitted)
+                self.outbox.record_results(to_submit, results)
+                flagged = sum(1 for result in results if result["status"] == "flagged")
+                print(f"🔗 Flag worker: {flagged}/{len(to_submit)} flagged on-chain")
+            return len(operations)
+
+    def drain(self, batch_id: Optional[str] = None, timeout: float = 300.0) -> bool:
+        """
+        Run passes until the batch (or the whole outbox) has nothing pending or submitted
+
+        Returns:
+            True if it drained before the timeout
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            processed = self.run_once()
+            if self.outbox.open_count(batch_id) == 0:
+                return True
+            if not processed:
+                # Only in-flight submissions left - give them a round to land
+                self._stop.wait(self.poll_interval)
+        return False
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+
+        def run():
+            while not self._stop.is_set():
+                try:
+                    if self.run_once():
+                        continue
+                except Exception as e:
+                    print(f"⚠️ Flag worker pass failed: {e}")
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+        self._thread = threading.Thread(target=run, name="flag-worker", daemon=True)
+        self._thread.start()
+
+    def wake(self) -> None:
+        """Start the next pass now instead of after poll_interval"""
+        self._wake.set()
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stop the worker and wait for its current pass to finish
+
+        Operations a pass leaves submitted are resumed by recover() on the
+        next start, so giving up after timeout loses nothing.
+
+        Returns:
+            True once the thread has exited (or was never started)
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._thread is None:
+            return True
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    @staticmethod
+    def _confirmed_round(algod_client, txid: Optional[str]) -> Optional[int]:
+        if not txid:
+            return None
+        try:
+            info = algod_client.pending_transaction_info(txid)
+        except Exception:
+            return None
+        return info.get("confirmed-round") or None
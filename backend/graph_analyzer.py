@@ -2,11 +2,15 @@
 Graph Analysis Module for Money Mule Detection
 Uses NetworkX to detect suspicious transaction patterns
 """
+import math
+import os
 import networkx as nx
 import pandas as pd
-from io import StringIO
-from typing import Dict, List, Set, Any, Tuple
+import csv
+from io import BytesIO
+from typing import Dict, List, Set, Any, Tuple, Optional
 import time
+from analysis_profiler import ANALYSIS_METRICS, NULL_PROFILER, StageProfiler
 
 
 # Trusted accounts whitelist (reduce false positives)
@@ -15,10 +19,128 @@ TRUSTED_ACCOUNTS = {
     'TAX_AUTHORITY', 'INSURANCE', 'UTILITY_COMPANY'
 }
 
+# Mule ring sizes (accounts per cycle) and shell chain sizes (accounts per path)
+MIN_RING_SIZE = 3
+MAX_RING_SIZE = 5
+MIN_CHAIN_SIZE = 4
+MAX_CHAIN_SIZE = 5
+DORMANT_MAX_DEGREE = 3
 
-def analyze_transactions(csv_data: bytes) -> Dict[str, Any]:
+# Shell chains are searched from this many highest-degree accounts
+SHELL_SEARCH_SOURCES = 50
+
+# Smurfing: ≥FAN_MIN_DEGREE on one side, ≤FAN_MAX_OTHER_DEGREE on the other
+FAN_MIN_DEGREE = 10
+FAN_MAX_OTHER_DEGREE = 2
+HIGH_VELOCITY_DEGREE = 8
+
+# Uploaded file extensions by input format (see parse_transactions)
+INPUT_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+# Columns read from columnar input; any others are never decoded
+TRANSACTION_COLUMNS = ['sender_id', 'receiver_id', 'amount', 'timestamp']
+
+
+class DetectorBudget:
+    """
+    Work limits for one combinatorial detector
+    
+    A configured budget is a template: start() returns a fresh running copy,
+    so concurrent analyses never share counters. Start it right before the
+    detector runs and stop() it when the detector returns, so max_seconds and
+    the reported time cover that detector alone. A detector calls expand()
+    per DFS step and found() per result; once any limit is hit both return
+    False, the detector stops and keeps what it has, and report() marks the
+    result as truncated.
+    """
+    
+    # Wall-clock is checked every this many expansions
+    CLOCK_CHECK_INTERVAL = 1024
+    
+    def __init__(
+        self,
+        max_seconds: Optional[float] = None,
+        max_results: Optional[int] = None,
+        max_expansions: Optional[int] = None
+    ):
+        self.max_seconds = max_seconds
+        self.max_results = max_results
+        self.max_expansions = max_expansions
+        self.expansions = 0
+        self.results = 0
+        self.exhausted: Optional[str] = None
+        self._deadline: Optional[float] = None
+        self._started = 0.0
+        self._elapsed: Optional[float] = None
+    
+    def start(self) -> "DetectorBudget":
+        running = DetectorBudget(self.max_seconds, self.max_results, self.max_expansions)
+        running._started = time.perf_counter()
+        if self.max_seconds is not None:
+            running._deadline = running._started + self.max_seconds
+        return running
+    
+    def stop(self) -> "DetectorBudget":
+        """Freeze the elapsed time once the detector has returned"""
+        if self._elapsed is None:
+            self._elapsed = time.perf_counter() - self._started
+        return self
+    
+    def expand(self) -> bool:
+        """Account for one DFS expansion; False once the budget is spent"""
+        if self.exhausted:
+            return False
+        self.expansions += 1
+        if self.max_expansions is not None and self.expansions > self.max_expansions:
+            self.exhausted = f"max_expansions ({self.max_expansions})"
+        elif (
+            self._deadline is not None
+            and self.expansions % self.CLOCK_CHECK_INTERVAL == 0
+            and time.perf_counter() > self._deadline
+        ):
+            self.exhausted = f"max_seconds ({self.max_seconds:g})"
+        return not self.exhausted
+    
+    def found(self) -> bool:
+        """Account for one result; False once the result limit is reached"""
+        self.results += 1
+        if self.max_results is not None and self.results >= self.max_results:
+            self.exhausted = f"max_results ({self.max_results})"
+        return not self.exhausted
+    
+    def report(self) -> Dict[str, Any]:
+        return {
+            "truncated": self.exhausted is not None,
+            "reason": self.exhausted,
+            "expansions": self.expansions,
+            "results": self.results,
+            "seconds": round(
+                self._elapsed if self._elapsed is not None else time.perf_counter() - self._started, 4
+            )
+        }
+
+
+# Default budgets; main.py overrides them from the environment
+DEFAULT_BUDGETS = {
+    "cycles": DetectorBudget(max_seconds=10.0, max_results=100_000, max_expansions=5_000_000),
+    "shell_networks": DetectorBudget(max_seconds=10.0, max_results=100_000, max_expansions=5_000_000),
+}
+
+
+def analyze_transactions(
+    csv_data: bytes,
+    profile: bool = False,
+    budgets: Optional[Dict[str, DetectorBudget]] = None,
+    input_format: str = "csv"
+) -> Dict[str, Any]:
     """
-    Analyze transaction CSV for money mule patterns using graph analysis
+    Analyze transaction CSV (or Parquet / Arrow) for money mule patterns using graph analysis
     
     Detections:
     1. Circular Routing (3-5 node cycles)
@@ -26,7 +148,13 @@ def analyze_transactions(csv_data: bytes) -> Dict[str, Any]:
     3. Shell Networks (dormant intermediary chains)
     
     Args:
-        csv_data: Raw CSV file bytes
+        csv_data: Raw file bytes
+        profile: Add summary.profile (per-stage time, tracemalloc peaks, work counters)
+        budgets: Work limits per detector ("cycles", "shell_networks"); missing
+            entries use DEFAULT_BUDGETS. Truncated detectors are listed in
+            summary.truncated_detectors and detailed in summary.detector_coverage
+        input_format: 'csv', 'parquet' or 'arrow' (see parse_transactions);
+            columnar input decodes only the transaction columns
         
     Returns:
         Dictionary containing:
@@ -34,52 +162,83 @@ def analyze_transactions(csv_data: bytes) -> Dict[str, Any]:
         - fraud_rings: List of fraud ring objects
         - summary: Statistics and metadata
     """
-    # Start timing
+    # Start timing (stage timings always feed /metrics; memory tracing only when profiling)
     start_time = time.time()
+    profiler = StageProfiler(trace_memory=profile)
+    detector_budgets = {
+        name: (budgets or {}).get(name, default)
+        for name, default in DEFAULT_BUDGETS.items()
+    }
+    with profiler:
+        output, G, running_budgets = _run_pipeline(csv_data, profiler, detector_budgets, input_format)
     
-    # Parse CSV
-    try:
-        df = pd.read_csv(StringIO(csv_data.decode('utf-8')))
-    except Exception as e:
-        raise ValueError(f"Failed to parse CSV: {str(e)}")
+    ANALYSIS_METRICS.observe(profiler)
+    coverage = {name: budget.report() for name, budget in running_budgets.items()}
+    truncated = [name for name, report in coverage.items() if report["truncated"]]
+    for name in truncated:
+        print(f"⚠️ {name} detector truncated at {coverage[name]['reason']}: results are partial")
+    output["summary"]["truncated_detectors"] = truncated
+    output["summary"]["detector_coverage"] = coverage
+    output["summary"]["processing_time_seconds"] = round(time.time() - start_time, 2)
+    if profile:
+        output["summary"]["profile"] = profiler.as_dict()
     
-    # Validate required columns
-    required_columns = ['sender_id', 'receiver_id', 'amount']
-    if not all(col in df.columns for col in required_columns):
-        raise ValueError(f"CSV must contain columns: {required_columns}")
+    # Return both output and graph for visualization
+    return output, G
+
+
+def _run_pipeline(
+    csv_data: bytes,
+    profiler: StageProfiler,
+    budgets: Dict[str, DetectorBudget],
+    input_format: str = "csv"
+) -> Tuple[Dict[str, Any], nx.DiGraph, Dict[str, DetectorBudget]]:
+    """
+    The analysis stages of analyze_transactions, each timed by the profiler
     
-    # Build directed graph
-    G = nx.DiGraph()
+    Each budget template is started right before its detector, so parsing and
+    graph building never count against it. Returns the output, the graph and
+    the stopped running budgets.
+    """
+    running: Dict[str, DetectorBudget] = {}
     
-    for _, row in df.iterrows():
-        from_acc = str(row['sender_id'])
-        to_acc = str(row['receiver_id'])
-        amount = float(row['amount'])
-        
-        # Add edge with transaction metadata
-        if G.has_edge(from_acc, to_acc):
-            # Aggregate multiple transactions
-            G[from_acc][to_acc]['amount'] += amount
-            G[from_acc][to_acc]['count'] += 1
-        else:
-            G.add_edge(from_acc, to_acc, amount=amount, count=1)
+    # Parse input (the stage keeps its "parse_csv" name for every format)
+    with profiler.stage("parse_csv"):
+        df = parse_transactions(csv_data, input_format)
+    profiler.count("transactions_parsed", len(df))
+    
+    # Build directed graph
+    with profiler.stage("build_graph"):
+        G = nx.DiGraph()
+        add_transactions(G, df)
+    profiler.count("graph_nodes", G.number_of_nodes())
+    profiler.count("graph_edges", G.number_of_edges())
     
     # DETECTION 1: Cycle Detection (Money Mule Rings)
-    mule_rings = detect_mule_rings(G)
+    with profiler.stage("detect_cycles"):
+        running["cycles"] = budgets["cycles"].start()
+        mule_rings = detect_mule_rings(G, profiler=profiler, budget=running["cycles"])
+        running["cycles"].stop()
     
     # DETECTION 2: Smurfing Detection
-    smurfing_accounts = detect_smurfing(G)
+    with profiler.stage("detect_smurfing"):
+        smurfing_accounts = detect_smurfing(G)
     
     # DETECTION 3: Layered Networks
-    layered_chains = detect_shell_networks(G)
+    with profiler.stage("detect_shell_networks"):
+        running["shell_networks"] = budgets["shell_networks"].start()
+        layered_chains = detect_shell_networks(G, profiler=profiler, budget=running["shell_networks"])
+        running["shell_networks"].stop()
     
     # DETECTION 4: High Velocity Accounts
-    high_velocity_accounts = detect_high_velocity(G)
+    with profiler.stage("detect_high_velocity"):
+        high_velocity_accounts = detect_high_velocity(G)
     
     # Track patterns for each account
-    account_patterns = track_patterns_per_account(
-        G, mule_rings, smurfing_accounts, layered_chains, high_velocity_accounts
-    )
+    with profiler.stage("track_patterns"):
+        account_patterns = track_patterns_per_account(
+            G, mule_rings, smurfing_accounts, layered_chains, high_velocity_accounts
+        )
     
     # Calculate risk scores for all suspicious accounts
     all_suspicious = set()
@@ -90,62 +249,369 @@ def analyze_transactions(csv_data: bytes) -> Dict[str, Any]:
         all_suspicious.update(chain)
     all_suspicious.update(high_velocity_accounts)
     
+    profiler.count("accounts_scored", len(all_suspicious))
+    
     risk_scores = {}
-    for account in all_suspicious:
-        score = calculate_risk_score(G, account, mule_rings, smurfing_accounts, layered_chains)
-        risk_scores[account] = score
+    with profiler.stage("risk_scoring"):
+        centrality = account_centrality(G, profiler)
+        for account in all_suspicious:
+            score = calculate_risk_score(
+                G, account, mule_rings, smurfing_accounts, layered_chains,
+                profiler=profiler, centrality=centrality
+            )
+            risk_scores[account] = score
     
     # APPLY FALSE POSITIVE CONTROLS
     # 1. Multi-pattern confirmation: Flag only if ≥2 patterns
     # 2. Risk threshold: Flag only if risk ≥60
     # 3. Trusted accounts: Reduce risk for known legitimate accounts
-    suspicious_accounts = apply_false_positive_controls(
-        all_suspicious, account_patterns, risk_scores, G
-    )
+    with profiler.stage("false_positive_controls"):
+        suspicious_accounts = apply_false_positive_controls(
+            all_suspicious, account_patterns, risk_scores, G
+        )
     
     # GENERATE FRAUD RINGS
     # Create structured ring objects with IDs
-    fraud_rings, account_to_ring = generate_fraud_rings(
-        mule_rings, smurfing_accounts, layered_chains, 
-        suspicious_accounts, risk_scores
-    )
+    with profiler.stage("fraud_rings"):
+        fraud_rings, account_to_ring = generate_fraud_rings(
+            mule_rings, smurfing_accounts, layered_chains, 
+            suspicious_accounts, risk_scores
+        )
     
     # Prepare graph data for visualization (only suspicious accounts and their connections)
-    graph_data = prepare_graph_visualization(G, suspicious_accounts)
+    with profiler.stage("graph_visualization_data"):
+        graph_data = prepare_graph_visualization(G, suspicious_accounts)
     
     # Filter risk_scores to only include final flagged accounts
     filtered_risk_scores = {acc: risk_scores[acc] for acc in suspicious_accounts if acc in risk_scores}
-    # End timing
-    processing_time = round(time.time() - start_time, 2)
-    
-    # TRANSFORM TO REQUIRED OUTPUT FORMAT
-    output = transform_to_required_format(
-        suspicious_accounts=suspicious_accounts,
-        account_patterns=account_patterns,
-        risk_scores=filtered_risk_scores,
-        account_to_ring=account_to_ring,
-        fraud_rings=fraud_rings,
-        total_accounts=G.number_of_nodes(),
-        total_transactions=G.number_of_edges(),
-        processing_time=processing_time
-    )
     
-    # Return both output and graph for visualization
-    return output, G
+    # TRANSFORM TO REQUIRED OUTPUT FORMAT (processing time is filled in by analyze_transactions)
+    with profiler.stage("format_output"):
+        output = transform_to_required_format(
+            suspicious_accounts=suspicious_accounts,
+            account_patterns=account_patterns,
+            risk_scores=filtered_risk_scores,
+            account_to_ring=account_to_ring,
+            fraud_rings=fraud_rings,
+            total_accounts=G.number_of_nodes(),
+            total_transactions=G.number_of_edges(),
+            processing_time=0.0
+        )
+    
+    return output, G, running
+
+
+def input_format_for(filename: str) -> Optional[str]:
+    """The input format for an uploaded file name ('csv', 'parquet', 'arrow'; None if unsupported)"""
+    return INPUT_FORMATS.get(os.path.splitext(filename.lower())[1])
+
+
+def parse_transactions(data: bytes, input_format: str = "csv") -> pd.DataFrame:
+    """
+    Parse and validate a transaction file
+    
+    Args:
+        data: Raw file bytes
+        input_format: 'csv', 'parquet' or 'arrow' (Arrow IPC file/stream, Feather v2)
+    
+    Raises:
+        ValueError: Unparseable input or missing sender_id / receiver_id / amount
+    """
+    if input_format == "csv":
+        df = read_csv_transactions(data)
+    elif input_format in ("parquet", "arrow"):
+        df = read_columnar(data, input_format)
+    else:
+        raise ValueError(f"Unsupported input format: {input_format}")
+    
+    validate_transactions(df)
+    return df
+
+
+def read_csv_transactions(data: bytes, use_pyarrow: Optional[bool] = None) -> pd.DataFrame:
+    """
+    Parse CSV bytes into TRANSACTION_COLUMNS with explicit types
+    
+    IDs are strings, amounts float64 and timestamps UTC datetimes (NaT
+    where unparseable); other columns are skipped. pyarrow's multi-threaded
+    parser reads the bytes in place and parses ISO 8601 timestamps natively;
+    without it, pandas' C parser reads them through a BytesIO (no decoded
+    text copy) with the same dtypes.
+    
+    Args:
+        use_pyarrow: Force (True) or skip (False) the pyarrow parser; by
+            default it is used when installed
+    
+    Raises:
+        ValueError: Unparseable CSV
+    """
+    # Only the header line is decoded, to find which columns to read
+    header_end = data.find(b"\n")
+    header_line = (data if header_end < 0 else data[:header_end]).decode('utf-8-sig', errors='replace')
+    header = next(csv.reader([header_line.rstrip("\r")]), [])
+    columns = [name for name in TRANSACTION_COLUMNS if name in header]
+    
+    if use_pyarrow is not False:
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pa_csv
+        except ImportError:
+            if use_pyarrow:
+                raise ValueError("The pyarrow CSV parser requires pyarrow (pip install pyarrow)")
+            use_pyarrow = False
+    
+    try:
+        if use_pyarrow is False:
+            df = pd.read_csv(
+                BytesIO(data),
+                usecols=columns,
+                dtype={'sender_id': str, 'receiver_id': str, 'amount': 'float64', 'timestamp': str},
+            )
+        else:
+            column_types = {
+                'sender_id': pa.string(), 'receiver_id': pa.string(), 'amount': pa.float64(), 'timestamp': pa.string()
+            }
+            table = pa_csv.read_csv(
+                pa.BufferReader(data),
+                read_options=pa_csv.ReadOptions(use_threads=True),
+                convert_options=pa_csv.ConvertOptions(include_columns=columns, column_types=column_types),
+            )
+            if 'timestamp' in columns:
+                try:
+                    # ISO 8601 dates and date-times parse natively; anything else falls back to pandas below
+                    timestamps = table['timestamp'].cast(pa.timestamp('ns'))
+                    table = table.set_column(table.schema.get_field_index('timestamp'), 'timestamp', timestamps)
+                except pa.ArrowInvalid:
+                    pass
+            df = table.to_pandas()
+    except Exception as e:
+        raise ValueError(f"Failed to parse CSV: {str(e)}")
+    
+    if 'timestamp' in df.columns:
+        df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce', utc=True)
+    return df
 
 
-def detect_mule_rings(G: nx.DiGraph) -> List[List[str]]:
+def read_columnar(data: bytes, input_format: str) -> pd.DataFrame:
+    """
+    Read Parquet or Arrow IPC bytes, decoding only TRANSACTION_COLUMNS
+    
+    Parquet column chunks outside the projection are never read or
+    decompressed; IPC readers skip the other fields' buffers. Uncompressed
+    IPC columns are referenced in place until the conversion to pandas.
+    
+    Raises:
+        ValueError: pyarrow is not installed, or the bytes are not valid input
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError(f"{input_format} input requires pyarrow (pip install pyarrow)")
+    
+    try:
+        if input_format == "parquet":
+            parquet = pq.ParquetFile(pa.BufferReader(data))
+            columns = [name for name in TRANSACTION_COLUMNS if name in parquet.schema_arrow.names]
+            table = parquet.read(columns=columns)
+        else:
+            try:
+                open_reader = ipc.open_file
+                schema = open_reader(pa.BufferReader(data)).schema
+            except pa.ArrowInvalid:
+                # No file footer: the IPC stream format
+                open_reader = ipc.open_stream
+                schema = open_reader(pa.BufferReader(data)).schema
+            fields = [schema.get_field_index(name) for name in TRANSACTION_COLUMNS if name in schema.names]
+            options = ipc.IpcReadOptions(included_fields=fields)
+            table = open_reader(pa.BufferReader(data), options=options).read_all()
+    except (pa.ArrowException, OSError) as e:
+        raise ValueError(f"Failed to read {input_format} input: {e}")
+    return table.to_pandas()
+
+
+def validate_transactions(df: pd.DataFrame) -> None:
+    """Raise ValueError unless df has the sender_id, receiver_id and amount columns"""
+    required_columns = ['sender_id', 'receiver_id', 'amount']
+    if not all(col in df.columns for col in required_columns):
+        raise ValueError(f"Input must contain columns: {required_columns}")
+
+
+def transaction_columns(df: pd.DataFrame) -> Tuple[List[str], List[str], List[float]]:
+    """Sender IDs, receiver IDs (as str) and amounts (as float), converted a column at a time"""
+    if df.empty:
+        return [], [], []
+    return _str_list(df['sender_id']), _str_list(df['receiver_id']), df['amount'].astype(float).tolist()
+
+
+def _str_list(column: pd.Series) -> List[str]:
+    if isinstance(column.dtype, pd.CategoricalDtype) and not (column.cat.codes < 0).any():
+        # Dictionary-encoded IDs: convert each distinct ID once, rows share its str
+        categories = column.cat.categories.astype(str).to_numpy(dtype=object)
+        return categories[column.cat.codes.to_numpy()].tolist()
+    return column.astype(str).tolist()
+
+
+def transaction_timestamps(df: pd.DataFrame) -> Optional[List[float]]:
+    """Epoch seconds per row from the timestamp column (NaN where unparseable; None without the column)"""
+    if "timestamp" not in df.columns:
+        return None
+    parsed = pd.to_datetime(df["timestamp"], errors="coerce", utc=True)
+    return (parsed - pd.Timestamp(0, tz="UTC")).dt.total_seconds().tolist()
+
+
+def add_transactions(G: nx.DiGraph, df: pd.DataFrame) -> List[Tuple[str, str]]:
+    """
+    Add transactions to the graph, aggregating repeats per sender -> receiver edge
+    
+    Edges also keep 'last_seen', the newest transaction timestamp (epoch
+    seconds), when the timestamp column is present and parseable.
+    
+    Returns:
+        The edges that did not exist before, in insertion order
+    """
+    timestamps = transaction_timestamps(df)
+    senders, receivers, amounts = transaction_columns(df)
+    new_edges = []
+    for position, (from_acc, to_acc, amount) in enumerate(zip(senders, receivers, amounts)):
+        # Add edge with transaction metadata
+        if G.has_edge(from_acc, to_acc):
+            # Aggregate multiple transactions
+            G[from_acc][to_acc]['amount'] += amount
+            G[from_acc][to_acc]['count'] += 1
+        else:
+            G.add_edge(from_acc, to_acc, amount=amount, count=1)
+            new_edges.append((from_acc, to_acc))
+        if timestamps is not None and not math.isnan(timestamps[position]):
+            edge = G[from_acc][to_acc]
+            edge['last_seen'] = max(edge.get('last_seen', timestamps[position]), timestamps[position])
+    return new_edges
+
+
+def detect_mule_rings(
+    G: nx.DiGraph,
+    profiler: StageProfiler = NULL_PROFILER,
+    budget: Optional[DetectorBudget] = None
+) -> List[List[str]]:
     """
     Detect money mule rings (circular routing patterns)
     Look for cycles of length 3-5 nodes
+    
+    Depth-bounded DFS from every account, visiting only accounts later in
+    graph order, so each cycle is found once (starting at its earliest
+    account) and longer cycles are never enumerated. Stops early, returning
+    the rings found so far, when the budget runs out.
     """
-    try:
-        all_cycles = list(nx.simple_cycles(G))
-        # Filter for typical mule ring sizes (3-5 participants)
-        mule_rings = [cycle for cycle in all_cycles if 3 <= len(cycle) <= 5]
-        return mule_rings
-    except:
-        return []
+    budget = budget or DetectorBudget()
+    order = {node: index for index, node in enumerate(G.nodes())}
+    mule_rings = []
+    
+    for start in G.nodes():
+        if budget.exhausted:
+            break
+        start_order = order[start]
+        path = [start]
+        on_path = {start}
+        # Stack of successor iterators, one per node on the path
+        stack = [iter(G.successors(start))]
+        
+        while stack:
+            next_node = next(stack[-1], None)
+            if next_node is None:
+                stack.pop()
+                on_path.discard(path.pop())
+                continue
+            if not budget.expand():
+                break
+            
+            if next_node == start:
+                if len(path) >= MIN_RING_SIZE:
+                    mule_rings.append(list(path))
+                    if not budget.found():
+                        break
+                continue
+            if order[next_node] < start_order or next_node in on_path or len(path) >= MAX_RING_SIZE:
+                continue
+            path.append(next_node)
+            on_path.add(next_node)
+            stack.append(iter(G.successors(next_node)))
+    
+    profiler.count("cycle_dfs_expansions", budget.expansions)
+    profiler.count("cycles_enumerated", len(mule_rings))
+    profiler.count("mule_rings", len(mule_rings))
+    return mule_rings
+
+
+def cycles_through_edge(
+    G: nx.DiGraph,
+    sender: str,
+    receiver: str,
+    budget: Optional[DetectorBudget] = None
+) -> List[List[str]]:
+    """
+    Every 3-5 account cycle that uses the edge sender -> receiver
+    
+    A new edge can only close cycles through itself, so instead of searching
+    the graph this joins 1-2 hop paths out of receiver with 1-2 hop paths into
+    sender at a shared middle account (bidirectional search, depth 4 in
+    total). A receiver ... sender path of L hops is always split as
+    floor(L/2) forward and ceil(L/2) backward hops, so each cycle is built
+    exactly once.
+    
+    Args:
+        G: Transaction graph containing the edge
+        sender, receiver: The edge
+        budget: Running budget (expand per neighbour visited, found per cycle)
+    
+    Returns:
+        Cycles as account lists starting [sender, receiver, ...]
+    """
+    budget = budget or DetectorBudget()
+    cycles = []
+    # A fresh account on either side closes nothing (the common case on a live stream)
+    if sender == receiver or G.out_degree(receiver) == 0 or G.in_degree(sender) == 0:
+        return cycles
+    
+    # Middle account -> hops from it into sender (sender itself excluded)
+    backward: Dict[str, List[Tuple[str, ...]]] = {}
+    for last in G.predecessors(sender):
+        if not budget.expand():
+            return cycles
+        if last in (sender, receiver):
+            continue
+        backward.setdefault(last, []).append((last,))
+        for middle in G.predecessors(last):
+            if not budget.expand():
+                return cycles
+            if middle in (sender, receiver, last):
+                continue
+            backward.setdefault(middle, []).append((middle, last))
+    if not backward:
+        return cycles
+    
+    for first in G.successors(receiver):
+        if not budget.expand():
+            return cycles
+        if first in (sender, receiver):
+            continue
+        # 1 forward hop + 1 or 2 backward hops: 3-4 account cycles
+        for hops in backward.get(first, ()):
+            cycles.append([sender, receiver, *hops])
+            if not budget.found():
+                return cycles
+        # 2 forward hops + 2 backward hops: 5 account cycles
+        for second in G.successors(first):
+            if not budget.expand():
+                return cycles
+            if second in (sender, receiver, first):
+                continue
+            for hops in backward.get(second, ()):
+                if len(hops) == 2 and hops[1] != first:
+                    cycles.append([sender, receiver, first, *hops])
+                    if not budget.found():
+                        return cycles
+    return cycles
 
 
 def detect_smurfing(G: nx.DiGraph) -> List[str]:
@@ -154,24 +620,34 @@ def detect_smurfing(G: nx.DiGraph) -> List[str]:
     1. FAN-IN: Many accounts (≥10) send to same receiver
     2. FAN-OUT: One account sends to many receivers (≥10)
     """
-    smurfing_accounts = []
-    
-    for node in G.nodes():
-        in_degree = G.in_degree(node)
-        out_degree = G.out_degree(node)
-        
-        # FAN-IN Pattern: 10+ incoming, few outgoing
-        if in_degree >= 10 and out_degree <= 2:
-            smurfing_accounts.append(node)
-        
-        # FAN-OUT Pattern: Few incoming, 10+ outgoing
-        elif out_degree >= 10 and in_degree <= 2:
-            smurfing_accounts.append(node)
-    
-    return smurfing_accounts
+    return [node for node in G.nodes() if is_smurfing(G, node)]
+
+
+def is_smurfing(G: nx.DiGraph, node: str) -> bool:
+    """Fan-in (10+ incoming, few outgoing) or fan-out (few incoming, 10+ outgoing)"""
+    in_degree = G.in_degree(node)
+    out_degree = G.out_degree(node)
+    return (
+        (in_degree >= FAN_MIN_DEGREE and out_degree <= FAN_MAX_OTHER_DEGREE)
+        or (out_degree >= FAN_MIN_DEGREE and in_degree <= FAN_MAX_OTHER_DEGREE)
+    )
 
 
-def detect_shell_networks(G: nx.DiGraph) -> List[List[str]]:
+def smurfing_patterns(G: nx.DiGraph, node: str) -> List[str]:
+    """The fan_in / fan_out pattern names of a smurfing account"""
+    patterns = []
+    if G.in_degree(node) >= FAN_MIN_DEGREE:
+        patterns.append("fan_in")
+    if G.out_degree(node) >= FAN_MIN_DEGREE:
+        patterns.append("fan_out")
+    return patterns
+
+
+def detect_shell_networks(
+    G: nx.DiGraph,
+    profiler: StageProfiler = NULL_PROFILER,
+    budget: Optional[DetectorBudget] = None
+) -> List[List[str]]:
     """
     Detect layered mule networks (multi-hop chains with dormant intermediaries)
     
@@ -181,57 +657,91 @@ def detect_shell_networks(G: nx.DiGraph) -> List[List[str]]:
     - Max depth 4 to prevent performance issues
     
     Pattern: A → B → C → D where B, C are dormant mule accounts
+    
+    One depth-bounded DFS per source walks only through dormant accounts, so
+    every qualifying chain from that source is found in a single pass. Stops
+    early, returning the chains found so far, when the budget runs out.
     """
+    budget = budget or DetectorBudget()
     layered_chains = []
     
-    if G.number_of_nodes() == 0:
-        return layered_chains
+    for source in shell_search_sources(G):
+        if budget.exhausted:
+            break
+        layered_chains.extend(shell_chains_from(G, source, budget, profiler))
     
+    profiler.count("shell_dfs_expansions", budget.expansions)
+    return layered_chains
+
+
+def shell_search_sources(G: nx.DiGraph) -> List[str]:
+    """The highest-degree accounts (ties in graph order) that shell chains start from"""
     # Get all nodes sorted by degree (potential start nodes have higher activity)
     nodes_by_degree = sorted(G.nodes(), key=lambda n: G.degree(n), reverse=True)
     
     # Limit search to top nodes to avoid performance issues
-    search_nodes = nodes_by_degree[:min(50, len(nodes_by_degree))]
+    return nodes_by_degree[:SHELL_SEARCH_SOURCES]
+
+
+def shell_chains_from(
+    G: nx.DiGraph,
+    source: str,
+    budget: DetectorBudget,
+    profiler: StageProfiler = NULL_PROFILER,
+    reached: Optional[Set[str]] = None
+) -> List[List[str]]:
+    """
+    Every shell chain starting at source, in one depth-bounded DFS
     
-    processed_chains = set()
+    Args:
+        G: Transaction graph
+        source: Chain start account
+        budget: Running budget shared across sources
+        profiler: Receives the shell_sources_searched / shell_paths_explored counters
+        reached: If given, filled with every account the search looked at; the
+            chains from source can only change when one of these changes
+    
+    Returns:
+        Chains as account lists (source first)
+    """
+    chains = []
+    if reached is not None:
+        reached.add(source)
+    # Only search from nodes with outgoing connections
+    if G.out_degree(source) == 0:
+        return chains
+    profiler.count("shell_sources_searched")
+    
+    path = [source]
+    stack = [iter(G.successors(source))]
     
-    for source in search_nodes:
-        # Only search from nodes with outgoing connections
-        if G.out_degree(source) == 0:
+    while stack:
+        next_node = next(stack[-1], None)
+        if next_node is None:
+            stack.pop()
+            path.pop()
             continue
-            
-        # Find all paths of length 4 from this source (max depth 4)
-        try:
-            for target in G.nodes():
-                if source == target:
-                    continue
-                    
-                # Use cutoff=4 to limit path length and improve performance
-                try:
-                    paths = list(nx.all_simple_paths(G, source, target, cutoff=4))
-                    
-                    for path in paths:
-                        # Require path length ≥4 (4 or more accounts)
-                        if len(path) < 4:
-                            continue
-                        
-                        # Check if intermediate nodes are dormant (≤3 transactions)
-                        intermediates = path[1:-1]  # Exclude source and target
-                        
-                        if all(G.degree(node) <= 3 for node in intermediates):
-                            # Valid layered network found
-                            path_tuple = tuple(path)
-                            if path_tuple not in processed_chains:
-                                layered_chains.append(path)
-                                processed_chains.add(path_tuple)
-                                
-                except (nx.NetworkXNoPath, nx.NodeNotFound):
-                    continue
-                    
-        except Exception:
+        if not budget.expand():
+            break
+        if next_node in path:
             continue
+        if reached is not None:
+            reached.add(next_node)
+        
+        path.append(next_node)
+        if len(path) >= MIN_CHAIN_SIZE:
+            # Intermediates (path[1:-1]) were all checked as dormant on the way in
+            profiler.count("shell_paths_explored")
+            chains.append(list(path))
+            if not budget.found():
+                break
+        # Extending makes next_node an intermediate: only dormant accounts qualify
+        if len(path) < MAX_CHAIN_SIZE and G.degree(next_node) <= DORMANT_MAX_DEGREE:
+            stack.append(iter(G.successors(next_node)))
+        else:
+            path.pop()
     
-    return layered_chains
+    return chains
 
 
 def calculate_risk_score(
@@ -239,11 +749,32 @@ def calculate_risk_score(
     account: str,
     mule_rings: List[List[str]],
     smurfing_accounts: List[str],
-    layered_chains: List[List[str]]
+    layered_chains: List[List[str]],
+    profiler: StageProfiler = NULL_PROFILER,
+    centrality: Optional[Dict[str, float]] = None
 ) -> int:
     """
     Calculate risk score for an account (0-100 scale)
     
+    Args:
+        centrality: Betweenness centrality of every account (account_centrality);
+            computed for this call alone when omitted
+    """
+    if centrality is None:
+        centrality = account_centrality(G, profiler)
+    return score_account(
+        in_ring=any(account in ring for ring in mule_rings),
+        smurfing=account in smurfing_accounts,
+        in_chain=any(account in chain for chain in layered_chains),
+        degree=G.degree(account),
+        centrality=centrality.get(account, 0)
+    )
+
+
+def score_account(in_ring: bool, smurfing: bool, in_chain: bool, degree: int, centrality: float) -> int:
+    """
+    Risk score (0-100) from an account's pattern memberships
+    
     Scoring:
     - In mule ring (cycle): +40 points
     - Smurfing pattern (fan-in/fan-out): +25 points (changed from +30)
@@ -252,35 +783,35 @@ def calculate_risk_score(
     - High centrality: +10 points
     """
     score = 0
-    
-    # Check if in mule ring
-    if any(account in ring for ring in mule_rings):
+    if in_ring:
         score += 40
-    
-    # Check if smurfing account
-    if account in smurfing_accounts:
+    if smurfing:
         score += 25
-    
-    # Check if in layered network
-    if any(account in chain for chain in layered_chains):
+    if in_chain:
         score += 35
-    
-    # Check high velocity
-    if G.degree(account) >= 8:
+    if degree >= HIGH_VELOCITY_DEGREE:
         score += 10
     
     # Add centrality score (high traffic node)
-    if G.number_of_nodes() > 0:
-        try:
-            centrality = nx.betweenness_centrality(G).get(account, 0)
-            score += int(centrality * 10)
-        except:
-            pass
+    score += int(centrality * 10)
     
     # Cap at 100
     return min(score, 100)
 
 
+def account_centrality(G: nx.DiGraph, profiler: StageProfiler = NULL_PROFILER) -> Dict[str, float]:
+    """Betweenness centrality of every account (empty if it cannot be computed)"""
+    if G.number_of_nodes() == 0:
+        return {}
+    try:
+        with profiler.stage("centrality"):
+            centrality = nx.betweenness_centrality(G)
+        profiler.count("centrality_nodes_explored", G.number_of_nodes())
+        return centrality
+    except Exception:
+        return {}
+
+
 def detect_high_velocity(G: nx.DiGraph) -> List[str]:
     """
     Detect high velocity accounts (≥8 transactions)
@@ -293,7 +824,7 @@ def detect_high_velocity(G: nx.DiGraph) -> List[str]:
         # Count total transactions (in + out)
         transaction_count = G.degree(node)
         
-        if transaction_count >= 8:
+        if transaction_count >= HIGH_VELOCITY_DEGREE:
             high_velocity.append(node)
     
     return high_velocity
@@ -327,13 +858,7 @@ def track_patterns_per_account(
             account_patterns[account] = []
         
         # Check if it's fan-in or fan-out
-        in_degree = G.in_degree(account)
-        out_degree = G.out_degree(account)
-        
-        if in_degree >= 10:
-            account_patterns[account].append("fan_in")
-        if out_degree >= 10:
-            account_patterns[account].append("fan_out")
+        account_patterns[account].extend(smurfing_patterns(G, account))
     
     # Track layered network patterns
     for chain in layered_chains:
@@ -0,0 +1,204 @@
+"""
+Graph Store Module
+Compact columnar file for a built transaction graph: interned account IDs,
+edge index arrays, amounts, counts and last-seen timestamps, memory-mapped
+back zero-copy so a restarted (or sibling) worker reloads it in milliseconds
+"""
+import json
+import math
+import mmap
+import os
+import struct
+import tempfile
+from typing import Any, Dict, List, Optional
+
+import networkx as nx
+import numpy as np
+
+MAGIC = b"AMLGRAPH"
+FORMAT_VERSION = 1
+# Every array starts on a 64-byte boundary (cache line; aligned numpy views)
+ALIGNMENT = 64
+# MAGIC, then the little-endian uint64 length of the JSON header that follows
+PREAMBLE = struct.Struct("<8sQ")
+
+
+def _aligned(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def save_graph(G: nx.DiGraph, path: str, documents: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Write the graph to path (atomically: temp file, then rename)
+
+    Account IDs are interned in graph node order into one UTF-8 blob plus an
+    offsets array; edges become src/dst index arrays in graph edge order
+    with their amount, count and last_seen (epoch seconds, NaN if unknown).
+    Documents are JSON values stored alongside and parsed only on demand.
+
+    Returns:
+        The file size in bytes
+    """
+    ids = [str(node).encode() for node in G.nodes()]
+    index = {node: position for position, node in enumerate(G.nodes())}
+    id_offsets = np.zeros(len(ids) + 1, dtype=np.uint64)
+    np.cumsum([len(account) for account in ids], out=id_offsets[1:])
+
+    # One pass over the adjacency (same order as G.edges())
+    src, dst, amount, count, last_seen = [], [], [], [], []
+    for u, neighbours in G.adjacency():
+        u_index = index[u]
+        for v, data in neighbours.items():
+            src.append(u_index)
+            dst.append(index[v])
+            amount.append(data.get('amount', 0.0))
+            count.append(data.get('count', 1))
+            last_seen.append(data.get('last_seen', math.nan))
+    edge_count = len(src)
+    index_dtype = np.uint32 if len(ids) < 2 ** 32 else np.uint64
+    arrays = {
+        "id_offsets": id_offsets,
+        "id_bytes": np.frombuffer(b"".join(ids), dtype=np.uint8),
+        "src": np.array(src, dtype=index_dtype),
+        "dst": np.array(dst, dtype=index_dtype),
+        "amount": np.array(amount, dtype=np.float64),
+        "count": np.array(count, dtype=np.uint32),
+        "last_seen": np.array(last_seen, dtype=np.float64),
+    }
+    for name, value in (documents or {}).items():
+        blob = json.dumps(value, separators=(",", ":")).encode()
+        arrays[f"doc:{name}"] = np.frombuffer(blob, dtype=np.uint8)
+
+    # Array offsets are relative to the data section, which starts at the
+    # first aligned position after the header
+    layout = {}
+    position = 0
+    for name, array in arrays.items():
+        layout[name] = {"dtype": array.dtype.str, "length": int(array.size), "offset": position}
+        position = _aligned(position + array.nbytes)
+    header = json.dumps(
+        {"version": FORMAT_VERSION, "nodes": len(ids), "edges": edge_count, "arrays": layout}
+    ).encode()
+    data_start = _aligned(PREAMBLE.size + len(header))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".graph-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(PREAMBLE.pack(MAGIC, len(header)))
+            f.write(header)
+            for name, array in arrays.items():
+                f.seek(data_start + layout[name]["offset"])
+                f.write(array.tobytes())
+            f.truncate(data_start + position)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+    return data_start + position
+
+
+class GraphFile:
+    """
+    A saved graph, memory-mapped read-only
+
+    Arrays are numpy views straight into the mapping: opening reads only the
+    header, pages come in as they are touched, and every process mapping the
+    same file shares them through the page cache. The file is replaced, never
+    rewritten, so an open mapping stays valid while a newer graph is saved.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_length = PREAMBLE.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a saved graph")
+        header = json.loads(self._mmap[PREAMBLE.size:PREAMBLE.size + header_length])
+        if header["version"] != FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"{path}: unsupported graph format version {header['version']}")
+        data_start = _aligned(PREAMBLE.size + header_length)
+        self.arrays: Dict[str, np.ndarray] = {
+            name: np.frombuffer(
+                self._mmap, dtype=entry["dtype"], count=entry["length"], offset=data_start + entry["offset"]
+            )
+            for name, entry in header["arrays"].items()
+        }
+        self.id_offsets = self.arrays["id_offsets"]
+        self.id_bytes = self.arrays["id_bytes"]
+        self.src = self.arrays["src"]
+        self.dst = self.arrays["dst"]
+        self.amount = self.arrays["amount"]
+        self.count = self.arrays["count"]
+        self.last_seen = self.arrays["last_seen"]
+        self._graph: Optional[nx.DiGraph] = None
+
+    def number_of_nodes(self) -> int:
+        return len(self.id_offsets) - 1
+
+    def number_of_edges(self) -> int:
+        return len(self.src)
+
+    def account_id(self, index: int) -> str:
+        start, end = int(self.id_offsets[index]), int(self.id_offsets[index + 1])
+        return self.id_bytes[start:end].tobytes().decode()
+
+    def account_ids(self) -> List[str]:
+        """All account IDs, in graph node order"""
+        blob = self.id_bytes.tobytes()
+        offsets = self.id_offsets.tolist()
+        return [blob[offsets[i]:offsets[i + 1]].decode() for i in range(len(offsets) - 1)]
+
+    def degrees(self) -> np.ndarray:
+        """In + out degree per account index"""
+        nodes = self.number_of_nodes()
+        return np.bincount(self.src, minlength=nodes) + np.bincount(self.dst, minlength=nodes)
+
+    def document(self, name: str) -> Optional[Any]:
+        """A JSON document saved with the graph (None if absent)"""
+        blob = self.arrays.get(f"doc:{name}")
+        return None if blob is None else json.loads(blob.tobytes())
+
+    def to_networkx(self) -> nx.DiGraph:
+        """
+        The graph as an nx.DiGraph, built once and cached
+
+        Node and edge order match the saved graph, so detectors (whose tie
+        breaks follow graph order) give the same results as on the original.
+        """
+        if self._graph is None:
+            ids = self.account_ids()
+            G = nx.DiGraph()
+            G.add_nodes_from(ids)
+            for u, v, amount, count, last_seen in zip(
+                self.src.tolist(), self.dst.tolist(), self.amount.tolist(),
+                self.count.tolist(), self.last_seen.tolist()
+            ):
+                if not math.isnan(last_seen):
+                    G.add_edge(ids[u], ids[v], amount=amount, count=count, last_seen=last_seen)
+                else:
+                    G.add_edge(ids[u], ids[v], amount=amount, count=count)
+            self._graph = G
+        return self._graph
+
+    def close(self) -> None:
+        """Unmap the file (arrays taken from this object must no longer be used)"""
+        self.arrays.clear()
+        self.id_offsets = self.id_bytes = self.src = self.dst = None
+        self.amount = self.count = self.last_seen = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            # A caller still holds a view; the mapping goes when it does
+            pass
+
+
+def load_graph(path: str) -> Optional[GraphFile]:
+    """Map a saved graph, or None when there is no file at path"""
+    if not path or not os.path.exists(path):
+        return None
+    return GraphFile(path)
@@ -1,19 +1,37 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
+from contextlib import AsyncExitStack, asynccontextmanager
 from pydantic import BaseModel
+import asyncio
 import hashlib
+import importlib
 import json
+import math
 import time
 from pathlib import Path
-from graph_analyzer import analyze_transactions
-from typing import Optional
+from graph_analyzer import analyze_transactions, input_format_for, DetectorBudget, INPUT_FORMATS
+from analysis_profiler import ANALYSIS_METRICS, StageProfiler
+from analysis_session import AnalysisSession, delta_events
+from graph_store import GraphFile, load_graph, save_graph
+from blockchain_submitter import BulkFlagSubmitter, register_wallet_fee
+from registry_reader import read_wallet_profile_async, screen_wallets
+from profile_codec import cid_to_multihash
+from profile_cache import ProfileCache
+from registry_index import RegistryIndex
+from async_clients import AsyncAlgodClient, AsyncKMDClient, AsyncIPFSClient
+from blob_store import LocalBlobStore
+from params_provider import SuggestedParamsProvider
+from flag_outbox import FlagOutbox, FlagWorker
+from evidence_store import EvidenceStore
+from service_registry import ServiceRegistry
+from typing import List, Optional
 import networkx as nx
 import os
 import secrets
 from dotenv import load_dotenv
 from algosdk.v2client import algod
-from algosdk.kmd import KMDClient
 from algosdk import mnemonic, account, transaction
 from algosdk.atomic_transaction_composer import (
     AtomicTransactionComposer, 
@@ -22,24 +40,6 @@ from algosdk.atomic_transaction_composer import (
 )
 from algosdk.abi import Contract, Method
 
-# IPFS Client
-try:
-    import ipfshttpclient
-    IPFS_AVAILABLE = True
-    # Connect to local IPFS node (default: http://127.0.0.1:5001)
-    try:
-        ipfs_client = ipfshttpclient.connect('/ip4/127.0.0.1/tcp/5001')
-        print("✅ Connected to IPFS node")
-    except Exception as e:
-        print(f"⚠️ IPFS node not available: {e}")
-        print("   Run: ipfs daemon")
-        ipfs_client = None
-        IPFS_AVAILABLE = False
-except ImportError:
-    print("⚠️ IPFS client not installed. Run: pip install ipfshttpclient")
-    ipfs_client = None
-    IPFS_AVAILABLE = False
-
 # Load environment variables
 load_dotenv()
 ALGOD_SERVER = os.getenv("ALGOD_SERVER", "http://localhost:4001")
@@ -47,19 +47,81 @@ ALGOD_TOKEN = os.getenv("ALGOD_TOKEN", "aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa
 APP_ID = int(os.getenv("APP_ID", "1002"))
 CREATOR_MNEMONIC = os.getenv("CREATOR_MNEMONIC", "")
 NETWORK = os.getenv("NETWORK", "localnet")
+FLAG_MAX_IN_FLIGHT = int(os.getenv("FLAG_MAX_IN_FLIGHT", "32"))
+FLAG_MAX_RETRIES = int(os.getenv("FLAG_MAX_RETRIES", "3"))
+FLAG_GROUP_SIZE = int(os.getenv("FLAG_GROUP_SIZE", "16"))
+PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", "10000"))
+PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", "60"))
+PROFILE_CACHE_PATH = os.getenv("PROFILE_CACHE_PATH", "")
+SCREEN_MAX_IDS = int(os.getenv("SCREEN_MAX_IDS", "50000"))
+SCREEN_SMALL_BATCH = int(os.getenv("SCREEN_SMALL_BATCH", "64"))
+REGISTRY_INDEX_PATH = os.getenv("REGISTRY_INDEX_PATH", "")
+REGISTRY_INDEX_POLL = float(os.getenv("REGISTRY_INDEX_POLL", "5"))
+KMD_SERVER = os.getenv("KMD_SERVER", "http://localhost:4002")
+KMD_TOKEN = os.getenv("KMD_TOKEN", "aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa")
+IPFS_API_URL = os.getenv("IPFS_API_URL", "http://127.0.0.1:5001")
+BLOB_STORE = os.getenv("BLOB_STORE", "ipfs")
+BLOB_STORE_PATH = os.getenv("BLOB_STORE_PATH", os.path.join(os.path.dirname(__file__), "blobs"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+PARAMS_REFRESH_MARGIN = int(os.getenv("PARAMS_REFRESH_MARGIN", "100"))
+FLAG_OUTBOX_PATH = os.getenv("FLAG_OUTBOX_PATH", os.path.join(os.path.dirname(__file__), "flag_outbox.db"))
+FLAG_WORKER_BATCH = int(os.getenv("FLAG_WORKER_BATCH", "256"))
+EVIDENCE_CACHE_PATH = os.getenv(
+    "EVIDENCE_CACHE_PATH", os.path.join(os.path.dirname(__file__), "evidence_cache.db")
+)
+SERVICE_INIT_TIMEOUT = float(os.getenv("SERVICE_INIT_TIMEOUT", "5"))
+CYCLE_BUDGET_SECONDS = float(os.getenv("CYCLE_BUDGET_SECONDS", "10"))
+CYCLE_MAX_CYCLES = int(os.getenv("CYCLE_MAX_CYCLES", "100000"))
+CYCLE_MAX_EXPANSIONS = int(os.getenv("CYCLE_MAX_EXPANSIONS", "5000000"))
+SHELL_BUDGET_SECONDS = float(os.getenv("SHELL_BUDGET_SECONDS", "10"))
+SHELL_MAX_PATHS = int(os.getenv("SHELL_MAX_PATHS", "100000"))
+SHELL_MAX_EXPANSIONS = int(os.getenv("SHELL_MAX_EXPANSIONS", "5000000"))
+SERVICE_RETRY_INTERVAL = float(os.getenv("SERVICE_RETRY_INTERVAL", "30"))
+SHUTDOWN_JOIN_TIMEOUT = float(os.getenv("SHUTDOWN_JOIN_TIMEOUT", "10"))
+# Incremental session: edges older than the window expire (0 keeps everything)
+ANALYSIS_WINDOW_SECONDS = float(os.getenv("ANALYSIS_WINDOW_SECONDS", "604800"))
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "1000"))
+# Last built graph + result, memory-mapped back on startup (empty = keep in memory only)
+GRAPH_STORE_PATH = os.getenv("GRAPH_STORE_PATH", os.path.join(os.path.dirname(__file__), "last_graph.amlg"))
+
+# Work limits for the combinatorial detectors: past any of them the detector
+# returns partial results and the analysis summary lists it as truncated
+DETECTOR_BUDGETS = {
+    "cycles": DetectorBudget(
+        max_seconds=CYCLE_BUDGET_SECONDS, max_results=CYCLE_MAX_CYCLES, max_expansions=CYCLE_MAX_EXPANSIONS
+    ),
+    "shell_networks": DetectorBudget(
+        max_seconds=SHELL_BUDGET_SECONDS, max_results=SHELL_MAX_PATHS, max_expansions=SHELL_MAX_EXPANSIONS
+    ),
+}
 
-# Helper: get algod client
+# Helper: get algod client (sync - used by the threaded bulk submitter and registry index)
 algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_SERVER)
 
+# Pooled async clients - request handlers await these instead of blocking the event loop
+async_algod_client = AsyncAlgodClient(
+    ALGOD_TOKEN, ALGOD_SERVER, timeout=HTTP_TIMEOUT, max_connections=HTTP_MAX_CONNECTIONS
+)
+# Suggested params fetched once and shared by every flagging path
+params_provider = SuggestedParamsProvider(
+    algod_client, async_algod_client, refresh_margin_rounds=PARAMS_REFRESH_MARGIN
+)
+
+# Off-chain storage: the IPFS daemon, or a local store with identical CIDs (BLOB_STORE=local)
+if BLOB_STORE == "local":
+    ipfs_client = LocalBlobStore(BLOB_STORE_PATH)
+else:
+    ipfs_client = AsyncIPFSClient(IPFS_API_URL, timeout=HTTP_TIMEOUT, max_connections=HTTP_MAX_CONNECTIONS)
+# Evidence bundles are uploaded once per distinct content (CID cache survives restarts)
+evidence_store = EvidenceStore(ipfs_client, EVIDENCE_CACHE_PATH)
+
 # Helper: get account from LocalNet KMD (default funded account)
-def get_localnet_default_account():
+async def get_localnet_default_account():
     """Get the first funded account from LocalNet KMD wallet"""
+    kmd_client = AsyncKMDClient(KMD_TOKEN, KMD_SERVER, timeout=HTTP_TIMEOUT, max_connections=2)
     try:
-        kmd_client = KMDClient(
-            "aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa",
-            "http://localhost:4002"
-        )
-        wallets = kmd_client.list_wallets()
+        wallets = await kmd_client.list_wallets()
         wallet_id = None
         for wallet in wallets:
             if wallet["name"] == "unencrypted-default-wallet":
@@ -67,27 +129,23 @@ def get_localnet_default_account():
                 break
         
         if wallet_id:
-            wallet_handle = kmd_client.init_wallet_handle(wallet_id, "")
-            addresses = kmd_client.list_keys(wallet_handle)
+            wallet_handle = await kmd_client.init_wallet_handle(wallet_id, "")
+            addresses = await kmd_client.list_keys(wallet_handle)
             if addresses:
                 # Get first account
                 addr = addresses[0]
-                private_key = kmd_client.export_key(wallet_handle, "", addr)
+                private_key = await kmd_client.export_key(wallet_handle, "", addr)
                 return private_key, addr
-    except Exception as e:
-        print(f"Warning: Could not access LocalNet KMD: {e}")
-        return None, None
+    finally:
+        await kmd_client.aclose()
+    raise RuntimeError("No funded account in the LocalNet unencrypted-default-wallet")
 
-# Get sender account (try KMD first for localnet, then mnemonic)
+# Get sender account (KMD on localnet is resolved at startup, mnemonic here)
 sender_sk = None
 sender_addr = None
 
-# Only try KMD on localnet
-if NETWORK == "localnet":
-    sender_sk, sender_addr = get_localnet_default_account()
-
-# Fallback to mnemonic (required for testnet/mainnet)
-if not sender_sk and CREATOR_MNEMONIC:
+# Mnemonic account (required for testnet/mainnet; LocalNet KMD overrides it at startup)
+if CREATOR_MNEMONIC:
     try:
         sender_sk = mnemonic.to_private_key(CREATOR_MNEMONIC)
         sender_addr = account.address_from_private_key(sender_sk)
@@ -105,32 +163,229 @@ CONTRACT_JSON_PATH = os.path.join(
     "aml_registry", 
     "AmlRegistry.arc56.json"
 )
+# Parsed by the "contract" service at startup (see lifespan)
 contract = None
-if os.path.exists(CONTRACT_JSON_PATH):
+
+def load_contract() -> Contract:
+    """Parse the ARC-56 contract ABI"""
+    if not os.path.exists(CONTRACT_JSON_PATH):
+        raise FileNotFoundError(f"Contract ABI not found at {CONTRACT_JSON_PATH}")
     with open(CONTRACT_JSON_PATH) as f:
-        contract = Contract.from_json(f.read())
-else:
-    print(f"Warning: Contract ABI not found at {CONTRACT_JSON_PATH}")
+        return Contract.from_json(f.read())
+
+# Cache of on-chain wallet profiles for /query-wallet screening
+profile_cache = ProfileCache(
+    max_entries=PROFILE_CACHE_SIZE,
+    ttl_seconds=PROFILE_CACHE_TTL,
+    db_path=PROFILE_CACHE_PATH or None
+)
+
+# Local mirror of the registry's boxes (disabled unless REGISTRY_INDEX_PATH is set)
+registry_index = None
+if REGISTRY_INDEX_PATH:
+    registry_index = RegistryIndex(algod_client, APP_ID, db_path=REGISTRY_INDEX_PATH)
+
+# Bulk submission engine (shared by /bulk-flag-suspicious and /detect auto-flagging)
+def build_flag_submitter():
+    """Create the bulk submitter for the current sender account (None if not configured)"""
+    if not (contract and sender_sk):
+        return None
+    return BulkFlagSubmitter(
+        algod_client,
+        contract,
+        APP_ID,
+        sender_addr,
+        sender_sk,
+        max_in_flight=FLAG_MAX_IN_FLIGHT,
+        max_retries=FLAG_MAX_RETRIES,
+        group_size=FLAG_GROUP_SIZE,
+        on_confirmed=profile_cache.invalidate,
+        params_provider=params_provider
+    )
+
+flag_submitter = build_flag_submitter()
+
+# Durable queue of auto-flag operations, drained in the background so /detect never waits on-chain
+flag_outbox = FlagOutbox(FLAG_OUTBOX_PATH)
+flag_worker = FlagWorker(flag_outbox, lambda: flag_submitter, batch_size=FLAG_WORKER_BATCH)
+
+# External dependencies, initialized lazily: startup only schedules concurrent
+# warm-ups (each bounded by SERVICE_INIT_TIMEOUT), handlers await ensure() on
+# first use, and /health reports each one's real state
+services = ServiceRegistry(timeout=SERVICE_INIT_TIMEOUT, retry_interval=SERVICE_RETRY_INTERVAL)
+
+
+async def init_contract():
+    """Parse the contract ABI off the event loop"""
+    global contract, flag_submitter
+    contract = await asyncio.to_thread(load_contract)
+    flag_submitter = build_flag_submitter()
+    return contract
+
+
+async def init_kmd_account():
+    """Use the LocalNet KMD default account as the sender"""
+    global sender_sk, sender_addr, flag_submitter
+    sender_sk, sender_addr = await get_localnet_default_account()
+    flag_submitter = build_flag_submitter()
+    return sender_addr
+
+
+async def init_ipfs():
+    version = await ipfs_client.version()
+    if ipfs_client.backend == "local":
+        print(f"✅ Using local blob store: {BLOB_STORE_PATH}")
+    else:
+        print("✅ Connected to IPFS node")
+    return version
+
+
+async def init_visualization():
+    """Import matplotlib (via graph_visualizer) off the event loop"""
+    try:
+        return await asyncio.to_thread(importlib.import_module, "graph_visualizer")
+    except ImportError as e:
+        raise RuntimeError(f"matplotlib not installed ({e}). Install with: pip install matplotlib==3.9.0")
+
+
+services.register("contract", init_contract)
+if NETWORK == "localnet":
+    services.register("kmd", init_kmd_account)
+services.register("ipfs", init_ipfs)
+services.register("algod", async_algod_client.status)
+services.register("visualization", init_visualization)
+
+# Services the flag submitter is built from
+FLAG_SERVICES = ("contract", "kmd") if NETWORK == "localnet" else ("contract",)
+
+
+async def ensure_flag_submitter():
+    """Wait (bounded) for the contract ABI and sender account, then return the submitter or None"""
+    await asyncio.gather(*(services.ensure(name) for name in FLAG_SERVICES))
+    return flag_submitter
+
+
+UNSUPPORTED_FILE_DETAIL = f"File must be a CSV, Parquet or Arrow/Feather file ({', '.join(INPUT_FORMATS)})"
 
-# Try to import visualization (requires matplotlib)
-try:
-    from graph_visualizer import generate_all_visualizations
-    VISUALIZATION_AVAILABLE = True
-except ImportError:
-    VISUALIZATION_AVAILABLE = False
-    print("Warning: matplotlib not installed. Graph visualizations disabled.")
-    print("Install with: pip install matplotlib==3.9.0")
 
 # Global variables to store last analysis result and graph
 last_analysis_result = None
 last_graph = None
+# Stable ID of the last analysis (hash of the uploaded CSV) - keys its flag operations in the outbox
+last_analysis_id = None
+# Incremental analysis fed by /analyze/append and /stream/transactions
+analysis_session: Optional[AnalysisSession] = None
+# Saved copy of the last graph, mapped on startup; stands in for last_graph after a restart
+stored_graph: Optional[GraphFile] = None
+
+
+def current_graph() -> Optional[nx.DiGraph]:
+    """The last analysis graph: in memory, or rebuilt (once) from the saved file after a restart"""
+    if last_graph is not None:
+        return last_graph
+    if stored_graph is not None:
+        return stored_graph.to_networkx()
+    return None
+
+
+async def persist_last_analysis(live: bool = False) -> None:
+    """
+    Save last_graph and last_analysis_result to GRAPH_STORE_PATH
+    
+    Args:
+        live: The graph is the session's and may change under a worker
+            thread, so save it on the event loop instead
+    """
+    if not GRAPH_STORE_PATH or last_graph is None:
+        return
+    documents = {"result": last_analysis_result, "analysis_id": last_analysis_id}
+    try:
+        if live:
+            save_graph(last_graph, GRAPH_STORE_PATH, documents)
+        else:
+            await run_in_threadpool(save_graph, last_graph, GRAPH_STORE_PATH, documents)
+    except (OSError, TypeError, ValueError) as e:
+        print(f"⚠️ Could not save graph to {GRAPH_STORE_PATH}: {e}")
+
+
+def get_analysis_session(reset: bool = False) -> AnalysisSession:
+    """The long-lived incremental session (a new one on first use or reset)"""
+    global analysis_session
+    if reset or analysis_session is None:
+        analysis_session = AnalysisSession(budgets=DETECTOR_BUDGETS, window_seconds=ANALYSIS_WINDOW_SECONDS)
+    return analysis_session
+
+async def load_last_analysis():
+    """Map the graph saved by a previous process, so /graph-stats, /results and PAN verification survive restarts"""
+    global stored_graph, last_analysis_result, last_analysis_id
+    if not GRAPH_STORE_PATH:
+        return
+    try:
+        stored_graph = load_graph(GRAPH_STORE_PATH)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not load saved graph {GRAPH_STORE_PATH}: {e}")
+        return
+    if stored_graph is not None:
+        last_analysis_result = stored_graph.document("result")
+        last_analysis_id = stored_graph.document("analysis_id")
+        print(f"✅ Loaded last graph ({stored_graph.number_of_nodes()} accounts, "
+              f"{stored_graph.number_of_edges()} edges) from {GRAPH_STORE_PATH}")
+
+
+async def stop_flag_worker():
+    """Wait for the flag worker's current pass, then close the outbox"""
+    if await run_in_threadpool(flag_worker.stop, SHUTDOWN_JOIN_TIMEOUT):
+        flag_outbox.close()
+    else:
+        print(f"⚠️ Flag worker still running after {SHUTDOWN_JOIN_TIMEOUT:g}s; its submitted operations resume on the next start")
+
+
+async def stop_registry_index():
+    """Stop following rounds, then close the index"""
+    if await run_in_threadpool(registry_index.stop, SHUTDOWN_JOIN_TIMEOUT):
+        registry_index.close()
+    else:
+        print(f"⚠️ Registry index sync still running after {SHUTDOWN_JOIN_TIMEOUT:g}s")
+
+
+async def close_services():
+    """Cancel pending warm-ups and close pooled HTTP connections"""
+    await services.aclose()
+    await async_algod_client.aclose()
+    await ipfs_client.aclose()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start the background work in order and tear it down in reverse
+
+    1. Warm-up of KMD, IPFS, algod, the contract ABI and matplotlib (boot does not wait on it)
+    2. Flag worker (its first pass resumes anything a previous process left submitted)
+    3. Registry index sync, following new rounds
+    4. Graph saved by a previous process
+    """
+    async with AsyncExitStack() as teardown:
+        services.start_all()
+        teardown.push_async_callback(close_services)
+        flag_worker.start()
+        teardown.push_async_callback(stop_flag_worker)
+        if registry_index is not None:
+            registry_index.start(poll_interval=REGISTRY_INDEX_POLL)
+            teardown.push_async_callback(stop_registry_index)
+            print(f"✅ Registry index syncing to {REGISTRY_INDEX_PATH}")
+        await load_last_analysis()
+        yield
+
 
 app = FastAPI(
     title="AML Registry Backend",
     description="Anti-Money Laundering transaction analysis and blockchain integration",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+
 # CORS for React frontend
 app.add_middleware(
     CORSMiddleware,
@@ -168,6 +423,22 @@ class FlagRequest(BaseModel):
     ipfs_hash: Optional[str] = None
 
 
+class BulkScreenRequest(BaseModel):
+    """Request model for screening many wallets at once"""
+    hashed_ids: List[str]
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for endpoints that keep reading the request body while
+    responding: Starlette's disconnect listener would otherwise consume the
+    body messages (a disconnect still ends request.stream())
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+
+
 # Global variable to store PAN mapping IPFS CID (permanent, stored in IPFS)
 pan_mapping_ipfs_cid = "QmdSjyrrBLvdH4Gjda1wMrk9sGrLowGBEbP5VnxuNZkydN"
 
@@ -184,44 +455,62 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Detailed health check"""
-    return {
-        "status": "healthy",
-        "services": {
-            "api": "operational",
-            "graph_analysis": "operational",
-            "blockchain": "operational"
-        }
-    }
+    """
+    Readiness of every external dependency
+
+    Reports each service's state (pending / starting / ready / unavailable),
+    its last error and init time, without waiting on any of them.
+    """
+    health = services.health()
+    health["flag_submitter"] = "ready" if flag_submitter else "unavailable"
+    return health
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Per-stage analysis timings, memory and work counters in Prometheus text format"""
+    return PlainTextResponse(ANALYSIS_METRICS.render(), media_type="text/plain; version=0.0.4")
 
 
 @app.post("/analyze")
-async def analyze_csv(file: UploadFile = File(...)):
+async def analyze_csv(file: UploadFile = File(...), profile: bool = False):
     """
-    Analyze uploaded transaction CSV for money mule patterns
+    Analyze an uploaded transaction file (CSV, Parquet or Arrow/Feather) for money mule patterns
+    
+    Args:
+        profile: Include summary.profile (per-stage time, memory, work counters)
     
     Returns:
         - suspicious_accounts: List of flagged account objects
         - fraud_rings: Detected fraud rings with IDs
         - summary: Statistics and processing time
     """
-    global last_analysis_result, last_graph
+    global last_analysis_result, last_graph, last_analysis_id
     
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="File must be a CSV")
+    input_format = input_format_for(file.filename)
+    if input_format is None:
+        raise HTTPException(status_code=400, detail=UNSUPPORTED_FILE_DETAIL)
     
     try:
         contents = await file.read()
-        results, graph = analyze_transactions(contents)
+        results, graph = analyze_transactions(
+            contents, profile=profile, budgets=DETECTOR_BUDGETS, input_format=input_format
+        )
         
         # Save to global variables
         last_analysis_result = results
         last_graph = graph
+        last_analysis_id = hashlib.sha256(contents).hexdigest()[:16]
         
         # Generate visualizations (if matplotlib is available)
-        if VISUALIZATION_AVAILABLE:
+        if await services.ensure("visualization"):
             try:
-                viz_paths = generate_all_visualizations(graph, results)
+                viz_profiler = StageProfiler(trace_memory=profile)
+                with viz_profiler, viz_profiler.stage("visualization"):
+                    viz_paths = services["visualization"].value.generate_all_visualizations(graph, results)
+                ANALYSIS_METRICS.observe(viz_profiler, run=False)
+                if profile:
+                    results["summary"]["profile"]["stages"].update(viz_profiler.as_dict()["stages"])
                 results['visualizations'] = viz_paths
             except Exception as viz_error:
                 error_msg = f"Visualization generation failed: {str(viz_error)}"
@@ -230,18 +519,176 @@ async def analyze_csv(file: UploadFile = File(...)):
                 traceback.print_exc()
                 results['visualizations'] = {'error': error_msg}
         else:
-            results['visualizations'] = {'error': 'matplotlib not installed'}
+            results['visualizations'] = {'error': services["visualization"].error}
         
         # Save to JSON file
         output_path = Path("output.json")
         with open(output_path, 'w') as f:
             json.dump(results, f, indent=2)
+        await persist_last_analysis()
         
         return results
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
+@app.post("/analyze/append")
+async def analyze_append(file: UploadFile = File(...), reset: bool = False):
+    """
+    Append a transaction CSV (or Parquet / Arrow) batch to the incremental analysis session
+    
+    Only the accounts, rings and shell chains the batch can affect are
+    re-analyzed; GET /analyze/session returns the full result.
+    
+    Args:
+        reset: Start a new session with this batch
+    
+    Returns:
+        The batch's delta: changed accounts, rings and chains added/removed, expired edges
+    """
+    input_format = input_format_for(file.filename)
+    if input_format is None:
+        raise HTTPException(status_code=400, detail=UNSUPPORTED_FILE_DETAIL)
+    
+    try:
+        contents = await file.read()
+        session = get_analysis_session(reset)
+        delta = session.append(contents, input_format)
+        delta["session"] = {
+            "analysis_id": session.analysis_id,
+            "appends": session.appends,
+            "transactions_appended": session.transactions
+        }
+        return delta
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+
+@app.post("/stream/transactions")
+async def stream_transactions(request: Request, reset: bool = False):
+    """
+    Streaming ingestion: chunked NDJSON transactions in, NDJSON events out
+    
+    Each request line is one transaction object (sender_id, receiver_id,
+    amount, optional timestamp). Lines are appended to the incremental
+    session as they arrive (at most STREAM_BATCH_SIZE per append) and each
+    append's events - fraud_ring, ring_cleared, suspicious_account,
+    account_cleared - are written back immediately. Malformed lines (bad
+    JSON, missing or empty string IDs, non-numeric amounts) give an error
+    event with their line number and are skipped before the append, so one
+    bad line never costs the rest of its batch; a final summary event
+    closes the stream.
+    
+    Args:
+        reset: Start a new session for this stream
+    """
+    session = get_analysis_session(reset)
+    
+    async def events():
+        received = 0
+        line_number = 0
+        buffer = b""
+        
+        def parse(line: bytes) -> dict:
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"invalid JSON: {e}")
+            if not isinstance(record, dict) or not all(
+                key in record for key in ("sender_id", "receiver_id", "amount")
+            ):
+                raise ValueError("transaction needs sender_id, receiver_id and amount")
+            for key in ("sender_id", "receiver_id"):
+                if not isinstance(record[key], str) or not record[key].strip():
+                    raise ValueError(f"{key} must be a non-empty string")
+            amount = record["amount"]
+            try:
+                if isinstance(amount, bool):
+                    raise TypeError
+                amount = float(amount)
+            except (TypeError, ValueError):
+                raise ValueError(f"amount must be a number, got {json.dumps(amount)}")
+            if not math.isfinite(amount):
+                raise ValueError("amount must be finite")
+            return {**record, "amount": amount}
+        
+        async def chunks():
+            async for chunk in request.stream():
+                yield chunk, False
+            yield b"", True
+        
+        async for chunk, done in chunks():
+            buffer += chunk
+            lines = buffer.split(b"\n")
+            buffer = b"" if done else lines.pop()
+            records = []
+            record_lines = []
+            for line in lines:
+                line_number += 1
+                if not line.strip():
+                    continue
+                try:
+                    records.append(parse(line))
+                    record_lines.append(line_number)
+                except ValueError as e:
+                    yield json.dumps({"event": "error", "line": line_number, "detail": str(e)}) + "\n"
+            for start in range(0, len(records), STREAM_BATCH_SIZE):
+                batch = records[start:start + STREAM_BATCH_SIZE]
+                try:
+                    delta = session.append_records(batch)
+                except Exception as e:
+                    batch_lines = record_lines[start:start + STREAM_BATCH_SIZE]
+                    yield json.dumps({
+                        "event": "error",
+                        "lines": [batch_lines[0], batch_lines[-1]],
+                        "detail": f"Analysis failed: {str(e)}"
+                    }) + "\n"
+                    continue
+                received += len(batch)
+                for event in delta_events(delta):
+                    yield json.dumps(event) + "\n"
+        
+        yield json.dumps({
+            "event": "summary",
+            "transactions_received": received,
+            "analysis_id": session.analysis_id,
+            "accounts": session.G.number_of_nodes(),
+            "edges": session.G.number_of_edges(),
+            "flagged_total": len(session.flagged),
+            "expired_edges": session.window.expired_edges if session.window else 0,
+            "late_transactions": session.window.late_transactions if session.window else 0
+        }) + "\n"
+    
+    return DuplexStreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@app.get("/analyze/session")
+async def analyze_session_result(refresh_centrality: bool = False):
+    """
+    Full result of the incremental analysis session
+    
+    The result becomes the last analysis (/results, /download,
+    /bulk-flag-suspicious); the session's graph is shared, not copied.
+    
+    Args:
+        refresh_centrality: Recompute betweenness centrality first (O(history))
+            so scores match a full /analyze of the same transactions
+    """
+    global last_analysis_result, last_graph, last_analysis_id
+    
+    if analysis_session is None:
+        raise HTTPException(status_code=404, detail="No analysis session. Append a batch first.")
+    
+    if refresh_centrality:
+        analysis_session.refresh_centrality()
+    results = analysis_session.snapshot()
+    last_analysis_result = results
+    last_graph = analysis_session.G
+    last_analysis_id = analysis_session.analysis_id
+    await persist_last_analysis(live=True)
+    return results
+
+
 @app.post("/hash")
 async def hash_identity(request: HashRequest):
     """
@@ -330,10 +777,10 @@ async def upload_pan_mapping(file: UploadFile = File(...)):
     """
     global pan_mapping_ipfs_cid
     
-    if not IPFS_AVAILABLE or not ipfs_client:
+    if not await services.ensure("ipfs"):
         raise HTTPException(
             status_code=503,
-            detail="IPFS not available. Please start IPFS daemon: ipfs daemon"
+            detail="IPFS not available. Please start IPFS daemon: ipfs daemon (or set BLOB_STORE=local)"
         )
     
     try:
@@ -353,26 +800,27 @@ async def upload_pan_mapping(file: UploadFile = File(...)):
                 detail=f"CSV must contain columns: {required_columns}. Found: {set(df.columns)}"
             )
         
-        # Convert to JSON for IPFS storage
+        # Convert to JSON for IPFS storage (no upload timestamp, so the same
+        # mapping always has the same CID and re-uploads are skipped)
         pan_mapping_data = {
             "mapping": df.to_dict('records'),
-            "uploaded_at": pd.Timestamp.now().isoformat(),
             "total_records": len(df)
         }
         
         # Upload to IPFS
-        result = ipfs_client.add_json(pan_mapping_data)
-        ipfs_cid = result
+        ipfs_cid, uploaded = await evidence_store.put(pan_mapping_data)
         
         # Store CID globally for later use
         pan_mapping_ipfs_cid = ipfs_cid
         
-        print(f"✅ Uploaded PAN mapping to IPFS: {ipfs_cid}")
+        print(f"✅ {'Uploaded' if uploaded else 'Reused'} PAN mapping on IPFS: {ipfs_cid}")
         
         return {
             "status": "success",
             "message": "PAN mapping uploaded to IPFS (off-chain storage)",
             "ipfs_cid": ipfs_cid,
+            "already_on_ipfs": not uploaded,
+            "uploaded_at": pd.Timestamp.now().isoformat(),
             "total_records": len(df),
             "note": "This CID is now stored in memory. Use /verify-pan-blacklist to check PANs."
         }
@@ -407,7 +855,7 @@ async def verify_pan_blacklist(request: PANVerificationRequest):
     global pan_mapping_ipfs_cid
     
     # CSV 2 is permanently stored in IPFS at the hardcoded CID
-    if not IPFS_AVAILABLE or not ipfs_client:
+    if not await services.ensure("ipfs"):
         raise HTTPException(
             status_code=503,
             detail="IPFS not available. Cannot fetch PAN mapping."
@@ -421,7 +869,7 @@ async def verify_pan_blacklist(request: PANVerificationRequest):
     
     try:
         # Fetch PAN mapping from IPFS
-        pan_mapping_data = ipfs_client.get_json(pan_mapping_ipfs_cid)
+        pan_mapping_data = await ipfs_client.get_json(pan_mapping_ipfs_cid)
         mapping_records = pan_mapping_data.get("mapping", [])
         
         # Find account associated with this PAN
@@ -494,6 +942,7 @@ async def flag_to_blockchain(request: FlagRequest):
     
     Soul Bound Token: Creates immutable on-chain flag + IPFS pointer to detailed data
     """
+    await ensure_flag_submitter()
     if not contract:
         raise HTTPException(status_code=500, detail="Contract ABI not found. Please compile and deploy the contract.")
     if not sender_sk:
@@ -501,6 +950,11 @@ async def flag_to_blockchain(request: FlagRequest):
     
     # Use provided IPFS hash or empty string
     ipfs_hash = request.ipfs_hash if request.ipfs_hash else ""
+    try:
+        # Stored on-chain as the CID's raw 34-byte multihash
+        ipfs_multihash = cid_to_multihash(ipfs_hash)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     try:
         atc = AtomicTransactionComposer()
@@ -510,21 +964,13 @@ async def flag_to_blockchain(request: FlagRequest):
         hashed_id_bytes = bytes.fromhex(request.hashed_id)
         signer = AccountTransactionSigner(sender_sk)
         
-        # Get suggested params and modify for box storage
-        sp = algod_client.suggested_params()
+        # Get (cached) suggested params and modify for box storage
+        sp = await params_provider.get_async()
         # Box storage requires extra fee (2500 + (400 * (box_size_in_bytes)))
-        # WalletRiskProfile is 6 UInt64s = 48 bytes
-        # IPFS hash box: 32 bytes (key suffix) + ~46 bytes (CID) = ~78 bytes
-        profile_box_size = 48
-        ipfs_box_size = 32 + len(ipfs_hash)  # key suffix + IPFS CID length
-        
-        # Fee = base + (2500 + 400*size) for each box
-        sp.fee = 1000 + (2500 + 400 * profile_box_size) + (2500 + 400 * ipfs_box_size)
+        # One compact profile box per wallet, CID included
+        sp.fee = register_wallet_fee()
         sp.flat_fee = True
         
-        # Box references for both boxes
-        ipfs_key_bytes = hashed_id_bytes + b"_ipfs"
-        
         atc.add_method_call(
             app_id=APP_ID,
             method=method,
@@ -536,12 +982,14 @@ async def flag_to_blockchain(request: FlagRequest):
                 request.risk_score,
                 request.transaction_count,
                 request.flagged_connections,
-                ipfs_hash
+                ipfs_multihash
             ],
-            boxes=[(APP_ID, hashed_id_bytes), (APP_ID, ipfs_key_bytes)]  # Both box references
+            boxes=[(APP_ID, hashed_id_bytes)]
         )
-        result = atc.execute(algod_client, 2)
-        txid = result.tx_ids[0]
+        txid = await async_algod_client.send_transactions(atc.gather_signatures())
+        txinfo = await async_algod_client.wait_for_confirmation(txid, 2)
+        params_provider.observe_round(txinfo["confirmed-round"])
+        profile_cache.invalidate([request.hashed_id.lower()])
         return {
             "status": "success",
             "message": "Account flagged to blockchain with IPFS reference (Soul Bound Token created)",
@@ -568,13 +1016,17 @@ async def bulk_flag_suspicious():
     
     On-chain: Minimal flag + IPFS pointer (immutable)
     Off-chain (IPFS): Full analysis, transaction data, graph info
+    
+    Runs through the durable flag outbox: wallets whose boxes already hold the
+    same payload are skipped, and accounts still awaiting confirmation are
+    reported as in flight (poll /flag-batches/{batch_id}).
     """
-    global last_analysis_result
+    global last_analysis_result, last_analysis_id
     
     if not last_analysis_result:
         raise HTTPException(status_code=404, detail="No analysis results available. Run /analyze first.")
     
-    if not contract or not sender_sk:
+    if not await ensure_flag_submitter():
         raise HTTPException(status_code=500, detail="Blockchain not configured")
     
     suspicious_accounts = last_analysis_result.get("suspicious_accounts", [])
@@ -587,99 +1039,72 @@ async def bulk_flag_suspicious():
             "failed_count": 0
         }
     
-    # Upload mule data to IPFS (off-chain storage)
+    # Publish mule evidence to IPFS (off-chain storage): one bundle per fraud ring
+    # plus one per analysis referencing them. Bundles are canonical JSON, so an
+    # unchanged analysis keeps its CID and nothing is uploaded twice.
     ipfs_hash = ""
-    if IPFS_AVAILABLE and ipfs_client:
+    evidence = None
+    if await services.ensure("ipfs"):
         try:
-            # Prepare data for IPFS (only mule-related info, no full transaction graph)
-            ipfs_data = {
-                "mules_detected": [
-                    {
-                        "account_id": acc.get("account_id"),
-                        "risk_score": acc.get("suspicion_score"),
-                        "patterns": acc.get("detected_patterns", []),
-                        "transaction_count": acc.get("transaction_count", 0),
-                        "flagged_connections": acc.get("flagged_connections", 0),
-                    }
-                    for acc in suspicious_accounts
-                ],
-                "fraud_rings": last_analysis_result.get("fraud_rings", []),
-                "detection_timestamp": last_analysis_result.get("summary", {}).get("timestamp", ""),
-            }
-            
-            # Upload to IPFS
-            result = ipfs_client.add_json(ipfs_data)
-            ipfs_hash = result  # This is the CID
-            print(f"✅ Uploaded mule data to IPFS: {ipfs_hash}")
+            evidence = await evidence_store.publish_analysis(last_analysis_result)
+            ipfs_hash = evidence["cid"]
+            print(
+                f"✅ Mule evidence on IPFS: {ipfs_hash} "
+                f"({evidence['uploaded']} uploaded, {evidence['reused']} already stored)"
+            )
         except Exception as e:
             print(f"⚠️  IPFS upload failed: {e}")
             # Continue without IPFS (blockchain flag only)
     
+    # Journal every operation in the outbox first: an interrupted run resumes from
+    # it on restart, and re-running this endpoint never pays for a flag twice
+    flag_requests = [
+        {
+            "account_id": account.get("account_id"),
+            "hashed_id": hashlib.sha256(account.get("account_id").encode()).hexdigest(),
+            "risk_score": int(account.get("suspicion_score", 0)),
+            "transaction_count": account.get("transaction_count", 0),
+            "flagged_connections": account.get("flagged_connections", 0),
+            "ipfs_hash": ipfs_hash
+        }
+        for account in suspicious_accounts
+    ]
+    batch_id = flag_outbox.enqueue(f"{last_analysis_id}:bulk", flag_requests)
+    await run_in_threadpool(flag_worker.drain, batch_id)
+    batch = flag_outbox.batch_status(batch_id)
+    
     flagged = []
     failed = []
+    in_flight = []
     
-    for account in suspicious_accounts:
-        try:
-            account_id = account.get("account_id")
-            risk_score = int(account.get("suspicion_score", 0))
-            
-            # Hash the account ID
-            hashed_id = hashlib.sha256(account_id.encode()).hexdigest()
-            hashed_id_bytes = bytes.fromhex(hashed_id)
-            
-            # Flag to blockchain with IPFS reference
-            atc = AtomicTransactionComposer()
-            method: Method = contract.get_method_by_name("register_wallet")
-            signer = AccountTransactionSigner(sender_sk)
-            
-            sp = algod_client.suggested_params()
-            profile_box_size = 48
-            ipfs_box_size = 32 + len(ipfs_hash)
-            sp.fee = 1000 + (2500 + 400 * profile_box_size) + (2500 + 400 * ipfs_box_size)
-            sp.flat_fee = True
-            
-            ipfs_key_bytes = hashed_id_bytes + b"_ipfs"
-            
-            atc.add_method_call(
-                app_id=APP_ID,
-                method=method,
-                sender=sender_addr,
-                sp=sp,
-                signer=signer,
-                method_args=[
-                    hashed_id_bytes,
-                    risk_score,
-                    account.get("transaction_count", 0),
-                    account.get("flagged_connections", 0),
-                    ipfs_hash
-                ],
-                boxes=[(APP_ID, hashed_id_bytes), (APP_ID, ipfs_key_bytes)]
-            )
-            
-            result = atc.execute(algod_client, 2)
-            txid = result.tx_ids[0]
-            
+    for entry in batch["accounts"]:
+        if entry["status"] in ("confirmed", "skipped"):
             flagged.append({
-                "account_id": account_id,
-                "hashed_id": hashed_id,
-                "transaction_id": txid,
+                "account_id": entry["account"],
+                "hashed_id": entry["hashed_id"],
+                "transaction_id": entry["txid"],
+                "already_on_chain": entry["status"] == "skipped",
                 "ipfs_hash": ipfs_hash if ipfs_hash else "N/A"
             })
-            
-        except Exception as e:
+        elif entry["status"] == "failed":
             failed.append({
-                "account_id": account.get("account_id"),
-                "error": str(e)
+                "account_id": entry["account"],
+                "error": entry["error"]
             })
+        else:
+            in_flight.append(entry["account"])
     
     return {
         "status": "success",
         "message": f"Flagged {len(flagged)} accounts with Soul Bound Tokens (+ IPFS), {len(failed)} failed",
+        "batch_id": batch_id,
         "flagged_count": len(flagged),
         "failed_count": len(failed),
+        "in_flight_count": len(in_flight),
         "flagged_accounts": flagged,
         "failed_accounts": failed,
-        "ipfs_hash": ipfs_hash if ipfs_hash else "IPFS not available - data only on blockchain"
+        "ipfs_hash": ipfs_hash if ipfs_hash else "IPFS not available - data only on blockchain",
+        "ring_evidence": evidence["ring_cids"] if evidence else {}
     }
 
 
@@ -690,75 +1115,145 @@ async def query_wallet(hashed_id: str):
     
     Used by Bank B to screen new customers
     
-    Queries the blockchain for the wallet's risk profile
+    Reads the wallet's profile box directly from algod and decodes the
+    WalletRiskProfile struct locally (no signed transaction, no fee, no round wait).
+    Decoded profiles are cached in-process and dropped when our own flagging confirms.
     """
-    if not contract:
-        raise HTTPException(status_code=500, detail="Contract ABI not found.")
+    try:
+        bytes.fromhex(hashed_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="hashed_id must be a hex-encoded SHA-256 hash")
     
+    # Repeat screening is served from the local cache
+    hit, profile = profile_cache.get(hashed_id.lower())
     try:
-        # Convert hashed_id to bytes
-        hashed_id_bytes = bytes.fromhex(hashed_id)
-        
-        # Call get_risk_profile method on the smart contract
-        atc = AtomicTransactionComposer()
-        method: Method = contract.get_method_by_name("get_risk_profile")
-        
-        # Create a temporary signer for read-only call (no transaction fees for queries)
-        if sender_sk:
-            signer = AccountTransactionSigner(sender_sk)
-            addr = sender_addr
-        else:
-            raise HTTPException(status_code=500, detail="No account configured for queries")
-        
-        atc.add_method_call(
-            app_id=APP_ID,
-            method=method,
-            sender=addr,
-            sp=algod_client.suggested_params(),
-            signer=signer,
-            method_args=[hashed_id_bytes],
-            boxes=[(APP_ID, hashed_id_bytes)]  # Box reference
-        )
-        
-        result = atc.execute(algod_client, 2)
-        
-        # Parse the return value (WalletRiskProfile struct)
-        # Return format: [risk_score, transaction_count, flagged_connections, last_updated, is_flagged]
-        profile = result.abi_results[0].return_value
-        
-        # Check if profile is None (wallet doesn't exist)
-        if profile is None:
-            return {
-                "hashed_id": hashed_id,
-                "is_flagged": False,
-                "risk_score": 0,
-                "message": "Wallet not found in registry"
-            }
-        
+        if not hit:
+            generation = profile_cache.generation()
+            profile = await read_wallet_profile_async(async_algod_client, APP_ID, hashed_id)
+            profile_cache.put(hashed_id.lower(), profile, generation=generation)
+    except Exception as e:
+        import traceback
+        print(f"Query wallet failed: {traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=f"Query failed: {str(e)}")
+    
+    # No profile box = wallet never registered
+    if profile is None:
         return {
             "hashed_id": hashed_id,
-            "risk_score": profile[0],
-            "transaction_count": profile[1],
-            "flagged_connections": profile[2],
-            "last_updated": profile[3],
-            "is_flagged": bool(profile[4]),
-            "message": "Wallet found in registry"
+            "is_flagged": False,
+            "risk_score": 0,
+            "message": "Wallet not found in registry"
         }
-        
-    except Exception as e:
-        # Wallet not found or other error
-        error_msg = str(e)
-        if "box not found" in error_msg.lower() or "does not exist" in error_msg.lower():
-            return {
-                "hashed_id": hashed_id,
-                "is_flagged": False,
-                "risk_score": 0,
-                "message": "Wallet not found in registry"
-            }
+    
+    return {
+        "hashed_id": hashed_id,
+        "risk_score": profile["risk_score"],
+        "transaction_count": profile["transaction_count"],
+        "flagged_connections": profile["flagged_connections"],
+        "last_updated": profile["last_updated"],
+        "is_flagged": profile["is_flagged"],
+        # Compact profiles carry their CID; legacy ones keep it in a separate box
+        "ipfs_hash": profile.get("ipfs_hash"),
+        "message": "Wallet found in registry"
+    }
+
+
+@app.post("/screen-wallets")
+async def screen_wallets_bulk(request: BulkScreenRequest):
+    """
+    Screen many wallets against the AML registry in one call
+    
+    Used by Bank B for batch onboarding / periodic re-screening
+    
+    Answered from the local registry index when it is enabled and synced.
+    Otherwise small batches are resolved with parallel box reads and large
+    batches walk the app's boxes once with paged box-listing calls.
+    Returns one decision per hashed ID, in request order.
+    """
+    if len(request.hashed_ids) > SCREEN_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {SCREEN_MAX_IDS} hashed IDs per request")
+    
+    invalid = []
+    for hashed_id in request.hashed_ids:
+        try:
+            bytes.fromhex(hashed_id)
+        except ValueError:
+            invalid.append(hashed_id)
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"hashed_ids must be hex-encoded SHA-256 hashes (invalid: {invalid[:5]})"
+        )
+    
+    start = time.time()
+    try:
+        if registry_index is not None and registry_index.ready:
+            results = registry_index.screen(request.hashed_ids)
         else:
-            import traceback
-            print(f"Query wallet failed: {traceback.format_exc()}")
-            raise HTTPException(status_code=500, detail=f"Query failed: {str(e)}")
+            results = await run_in_threadpool(
+                screen_wallets,
+                algod_client,
+                APP_ID,
+                request.hashed_ids,
+                cache=profile_cache,
+                small_batch_threshold=SCREEN_SMALL_BATCH
+            )
+    except Exception as e:
+        import traceback
+        print(f"Bulk screening failed: {traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=f"Screening failed: {str(e)}")
+    
+    flagged = sum(1 for result in results if result["decision"] == "REJECT")
+    return {
+        "total": len(results),
+        "flagged": flagged,
+        "elapsed_ms": round((time.time() - start) * 1000, 1),
+        "results": results
+    }
+
+
+@app.get("/registry/wallets")
+async def registry_wallets(
+    min_risk: Optional[int] = None,
+    flagged: Optional[bool] = None,
+    limit: int = 100,
+    offset: int = 0
+):
+    """
+    Query the local registry index, e.g. /registry/wallets?min_risk=70
+    
+    Returns wallets ordered by risk score (highest first)
+    """
+    if registry_index is None:
+        raise HTTPException(status_code=503, detail="Registry index disabled (set REGISTRY_INDEX_PATH)")
+    
+    return {
+        "checkpoint_round": registry_index.checkpoint,
+        "wallets": registry_index.query(min_risk=min_risk, flagged=flagged, limit=min(limit, 1000), offset=offset)
+    }
+
+
+@app.get("/registry/stats")
+async def registry_stats():
+    """Wallet counts and sync state of the local registry index"""
+    if registry_index is None:
+        raise HTTPException(status_code=503, detail="Registry index disabled (set REGISTRY_INDEX_PATH)")
+    return registry_index.stats()
+
+
+@app.post("/registry/reconcile")
+async def registry_reconcile():
+    """
+    Re-walk every registry box and rebuild the local index
+    
+    Returns how many wallets were added, updated or removed compared to the index
+    """
+    if registry_index is None:
+        raise HTTPException(status_code=503, detail="Registry index disabled (set REGISTRY_INDEX_PATH)")
+    try:
+        return await run_in_threadpool(registry_index.full_sync)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Reconciliation failed: {str(e)}")
 
 
 @app.get("/download")
@@ -818,13 +1313,13 @@ async def get_graph_visualization(graph_type: str):
     Returns:
         PNG image file
     """
-    if not VISUALIZATION_AVAILABLE:
+    if not await services.ensure("visualization"):
         raise HTTPException(
             status_code=503,
-            detail="Visualization feature requires matplotlib. Install with: pip install matplotlib==3.9.0"
+            detail=f"Visualization unavailable: {services['visualization'].error}"
         )
     
-    if last_graph is None:
+    if last_graph is None and stored_graph is None:
         raise HTTPException(
             status_code=404,
             detail="No graph available. Please run /analyze first."
@@ -867,14 +1362,13 @@ async def get_graph_statistics():
     Returns:
         Graph metrics and analysis
     """
-    if last_graph is None:
+    G = current_graph()
+    if G is None:
         raise HTTPException(
             status_code=404,
             detail="No graph available. Please run /analyze first."
         )
     
-    G = last_graph
-    
     # Calculate various graph metrics
     stats = {
         "nodes": G.number_of_nodes(),
@@ -903,23 +1397,29 @@ async def get_graph_statistics():
 # ==================== FRONTEND-COMPATIBLE ENDPOINTS ====================
 
 @app.post("/detect")
-async def detect_mules(file: UploadFile = File(...)):
+async def detect_mules(file: UploadFile = File(...), profile: bool = False):
     """
     Frontend-compatible endpoint for detecting money mules
     Alias to /analyze but returns data in frontend-expected format
+    (profile=true adds detailedAnalysis.analysis_summary.profile)
     """
-    global last_analysis_result, last_graph
+    global last_analysis_result, last_graph, last_analysis_id
     
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="File must be a CSV")
+    input_format = input_format_for(file.filename)
+    if input_format is None:
+        raise HTTPException(status_code=400, detail=UNSUPPORTED_FILE_DETAIL)
     
     try:
         contents = await file.read()
-        results, graph = analyze_transactions(contents)
+        results, graph = analyze_transactions(
+            contents, profile=profile, budgets=DETECTOR_BUDGETS, input_format=input_format
+        )
         
         # Save to global variables
         last_analysis_result = results
         last_graph = graph
+        last_analysis_id = hashlib.sha256(contents).hexdigest()[:16]
+        await persist_last_analysis()
         
         suspicious_accounts = results.get("suspicious_accounts", [])
         
@@ -997,7 +1497,9 @@ async def detect_mules(file: UploadFile = File(...)):
                 "totalTransactions": results.get("summary", {}).get("total_transactions", 0),
                 "flaggedAccounts": len(mules),
                 "averageRiskScore": round(avg_risk, 1),
-                "detectedCycles": detected_cycles
+                "detectedCycles": detected_cycles,
+                # Detectors that hit their work budget (results are partial)
+                "truncatedDetectors": results.get("summary", {}).get("truncated_detectors", [])
             },
             # Include original detailed analysis for download
             "detailedAnalysis": {
@@ -1007,68 +1509,41 @@ async def detect_mules(file: UploadFile = File(...)):
                 "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
                 "ipfs_integration": {
                     "pan_mapping_cid": pan_mapping_ipfs_cid,
-                    "status": "active" if IPFS_AVAILABLE else "unavailable"
+                    "status": "active" if services["ipfs"].ready else "unavailable",
+                    "backend": ipfs_client.backend
                 }
             }
         }
         
-        # AUTO-FLAG: Register each detected mule as Soul Bound Token on blockchain
+        # AUTO-FLAG: Queue each detected mule for Soul Bound Token registration.
+        # The background flag worker submits them; poll /flag-batches/{flagBatchId} for on-chain status.
         blockchain_results = []
-        if contract and sender_sk and mules:
-            print(f"\n🔗 Auto-flagging {len(mules)} mules to Algorand blockchain...")
-            for mule in mules:
-                try:
-                    account_id = mule["id"]
-                    hashed_id_bytes = hashlib.sha256(account_id.encode()).digest()
-                    risk_score = int(mule["riskScore"])
-                    
-                    atc = AtomicTransactionComposer()
-                    method: Method = contract.get_method_by_name("register_wallet")
-                    signer = AccountTransactionSigner(sender_sk)
-                    
-                    sp = algod_client.suggested_params()
-                    ipfs_hash = pan_mapping_ipfs_cid if pan_mapping_ipfs_cid else ""
-                    profile_box_size = 48
-                    ipfs_box_size = 32 + len(ipfs_hash)
-                    sp.fee = 1000 + (2500 + 400 * profile_box_size) + (2500 + 400 * ipfs_box_size)
-                    sp.flat_fee = True
-                    
-                    ipfs_key_bytes = hashed_id_bytes + b"_ipfs"
-                    
-                    atc.add_method_call(
-                        app_id=APP_ID,
-                        method=method,
-                        sender=sender_addr,
-                        sp=sp,
-                        signer=signer,
-                        method_args=[
-                            hashed_id_bytes,
-                            risk_score,
-                            1,  # transaction_count
-                            mule.get("linkedAccounts", 0),
-                            ipfs_hash
-                        ],
-                        boxes=[(APP_ID, hashed_id_bytes), (APP_ID, ipfs_key_bytes)]
-                    )
-                    result = atc.execute(algod_client, 2)
-                    txid = result.tx_ids[0]
-                    blockchain_results.append({
-                        "account": account_id,
-                        "txid": txid,
-                        "status": "flagged"
-                    })
-                    print(f"  ✅ {account_id} flagged on-chain (txid: {txid[:12]}...)")
-                except Exception as e:
-                    print(f"  ⚠️ Failed to flag {mule['id']}: {str(e)}")
-                    blockchain_results.append({
-                        "account": mule["id"],
-                        "status": "failed",
-                        "error": str(e)
-                    })
-            print(f"🔗 Blockchain flagging complete: {len([b for b in blockchain_results if b['status'] == 'flagged'])}/{len(mules)} succeeded\n")
+        flag_batch_id = None
+        if mules and await ensure_flag_submitter():
+            ipfs_hash = pan_mapping_ipfs_cid if pan_mapping_ipfs_cid else ""
+            flag_requests = [
+                {
+                    "account_id": mule["id"],
+                    "hashed_id": hashlib.sha256(mule["id"].encode()).hexdigest(),
+                    "risk_score": int(mule["riskScore"]),
+                    "transaction_count": 1,
+                    "flagged_connections": mule.get("linkedAccounts", 0),
+                    "ipfs_hash": ipfs_hash
+                }
+                for mule in mules
+            ]
+            # Same upload = same analysis ID, so re-running it never queues duplicate flags
+            flag_batch_id = flag_outbox.enqueue(last_analysis_id, flag_requests)
+            flag_worker.wake()
+            blockchain_results = [
+                {"account": entry["account"], "status": entry["status"], "txid": entry["txid"]}
+                for entry in flag_outbox.batch_status(flag_batch_id)["accounts"]
+            ]
+            print(f"🔗 Queued {len(mules)} mules for on-chain flagging (batch {flag_batch_id})")
         
         # Add blockchain results to response
         response_data["blockchainFlags"] = blockchain_results
+        response_data["flagBatchId"] = flag_batch_id
         
         return response_data
     except Exception as e:
@@ -1077,6 +1552,19 @@ async def detect_mules(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
+@app.get("/flag-batches/{batch_id}")
+async def get_flag_batch(batch_id: str):
+    """
+    On-chain status of a flagging batch queued by /detect or /bulk-flag-suspicious
+    
+    Returns per-account status (pending / submitted / confirmed / skipped / failed) with txids once submitted
+    """
+    status = flag_outbox.batch_status(batch_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Flag batch {batch_id} not found")
+    return status
+
+
 @app.post("/verify-pan")
 async def verify_pan(request: dict):
     """
@@ -1109,7 +1597,7 @@ async def verify_pan(request: dict):
     }
     
     # Check if IPFS is available and PAN mapping exists
-    if not IPFS_AVAILABLE or not ipfs_client:
+    if not await services.ensure("ipfs"):
         return response
     
     if not pan_mapping_ipfs_cid:
@@ -1120,7 +1608,7 @@ async def verify_pan(request: dict):
     
     try:
         # Fetch PAN mapping from IPFS
-        pan_mapping_data = ipfs_client.get_json(pan_mapping_ipfs_cid)
+        pan_mapping_data = await ipfs_client.get_json(pan_mapping_ipfs_cid)
         mapping_records = pan_mapping_data.get("mapping", [])
         
         response["ipfsFound"] = True
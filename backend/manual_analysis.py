@@ -3,11 +3,14 @@ Manual analysis of test.csv to generate expected output
 This helps verify backend accuracy by comparing with known patterns
 """
 
+import os
+import sys
 import pandas as pd
 from collections import defaultdict
 
-# Read the CSV
-df = pd.read_csv(r"c:\Users\Admin\OneDrive\Desktop\test.csv")
+# Read the CSV (path from the command line, default: sample_transactions.csv next to this script)
+csv_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_transactions.csv")
+df = pd.read_csv(csv_path)
 
 # Count transactions per account
 account_txn_count = defaultdict(int)
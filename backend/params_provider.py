@@ -0,0 +1,116 @@
+"""
+Suggested Params Provider Module
+One cached copy of algod's suggested transaction params, shared by every
+submission path and refreshed only when a round change makes it stale
+"""
+import asyncio
+import copy
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from algosdk import transaction
+from algosdk.v2client import algod
+
+
+# Average Algorand block time, used to estimate how far the cached window has aged
+DEFAULT_ROUND_TIME = 2.8
+
+
+class SuggestedParamsProvider:
+    """
+    Cached suggested params for all flagging paths
+
+    Cached params are reused until either:
+    - a newer round than their first-valid round has been observed
+      (observe_round(), fed by confirmation loops), or
+    - the estimated current round is within refresh_margin_rounds of their
+      last-valid round (estimated from elapsed time when no round is observed)
+
+    get() serves sync callers (bulk submitter threads), get_async() serves
+    request handlers through the async algod client; both share one cache.
+    Every call returns a copy, so callers can set fee/flat_fee freely.
+    """
+
+    def __init__(
+        self,
+        algod_client: algod.AlgodClient,
+        async_algod_client=None,
+        refresh_margin_rounds: int = 100,
+        round_time: float = DEFAULT_ROUND_TIME,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.algod_client = algod_client
+        self.async_algod_client = async_algod_client
+        self.refresh_margin_rounds = refresh_margin_rounds
+        self.round_time = round_time
+        self.clock = clock
+        self._params: Optional[transaction.SuggestedParams] = None
+        self._fetched_at = 0.0
+        self._observed_round = 0
+        # Highest round already reflected in the cached params
+        self._params_round = 0
+        self._lock = threading.Lock()
+        self._async_lock = asyncio.Lock()
+        self.fetches = 0
+        self.hits = 0
+
+    def get(self) -> transaction.SuggestedParams:
+        """Suggested params, fetched from algod only if the cached copy is stale"""
+        with self._lock:
+            if self._is_stale():
+                self._store(self.algod_client.suggested_params())
+            else:
+                self.hits += 1
+            return copy.copy(self._params)
+
+    async def get_async(self) -> transaction.SuggestedParams:
+        """get() for async callers (uses the async algod client when configured)"""
+        async with self._async_lock:
+            with self._lock:
+                if not self._is_stale():
+                    self.hits += 1
+                    return copy.copy(self._params)
+
+            if self.async_algod_client is not None:
+                params = await self.async_algod_client.suggested_params()
+            else:
+                params = self.algod_client.suggested_params()
+
+            with self._lock:
+                self._store(params)
+                return copy.copy(self._params)
+
+    def observe_round(self, rnd: int) -> None:
+        """Record a round seen elsewhere (e.g. a confirmation); newer rounds invalidate the cache"""
+        with self._lock:
+            self._observed_round = max(self._observed_round, rnd)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._params = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "fetches": self.fetches,
+                "hits": self.hits,
+                "first_valid": self._params.first if self._params else None,
+                "last_valid": self._params.last if self._params else None,
+                "observed_round": self._observed_round
+            }
+
+    def _is_stale(self) -> bool:
+        if self._params is None:
+            return True
+        if self._observed_round > self._params_round:
+            return True
+        elapsed_rounds = int((self.clock() - self._fetched_at) / self.round_time)
+        return self._params.first + elapsed_rounds >= self._params.last - self.refresh_margin_rounds
+
+    def _store(self, params: transaction.SuggestedParams) -> None:
+        self._params = params
+        self._fetched_at = self.clock()
+        self._observed_round = max(self._observed_round, params.first)
+        self._params_round = self._observed_round
+        self.fetches += 1
@@ -0,0 +1,167 @@
+"""
+Wallet Profile Cache Module
+In-process LRU cache (with optional on-disk SQLite tier) of decoded on-chain
+WalletRiskProfile entries, tagged with the round they were read at
+"""
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+class ProfileCache:
+    """
+    Cache of decoded wallet risk profiles keyed by hashed ID
+
+    - LRU eviction once max_entries is reached
+    - TTL expiry (entries older than ttl_seconds are re-read from chain)
+    - Negative entries (wallet not registered) are cached too
+    - Each entry remembers the round it was read at
+    - invalidate() drops an entry as soon as one of our own
+      register/update/flag transactions for that hashed ID confirms
+    - Readers take generation() before reading the chain and pass it to
+      put(): a read that started before an invalidation of its hashed ID
+      is discarded, so a pre-write profile cannot land after the drop
+    - Optional SQLite file keeps entries across restarts and workers
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: float = 60.0,
+        db_path: Optional[str] = None
+    ):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidate(); hashed ID -> generation it was last invalidated at
+        self._generation = 0
+        self._invalidated: "OrderedDict[str, int]" = OrderedDict()
+        # Highest generation pruned from _invalidated (older reads cannot be checked)
+        self._pruned_generation = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS profiles ("
+                "hashed_id TEXT PRIMARY KEY, profile TEXT, round INTEGER, stored_at REAL)"
+            )
+            self._db.commit()
+
+    def get(self, hashed_id: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Look up a cached profile
+
+        Returns:
+            (hit, profile) - profile is None on a cached "not registered" entry
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(hashed_id)
+            if entry is None:
+                entry = self._load_from_disk(hashed_id)
+                if entry is not None:
+                    self._store(hashed_id, entry)
+
+            if entry is None or now - entry["stored_at"] > self.ttl_seconds:
+                if entry is not None:
+                    self._drop(hashed_id)
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(hashed_id)
+            self.hits += 1
+            return True, entry["profile"]
+
+    def generation(self) -> int:
+        """Current invalidation generation; take it before reading a profile from chain"""
+        with self._lock:
+            return self._generation
+
+    def put(
+        self,
+        hashed_id: str,
+        profile: Optional[Dict[str, Any]],
+        read_round: Optional[int] = None,
+        generation: Optional[int] = None
+    ) -> bool:
+        """
+        Cache a profile (or None for "not registered") read at read_round
+
+        Args:
+            generation: generation() taken before the read; if the hashed ID
+                was invalidated since, the profile may predate our write and
+                is not cached
+
+        Returns:
+            True if the profile was cached
+        """
+        entry = {
+            "profile": profile,
+            "round": read_round if read_round is not None else (profile or {}).get("round"),
+            "stored_at": time.time()
+        }
+        with self._lock:
+            if generation is not None and (
+                generation < self._pruned_generation
+                or self._invalidated.get(hashed_id, 0) > generation
+            ):
+                return False
+            self._store(hashed_id, entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO profiles (hashed_id, profile, round, stored_at) VALUES (?, ?, ?, ?)",
+                    (hashed_id, json.dumps(profile), entry["round"], entry["stored_at"])
+                )
+                self._db.commit()
+            return True
+
+    def invalidate(self, hashed_ids: Iterable[str]) -> None:
+        """Drop entries whose on-chain profile we just changed (and reads already in flight for them)"""
+        with self._lock:
+            self._generation += 1
+            for hashed_id in hashed_ids:
+                self._drop(hashed_id)
+                self._invalidated[hashed_id] = self._generation
+                self._invalidated.move_to_end(hashed_id)
+            while len(self._invalidated) > self.max_entries:
+                _, pruned = self._invalidated.popitem(last=False)
+                self._pruned_generation = max(self._pruned_generation, pruned)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "persistent": self._db is not None
+            }
+
+    def _store(self, hashed_id: str, entry: Dict[str, Any]) -> None:
+        self._entries[hashed_id] = entry
+        self._entries.move_to_end(hashed_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _drop(self, hashed_id: str) -> None:
+        self._entries.pop(hashed_id, None)
+        if self._db is not None:
+            self._db.execute("DELETE FROM profiles WHERE hashed_id = ?", (hashed_id,))
+            self._db.commit()
+
+    def _load_from_disk(self, hashed_id: str) -> Optional[Dict[str, Any]]:
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT profile, round, stored_at FROM profiles WHERE hashed_id = ?", (hashed_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"profile": json.loads(row[0]), "round": row[1], "stored_at": row[2]}
@@ -0,0 +1,172 @@
+"""
+Profile Codec Module
+Encode/decode the compact on-chain WalletRiskProfile box and convert IPFS
+CIDs to and from the raw multihash bytes stored inside it
+"""
+import struct
+from typing import Any, Dict, Optional
+
+
+# Compact profile box (47 bytes, one box per wallet):
+#   uint8   risk score (bits 0-6) | is_flagged (bit 7)
+#   uint32  transaction_count
+#   uint32  flagged_connections
+#   uint32  last_updated (block timestamp, seconds)
+#   34 B    IPFS CIDv0 multihash (0x12 0x20 + sha2-256 digest), zeros if none
+PROFILE_HEADER_FORMAT = ">BIII"
+PROFILE_HEADER_SIZE = struct.calcsize(PROFILE_HEADER_FORMAT)
+MULTIHASH_LENGTH = 34
+COMPACT_PROFILE_SIZE = PROFILE_HEADER_SIZE + MULTIHASH_LENGTH
+FLAG_BIT = 0x80
+RISK_MASK = 0x7F
+FLAG_THRESHOLD = 70
+
+# Profiles written before the compact format: 6 big-endian UInt64s, with the
+# CID kept in a separate "<hashed_id>_ipfs" box
+LEGACY_PROFILE_FORMAT = ">6Q"
+LEGACY_PROFILE_SIZE = struct.calcsize(LEGACY_PROFILE_FORMAT)
+
+PROFILE_SIZES = (COMPACT_PROFILE_SIZE, LEGACY_PROFILE_SIZE)
+PROFILE_FIELDS = (
+    "risk_score",
+    "transaction_count",
+    "flagged_connections",
+    "last_updated",
+    "is_flagged",
+    "ipfs_hash_length",
+)
+
+# sha2-256 multihash prefix: function code 0x12, digest length 32
+SHA256_MULTIHASH_PREFIX = b"\x12\x20"
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_BASE58_INDEX = {char: index for index, char in enumerate(BASE58_ALPHABET)}
+_UINT32_MAX = 0xFFFFFFFF
+
+
+def base58_encode(data: bytes) -> str:
+    """Bitcoin-alphabet base58 (the encoding of CIDv0 strings)"""
+    number = int.from_bytes(data, "big")
+    encoded = ""
+    while number:
+        number, remainder = divmod(number, 58)
+        encoded = BASE58_ALPHABET[remainder] + encoded
+    leading_zeros = len(data) - len(data.lstrip(b"\x00"))
+    return BASE58_ALPHABET[0] * leading_zeros + encoded
+
+
+def base58_decode(text: str) -> bytes:
+    number = 0
+    for char in text:
+        if char not in _BASE58_INDEX:
+            raise ValueError(f"Invalid base58 character {char!r}")
+        number = number * 58 + _BASE58_INDEX[char]
+    decoded = number.to_bytes((number.bit_length() + 7) // 8, "big")
+    leading_zeros = len(text) - len(text.lstrip(BASE58_ALPHABET[0]))
+    return b"\x00" * leading_zeros + decoded
+
+
+def cid_to_multihash(cid: str) -> bytes:
+    """
+    Raw multihash bytes of a CIDv0 ("Qm...") IPFS hash
+
+    Args:
+        cid: CIDv0 string, or "" for no CID
+
+    Returns:
+        34 multihash bytes, or b"" for an empty CID
+
+    Raises:
+        ValueError: for anything that is not a sha2-256 CIDv0
+    """
+    if not cid:
+        return b""
+    multihash = base58_decode(cid)
+    if len(multihash) != MULTIHASH_LENGTH or not multihash.startswith(SHA256_MULTIHASH_PREFIX):
+        raise ValueError(f"Unsupported IPFS CID (expected a CIDv0 sha2-256 hash): {cid}")
+    return multihash
+
+
+def multihash_to_cid(multihash: bytes) -> str:
+    """CIDv0 string for stored multihash bytes ("" for the all-zero placeholder)"""
+    if not multihash.strip(b"\x00"):
+        return ""
+    if len(multihash) != MULTIHASH_LENGTH or not multihash.startswith(SHA256_MULTIHASH_PREFIX):
+        raise ValueError("Stored multihash is not a sha2-256 multihash")
+    return base58_encode(multihash)
+
+
+def encode_profile(
+    risk_score: int,
+    transaction_count: int,
+    flagged_connections: int,
+    last_updated: int,
+    ipfs_hash: str = "",
+    is_flagged: Optional[bool] = None
+) -> bytes:
+    """
+    Encode a compact profile box exactly as the contract writes it
+
+    Args:
+        risk_score: 0-100
+        transaction_count, flagged_connections: Counts (uint32)
+        last_updated: Block timestamp (uint32)
+        ipfs_hash: CIDv0 of the evidence, or ""
+        is_flagged: Flag bit; defaults to risk_score >= 70 like the contract
+
+    Returns:
+        COMPACT_PROFILE_SIZE bytes
+    """
+    if not 0 <= risk_score <= 100:
+        raise ValueError("Risk score must be between 0 and 100")
+    if not (0 <= transaction_count <= _UINT32_MAX and 0 <= flagged_connections <= _UINT32_MAX):
+        raise ValueError("Counts must fit in uint32")
+    if is_flagged is None:
+        is_flagged = risk_score >= FLAG_THRESHOLD
+    header = struct.pack(
+        PROFILE_HEADER_FORMAT,
+        risk_score | (FLAG_BIT if is_flagged else 0),
+        transaction_count,
+        flagged_connections,
+        last_updated
+    )
+    return header + cid_to_multihash(ipfs_hash).ljust(MULTIHASH_LENGTH, b"\x00")
+
+
+def decode_profile(raw: bytes) -> Dict[str, Any]:
+    """
+    Decode a profile box in either the compact or the legacy layout
+
+    Args:
+        raw: Box value (47 bytes compact, 48 bytes legacy)
+
+    Returns:
+        Dict with PROFILE_FIELDS (is_flagged as bool) plus "ipfs_hash": the CID
+        for compact boxes, None for legacy ones (their CID is in the _ipfs box)
+    """
+    if len(raw) == COMPACT_PROFILE_SIZE:
+        risk_and_flag, transaction_count, flagged_connections, last_updated = struct.unpack(
+            PROFILE_HEADER_FORMAT, raw[:PROFILE_HEADER_SIZE]
+        )
+        ipfs_hash = multihash_to_cid(raw[PROFILE_HEADER_SIZE:])
+        return {
+            "risk_score": risk_and_flag & RISK_MASK,
+            "transaction_count": transaction_count,
+            "flagged_connections": flagged_connections,
+            "last_updated": last_updated,
+            "is_flagged": bool(risk_and_flag & FLAG_BIT),
+            "ipfs_hash_length": len(ipfs_hash),
+            "ipfs_hash": ipfs_hash
+        }
+    if len(raw) == LEGACY_PROFILE_SIZE:
+        profile = dict(zip(PROFILE_FIELDS, struct.unpack(LEGACY_PROFILE_FORMAT, raw)))
+        profile["is_flagged"] = bool(profile["is_flagged"])
+        profile["ipfs_hash"] = None
+        return profile
+    raise ValueError(
+        f"WalletRiskProfile must be {COMPACT_PROFILE_SIZE} or {LEGACY_PROFILE_SIZE} bytes, got {len(raw)}"
+    )
+
+
+def is_compact(profile: Dict[str, Any]) -> bool:
+    """True if a decoded profile carries its own CID (compact layout)"""
+    return profile.get("ipfs_hash") is not None
@@ -0,0 +1,363 @@
+"""
+Registry Index Module
+Local SQLite mirror of the AmlRegistry's box storage (profiles + IPFS hashes),
+kept current by following new rounds, so screening and analytics run against
+indexed local data instead of per-key algod calls
+"""
+import base64
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from algosdk.v2client import algod
+
+from profile_codec import PROFILE_FIELDS, PROFILE_SIZES, decode_profile, is_compact
+from registry_reader import (
+    iter_registry_boxes,
+    read_box,
+    screening_decision,
+)
+
+
+HASHED_ID_SIZE = 32
+# Legacy (pre-compact) deployments keep the CID outside the profile box
+IPFS_BOX_SUFFIX = b"_ipfs"
+
+
+class RegistryIndex:
+    """
+    Embedded index of every wallet registered in the AmlRegistry app
+
+    - full_sync() walks all of the app's boxes once (paged box listing) and
+      rewrites the index; its added/updated/removed counts double as a
+      reconciliation report
+    - catch_up() replays the app calls in each round since the checkpoint and
+      re-reads only the boxes they referenced
+    - start() runs catch_up() in a background thread that follows new rounds
+    """
+
+    def __init__(
+        self,
+        algod_client: algod.AlgodClient,
+        app_id: int,
+        db_path: str = ":memory:",
+        page_size: int = 1000,
+        max_replay_rounds: int = 1000
+    ):
+        self.algod_client = algod_client
+        self.app_id = app_id
+        self.page_size = page_size
+        self.max_replay_rounds = max_replay_rounds
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_error: Optional[str] = None
+
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS wallets ("
+            " hashed_id TEXT PRIMARY KEY,"
+            " risk_score INTEGER, transaction_count INTEGER, flagged_connections INTEGER,"
+            " last_updated INTEGER, is_flagged INTEGER, ipfs_hash_length INTEGER,"
+            " ipfs_hash TEXT, round INTEGER);"
+            "CREATE INDEX IF NOT EXISTS wallets_risk ON wallets (risk_score);"
+            "CREATE INDEX IF NOT EXISTS wallets_flagged ON wallets (is_flagged);"
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);"
+        )
+        self._db.commit()
+
+    @property
+    def checkpoint(self) -> Optional[int]:
+        """Last round fully reflected in the index (None until the first sync)"""
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = 'round'").fetchone()
+            return row[0] if row else None
+
+    @property
+    def ready(self) -> bool:
+        return self.checkpoint is not None
+
+    def full_sync(self) -> Dict[str, int]:
+        """
+        Rebuild the index from a complete walk over the app's boxes
+
+        Returns:
+            Counts of wallets added, updated, removed and total, compared to
+            what the index held before
+        """
+        profiles: Dict[str, Dict[str, Any]] = {}
+        ipfs_values: Dict[str, bytes] = {}
+        sync_round = None
+
+        for name, value, read_round in iter_registry_boxes(self.algod_client, self.app_id, self.page_size):
+            if read_round is not None:
+                sync_round = max(sync_round or 0, read_round)
+            if value is None:
+                # Node without values support - read the box individually
+                box = read_box(self.algod_client, self.app_id, name)
+                if box is None:
+                    continue
+                value = box[0]
+            self._classify(name, value, profiles, ipfs_values)
+
+        if sync_round is None:
+            sync_round = self.algod_client.status()["last-round"]
+
+        rows = [
+            self._row(
+                hashed_id,
+                profile,
+                profile["ipfs_hash"] if is_compact(profile) else self._legacy_ipfs(ipfs_values.get(hashed_id)),
+                sync_round
+            )
+            for hashed_id, profile in profiles.items()
+        ]
+
+        with self._lock:
+            before = {
+                row[0]: row[1:7]
+                for row in self._db.execute(
+                    "SELECT hashed_id, risk_score, transaction_count, flagged_connections,"
+                    " last_updated, is_flagged, ipfs_hash_length FROM wallets"
+                )
+            }
+            self._db.execute("DELETE FROM wallets")
+            self._db.executemany(self._UPSERT, rows)
+            self._set_checkpoint(sync_round)
+            self._db.commit()
+
+        added = sum(1 for row in rows if row[0] not in before)
+        updated = sum(1 for row in rows if row[0] in before and tuple(before[row[0]]) != tuple(row[1:7]))
+        return {
+            "added": added,
+            "updated": updated,
+            "removed": len(set(before) - set(profiles)),
+            "total": len(rows),
+            "round": sync_round
+        }
+
+    def catch_up(self) -> int:
+        """
+        Bring the index up to the node's latest round
+
+        Replays the app calls in each new block and refreshes the wallets whose
+        boxes they referenced. Falls back to full_sync() when there is no
+        checkpoint yet or the gap exceeds max_replay_rounds.
+
+        Returns:
+            Number of wallets refreshed
+        """
+        checkpoint = self.checkpoint
+        last_round = self.algod_client.status()["last-round"]
+        if checkpoint is None or last_round - checkpoint > self.max_replay_rounds:
+            return self.full_sync()["total"]
+        if last_round <= checkpoint:
+            return 0
+
+        touched: Set[str] = set()
+        for rnd in range(checkpoint + 1, last_round + 1):
+            block = self.algod_client.block_info(rnd).get("block", {})
+            touched.update(self._touched_wallets(block))
+
+        self.refresh(touched, last_round)
+        return len(touched)
+
+    def refresh(self, hashed_ids: Iterable[str], as_of_round: Optional[int] = None) -> None:
+        """Re-read the given wallets' boxes from algod and update their rows"""
+        rows = []
+        removed = []
+        for hashed_id in hashed_ids:
+            box = read_box(self.algod_client, self.app_id, bytes.fromhex(hashed_id))
+            if box is None or len(box[0]) not in PROFILE_SIZES:
+                removed.append(hashed_id)
+                continue
+            profile = decode_profile(box[0])
+            if is_compact(profile):
+                ipfs_hash = profile["ipfs_hash"]
+            else:
+                # Legacy layout: the CID sits in a separate _ipfs box
+                ipfs_box = read_box(self.algod_client, self.app_id, bytes.fromhex(hashed_id) + IPFS_BOX_SUFFIX)
+                ipfs_hash = self._legacy_ipfs(ipfs_box[0] if ipfs_box else None)
+            rows.append(self._row(hashed_id, profile, ipfs_hash, box[1] or as_of_round))
+
+        with self._lock:
+            self._db.executemany(self._UPSERT, rows)
+            self._db.executemany("DELETE FROM wallets WHERE hashed_id = ?", [(h,) for h in removed])
+            if as_of_round is not None:
+                self._set_checkpoint(as_of_round)
+            self._db.commit()
+
+    def start(self, poll_interval: float = 5.0) -> None:
+        """Follow new rounds in a background thread"""
+        if self._thread is not None:
+            return
+
+        def run():
+            while not self._stop.is_set():
+                try:
+                    self.catch_up()
+                    self.last_error = None
+                    checkpoint = self.checkpoint
+                    if checkpoint is not None:
+                        # Long-polls until the next round lands
+                        self.algod_client.status_after_block(checkpoint)
+                        continue
+                except Exception as e:
+                    self.last_error = str(e)
+                    print(f"⚠️ Registry index sync failed: {e}")
+                self._stop.wait(poll_interval)
+
+        self._thread = threading.Thread(target=run, name="registry-index", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stop following rounds and wait for the sync thread to exit
+
+        A pending long-poll ends at the next round and the thread exits
+        without touching the index.
+
+        Returns:
+            True once the thread has exited (or was never started)
+        """
+        self._stop.set()
+        if self._thread is None:
+            return True
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def close(self) -> None:
+        """Close the SQLite connection (stop() the sync thread first)"""
+        with self._lock:
+            self._db.close()
+
+    def get(self, hashed_id: str) -> Optional[Dict[str, Any]]:
+        """Indexed profile for one wallet, or None if it is not registered"""
+        rows = self._select("WHERE hashed_id = ?", (hashed_id.lower(),))
+        return rows[0] if rows else None
+
+    def screen(self, hashed_ids: List[str]) -> List[Dict[str, Any]]:
+        """Screening decision per hashed ID, answered entirely from the index"""
+        keys = list(dict.fromkeys(hashed_id.lower() for hashed_id in hashed_ids))
+        profiles: Dict[str, Dict[str, Any]] = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for profile in self._select(f"WHERE hashed_id IN ({placeholders})", chunk):
+                profiles[profile["hashed_id"]] = profile
+        return [screening_decision(hashed_id, profiles.get(hashed_id.lower())) for hashed_id in hashed_ids]
+
+    def query(
+        self,
+        min_risk: Optional[int] = None,
+        flagged: Optional[bool] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        Analytics over indexed wallets, e.g. query(min_risk=70)
+
+        Returns:
+            Matching wallets ordered by risk score (highest first)
+        """
+        clauses = []
+        params: List[Any] = []
+        if min_risk is not None:
+            clauses.append("risk_score >= ?")
+            params.append(min_risk)
+        if flagged is not None:
+            clauses.append("is_flagged = ?")
+            params.append(int(flagged))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._select(
+            f"{where} ORDER BY risk_score DESC, hashed_id LIMIT ? OFFSET ?",
+            params + [limit, offset]
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Wallet counts and sync state"""
+        with self._lock:
+            total, flagged = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(is_flagged), 0) FROM wallets"
+            ).fetchone()
+        return {
+            "wallets": total,
+            "flagged": flagged,
+            "checkpoint_round": self.checkpoint,
+            "syncing": self._thread is not None and self._thread.is_alive(),
+            "last_error": self.last_error
+        }
+
+    _UPSERT = (
+        "INSERT OR REPLACE INTO wallets (hashed_id, risk_score, transaction_count,"
+        " flagged_connections, last_updated, is_flagged, ipfs_hash_length, ipfs_hash, round)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+
+    def _select(self, clause: str, params: Iterable[Any]) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT hashed_id, risk_score, transaction_count, flagged_connections, last_updated,"
+                f" is_flagged, ipfs_hash_length, ipfs_hash, round FROM wallets {clause}",
+                list(params)
+            ).fetchall()
+        columns = ("hashed_id",) + PROFILE_FIELDS + ("ipfs_hash", "round")
+        profiles = [dict(zip(columns, row)) for row in rows]
+        for profile in profiles:
+            profile["is_flagged"] = bool(profile["is_flagged"])
+        return profiles
+
+    def _set_checkpoint(self, rnd: int) -> None:
+        self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('round', ?)", (rnd,))
+
+    def _touched_wallets(self, block: Dict[str, Any]) -> Set[str]:
+        """Hashed IDs whose profile box was referenced by an app call in this block"""
+        touched = set()
+        for stxn in block.get("txns", []):
+            txn = stxn.get("txn", {})
+            if txn.get("type") != "appl" or txn.get("apid") != self.app_id:
+                continue
+            for ref in txn.get("apbx", []):
+                # Index 0 (omitted) = the called app's own boxes
+                if ref.get("i", 0) != 0 or "n" not in ref:
+                    continue
+                name = base64.b64decode(ref["n"])
+                if name.endswith(IPFS_BOX_SUFFIX):
+                    name = name[:-len(IPFS_BOX_SUFFIX)]
+                if len(name) == HASHED_ID_SIZE:
+                    touched.add(name.hex())
+        return touched
+
+    @staticmethod
+    def _legacy_ipfs(value: Optional[bytes]) -> Optional[str]:
+        """A legacy _ipfs box holds the CID string"""
+        if value is None:
+            return None
+        return value.decode("utf-8", errors="replace")
+
+    @staticmethod
+    def _classify(
+        name: bytes,
+        value: bytes,
+        profiles: Dict[str, Dict[str, Any]],
+        ipfs_values: Dict[str, bytes]
+    ) -> None:
+        if len(name) == HASHED_ID_SIZE and len(value) in PROFILE_SIZES:
+            profiles[name.hex()] = decode_profile(value)
+        elif len(name) == HASHED_ID_SIZE + len(IPFS_BOX_SUFFIX) and name.endswith(IPFS_BOX_SUFFIX):
+            ipfs_values[name[:HASHED_ID_SIZE].hex()] = value
+
+    @staticmethod
+    def _row(hashed_id: str, profile: Dict[str, Any], ipfs_hash: Optional[str], rnd: Optional[int]) -> tuple:
+        return (
+            hashed_id,
+            profile["risk_score"],
+            profile["transaction_count"],
+            profile["flagged_connections"],
+            profile["last_updated"],
+            int(profile["is_flagged"]),
+            profile["ipfs_hash_length"],
+            ipfs_hash,
+            rnd
+        )
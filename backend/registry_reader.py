@@ -0,0 +1,235 @@
+"""
+Registry Reader Module
+Read-only access to AmlRegistry wallet profiles straight from box storage
+(no signing, no fees, no waiting for a round)
+"""
+import base64
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from algosdk import error as algod_error
+from algosdk.v2client import algod
+
+from profile_codec import PROFILE_SIZES, decode_profile
+
+
+def read_box(
+    algod_client: algod.AlgodClient,
+    app_id: int,
+    name: bytes
+) -> Optional[Tuple[bytes, Optional[int]]]:
+    """
+    Read one raw box of the application
+
+    Returns:
+        (box value, round it was read at or None), or None if the box does not exist
+    """
+    try:
+        response = algod_client.application_box_by_name(app_id, name)
+    except algod_error.AlgodHTTPError as e:
+        if e.code == 404:
+            return None
+        raise
+    return base64.b64decode(response["value"]), response.get("round")
+
+
+def read_wallet_profile(
+    algod_client: algod.AlgodClient,
+    app_id: int,
+    hashed_id: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Read a wallet's risk profile box through algod's application box endpoint
+
+    Args:
+        algod_client: Algod client
+        app_id: AmlRegistry application ID
+        hashed_id: Hex SHA-256 hashed ID (the box key)
+
+    Returns:
+        Decoded profile (plus "round" the value was read at, when algod reports it),
+        or None if the wallet has no profile box
+    """
+    return _profile_from_box(read_box(algod_client, app_id, bytes.fromhex(hashed_id)))
+
+
+async def read_box_async(async_algod_client, app_id: int, name: bytes) -> Optional[Tuple[bytes, Optional[int]]]:
+    """read_box() for an AsyncAlgodClient"""
+    try:
+        response = await async_algod_client.application_box_by_name(app_id, name)
+    except algod_error.AlgodHTTPError as e:
+        if e.code == 404:
+            return None
+        raise
+    return base64.b64decode(response["value"]), response.get("round")
+
+
+async def read_wallet_profile_async(async_algod_client, app_id: int, hashed_id: str) -> Optional[Dict[str, Any]]:
+    """read_wallet_profile() for an AsyncAlgodClient"""
+    return _profile_from_box(await read_box_async(async_algod_client, app_id, bytes.fromhex(hashed_id)))
+
+
+def _profile_from_box(box: Optional[Tuple[bytes, Optional[int]]]) -> Optional[Dict[str, Any]]:
+    if box is None:
+        return None
+    value, read_round = box
+    profile = decode_profile(value)
+    if read_round is not None:
+        profile["round"] = read_round
+    return profile
+
+
+def iter_registry_boxes(
+    algod_client: algod.AlgodClient,
+    app_id: int,
+    page_size: int = 1000
+) -> Iterator[Tuple[bytes, Optional[bytes], Optional[int]]]:
+    """
+    Enumerate every box of the application with paged box-listing calls
+
+    Uses GET /v2/applications/{id}/boxes with max/next/values, so names and
+    values come back together, one page per request.
+
+    Yields:
+        (box name, box value or None if the node returned names only, round)
+    """
+    next_token = None
+    while True:
+        params = {"max": page_size, "values": "true"}
+        if next_token:
+            params["next"] = next_token
+        page = algod_client.algod_request("GET", f"/applications/{app_id}/boxes", params=params)
+
+        for box in page.get("boxes", []):
+            value = box.get("value")
+            yield (
+                base64.b64decode(box["name"]),
+                base64.b64decode(value) if value is not None else None,
+                page.get("round")
+            )
+
+        next_token = page.get("next-token")
+        if not next_token:
+            break
+
+
+def screening_decision(hashed_id: str, profile: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Turn a (possibly missing) wallet profile into a screening decision"""
+    if profile is None:
+        return {
+            "hashed_id": hashed_id,
+            "found": False,
+            "is_flagged": False,
+            "risk_score": 0,
+            "decision": "ALLOW"
+        }
+    return {
+        "hashed_id": hashed_id,
+        "found": True,
+        "is_flagged": profile["is_flagged"],
+        "risk_score": profile["risk_score"],
+        "transaction_count": profile["transaction_count"],
+        "flagged_connections": profile["flagged_connections"],
+        "last_updated": profile["last_updated"],
+        "decision": "REJECT" if profile["is_flagged"] else "ALLOW"
+    }
+
+
+def screen_wallets(
+    algod_client: algod.AlgodClient,
+    app_id: int,
+    hashed_ids: List[str],
+    cache=None,
+    small_batch_threshold: int = 64,
+    max_workers: int = 16,
+    page_size: int = 1000
+) -> List[Dict[str, Any]]:
+    """
+    Screen many hashed IDs against the registry
+
+    Strategy:
+    - Cached profiles are answered locally
+    - Up to small_batch_threshold uncached IDs: parallel single-box reads
+    - More than that: enumerate all of the app's boxes once (paged) and
+      answer every ID from that snapshot
+
+    Args:
+        algod_client: Algod client
+        app_id: AmlRegistry application ID
+        hashed_ids: Hex SHA-256 hashed IDs (any case, duplicates allowed)
+        cache: Optional ProfileCache to consult and fill
+
+    Returns:
+        One decision per input ID, in input order
+    """
+    keys = [hashed_id.lower() for hashed_id in hashed_ids]
+    profiles: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    generation = cache.generation() if cache is not None else None
+    unresolved = []
+    for key in dict.fromkeys(keys):
+        if cache is not None:
+            hit, profile = cache.get(key)
+            if hit:
+                profiles[key] = profile
+                continue
+        unresolved.append(key)
+
+    if len(unresolved) <= small_batch_threshold:
+        fetched = _read_profiles_parallel(algod_client, app_id, unresolved, max_workers)
+    else:
+        fetched = _read_profiles_by_enumeration(
+            algod_client, app_id, unresolved, max_workers, page_size
+        )
+
+    for key, profile in fetched.items():
+        profiles[key] = profile
+        if cache is not None:
+            cache.put(key, profile, generation=generation)
+
+    return [screening_decision(hashed_id, profiles.get(key)) for hashed_id, key in zip(hashed_ids, keys)]
+
+
+def _read_profiles_parallel(
+    algod_client: algod.AlgodClient,
+    app_id: int,
+    hashed_ids: List[str],
+    max_workers: int
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Read each profile box with its own request, several at a time"""
+    if not hashed_ids:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(hashed_ids)))) as pool:
+        profiles = pool.map(lambda key: read_wallet_profile(algod_client, app_id, key), hashed_ids)
+        return dict(zip(hashed_ids, profiles))
+
+
+def _read_profiles_by_enumeration(
+    algod_client: algod.AlgodClient,
+    app_id: int,
+    hashed_ids: List[str],
+    max_workers: int,
+    page_size: int
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Resolve many IDs from one paged walk over all of the app's boxes"""
+    wanted = set(hashed_ids)
+    profiles: Dict[str, Optional[Dict[str, Any]]] = {key: None for key in hashed_ids}
+    names_only = []
+
+    for name, value, read_round in iter_registry_boxes(algod_client, app_id, page_size):
+        key = name.hex()
+        if key not in wanted:
+            continue
+        if value is None:
+            # Node without values support - read these boxes individually
+            names_only.append(key)
+            continue
+        if len(value) not in PROFILE_SIZES:
+            continue
+        profile = decode_profile(value)
+        if read_round is not None:
+            profile["round"] = read_round
+        profiles[key] = profile
+
+    profiles.update(_read_profiles_parallel(algod_client, app_id, names_only, max_workers))
+    return profiles
@@ -0,0 +1,159 @@
+"""
+Service Registry Module
+Lazy handles for external dependencies (KMD, IPFS, algod, contract ABI,
+matplotlib): warmed up concurrently in the background with a bounded
+timeout, retried on demand, and reported by /health
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class ServiceHandle:
+    """
+    One lazily initialized dependency
+
+    The init coroutine runs at most once at a time and is bounded by
+    `timeout`. A failed init marks the service "unavailable"; the next
+    ensure() after `retry_interval` seconds tries again, so a daemon started
+    after the API comes up is picked up without a restart.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        init: Callable[[], Awaitable[Any]],
+        timeout: float = 10.0,
+        retry_interval: float = 30.0
+    ):
+        self.name = name
+        self._init = init
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self.state = "pending"
+        self.value: Any = None
+        self.error: Optional[str] = None
+        self.attempts = 0
+        self.init_seconds: Optional[float] = None
+        self._last_attempt: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def start(self) -> asyncio.Task:
+        """Schedule initialization unless it is running, done, or failed too recently"""
+        if self._task is None or (self._task.done() and self._retry_due()):
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self._task
+
+    async def ensure(self) -> bool:
+        """
+        Initialize on first use (or wait for the warm-up already running)
+
+        Returns:
+            True if the service is ready
+        """
+        if self.ready:
+            return True
+        # Shielded: a cancelled request must not cancel the shared warm-up
+        await asyncio.shield(self.start())
+        return self.ready
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "error": self.error,
+            "attempts": self.attempts,
+            "init_ms": round(self.init_seconds * 1000, 1) if self.init_seconds is not None else None
+        }
+
+    def _retry_due(self) -> bool:
+        return (
+            self.state == "unavailable"
+            and time.monotonic() - self._last_attempt >= self.retry_interval
+        )
+
+    async def _run(self) -> None:
+        self.state = "starting"
+        self.attempts += 1
+        started = self._last_attempt = time.monotonic()
+        try:
+            self.value = await asyncio.wait_for(self._init(), self.timeout)
+        except asyncio.TimeoutError:
+            self.state = "unavailable"
+            self.error = f"timed out after {self.timeout:g}s"
+        except Exception as e:
+            self.state = "unavailable"
+            self.error = str(e) or type(e).__name__
+        else:
+            self.state = "ready"
+            self.error = None
+        finally:
+            self.init_seconds = time.monotonic() - started
+
+
+class ServiceRegistry:
+    """Named ServiceHandles with concurrent warm-up and a health summary"""
+
+    def __init__(self, timeout: float = 10.0, retry_interval: float = 30.0):
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self._handles: Dict[str, ServiceHandle] = {}
+
+    def register(self, name: str, init: Callable[[], Awaitable[Any]], **kwargs) -> ServiceHandle:
+        kwargs.setdefault("timeout", self.timeout)
+        kwargs.setdefault("retry_interval", self.retry_interval)
+        handle = ServiceHandle(name, init, **kwargs)
+        self._handles[name] = handle
+        return handle
+
+    def __getitem__(self, name: str) -> ServiceHandle:
+        return self._handles[name]
+
+    def start_all(self) -> None:
+        """Kick off every warm-up concurrently and return immediately"""
+        for handle in self._handles.values():
+            handle.start()
+
+    async def ensure(self, name: str) -> bool:
+        return await self._handles[name].ensure()
+
+    async def wait_all(self) -> None:
+        """Wait for the warm-ups in flight (each already bounded by its timeout)"""
+        tasks = [handle._task for handle in self._handles.values() if handle._task is not None]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def health(self) -> Dict[str, Any]:
+        """
+        Readiness of every service
+
+        Unavailable services whose retry interval has passed are re-probed in
+        the background, so polling /health also recovers them.
+
+        Returns:
+            Dict with overall "status" (ready / starting / degraded) and per-service status
+        """
+        for handle in self._handles.values():
+            if handle._task is not None:
+                handle.start()
+        states = {handle.state for handle in self._handles.values()}
+        if states <= {"ready"}:
+            overall = "ready"
+        elif "unavailable" in states:
+            overall = "degraded"
+        else:
+            overall = "starting"
+        return {
+            "status": overall,
+            "services": {name: handle.status() for name, handle in self._handles.items()}
+        }
+
+    async def aclose(self) -> None:
+        """Cancel warm-ups still running at shutdown"""
+        for handle in self._handles.values():
+            if handle._task is not None and not handle._task.done():
+                handle._task.cancel()
+        await self.wait_all()
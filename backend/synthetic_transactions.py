@@ -0,0 +1,268 @@
+"""
+Synthetic Transactions Module
+Seeded generator of transaction CSVs: random background traffic with known
+money-mule structures (cycles, fan-in/fan-out smurfing, shell chains) and
+legitimate look-alikes (merchants, payroll) planted at recorded positions.
+Cycles, collectors and distributors combine two patterns, as the analyzer's
+two-pattern / 60-point rule needs before it flags an account
+
+Usage:
+    python synthetic_transactions.py 10000 -o synthetic_10k.csv --seed 7
+"""
+import argparse
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+ACCOUNT_ID_FORMAT = "ACC_{:08d}"
+START_TIMESTAMP = pd.Timestamp("2026-02-01")
+
+
+class _Planter:
+    """Allocates fresh account IDs (after the background range) and collects planted edges"""
+
+    def __init__(self, rng: np.random.Generator, first_account: int, background_accounts: int, span_seconds: int):
+        self.rng = rng
+        self.next_account = first_account
+        self.background_accounts = background_accounts
+        self.span_seconds = span_seconds
+        self.senders: List[int] = []
+        self.receivers: List[int] = []
+        self.amounts: List[float] = []
+        self.offsets: List[int] = []
+
+    def fresh(self, count: int) -> List[int]:
+        accounts = list(range(self.next_account, self.next_account + count))
+        self.next_account += count
+        return accounts
+
+    def background(self, count: int) -> List[int]:
+        return [int(a) for a in self.rng.choice(self.background_accounts, size=count, replace=False)]
+
+    def edge(self, sender: int, receiver: int, amount: float, offset: Optional[int] = None) -> None:
+        if offset is None:
+            offset = int(self.rng.integers(0, self.span_seconds))
+        self.senders.append(sender)
+        self.receivers.append(receiver)
+        self.amounts.append(round(float(amount), 2))
+        self.offsets.append(offset)
+
+
+def _account_ids(numbers: np.ndarray, total_accounts: int) -> np.ndarray:
+    """Account ID strings for account numbers (each distinct string built once)"""
+    names = np.array([ACCOUNT_ID_FORMAT.format(n) for n in range(total_accounts)], dtype=object)
+    return names[numbers]
+
+
+def generate_transactions(
+    rows: int,
+    seed: int = 0,
+    density: float = 1.0,
+    days: int = 30,
+    cycles: Optional[int] = None,
+    fan_ins: Optional[int] = None,
+    fan_outs: Optional[int] = None,
+    shell_chains: Optional[int] = None,
+    merchants: Optional[int] = None,
+    payrolls: Optional[int] = None
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Generate a transaction table with planted patterns
+
+    The same arguments always give the same rows, IDs and ground truth.
+
+    Args:
+        rows: Total number of transactions (background fills what patterns leave)
+        seed: RNG seed
+        density: Average transactions per background account (higher = denser graph)
+        days: Time span of the timestamps
+        cycles, fan_ins, fan_outs, shell_chains: Mule structures to plant
+            (default: one of each per 2,000 rows, at least one)
+        merchants, payrolls: Legitimate fan-in / fan-out traps (same default)
+
+    Returns:
+        (DataFrame with transaction_id, sender_id, receiver_id, amount, timestamp,
+         ground truth dict: planted account IDs per pattern and the traps)
+    """
+    rng = np.random.default_rng(seed)
+    default = max(1, rows // 2000)
+    counts = {
+        "cycles": default if cycles is None else cycles,
+        "fan_ins": default if fan_ins is None else fan_ins,
+        "fan_outs": default if fan_outs is None else fan_outs,
+        "shell_chains": default if shell_chains is None else shell_chains,
+        "merchants": default if merchants is None else merchants,
+        "payrolls": default if payrolls is None else payrolls,
+    }
+    background_accounts = max(60, int(rows / density))
+    span_seconds = days * 86400
+    planter = _Planter(rng, background_accounts, background_accounts, span_seconds)
+    truth: Dict[str, Any] = {key: [] for key in counts}
+    truth["cycle_sources"] = []
+
+    def loop(ring: List[int], amount: float, start: int) -> None:
+        """Pass a slowly shrinking amount around the ring, one hop every 5 minutes"""
+        for hop, sender in enumerate(ring):
+            planter.edge(sender, ring[(hop + 1) % len(ring)], amount * (0.98 ** hop), start + hop * 300)
+
+    # Circular routing: an active source pays into a loop of 3-4 dormant mules, so
+    # every member is both a cycle and a shell chain intermediate (a 5th member
+    # would sit past the longest chain from the source)
+    for _ in range(counts["cycles"]):
+        source, *ring = planter.fresh(int(rng.integers(4, 6)))
+        amount = float(rng.uniform(2000, 50000))
+        start = int(rng.integers(300, span_seconds - 3600))
+        planter.edge(source, ring[0], amount, start - 300)
+        loop(ring, amount, start)
+        for partner in planter.background(8):
+            planter.edge(source, partner, rng.uniform(100, 2000))
+        truth["cycles"].append(ring)
+        truth["cycle_sources"].append(source)
+
+    # Fan-in smurfing: 10-20 fresh smurfs send just-below-threshold amounts to one
+    # collector, which launders the pool around a loop with 2-3 fresh mules
+    for _ in range(counts["fan_ins"]):
+        collector, *smurfs = planter.fresh(int(rng.integers(11, 21)))
+        for smurf in smurfs:
+            planter.edge(smurf, collector, rng.uniform(9000, 9900))
+        ring = [collector] + planter.fresh(int(rng.integers(2, 4)))
+        loop(ring, rng.uniform(50000, 90000), int(rng.integers(0, span_seconds - 3600)))
+        truth["fan_ins"].append({"collector": collector, "smurfs": smurfs, "ring": ring})
+
+    # Fan-out smurfing: one distributor, paid out of a loop with 2-3 fresh mules,
+    # splits into 10-20 fresh accounts
+    for _ in range(counts["fan_outs"]):
+        distributor, *receivers = planter.fresh(int(rng.integers(11, 21)))
+        ring = [distributor] + planter.fresh(int(rng.integers(2, 4)))
+        loop(ring, rng.uniform(50000, 90000), int(rng.integers(0, span_seconds - 3600)))
+        for receiver in receivers:
+            planter.edge(distributor, receiver, rng.uniform(9000, 9900))
+        truth["fan_outs"].append({"distributor": distributor, "receivers": receivers, "ring": ring})
+
+    # Shell chains: an active source layers funds through 2-3 dormant intermediaries
+    for _ in range(counts["shell_chains"]):
+        chain = planter.fresh(int(rng.integers(4, 6)))
+        amount = float(rng.uniform(10000, 80000))
+        start = int(rng.integers(0, span_seconds - 86400))
+        for hop in range(len(chain) - 1):
+            planter.edge(chain[hop], chain[hop + 1], amount * (0.97 ** hop), start + hop * 3600)
+        for partner in planter.background(8):
+            planter.edge(chain[0], partner, rng.uniform(100, 2000))
+        truth["shell_chains"].append(chain)
+
+    # Traps: merchants with many paying customers, payroll paying many employees
+    for _ in range(counts["merchants"]):
+        merchant = planter.fresh(1)[0]
+        for customer in planter.background(int(rng.integers(12, 40))):
+            planter.edge(customer, merchant, rng.lognormal(4, 1))
+        planter.edge(merchant, planter.background(1)[0], rng.uniform(5000, 20000))
+        truth["merchants"].append(merchant)
+
+    for _ in range(counts["payrolls"]):
+        employer = planter.fresh(1)[0]
+        planter.edge(planter.background(1)[0], employer, rng.uniform(200000, 500000))
+        payday = int(rng.integers(0, span_seconds))
+        for employee in planter.background(int(rng.integers(12, 40))):
+            planter.edge(employer, employee, rng.uniform(3000, 8000), payday)
+        truth["payrolls"].append(employer)
+
+    # Background: uniform random pairs (no self-transfers), lognormal amounts
+    remaining = rows - len(planter.senders)
+    if remaining < 0:
+        raise ValueError(f"{rows} rows cannot hold the {len(planter.senders)} planted transactions")
+    senders = rng.integers(0, background_accounts, size=remaining)
+    receivers = (senders + rng.integers(1, background_accounts, size=remaining)) % background_accounts
+    amounts = np.round(rng.lognormal(6, 1.2, size=remaining), 2)
+    offsets = rng.integers(0, span_seconds, size=remaining)
+
+    all_senders = np.concatenate([senders, np.array(planter.senders, dtype=np.int64)])
+    all_receivers = np.concatenate([receivers, np.array(planter.receivers, dtype=np.int64)])
+    all_amounts = np.concatenate([amounts, np.array(planter.amounts)])
+    all_offsets = np.concatenate([offsets, np.array(planter.offsets, dtype=np.int64)])
+
+    # Interleave planted rows with the background in time order
+    order = np.argsort(all_offsets, kind="stable")
+    ids = _account_ids(np.concatenate([all_senders[order], all_receivers[order]]), planter.next_account)
+    df = pd.DataFrame({
+        "transaction_id": [f"TXN_{i:09d}" for i in range(len(order))],
+        "sender_id": ids[:len(order)],
+        "receiver_id": ids[len(order):],
+        "amount": all_amounts[order],
+        "timestamp": (START_TIMESTAMP + pd.to_timedelta(all_offsets[order], unit="s")).strftime("%Y-%m-%d %H:%M:%S"),
+    })
+
+    def name(account: int) -> str:
+        return ACCOUNT_ID_FORMAT.format(account)
+
+    ground_truth = {
+        "seed": seed,
+        "rows": len(df),
+        "background_accounts": background_accounts,
+        "cycles": [[name(a) for a in ring] for ring in truth["cycles"]],
+        "cycle_sources": [name(a) for a in truth["cycle_sources"]],
+        "fan_ins": [
+            {
+                "collector": name(p["collector"]),
+                "smurfs": [name(a) for a in p["smurfs"]],
+                "ring": [name(a) for a in p["ring"]],
+            }
+            for p in truth["fan_ins"]
+        ],
+        "fan_outs": [
+            {
+                "distributor": name(p["distributor"]),
+                "receivers": [name(a) for a in p["receivers"]],
+                "ring": [name(a) for a in p["ring"]],
+            }
+            for p in truth["fan_outs"]
+        ],
+        "shell_chains": [[name(a) for a in chain] for chain in truth["shell_chains"]],
+        "merchants": [name(a) for a in truth["merchants"]],
+        "payrolls": [name(a) for a in truth["payrolls"]],
+    }
+    return df, ground_truth
+
+
+def planted_mules(ground_truth: Dict[str, Any]) -> List[str]:
+    """
+    Accounts a detector should flag: the ones planted with two patterns
+
+    These are cycle members (also shell intermediaries), collectors and
+    distributors (also loop members). Shell chain intermediaries and the other
+    members of collector / distributor loops carry one pattern, which the
+    two-pattern rule leaves unflagged, so they are not counted.
+    """
+    mules = {account for ring in ground_truth["cycles"] for account in ring}
+    mules.update(p["collector"] for p in ground_truth["fan_ins"])
+    mules.update(p["distributor"] for p in ground_truth["fan_outs"])
+    return sorted(mules)
+
+
+def traps(ground_truth: Dict[str, Any]) -> List[str]:
+    """Legitimate accounts that look like smurfing (merchants, payroll) and should not be flagged"""
+    return sorted(ground_truth["merchants"] + ground_truth["payrolls"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic transaction CSV with planted mule patterns")
+    parser.add_argument("rows", type=int, help="Number of transactions")
+    parser.add_argument("-o", "--output", default="synthetic_transactions.csv", help="CSV output path")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--density", type=float, default=1.0, help="Average transactions per background account")
+    parser.add_argument("--truth", help="Also write the ground truth JSON here")
+    args = parser.parse_args()
+
+    df, ground_truth = generate_transactions(args.rows, seed=args.seed, density=args.density)
+    df.to_csv(args.output, index=False)
+    print(f"✅ Wrote {len(df)} transactions to {args.output}")
+    if args.truth:
+        with open(args.truth, "w") as f:
+            json.dump(ground_truth, f, indent=2)
+        print(f"✅ Wrote ground truth to {args.truth}")
+
+
+if __name__ == "__main__":
+    main()
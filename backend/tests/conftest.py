@@ -0,0 +1,135 @@
+import base64
+import json
+from pathlib import Path
+
+import msgpack
+import pytest
+from algosdk import error as algod_error
+from algosdk import transaction
+from algosdk.abi import Contract
+
+ARC56_PATH = (
+    Path(__file__).resolve().parents[2]
+    / "projects" / "aml-registry-contracts" / "smart_contracts"
+    / "artifacts" / "aml_registry" / "AmlRegistry.arc56.json"
+)
+
+
+class FakeAlgod:
+    """
+    Local stand-in for algod's box endpoints
+
+    Serves application_info, application_box_by_name and the paged GET /applications/{id}/boxes
+    listing from an in-memory dict, plus status/block_info for round following
+    and suggested_params/send_transactions/pending_transaction_info for
+    submissions (everything confirms in the next round), and counts requests so tests can assert how many round trips a code path makes.
+    """
+
+    def __init__(self, app_id: int = 1002, current_round: int = 100, supports_values: bool = True):
+        self.app_id = app_id
+        self.current_round = current_round
+        self.supports_values = supports_values
+        self.boxes: dict[bytes, bytes] = {}
+        self.requests: list[str] = []
+        self.blocks: dict[int, list[dict]] = {}
+        self.sent: dict[str, int] = {}
+        # Deployed approval program (defaults to the one built into the ARC-56 spec)
+        self.approval_program: bytes = base64.b64decode(json.loads(ARC56_PATH.read_text())["byteCode"]["approval"])
+
+    def application_box_by_name(self, app_id: int, name: bytes) -> dict:
+        self.requests.append("box")
+        if app_id != self.app_id or name not in self.boxes:
+            raise algod_error.AlgodHTTPError("box not found", code=404)
+        return {
+            "name": base64.b64encode(name).decode(),
+            "value": base64.b64encode(self.boxes[name]).decode(),
+            "round": self.current_round,
+        }
+
+    def application_info(self, app_id: int) -> dict:
+        self.requests.append("app")
+        if app_id != self.app_id:
+            raise algod_error.AlgodHTTPError("application does not exist", code=404)
+        return {"id": app_id, "params": {"approval-program": base64.b64encode(self.approval_program).decode()}}
+
+    def status(self) -> dict:
+        self.requests.append("status")
+        return {"last-round": self.current_round}
+
+    def status_after_block(self, block_num: int) -> dict:
+        self.current_round = max(self.current_round, block_num + 1)
+        return self.status()
+
+    def suggested_params(self) -> transaction.SuggestedParams:
+        self.requests.append("params")
+        return transaction.SuggestedParams(
+            0, self.current_round, self.current_round + 1000,
+            base64.b64encode(b"\x00" * 32).decode(), "localnet", False, "future", 1000,
+        )
+
+    def send_transactions(self, txns: list) -> str:
+        self.requests.append("send")
+        for txn in txns:
+            self.sent[txn.get_txid()] = self.current_round + 1
+        return txns[0].get_txid()
+
+    def send_raw_transaction(self, txn_b64: str) -> str:
+        self.requests.append("send")
+        unpacker = msgpack.Unpacker()
+        unpacker.feed(base64.b64decode(txn_b64))
+        txids = [transaction.SignedTransaction.undictify(stxn).get_txid() for stxn in unpacker]
+        for txid in txids:
+            self.sent.setdefault(txid, self.current_round + 1)
+        return txids[0]
+
+    def pending_transaction_info(self, txid: str) -> dict:
+        self.requests.append("pending")
+        confirmed = self.sent.get(txid, 0)
+        return {"confirmed-round": confirmed if confirmed <= self.current_round else 0}
+
+    def block_info(self, block_num: int) -> dict:
+        self.requests.append("block")
+        return {"block": {"rnd": block_num, "txns": self.blocks.get(block_num, [])}}
+
+    def app_call(self, box_names: list[bytes], app_id: int | None = None) -> None:
+        """Record an app call referencing box_names in a new round"""
+        self.current_round += 1
+        txn = {
+            "type": "appl",
+            "apid": app_id or self.app_id,
+            "apbx": [{"n": base64.b64encode(name).decode()} for name in box_names],
+        }
+        self.blocks.setdefault(self.current_round, []).append({"txn": txn})
+
+    def algod_request(self, method: str, requrl: str, params: dict | None = None, **kwargs) -> dict:
+        assert method == "GET" and requrl == f"/applications/{self.app_id}/boxes"
+        self.requests.append("boxes")
+        params = params or {}
+        names = sorted(self.boxes)
+        start = 0
+        if params.get("next"):
+            start = names.index(base64.b64decode(params["next"]))
+        limit = int(params.get("max") or len(names) or 1)
+        page = names[start:start + limit]
+
+        boxes = []
+        for name in page:
+            box = {"name": base64.b64encode(name).decode()}
+            if self.supports_values and params.get("values"):
+                box["value"] = base64.b64encode(self.boxes[name]).decode()
+            boxes.append(box)
+
+        response = {"boxes": boxes, "round": self.current_round}
+        if start + limit < len(names):
+            response["next-token"] = base64.b64encode(names[start + limit]).decode()
+        return response
+
+
+@pytest.fixture()
+def fake_algod() -> FakeAlgod:
+    return FakeAlgod()
+
+
+@pytest.fixture(scope="session")
+def registry_contract() -> Contract:
+    return Contract.from_json(ARC56_PATH.read_text())
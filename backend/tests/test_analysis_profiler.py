@@ -0,0 +1,77 @@
+import os
+
+from analysis_profiler import AnalysisMetrics, StageProfiler
+from graph_analyzer import analyze_transactions
+
+
+def _sample_csv() -> bytes:
+    with open(os.path.join(os.path.dirname(__file__), "..", "sample_transactions.csv"), "rb") as f:
+        return f.read()
+
+
+def test_profile_block_is_optional() -> None:
+    plain, _ = analyze_transactions(_sample_csv())
+    assert "profile" not in plain["summary"]
+
+    profiled, graph = analyze_transactions(_sample_csv(), profile=True)
+    profile = profiled["summary"]["profile"]
+
+    assert list(profile["stages"])[:4] == ["parse_csv", "build_graph", "detect_cycles", "detect_smurfing"]
+    assert {"risk_scoring", "centrality", "format_output"} <= set(profile["stages"])
+    assert profile["stages"]["centrality"]["calls"] == 1
+    assert profile["stages"]["risk_scoring"]["seconds"] >= profile["stages"]["centrality"]["seconds"]
+    assert profile["counters"]["graph_nodes"] == graph.number_of_nodes()
+    assert profile["counters"]["transactions_parsed"] == 19
+    assert profile["counters"]["cycles_enumerated"] >= profile["counters"]["mule_rings"] >= 1
+    assert "traced_peak_bytes" in profile["stages"]["build_graph"]
+    assert profile["max_rss_bytes"] > 0
+
+
+def test_nested_stage_peaks_include_inner_allocations() -> None:
+    with StageProfiler(trace_memory=True) as profiler:
+        with profiler.stage("outer"):
+            with profiler.stage("inner"):
+                block = bytearray(4 * 2**20)
+                del block
+            with profiler.stage("inner"):
+                pass
+
+    stages = profiler.as_dict()["stages"]
+    assert stages["inner"]["calls"] == 2
+    assert stages["inner"]["traced_peak_bytes"] >= 4 * 2**20
+    assert stages["outer"]["traced_peak_bytes"] >= 4 * 2**20
+
+
+def test_metrics_render_prometheus_text() -> None:
+    metrics = AnalysisMetrics()
+    for _ in range(2):
+        with StageProfiler() as profiler:
+            with profiler.stage("detect_cycles"):
+                profiler.count("cycles_enumerated", 3)
+        metrics.observe(profiler)
+
+    text = metrics.render()
+    assert "# TYPE aml_analysis_runs_total counter" in text
+    assert "aml_analysis_runs_total 2" in text
+    assert 'aml_analysis_stage_calls_total{stage="detect_cycles"} 2' in text
+    assert 'aml_analysis_work_total{counter="cycles_enumerated"} 6' in text
+    assert "aml_analysis_stage_traced_peak_bytes" not in text
+    assert text.endswith("\n")
+
+
+def test_rss_is_none_without_the_resource_module(monkeypatch) -> None:
+    import analysis_profiler
+
+    monkeypatch.setattr(analysis_profiler, "resource", None)
+    with StageProfiler() as profiler:
+        with profiler.stage("build_graph"):
+            pass
+    profile = profiler.as_dict()
+    assert profile["max_rss_bytes"] is None
+    assert profile["stages"]["build_graph"]["rss_peak_delta_bytes"] is None
+
+    metrics = AnalysisMetrics()
+    metrics.observe(profiler)
+    text = metrics.render()
+    assert "aml_analysis_stage_seconds_total" in text
+    assert "rss" not in text
@@ -0,0 +1,119 @@
+import networkx as nx
+import pandas as pd
+
+from analysis_session import AnalysisSession, delta_events
+from graph_analyzer import DetectorBudget, analyze_transactions, detect_mule_rings, detect_shell_networks
+from synthetic_transactions import generate_transactions
+
+
+def _frame(edges: list, timestamp: str = "2026-03-01") -> pd.DataFrame:
+    return pd.DataFrame([
+        {"sender_id": sender, "receiver_id": receiver, "amount": 100.0, "timestamp": timestamp}
+        for sender, receiver in edges
+    ])
+
+
+def _accounts(output: dict) -> dict:
+    return {
+        account["account_id"]: (account["suspicion_score"], sorted(account["detected_patterns"]))
+        for account in output["suspicious_accounts"]
+    }
+
+
+def test_batches_match_a_full_analysis() -> None:
+    df, _ = generate_transactions(1500, seed=11, density=2.0)
+    full, G = analyze_transactions(df.to_csv(index=False).encode())
+
+    session = AnalysisSession()
+    for start in range(0, len(df), 300):
+        session.append(df.iloc[start:start + 300].to_csv(index=False).encode())
+    session.refresh_centrality()
+    snapshot = session.snapshot()
+
+    assert sorted(session.rings) == sorted(tuple(ring) for ring in detect_mule_rings(G))
+    assert sorted(chain for chains in session._source_chains.values() for chain in chains) == sorted(
+        tuple(chain) for chain in detect_shell_networks(G)
+    )
+    assert _accounts(snapshot) == _accounts(full)
+    assert snapshot["summary"]["total_accounts_analyzed"] == G.number_of_nodes()
+    assert snapshot["summary"]["session"]["centrality_stale"] is False
+
+
+def test_only_new_edges_close_rings() -> None:
+    session = AnalysisSession()
+    session.append_frame(_frame([("A", "B"), ("B", "C")]))
+
+    delta = session.append_frame(_frame([("A", "B"), ("C", "A")]))
+    assert delta["new_edges"] == 1
+    assert delta["rings_added"] == [["A", "B", "C"]]
+
+    # A repeat transfer adds no edge, so nothing is searched or re-scored
+    delta = session.append_frame(_frame([("C", "A")]))
+    assert delta["new_edges"] == 0 and delta["rings_added"] == [] and delta["accounts"] == []
+    assert session.account_patterns["B"] == ["cycle_length_3"]
+
+
+def test_chain_is_dropped_when_an_intermediary_becomes_active() -> None:
+    session = AnalysisSession()
+    hub_partners = [("HUB", f"P{i}") for i in range(6)]
+    session.append_frame(_frame(hub_partners + [("HUB", "D1"), ("D1", "D2"), ("D2", "END")]))
+    assert ("HUB", "D1", "D2", "END") in session._source_chains["HUB"]
+
+    delta = session.append_frame(_frame([("D1", "X1"), ("D1", "X2")]))
+    assert ["HUB", "D1", "D2", "END"] in delta["chains_removed"]
+    assert "D2" not in session.account_patterns
+
+
+def test_budget_cut_work_resumes_on_next_append() -> None:
+    session = AnalysisSession(budgets={"cycles": DetectorBudget(max_expansions=2)})
+    session.append_frame(_frame([("A", "B"), ("B", "C"), ("C", "D")]))
+
+    delta = session.append_frame(_frame([("D", "A")]))
+    assert delta["truncated_detectors"] == ["cycles"]
+    assert session.snapshot()["summary"]["truncated_detectors"] == ["cycles"]
+
+    session.budgets["cycles"] = DetectorBudget()
+    delta = session.append_frame(_frame([]))
+    assert delta["rings_added"] == [["A", "B", "C", "D"]]
+    assert session.snapshot()["summary"]["truncated_detectors"] == []
+
+
+def test_window_expires_edges_rings_and_idle_accounts() -> None:
+    session = AnalysisSession(window_seconds=86400)
+    session.append_frame(_frame([("A", "B"), ("B", "C"), ("C", "A")], "2026-03-01 00:00"))
+    session.append_frame(_frame([("A", "B")], "2026-03-01 20:00"))
+
+    delta = session.append_frame(_frame([("X", "Y")], "2026-03-02 12:00"))
+    assert delta["expired_edges"] == 2
+    assert delta["rings_removed"] == [["A", "B", "C"]]
+    # A -> B was seen again inside the window, C has no edges left
+    assert set(session.G.edges()) == {("A", "B"), ("X", "Y")}
+    assert "C" not in session.G and "C" not in session.account_patterns
+    assert [event["event"] for event in delta_events(delta)] == ["ring_cleared"]
+
+
+def test_windowed_batches_match_a_full_analysis_of_the_live_edges() -> None:
+    df, _ = generate_transactions(2000, seed=5, density=1.5)
+    session = AnalysisSession(window_seconds=5 * 86400)
+    for start in range(0, len(df), 100):
+        session.append_frame(df.iloc[start:start + 100])
+    window = session.window
+    assert window.expired_edges > 0
+
+    # Live transactions: those in a bucket that has not ended before the window start
+    seconds = (pd.to_datetime(df["timestamp"], utc=True) - pd.Timestamp(0, tz="UTC")).dt.total_seconds()
+    live = df[(seconds // window.bucket_seconds) >= window.first_live_bucket]
+    _, G = analyze_transactions(live.to_csv(index=False).encode())
+    assert set(G.edges()) == set(session.G.edges())
+    for sender, receiver, data in G.edges(data=True):
+        assert session.G[sender][receiver]["count"] == data["count"]
+        assert abs(session.G[sender][receiver]["amount"] - data["amount"]) < 1e-6
+
+    # Reference graph: the live edges, accounts in the session's order
+    reference = nx.DiGraph()
+    reference.add_nodes_from(session.G.nodes())
+    reference.add_edges_from(G.edges())
+    assert sorted(session.rings) == sorted(tuple(ring) for ring in detect_mule_rings(reference))
+    assert sorted(chain for chains in session._source_chains.values() for chain in chains) == sorted(
+        tuple(chain) for chain in detect_shell_networks(reference)
+    )
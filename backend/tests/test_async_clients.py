@@ -0,0 +1,124 @@
+import asyncio
+import base64
+import json
+
+import httpx
+import pytest
+from algosdk import error as algod_error
+
+from async_clients import AsyncAlgodClient, AsyncIPFSClient
+from registry_reader import read_wallet_profile_async
+
+
+def _algod(handler, **kwargs) -> AsyncAlgodClient:
+    return AsyncAlgodClient("a" * 64, "http://algod.test", transport=httpx.MockTransport(handler), **kwargs)
+
+
+def test_algod_box_read_and_404() -> None:
+    profile = bytes(range(48))
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.headers["X-Algo-API-Token"] == "a" * 64
+        assert request.url.path == "/v2/applications/1002/box"
+        if request.url.params["name"] == "b64:" + base64.b64encode(b"\xab" * 32).decode():
+            return httpx.Response(200, json={"name": "", "value": base64.b64encode(profile).decode(), "round": 7})
+        return httpx.Response(404, json={"message": "box not found"})
+
+    async def run():
+        client = _algod(handler)
+        found = await read_wallet_profile_async(client, 1002, "ab" * 32)
+        missing = await read_wallet_profile_async(client, 1002, "cd" * 32)
+        with pytest.raises(algod_error.AlgodHTTPError) as excinfo:
+            await client.application_box_by_name(1002, b"nope")
+        await client.aclose()
+        return found, missing, excinfo.value.code
+
+    found, missing, code = asyncio.run(run())
+    assert found["round"] == 7 and found["risk_score"] == int.from_bytes(profile[:8], "big")
+    assert missing is None
+    assert code == 404
+
+
+def test_algod_suggested_params() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={
+            "fee": 0, "min-fee": 1000, "last-round": 50, "genesis-id": "localnet",
+            "genesis-hash": base64.b64encode(b"\x00" * 32).decode(), "consensus-version": "future",
+        })
+
+    async def run():
+        client = _algod(handler)
+        sp = await client.suggested_params()
+        await client.aclose()
+        return sp
+
+    sp = asyncio.run(run())
+    assert (sp.first, sp.last, sp.min_fee, sp.gen) == (50, 1050, 1000, "localnet")
+
+
+def test_concurrency_is_bounded() -> None:
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={"last-round": 1})
+
+    async def run():
+        client = _algod(handler, max_concurrency=3)
+        await asyncio.gather(*(client.status() for _ in range(12)))
+        await client.aclose()
+
+    asyncio.run(run())
+    assert peak == 3
+
+
+def test_ipfs_add_json_matches_ipfshttpclient_encoding() -> None:
+    stored = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/v0/add":
+            body = request.content
+            stored["data"] = body[body.index(b"\r\n\r\n") + 4:body.rindex(b"\r\n--")]
+            return httpx.Response(200, json={"Hash": "QmTest"})
+        assert request.url.path == "/api/v0/cat" and request.url.params["arg"] == "QmTest"
+        return httpx.Response(200, content=stored["data"])
+
+    async def run():
+        client = AsyncIPFSClient("http://ipfs.test", transport=httpx.MockTransport(handler))
+        cid = await client.add_json({"b": 1, "a": "₹"})
+        document = await client.get_json(cid)
+        await client.aclose()
+        return cid, document
+
+    cid, document = asyncio.run(run())
+    assert cid == "QmTest"
+    assert stored["data"] == json.dumps({"a": "₹", "b": 1}, ensure_ascii=False, separators=(",", ":")).encode()
+    assert document == {"a": "₹", "b": 1}
+
+
+def test_ipfs_contains_checks_the_pin_set() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/api/v0/pin/ls"
+        assert request.url.params["type"] == "recursive"
+        if request.url.params["arg"] == "QmPinned":
+            return httpx.Response(200, json={"Keys": {"QmPinned": {"Type": "recursive"}}})
+        if request.url.params["arg"] == "QmGone":
+            return httpx.Response(500, json={"Message": "path 'QmGone' is not pinned", "Code": 0})
+        return httpx.Response(503)
+
+    async def run():
+        client = AsyncIPFSClient("http://ipfs.test", transport=httpx.MockTransport(handler))
+        try:
+            found = await client.contains("QmPinned"), await client.contains("QmGone")
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.contains("QmDown")
+            return found
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == (True, False)
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+import blob_store
+from blob_store import LocalBlobStore, compute_cid
+from evidence_store import EvidenceStore
+
+
+def test_cids_match_ipfs_add() -> None:
+    # Reference CIDs from `ipfs add` with default settings
+    assert compute_cid(b"") == "QmbFMke1KXqnYyBBWxB74N4c5SBnJMVAiMNRcGu6x1AwQH"
+    assert compute_cid(b"hello world") == "Qmf412jQZiuVUtdgnB36FXFX7xg5V6KEbSJ4dpQuhkLyfD"
+    assert compute_cid(b"hello world\n") == "QmT78zSuBmuS4z925WZfrqQ1qHaJ56DQaTfyMUF7F8ff5o"
+
+
+def test_multi_level_dag_is_deterministic(monkeypatch) -> None:
+    monkeypatch.setattr(blob_store, "CHUNK_SIZE", 4)
+    monkeypatch.setattr(blob_store, "MAX_LINKS", 3)
+    data = bytes(range(50))
+
+    assert compute_cid(data) == compute_cid(bytes(data))
+    assert compute_cid(data) != compute_cid(data[:-1])
+    assert compute_cid(data).startswith("Qm")
+
+
+def test_local_store_round_trip(tmp_path) -> None:
+    store = LocalBlobStore(str(tmp_path))
+    data = b"x" * (blob_store.CHUNK_SIZE * 2 + 1)
+
+    async def run():
+        cid = await store.add_bytes(data)
+        return cid, await store.add_bytes(data), await store.cat(cid)
+
+    cid, again, read_back = asyncio.run(run())
+    assert cid == again == compute_cid(data)
+    assert read_back == data
+    assert asyncio.run(store.contains(cid))
+    assert not asyncio.run(store.contains(compute_cid(b"missing")))
+    with store.open(cid) as mapped:
+        assert mapped[:3] == b"xxx" and len(mapped) == len(data)
+
+    assert asyncio.run(store.cat(store.put(b""))) == b""
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(store.cat(compute_cid(b"missing")))
+
+
+def test_evidence_store_runs_on_local_backend(tmp_path) -> None:
+    store = LocalBlobStore(str(tmp_path))
+    evidence = EvidenceStore(store)
+    document = {"mapping": [{"sender_id": "A", "pan_card": "ABCDE1234F"}], "total_records": 1}
+
+    cid, uploaded = asyncio.run(evidence.put(document))
+    assert uploaded
+    assert asyncio.run(store.get_json(cid)) == document
+    assert asyncio.run(store.add_json(document)) == cid
+
+
+def test_backends_must_implement_the_whole_interface(tmp_path) -> None:
+    class CatOnly(blob_store.BlobStore):
+        async def cat(self, cid: str) -> bytes:
+            return b""
+
+    with pytest.raises(TypeError):
+        CatOnly()
+    assert LocalBlobStore(str(tmp_path)).store_id == f"local:{tmp_path}"
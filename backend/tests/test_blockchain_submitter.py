@@ -0,0 +1,95 @@
+import base64
+import hashlib
+import json
+
+import pytest
+from algosdk import account, transaction
+
+from blockchain_submitter import BOX_IO_QUOTA, MAX_TX_REFERENCES, BulkFlagSubmitter, check_group_resources
+from tests.conftest import ARC56_PATH
+
+TEAL_PATH = ARC56_PATH.with_name("AmlRegistry.approval.teal")
+
+
+def _flag_requests(count: int) -> list:
+    return [
+        {
+            "account_id": f"ACC{i}",
+            "hashed_id": hashlib.sha256(f"ACC{i}".encode()).hexdigest(),
+            "risk_score": 80,
+            "transaction_count": 3,
+            "flagged_connections": 1,
+            "ipfs_hash": "QmdSjyrrBLvdH4Gjda1wMrk9sGrLowGBEbP5VnxuNZkydN",
+        }
+        for i in range(count)
+    ]
+
+
+def _submitter(fake_algod, registry_contract) -> BulkFlagSubmitter:
+    sender_sk, sender_addr = account.generate_account()
+    return BulkFlagSubmitter(fake_algod, registry_contract, fake_algod.app_id, sender_addr, sender_sk)
+
+
+def _sent_methods(fake_algod, submitter, requests) -> list:
+    """Selectors of every app call sent while flagging requests"""
+    selectors = []
+    send = fake_algod.send_transactions
+
+    def record(stxns):
+        for stxn in stxns:
+            assert isinstance(stxn.transaction, transaction.ApplicationCallTxn)
+            selectors.append(stxn.transaction.app_args[0])
+        return send(stxns)
+
+    fake_algod.send_transactions = record
+    results = submitter.flag_accounts(requests)
+    assert all(result["status"] == "flagged" for result in results)
+    return selectors
+
+
+def test_built_program_routes_every_spec_method(registry_contract) -> None:
+    spec = json.loads(ARC56_PATH.read_text())
+    program = base64.b64decode(spec["byteCode"]["approval"])
+    teal = TEAL_PATH.read_text()
+    for method in registry_contract.methods:
+        selector = method.get_selector()
+        assert selector in program, f"{method.get_signature()} is in the spec but not in byteCode"
+        assert f"0x{selector.hex()}" in teal, f"{method.get_signature()} is in the spec but not in the TEAL"
+
+
+def test_accounts_are_batched_when_the_app_routes_the_batch_method(fake_algod, registry_contract) -> None:
+    submitter = _submitter(fake_algod, registry_contract)
+    selectors = _sent_methods(fake_algod, submitter, _flag_requests(9))
+
+    batch = registry_contract.get_method_by_name("register_wallets_batch").get_selector()
+    single = registry_contract.get_method_by_name("register_wallet").get_selector()
+    assert selectors == [batch, single]
+    # MAX_BATCH_SIZE accounts in one call, the remainder alone; the program is read once
+    submitter.flag_accounts(_flag_requests(2))
+    assert fake_algod.requests.count("app") == 1
+
+
+def test_stale_deployment_gets_single_calls_without_failed_round_trips(fake_algod, registry_contract) -> None:
+    batch = registry_contract.get_method_by_name("register_wallets_batch").get_selector()
+    fake_algod.approval_program = fake_algod.approval_program.replace(batch, b"\x00" * 4)
+    submitter = _submitter(fake_algod, registry_contract)
+    selectors = _sent_methods(fake_algod, submitter, _flag_requests(10))
+
+    single = registry_contract.get_method_by_name("register_wallet").get_selector()
+    assert selectors == [single] * 10
+    # One group of single calls, sent once
+    assert fake_algod.requests.count("send") == 1
+
+
+def test_group_resource_limits_are_pooled_across_calls() -> None:
+    def spec(box_count: int, box_bytes: int) -> dict:
+        return {"boxes": [(1, bytes([n])) for n in range(box_count)], "box_bytes": box_bytes}
+
+    check_group_resources([spec(MAX_TX_REFERENCES, 0), spec(MAX_TX_REFERENCES, 0)])
+    # A call may write more than its own references grant, using another call's quota
+    check_group_resources([spec(1, 2 * BOX_IO_QUOTA), spec(1, 0)])
+
+    with pytest.raises(ValueError, match="pooled limit"):
+        check_group_resources([spec(MAX_TX_REFERENCES + 4, 0), spec(5, 0)])
+    with pytest.raises(ValueError, match="box I/O quota"):
+        check_group_resources([spec(1, 2 * BOX_IO_QUOTA + 1), spec(1, 0)])
@@ -0,0 +1,59 @@
+import io
+
+import pytest
+
+from graph_analyzer import analyze_transactions, input_format_for, parse_transactions
+from synthetic_transactions import generate_transactions
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.ipc as ipc  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+
+
+def _columnar(df, input_format: str, stream: bool = False) -> bytes:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = io.BytesIO()
+    if input_format == "parquet":
+        pq.write_table(table, sink)
+    elif stream:
+        with ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        with ipc.new_file(sink, table.schema, options=ipc.IpcWriteOptions(compression="lz4")) as writer:
+            writer.write_table(table)
+    return sink.getvalue()
+
+
+def _accounts(output: dict) -> dict:
+    return {
+        account["account_id"]: (account["suspicion_score"], sorted(account["detected_patterns"]))
+        for account in output["suspicious_accounts"]
+    }
+
+
+def test_columnar_input_matches_csv() -> None:
+    df, _ = generate_transactions(800, seed=7, density=2.0)
+    df["memo"] = "unused"
+    from_csv, G = analyze_transactions(df.to_csv(index=False).encode())
+
+    for input_format, stream in (("parquet", False), ("arrow", False), ("arrow", True)):
+        output, columnar_graph = analyze_transactions(_columnar(df, input_format, stream), input_format=input_format)
+        assert _accounts(output) == _accounts(from_csv)
+        assert output["fraud_rings"] == from_csv["fraud_rings"]
+        assert list(columnar_graph.edges(data=True)) == list(G.edges(data=True))
+
+
+def test_only_transaction_columns_are_read() -> None:
+    df, _ = generate_transactions(200, seed=1)
+    df["memo"] = "unused"
+    for input_format in ("parquet", "arrow"):
+        parsed = parse_transactions(_columnar(df, input_format), input_format)
+        assert list(parsed.columns) == ["sender_id", "receiver_id", "amount", "timestamp"]
+
+    with pytest.raises(ValueError, match="must contain columns"):
+        parse_transactions(_columnar(df[["sender_id", "amount"]], "parquet"), "parquet")
+    with pytest.raises(ValueError, match="Failed to read"):
+        parse_transactions(b"not parquet", "parquet")
+    assert [input_format_for(name) for name in ("t.CSV", "t.parquet", "t.feather", "t.arrow", "t.xlsx")] == [
+        "csv", "parquet", "arrow", "arrow", None
+    ]
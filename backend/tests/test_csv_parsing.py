@@ -0,0 +1,44 @@
+import importlib.util
+
+import pandas as pd
+import pytest
+
+import benchmark_analyzer
+from graph_analyzer import read_csv_transactions, transaction_columns, transaction_timestamps
+
+# pandas' parser always; pyarrow's too when it is installed
+ENGINES = [False] + ([True] if importlib.util.find_spec("pyarrow") else [])
+
+CSV = (
+    b"transaction_id,sender_id,receiver_id,amount,timestamp,memo\n"
+    b"T1,007,ACC_2,100.5,2026-03-01 10:00:00,a\n"
+    b"T2,ACC_2,007,20,2026-03-02 00:00:00,b\n"
+    b"T3,ACC_3,ACC_2,3.25,not a date,c\n"
+)
+
+
+@pytest.mark.parametrize("use_pyarrow", ENGINES)
+def test_explicit_types_and_projection(use_pyarrow: bool) -> None:
+    df = read_csv_transactions(CSV, use_pyarrow=use_pyarrow)
+    assert list(df.columns) == ["sender_id", "receiver_id", "amount", "timestamp"]
+    assert df["amount"].dtype == "float64"
+    assert isinstance(df["timestamp"].dtype, pd.DatetimeTZDtype)
+    # IDs are never inferred as numbers: leading zeros survive
+    assert transaction_columns(df) == (["007", "ACC_2", "ACC_3"], ["ACC_2", "007", "ACC_2"], [100.5, 20.0, 3.25])
+    timestamps = transaction_timestamps(df)
+    assert timestamps[:2] == [1772359200.0, 1772409600.0] and pd.isna(timestamps[2])
+
+
+@pytest.mark.parametrize("use_pyarrow", ENGINES)
+def test_optional_timestamp_and_bad_input(use_pyarrow: bool) -> None:
+    df = read_csv_transactions(b"\xef\xbb\xbfsender_id,receiver_id,amount\r\nA,B,1\r\n", use_pyarrow=use_pyarrow)
+    assert list(df.columns) == ["sender_id", "receiver_id", "amount"] and transaction_timestamps(df) is None
+    assert read_csv_transactions(b"sender_id,receiver_id,amount\n", use_pyarrow=use_pyarrow).empty
+    with pytest.raises(ValueError, match="Failed to parse CSV"):
+        read_csv_transactions(b"sender_id,receiver_id,amount\nA,B,lots\n", use_pyarrow=use_pyarrow)
+
+
+def test_parse_benchmark_reports_each_engine() -> None:
+    result = benchmark_analyzer.run_parse_benchmark(2000, seed=1)
+    assert set(result["parsers"]) == {"legacy", "pandas"} | ({"pyarrow"} if True in ENGINES else set())
+    assert result["parsers"]["legacy"]["speedup"] == 1.0
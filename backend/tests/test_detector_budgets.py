@@ -0,0 +1,117 @@
+import os
+import time
+
+import networkx as nx
+
+import graph_analyzer
+from graph_analyzer import (
+    DetectorBudget,
+    analyze_transactions,
+    cycles_through_edge,
+    detect_mule_rings,
+    detect_shell_networks,
+)
+
+
+def _rotation(cycle: list) -> tuple:
+    return min(tuple(cycle[i:] + cycle[:i]) for i in range(len(cycle)))
+
+
+def _sample_csv() -> bytes:
+    with open(os.path.join(os.path.dirname(__file__), "..", "sample_transactions.csv"), "rb") as f:
+        return f.read()
+
+
+def test_cycles_match_networkx_within_ring_sizes() -> None:
+    G = nx.gnp_random_graph(18, 0.15, seed=4, directed=True)
+
+    expected = {_rotation(c) for c in nx.simple_cycles(G, length_bound=5) if len(c) >= 3}
+    found = detect_mule_rings(G)
+    assert {_rotation(c) for c in found} == expected
+    assert len(found) == len(expected)
+
+
+def test_cycles_through_edge_match_networkx_cycles_using_it() -> None:
+    G = nx.gnp_random_graph(14, 0.25, seed=7, directed=True)
+    G.add_edges_from([(3, 3), (5, 5)])
+    cycles = [c for c in nx.simple_cycles(G, length_bound=5) if len(c) >= 3]
+
+    for sender, receiver in G.edges():
+        found = cycles_through_edge(G, sender, receiver)
+        assert all(cycle[:2] == [sender, receiver] for cycle in found)
+        expected = {
+            _rotation(c) for c in cycles
+            if any((c[i], c[(i + 1) % len(c)]) == (sender, receiver) for i in range(len(c)))
+        }
+        assert {_rotation(c) for c in found} == expected
+        assert len(found) == len(expected)
+
+
+def test_shell_chains_only_pass_through_dormant_accounts() -> None:
+    G = nx.DiGraph()
+    hub_partners = [f"P{i}" for i in range(6)]
+    G.add_edges_from(("HUB", partner) for partner in hub_partners)
+    G.add_edges_from([("HUB", "D1"), ("D1", "D2"), ("D2", "SINK"), ("SINK", "END")])
+    # A busy intermediary breaks the chain
+    G.add_edges_from([("HUB", "BUSY"), ("BUSY", "X"), ("X", "Y")])
+    G.add_edges_from(("BUSY", partner) for partner in hub_partners)
+    G.add_edges_from(("SINK", partner) for partner in hub_partners[:3])
+
+    chains = detect_shell_networks(G)
+    assert ["HUB", "D1", "D2", "SINK"] in chains
+    # SINK is active, so it may end a chain but not relay one
+    assert ["HUB", "D1", "D2", "SINK", "END"] not in chains
+    assert not any("BUSY" in chain[1:-1] for chain in chains)
+
+
+def test_budgets_truncate_with_partial_results() -> None:
+    G = nx.complete_graph(12, create_using=nx.DiGraph)
+
+    budget = DetectorBudget(max_expansions=500).start()
+    rings = detect_mule_rings(G, budget=budget)
+    report = budget.report()
+    assert report["truncated"] and report["reason"] == "max_expansions (500)"
+    assert 0 < len(rings) and all(nx.is_path(G, ring + ring[:1]) for ring in rings)
+
+    budget = DetectorBudget(max_results=7).start()
+    assert len(detect_mule_rings(G, budget=budget)) == 7
+    assert budget.report()["reason"] == "max_results (7)"
+
+    budget = DetectorBudget(max_seconds=0).start()
+    detect_mule_rings(G, budget=budget)
+    assert budget.report()["reason"] == "max_seconds (0)"
+    assert budget.expansions == DetectorBudget.CLOCK_CHECK_INTERVAL
+
+    unlimited = DetectorBudget().start()
+    detect_mule_rings(nx.complete_graph(6, create_using=nx.DiGraph), budget=unlimited)
+    assert not unlimited.report()["truncated"]
+
+
+def test_truncation_is_reported_in_summary() -> None:
+    output, _ = analyze_transactions(_sample_csv())
+    assert output["summary"]["truncated_detectors"] == []
+    assert set(output["summary"]["detector_coverage"]) == {"cycles", "shell_networks"}
+
+    output, _ = analyze_transactions(_sample_csv(), budgets={"cycles": DetectorBudget(max_expansions=1)})
+    assert output["summary"]["truncated_detectors"] == ["cycles"]
+    assert output["summary"]["detector_coverage"]["cycles"]["reason"] == "max_expansions (1)"
+    assert not output["summary"]["detector_coverage"]["shell_networks"]["truncated"]
+
+
+def test_budgets_exclude_parsing_and_earlier_detectors(monkeypatch) -> None:
+    parse = graph_analyzer.parse_transactions
+
+    def slow_parse(*args, **kwargs):
+        time.sleep(0.5)
+        return parse(*args, **kwargs)
+
+    monkeypatch.setattr(graph_analyzer, "parse_transactions", slow_parse)
+    monkeypatch.setattr(DetectorBudget, "CLOCK_CHECK_INTERVAL", 1)
+    budgets = {name: DetectorBudget(max_seconds=0.25) for name in ("cycles", "shell_networks")}
+
+    output, _ = analyze_transactions(_sample_csv(), budgets=budgets)
+    coverage = output["summary"]["detector_coverage"]
+    assert output["summary"]["truncated_detectors"] == []
+    assert coverage["shell_networks"]["results"] > 0
+    # Reported time is the detector's own, frozen when it returned
+    assert all(report["seconds"] < 0.25 for report in coverage.values())
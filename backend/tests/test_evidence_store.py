@@ -0,0 +1,173 @@
+import asyncio
+import hashlib
+import random
+import sqlite3
+
+from blob_store import BlobStore
+from evidence_store import EvidenceStore, canonical_json
+from profile_codec import SHA256_MULTIHASH_PREFIX, base58_encode
+
+
+class FakeIPFS(BlobStore):
+    backend = "ipfs"
+
+    def __init__(self, api_url: str = "http://ipfs.test:5001"):
+        self.api_url = api_url
+        self.added = []
+        self.pinned = set()
+        self.checks = 0
+
+    @property
+    def location(self) -> str:
+        return self.api_url
+
+    async def version(self) -> dict:
+        return {"Version": "fake"}
+
+    async def cat(self, cid: str) -> bytes:
+        raise NotImplementedError
+
+    async def add_bytes(self, data: bytes) -> str:
+        await asyncio.sleep(0.001)
+        self.added.append(data)
+        cid = base58_encode(SHA256_MULTIHASH_PREFIX + hashlib.sha256(data).digest())
+        self.pinned.add(cid)
+        return cid
+
+    async def contains(self, cid: str) -> bool:
+        self.checks += 1
+        return cid in self.pinned
+
+
+def _analysis() -> dict:
+    return {
+        "suspicious_accounts": [
+            {"account_id": "A", "suspicion_score": 90, "detected_patterns": ["cycle", "fan_in"], "ring_id": "RING_001"},
+            {"account_id": "B", "suspicion_score": 80, "detected_patterns": ["cycle"], "ring_id": "RING_001"},
+            {"account_id": "C", "suspicion_score": 75, "detected_patterns": ["fan_out"], "ring_id": "RING_002"},
+        ],
+        "fraud_rings": [
+            {"ring_id": "RING_001", "pattern_type": "cycle", "member_accounts": ["A", "B"], "risk_score": 90},
+            {"ring_id": "RING_002", "pattern_type": "fan_out", "member_accounts": ["C", "D"], "risk_score": 75},
+        ],
+    }
+
+
+def test_repeated_publish_does_no_ipfs_io() -> None:
+    ipfs = FakeIPFS()
+    store = EvidenceStore(ipfs)
+
+    first = asyncio.run(store.publish_analysis(_analysis()))
+    assert first["uploaded"] == 3 and first["reused"] == 0
+    assert len(ipfs.added) == 3
+
+    second = asyncio.run(store.publish_analysis(_analysis()))
+    assert second == {**first, "uploaded": 0, "reused": 3}
+    assert len(ipfs.added) == 3
+
+
+def test_bundle_cid_ignores_input_order_and_ring_ids() -> None:
+    analysis = _analysis()
+    shuffled = _analysis()
+    random.Random(7).shuffle(shuffled["suspicious_accounts"])
+    for account in shuffled["suspicious_accounts"]:
+        account["detected_patterns"].reverse()
+        account["ring_id"] = account["ring_id"].replace("RING", "R")
+    for ring in shuffled["fraud_rings"]:
+        ring["ring_id"] = ring["ring_id"].replace("RING", "R")
+        ring["member_accounts"].reverse()
+    shuffled["fraud_rings"].reverse()
+
+    first = asyncio.run(EvidenceStore(FakeIPFS()).publish_analysis(analysis))
+    second = asyncio.run(EvidenceStore(FakeIPFS()).publish_analysis(shuffled))
+    assert first["cid"] == second["cid"]
+    assert sorted(first["ring_cids"].values()) == sorted(second["ring_cids"].values())
+
+
+def test_concurrent_puts_share_one_upload() -> None:
+    ipfs = FakeIPFS()
+    store = EvidenceStore(ipfs)
+    document = {"kind": "aml_fraud_ring", "member_accounts": ["A", "B"]}
+
+    async def run():
+        return await asyncio.gather(*(store.put(document) for _ in range(10)))
+
+    results = asyncio.run(run())
+    assert len(ipfs.added) == 1
+    assert ipfs.added[0] == canonical_json(document)
+    assert len({cid for cid, _ in results}) == 1
+    assert sum(uploaded for _, uploaded in results) == 1
+
+
+def test_cid_cache_survives_restart(tmp_path) -> None:
+    db_path = str(tmp_path / "evidence.db")
+    ipfs = FakeIPFS()
+    document = {"mapping": [{"account_id": "A", "pan": "ABCDE1234F"}], "total_records": 1}
+
+    cid, uploaded = asyncio.run(EvidenceStore(ipfs, db_path).put(document))
+    assert uploaded
+
+    restarted = EvidenceStore(ipfs, db_path)
+    assert restarted.lookup(document) == cid
+    assert asyncio.run(restarted.put(document)) == (cid, False)
+    assert len(ipfs.added) == 1
+
+
+def test_cached_cid_missing_from_the_node_is_uploaded_again(tmp_path) -> None:
+    db_path = str(tmp_path / "evidence.db")
+    ipfs = FakeIPFS()
+    document = {"kind": "aml_fraud_ring", "member_accounts": ["A", "B"]}
+    cid, _ = asyncio.run(EvidenceStore(ipfs, db_path).put(document))
+
+    # The node was wiped (or garbage collected) while the cache survived
+    ipfs.pinned.clear()
+    restarted = EvidenceStore(ipfs, db_path)
+    assert asyncio.run(restarted.put(document)) == (cid, True)
+    assert len(ipfs.added) == 2 and cid in ipfs.pinned
+    assert restarted.stats()["evictions"] == 1
+
+    assert asyncio.run(restarted.put(document)) == (cid, False)
+    assert len(ipfs.added) == 2
+
+
+def test_failed_presence_check_falls_back_to_uploading() -> None:
+    ipfs = FakeIPFS()
+    store = EvidenceStore(ipfs)
+    document = {"kind": "aml_fraud_ring", "member_accounts": ["A", "B"]}
+    cid, _ = asyncio.run(store.put(document))
+
+    async def unreachable(cid: str) -> bool:
+        raise ConnectionError("node unreachable")
+
+    ipfs.contains = unreachable
+    assert asyncio.run(store.put(document)) == (cid, True)
+    assert len(ipfs.added) == 2
+
+
+def test_cache_entries_are_scoped_to_the_backend(tmp_path) -> None:
+    db_path = str(tmp_path / "evidence.db")
+    document = {"kind": "aml_fraud_ring", "member_accounts": ["A", "B"]}
+    first, second = FakeIPFS("http://node-a:5001"), FakeIPFS("http://node-b:5001")
+    cid, _ = asyncio.run(EvidenceStore(first, db_path).put(document))
+
+    # Same document, same CID - but node-b was never given it
+    switched = EvidenceStore(second, db_path)
+    assert switched.lookup(document) is None
+    assert asyncio.run(switched.put(document)) == (cid, True)
+    assert second.checks == 0 and len(second.added) == 1
+    assert EvidenceStore(first, db_path).lookup(document) == cid
+
+
+def test_unscoped_cache_from_an_older_version_is_discarded(tmp_path) -> None:
+    db_path = str(tmp_path / "evidence.db")
+    legacy = sqlite3.connect(db_path)
+    legacy.execute(
+        "CREATE TABLE evidence (digest TEXT PRIMARY KEY, cid TEXT NOT NULL, kind TEXT, size INTEGER, created_at REAL)"
+    )
+    legacy.execute("INSERT INTO evidence VALUES ('00', 'QmOld', NULL, 1, 0)")
+    legacy.commit()
+    legacy.close()
+
+    store = EvidenceStore(FakeIPFS(), db_path)
+    assert store.stats()["documents"] == 0
+    assert asyncio.run(store.put({"kind": "aml_analysis"}))[1]
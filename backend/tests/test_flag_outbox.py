@@ -0,0 +1,186 @@
+import hashlib
+import struct
+import threading
+import time
+
+import pytest
+from algosdk import account
+
+from blockchain_submitter import BulkFlagSubmitter
+from flag_outbox import FlagOutbox, FlagWorker, box_matches
+from profile_codec import LEGACY_PROFILE_FORMAT, encode_profile
+
+
+class Crash(Exception):
+    pass
+
+
+def _flag_requests(accounts: list) -> list:
+    return [
+        {
+            "account_id": account_id,
+            "hashed_id": hashlib.sha256(account_id.encode()).hexdigest(),
+            "risk_score": 75,
+            "transaction_count": 1,
+            "flagged_connections": 2,
+            "ipfs_hash": "QmdSjyrrBLvdH4Gjda1wMrk9sGrLowGBEbP5VnxuNZkydN",
+        }
+        for account_id in accounts
+    ]
+
+
+def _submitter(fake_algod, registry_contract) -> BulkFlagSubmitter:
+    sender_sk, sender_addr = account.generate_account()
+    return BulkFlagSubmitter(fake_algod, registry_contract, fake_algod.app_id, sender_addr, sender_sk)
+
+
+def test_enqueue_is_idempotent_per_analysis() -> None:
+    outbox = FlagOutbox()
+
+    batch_id = outbox.enqueue("analysis-1", _flag_requests(["A", "B"]))
+    assert outbox.enqueue("analysis-1", _flag_requests(["A", "B", "C"])) == batch_id
+
+    status = outbox.batch_status(batch_id)
+    assert (status["total"], status["pending"], status["complete"]) == (3, 3, False)
+    assert outbox.batch_status("missing") is None
+
+
+def test_worker_drains_outbox_and_records_txids(fake_algod, registry_contract) -> None:
+    outbox = FlagOutbox()
+    batch_id = outbox.enqueue("analysis-1", _flag_requests([f"ACC{n}" for n in range(40)]))
+    worker = FlagWorker(outbox, lambda: _submitter(fake_algod, registry_contract), batch_size=25)
+
+    assert worker.run_once() == 25
+    assert outbox.batch_status(batch_id)["pending"] == 15
+    assert worker.run_once() == 15
+    assert worker.run_once() == 0
+
+    status = outbox.batch_status(batch_id)
+    assert (status["confirmed"], status["complete"]) == (40, True)
+    assert all(entry["txid"] and entry["confirmed_round"] for entry in status["accounts"])
+
+
+def test_worker_idles_without_submitter_and_defers_same_wallet() -> None:
+    outbox = FlagOutbox()
+    outbox.enqueue("analysis-1", _flag_requests(["A"]))
+    outbox.enqueue("analysis-2", _flag_requests(["A", "B"]))
+
+    assert FlagWorker(outbox, lambda: None).run_once() == 0
+    claimed = outbox.claim_pending(10)
+    assert [(op["account_id"], op["analysis_id"]) for op in claimed] == [("A", "analysis-1"), ("B", "analysis-2")]
+
+
+def test_stop_wakes_and_joins_an_idle_worker() -> None:
+    outbox = FlagOutbox()
+    worker = FlagWorker(outbox, lambda: None, poll_interval=60)
+    worker.start()
+
+    started = time.monotonic()
+    assert worker.stop(timeout=5)
+    assert time.monotonic() - started < 5
+    outbox.close()
+
+
+def test_wallets_already_holding_the_payload_are_skipped(fake_algod, registry_contract) -> None:
+    outbox = FlagOutbox()
+    requests = _flag_requests(["A", "B"])
+    same = requests[0]
+    key = bytes.fromhex(same["hashed_id"])
+    fake_algod.boxes[key] = encode_profile(75, 1, 2, 1700000000, same["ipfs_hash"])
+    batch_id = outbox.enqueue("analysis-1", requests)
+
+    FlagWorker(outbox, lambda: _submitter(fake_algod, registry_contract)).run_once()
+
+    statuses = {entry["account"]: entry["status"] for entry in outbox.batch_status(batch_id)["accounts"]}
+    assert statuses == {"A": "skipped", "B": "confirmed"}
+    assert fake_algod.requests.count("send") == 1
+
+
+def test_legacy_profiles_match_on_their_ipfs_box(fake_algod) -> None:
+    operation = _flag_requests(["A"])[0]
+    key = bytes.fromhex(operation["hashed_id"])
+    cid = operation["ipfs_hash"].encode()
+    fake_algod.boxes[key] = struct.pack(LEGACY_PROFILE_FORMAT, 75, 1, 2, 1700000000, 1, len(cid))
+    fake_algod.boxes[key + b"_ipfs"] = cid
+    assert box_matches(fake_algod, fake_algod.app_id, operation)["risk_score"] == 75
+
+    fake_algod.boxes[key + b"_ipfs"] = hashlib.sha256(cid).digest()[:8]
+    assert box_matches(fake_algod, fake_algod.app_id, operation) is None
+
+
+def test_box_checks_run_concurrently_within_the_bound(fake_algod, registry_contract) -> None:
+    outbox = FlagOutbox()
+    outbox.enqueue("analysis-1", _flag_requests([f"ACC{n}" for n in range(12)]))
+    read_box = fake_algod.application_box_by_name
+    lock = threading.Lock()
+    in_flight = []
+    peak = []
+
+    def slow_read(app_id, name):
+        with lock:
+            in_flight.append(name)
+            peak.append(len(in_flight))
+        time.sleep(0.05)
+        with lock:
+            in_flight.remove(name)
+        return read_box(app_id, name)
+
+    fake_algod.application_box_by_name = slow_read
+    worker = FlagWorker(outbox, lambda: _submitter(fake_algod, registry_contract), max_box_reads=4)
+    started = time.monotonic()
+    assert worker.run_once() == 12
+
+    assert max(peak) == 4
+    # Three waves of four reads instead of twelve in a row
+    assert time.monotonic() - started < 12 * 0.05
+
+
+def test_crash_after_journaling_resumes_without_re_signing(fake_algod, registry_contract) -> None:
+    outbox = FlagOutbox()
+    batch_id = outbox.enqueue("analysis-1", _flag_requests([f"ACC{n}" for n in range(20)]))
+    submitter = _submitter(fake_algod, registry_contract)
+
+    # Process dies right after the first group is journaled, before anything is sent
+    def journal_then_crash(operations, txids, stxns):
+        outbox.mark_submitted(operations, txids, stxns)
+        raise Crash()
+
+    with pytest.raises(Crash):
+        submitter.flag_accounts(outbox.claim_pending(20), on_signed=journal_then_crash)
+    journaled = {entry["txid"] for entry in outbox.batch_status(batch_id)["accounts"] if entry["txid"]}
+    assert journaled and outbox.batch_status(batch_id)["submitted"] > 0
+
+    # Restarted worker re-sends the journaled bytes, then confirms the same txids
+    worker = FlagWorker(outbox, lambda: submitter)
+    assert worker.recover() == 0
+    assert set(fake_algod.sent) == journaled
+    fake_algod.status_after_block(fake_algod.current_round)
+    assert worker.drain(batch_id, timeout=5)
+
+    status = outbox.batch_status(batch_id)
+    assert status["confirmed"] == 20
+    resumed = [entry for entry in status["accounts"] if entry["txid"] in journaled]
+    assert resumed and all(entry["status"] == "confirmed" for entry in resumed)
+
+
+def test_expired_submission_is_requeued_and_failed_rows_retry(fake_algod, registry_contract) -> None:
+    outbox = FlagOutbox()
+    batch_id = outbox.enqueue("analysis-1", _flag_requests(["A"]))
+    submitter = _submitter(fake_algod, registry_contract)
+
+    def journal_then_crash(operations, txids, stxns):
+        outbox.mark_submitted(operations, txids, stxns)
+        raise Crash()
+
+    with pytest.raises(Crash):
+        submitter.flag_accounts(outbox.claim_pending(1), on_signed=journal_then_crash)
+
+    # Its validity window passed without it ever reaching the network
+    fake_algod.current_round += 2000
+    assert FlagWorker(outbox, lambda: submitter).recover() == 1
+    assert outbox.batch_status(batch_id)["pending"] == 1
+    assert fake_algod.requests.count("send") == 0
+
+    outbox.set_status(outbox.claim_pending(1)[0], "failed", error="rejected")
+    outbox.enqueue("analysis-1", _flag_requests(["A"]))
+    assert outbox.batch_status(batch_id)["pending"] == 1
@@ -0,0 +1,58 @@
+import math
+
+import networkx as nx
+
+from graph_analyzer import analyze_transactions, detect_mule_rings
+from graph_store import GraphFile, load_graph, save_graph
+from synthetic_transactions import generate_transactions
+
+
+def test_round_trip_keeps_order_attributes_and_documents(tmp_path) -> None:
+    df, _ = generate_transactions(800, seed=3, density=2.0)
+    results, G = analyze_transactions(df.to_csv(index=False).encode())
+    G.add_node("ISOLATED-é")
+    path = str(tmp_path / "graph.amlg")
+    save_graph(G, path, {"result": results, "analysis_id": "abc123"})
+
+    stored = load_graph(path)
+    assert stored.number_of_nodes() == G.number_of_nodes()
+    assert stored.number_of_edges() == G.number_of_edges()
+    assert stored.account_ids() == list(G.nodes())
+    assert stored.account_id(G.number_of_nodes() - 1) == "ISOLATED-é"
+    assert stored.document("analysis_id") == "abc123"
+    assert stored.document("result")["summary"] == results["summary"]
+    assert stored.document("missing") is None
+    degrees = stored.degrees()
+    assert [int(degrees[i]) for i in range(5)] == [G.degree(node) for node in list(G.nodes())[:5]]
+
+    rebuilt = stored.to_networkx()
+    assert list(rebuilt.edges()) == list(G.edges())
+    for u, v, data in G.edges(data=True):
+        assert rebuilt[u][v]["amount"] == data["amount"]
+        assert rebuilt[u][v]["count"] == data["count"]
+        assert rebuilt[u][v]["last_seen"] == data["last_seen"]
+    assert detect_mule_rings(rebuilt) == detect_mule_rings(G)
+
+
+def test_arrays_are_views_into_the_mapping(tmp_path) -> None:
+    G = nx.DiGraph()
+    G.add_edge("A", "B", amount=10.0, count=2)
+    G.add_edge("B", "C", amount=5.5, count=1, last_seen=1700000000.0)
+    path = str(tmp_path / "graph.amlg")
+    save_graph(G, path)
+
+    stored = GraphFile(path)
+    for array in (stored.src, stored.dst, stored.amount, stored.count, stored.id_bytes):
+        assert not array.flags.owndata and not array.flags.writeable
+        assert array.ctypes.data % 64 == 0
+    assert stored.src.tolist() == [0, 1] and stored.dst.tolist() == [1, 2]
+    assert stored.amount.tolist() == [10.0, 5.5]
+    assert math.isnan(stored.last_seen[0]) and stored.last_seen[1] == 1700000000.0
+    assert "last_seen" not in stored.to_networkx()["A"]["B"]
+
+    # Saving again replaces the file; the open mapping keeps the old graph
+    G.add_edge("C", "A", amount=1.0, count=1)
+    save_graph(G, path)
+    assert stored.number_of_edges() == 2 and load_graph(path).number_of_edges() == 3
+    stored.close()
+    assert load_graph(str(tmp_path / "missing.amlg")) is None
@@ -0,0 +1,94 @@
+import asyncio
+import hashlib
+
+from algosdk import account
+
+from blockchain_submitter import BulkFlagSubmitter
+from params_provider import SuggestedParamsProvider
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_params_are_fetched_once_per_round(fake_algod) -> None:
+    provider = SuggestedParamsProvider(fake_algod)
+
+    first = provider.get()
+    first.fee = 123456  # callers mutate their copy
+    second = provider.get()
+
+    assert fake_algod.requests.count("params") == 1
+    assert second.fee == 0 and second.first == 100
+
+    provider.observe_round(100)
+    provider.get()
+    assert fake_algod.requests.count("params") == 1
+
+    fake_algod.current_round = 101
+    provider.observe_round(101)
+    assert provider.get().first == 101
+    assert fake_algod.requests.count("params") == 2
+
+
+def test_params_refresh_near_end_of_validity_window(fake_algod) -> None:
+    clock = FakeClock()
+    provider = SuggestedParamsProvider(fake_algod, refresh_margin_rounds=100, round_time=3.0, clock=clock)
+    provider.get()
+
+    clock.now = 3.0 * 899  # 899 rounds later: still 101 rounds of validity left
+    provider.get()
+    assert fake_algod.requests.count("params") == 1
+
+    clock.now = 3.0 * 900
+    provider.get()
+    assert fake_algod.requests.count("params") == 2
+
+
+def test_async_and_sync_callers_share_one_cache(fake_algod) -> None:
+    provider = SuggestedParamsProvider(fake_algod)
+
+    async def run():
+        return await asyncio.gather(*(provider.get_async() for _ in range(10)))
+
+    params = asyncio.run(run())
+    provider.get()
+
+    assert {sp.first for sp in params} == {100}
+    assert fake_algod.requests.count("params") == 1
+    assert provider.stats()["hits"] == 10
+
+
+def test_bulk_submitter_reuses_provider_params(fake_algod, registry_contract) -> None:
+    sender_sk, sender_addr = account.generate_account()
+    provider = SuggestedParamsProvider(fake_algod)
+    submitter = BulkFlagSubmitter(
+        fake_algod, registry_contract, fake_algod.app_id, sender_addr, sender_sk, params_provider=provider
+    )
+
+    def flag_requests(prefix: str) -> list:
+        return [
+            {
+                "account_id": f"{prefix}{n}",
+                "hashed_id": hashlib.sha256(f"{prefix}{n}".encode()).hexdigest(),
+                "risk_score": 80,
+                "transaction_count": 4,
+                "flagged_connections": 2,
+                "ipfs_hash": "Qm" + "a" * 44,
+            }
+            for n in range(20)
+        ]
+
+    provider.get()  # e.g. fetched by /flag-to-blockchain earlier in the round
+    results = submitter.flag_accounts(flag_requests("A"))
+
+    assert all(r["status"] == "flagged" for r in results)
+    assert fake_algod.requests.count("params") == 1
+    # Confirmation loop reported the new round, so the next batch gets fresh params
+    assert provider.stats()["observed_round"] > 100
+    submitter.flag_accounts(flag_requests("B"))
+    assert fake_algod.requests.count("params") == 2
@@ -0,0 +1,101 @@
+import profile_cache
+from profile_cache import ProfileCache
+
+PROFILE = {"risk_score": 92, "is_flagged": True, "round": 100}
+UPDATED = {"risk_score": 40, "is_flagged": False, "round": 105}
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_hit_and_miss() -> None:
+    cache = ProfileCache()
+    assert cache.get("aa") == (False, None)
+
+    cache.put("aa", PROFILE)
+    cache.put("bb", None)
+    assert cache.get("aa") == (True, PROFILE)
+    # "Not registered" is a hit too
+    assert cache.get("bb") == (True, None)
+    assert cache.stats() == {"entries": 2, "hits": 2, "misses": 1, "persistent": False}
+
+
+def test_entries_expire_after_ttl(monkeypatch) -> None:
+    clock = Clock()
+    monkeypatch.setattr(profile_cache.time, "time", clock)
+    cache = ProfileCache(ttl_seconds=60)
+    cache.put("aa", PROFILE)
+
+    clock.now += 60
+    assert cache.get("aa") == (True, PROFILE)
+    clock.now += 1
+    assert cache.get("aa") == (False, None)
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction_keeps_recently_used() -> None:
+    cache = ProfileCache(max_entries=2)
+    cache.put("aa", PROFILE)
+    cache.put("bb", PROFILE)
+    cache.get("aa")
+    cache.put("cc", PROFILE)
+
+    assert cache.get("bb") == (False, None)
+    assert cache.get("aa")[0] and cache.get("cc")[0]
+
+
+def test_read_started_before_invalidate_is_not_cached() -> None:
+    cache = ProfileCache()
+    # Screening misses and starts reading the box...
+    generation = cache.generation()
+    # ...our update confirms meanwhile...
+    cache.invalidate(["aa"])
+    # ...and the pre-update profile comes back afterwards
+    assert not cache.put("aa", PROFILE, generation=generation)
+    assert cache.get("aa") == (False, None)
+
+    # A read started after the invalidation is cached
+    generation = cache.generation()
+    assert cache.put("aa", UPDATED, generation=generation)
+    assert cache.get("aa") == (True, UPDATED)
+
+
+def test_invalidate_after_put_drops_the_entry() -> None:
+    cache = ProfileCache()
+    generation = cache.generation()
+    assert cache.put("aa", PROFILE, generation=generation)
+    assert cache.put("bb", PROFILE, generation=generation)
+    cache.invalidate(["aa"])
+
+    assert cache.get("aa") == (False, None)
+    # Other IDs read in the same generation are unaffected
+    assert not cache.put("aa", PROFILE, generation=generation)
+    assert cache.put("cc", PROFILE, generation=generation)
+    assert cache.get("bb") == (True, PROFILE)
+
+
+def test_reads_older_than_pruned_invalidations_are_not_cached() -> None:
+    cache = ProfileCache(max_entries=2)
+    generation = cache.generation()
+    for hashed_id in ("aa", "bb", "cc"):
+        cache.invalidate([hashed_id])
+
+    # "aa" fell out of the invalidation log, so an old read cannot be checked
+    assert not cache.put("aa", PROFILE, generation=generation)
+    assert not cache.put("dd", PROFILE, generation=generation)
+    assert cache.put("aa", PROFILE, generation=cache.generation())
+
+
+def test_invalidate_clears_the_disk_tier(tmp_path) -> None:
+    db_path = str(tmp_path / "profiles.db")
+    ProfileCache(db_path=db_path).put("aa", PROFILE)
+
+    restarted = ProfileCache(db_path=db_path)
+    assert restarted.get("aa") == (True, PROFILE)
+    restarted.invalidate(["aa"])
+    assert ProfileCache(db_path=db_path).get("aa") == (False, None)
@@ -0,0 +1,66 @@
+import struct
+
+import pytest
+
+from blockchain_submitter import register_wallet_fee
+from profile_codec import (
+    COMPACT_PROFILE_SIZE,
+    LEGACY_PROFILE_FORMAT,
+    cid_to_multihash,
+    decode_profile,
+    encode_profile,
+    multihash_to_cid,
+)
+
+CID = "QmdSjyrrBLvdH4Gjda1wMrk9sGrLowGBEbP5VnxuNZkydN"
+
+
+def test_cid_round_trips_through_multihash() -> None:
+    multihash = cid_to_multihash(CID)
+
+    assert len(multihash) == 34 and multihash[:2] == b"\x12\x20"
+    assert multihash_to_cid(multihash) == CID
+    assert cid_to_multihash("") == b""
+    assert multihash_to_cid(b"\x00" * 34) == ""
+
+
+def test_non_cidv0_hashes_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        cid_to_multihash("bafybeigdyrzt5sfp7udm7hu76uh7y26nf3efuylqabf3oclgtqy55fbzdi")
+    with pytest.raises(ValueError):
+        cid_to_multihash("Qm0OIl")
+
+
+def test_compact_profile_round_trip_packs_flag_bit() -> None:
+    raw = encode_profile(85, 120_000, 4, 1_700_000_000, CID)
+
+    assert len(raw) == COMPACT_PROFILE_SIZE == 47
+    assert raw[0] == 85 | 0x80
+    assert decode_profile(raw) == {
+        "risk_score": 85,
+        "transaction_count": 120_000,
+        "flagged_connections": 4,
+        "last_updated": 1_700_000_000,
+        "is_flagged": True,
+        "ipfs_hash_length": len(CID),
+        "ipfs_hash": CID,
+    }
+    assert decode_profile(encode_profile(69, 1, 0, 0))["is_flagged"] is False
+    assert decode_profile(encode_profile(20, 1, 0, 0, is_flagged=True))["risk_score"] == 20
+
+
+def test_legacy_profiles_still_decode() -> None:
+    profile = decode_profile(struct.pack(LEGACY_PROFILE_FORMAT, 92, 12, 3, 1_700_000_000, 1, 46))
+
+    assert profile["risk_score"] == 92 and profile["is_flagged"] is True
+    assert profile["ipfs_hash_length"] == 46 and profile["ipfs_hash"] is None
+
+
+def test_compact_layout_halves_storage_cost() -> None:
+    # Box MBR is 2500 + 400 * (key + value) per box; the key is the 32-byte hashed ID
+    legacy_mbr = (2500 + 400 * (32 + 48)) + (2500 + 400 * (32 + 5 + len(CID)))
+    compact_mbr = 2500 + 400 * (32 + COMPACT_PROFILE_SIZE)
+    legacy_fee = 1000 + (2500 + 400 * 48) + (2500 + 400 * (32 + len(CID)))
+
+    assert compact_mbr * 2 < legacy_mbr
+    assert register_wallet_fee() * 2 < legacy_fee
@@ -0,0 +1,107 @@
+import hashlib
+import struct
+import time
+
+from profile_codec import LEGACY_PROFILE_FORMAT, encode_profile
+from registry_index import RegistryIndex
+
+CID = "QmdSjyrrBLvdH4Gjda1wMrk9sGrLowGBEbP5VnxuNZkydN"
+
+
+def _hashed_id(n: int) -> str:
+    return hashlib.sha256(f"ACC{n:05d}".encode()).hexdigest()
+
+
+def _profile(risk_score: int, is_flagged: bool, cid: str = CID) -> bytes:
+    return encode_profile(risk_score, 12, 3, 1700000000, cid, is_flagged=is_flagged)
+
+
+def _register(fake_algod, hashed_id: str, risk_score: int, is_flagged: bool) -> None:
+    fake_algod.boxes[bytes.fromhex(hashed_id)] = _profile(risk_score, is_flagged)
+
+
+def test_full_sync_indexes_compact_and_legacy_profiles(fake_algod) -> None:
+    for n in range(20):
+        _register(fake_algod, _hashed_id(n), n * 5, n * 5 >= 70)
+    # Legacy wallet: 48-byte profile, CID in a separate _ipfs box
+    legacy = bytes.fromhex(_hashed_id(99))
+    fake_algod.boxes[legacy] = struct.pack(LEGACY_PROFILE_FORMAT, 88, 12, 3, 1700000000, 1, 8)
+    fake_algod.boxes[legacy + b"_ipfs"] = b"QmLegacy"
+
+    index = RegistryIndex(fake_algod, fake_algod.app_id, page_size=7)
+    report = index.full_sync()
+
+    assert report == {"added": 21, "updated": 0, "removed": 0, "total": 21, "round": 100}
+    assert index.checkpoint == 100
+    assert index.get(_hashed_id(99))["ipfs_hash"] == "QmLegacy"
+    assert index.get(_hashed_id(3))["ipfs_hash"] == CID
+
+    high_risk = index.query(min_risk=70)
+    assert [w["risk_score"] for w in high_risk] == [95, 90, 88, 85, 80, 75, 70]
+    assert all(w["is_flagged"] for w in high_risk)
+    assert index.stats()["flagged"] == 7
+
+
+def test_catch_up_replays_only_referenced_boxes(fake_algod) -> None:
+    for n in range(5):
+        _register(fake_algod, _hashed_id(n), 10, False)
+    index = RegistryIndex(fake_algod, fake_algod.app_id)
+    index.full_sync()
+
+    # Wallet 1 gets flagged, wallet 7 is newly registered, another app is ignored
+    key1, key7 = bytes.fromhex(_hashed_id(1)), bytes.fromhex(_hashed_id(7))
+    fake_algod.boxes[key1] = _profile(95, True)
+    fake_algod.app_call([key1])
+    _register(fake_algod, _hashed_id(7), 72, False)
+    fake_algod.app_call([key7])
+    fake_algod.app_call([bytes.fromhex(_hashed_id(2))], app_id=9999)
+    fake_algod.requests.clear()
+
+    assert index.catch_up() == 2
+    assert index.checkpoint == 103
+    assert fake_algod.requests.count("block") == 3
+    assert "boxes" not in fake_algod.requests
+    assert index.get(_hashed_id(1))["is_flagged"] is True
+    assert index.get(_hashed_id(7))["risk_score"] == 72
+
+
+def test_catch_up_without_checkpoint_does_full_sync(fake_algod) -> None:
+    _register(fake_algod, _hashed_id(1), 40, False)
+    index = RegistryIndex(fake_algod, fake_algod.app_id)
+
+    assert not index.ready
+    assert index.catch_up() == 1
+    assert index.ready
+
+
+def test_screen_answers_from_index_and_reconcile_reports_drift(fake_algod) -> None:
+    _register(fake_algod, _hashed_id(1), 95, True)
+    _register(fake_algod, _hashed_id(2), 20, False)
+    index = RegistryIndex(fake_algod, fake_algod.app_id)
+    index.full_sync()
+    fake_algod.requests.clear()
+
+    results = index.screen([_hashed_id(1).upper(), _hashed_id(2), _hashed_id(3)])
+
+    assert fake_algod.requests == []
+    assert [r["decision"] for r in results] == ["REJECT", "ALLOW", "ALLOW"]
+    assert [r["found"] for r in results] == [True, True, False]
+
+    del fake_algod.boxes[bytes.fromhex(_hashed_id(2))]
+    fake_algod.boxes[bytes.fromhex(_hashed_id(1))] = _profile(99, True)
+    report = index.full_sync()
+    assert (report["added"], report["updated"], report["removed"]) == (0, 1, 1)
+
+
+def test_stop_joins_the_sync_thread(fake_algod) -> None:
+    _register(fake_algod, _hashed_id(1), 40, False)
+    index = RegistryIndex(fake_algod, fake_algod.app_id)
+    index.start(poll_interval=0.01)
+    deadline = time.monotonic() + 5
+    while not index.ready and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert index.ready
+    assert index.stop(timeout=5)
+    assert not index.stats()["syncing"]
+    index.close()
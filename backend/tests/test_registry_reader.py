@@ -0,0 +1,102 @@
+import hashlib
+import struct
+
+from profile_cache import ProfileCache
+from profile_codec import LEGACY_PROFILE_FORMAT, encode_profile
+from registry_reader import (
+    iter_registry_boxes,
+    read_wallet_profile,
+    screen_wallets,
+)
+
+
+CID = "QmdSjyrrBLvdH4Gjda1wMrk9sGrLowGBEbP5VnxuNZkydN"
+
+
+def _hashed_id(n: int) -> str:
+    return hashlib.sha256(f"ACC{n:05d}".encode()).hexdigest()
+
+
+def _register(fake_algod, hashed_id: str, risk_score: int, is_flagged: bool) -> None:
+    fake_algod.boxes[bytes.fromhex(hashed_id)] = encode_profile(
+        risk_score, 12, 3, 1700000000, CID, is_flagged=is_flagged
+    )
+
+
+def test_read_wallet_profile_missing_box_returns_none(fake_algod) -> None:
+    assert read_wallet_profile(fake_algod, fake_algod.app_id, _hashed_id(1)) is None
+
+
+def test_read_wallet_profile_decodes_compact_and_legacy_boxes(fake_algod) -> None:
+    compact, legacy = _hashed_id(1), _hashed_id(2)
+    _register(fake_algod, compact, 92, True)
+    fake_algod.boxes[bytes.fromhex(legacy)] = struct.pack(LEGACY_PROFILE_FORMAT, 75, 12, 3, 1700000000, 1, 46)
+
+    assert read_wallet_profile(fake_algod, fake_algod.app_id, compact)["ipfs_hash"] == CID
+    assert read_wallet_profile(fake_algod, fake_algod.app_id, legacy)["is_flagged"] is True
+
+
+def test_iter_registry_boxes_follows_next_token(fake_algod) -> None:
+    for n in range(25):
+        _register(fake_algod, _hashed_id(n), 50, False)
+
+    boxes = list(iter_registry_boxes(fake_algod, fake_algod.app_id, page_size=10))
+
+    assert len(boxes) == 25
+    assert fake_algod.requests.count("boxes") == 3
+
+
+def test_screen_wallets_small_batch_uses_box_reads(fake_algod) -> None:
+    flagged, clean, unknown = _hashed_id(1), _hashed_id(2), _hashed_id(3)
+    _register(fake_algod, flagged, 92, True)
+    _register(fake_algod, clean, 10, False)
+
+    results = screen_wallets(fake_algod, fake_algod.app_id, [flagged, clean.upper(), unknown])
+
+    assert [r["decision"] for r in results] == ["REJECT", "ALLOW", "ALLOW"]
+    assert [r["found"] for r in results] == [True, True, False]
+    assert results[1]["hashed_id"] == clean.upper()
+    assert results[0]["risk_score"] == 92
+    assert fake_algod.requests == ["box"] * 3
+
+
+def test_screen_wallets_large_batch_enumerates_boxes_once(fake_algod) -> None:
+    registered = [_hashed_id(n) for n in range(300)]
+    for n, hashed_id in enumerate(registered):
+        _register(fake_algod, hashed_id, n % 100, n % 7 == 0)
+    queried = registered[::2] + [_hashed_id(n) for n in range(1000, 1200)]
+
+    results = screen_wallets(fake_algod, fake_algod.app_id, queried, small_batch_threshold=64, page_size=250)
+
+    assert len(results) == len(queried)
+    assert "box" not in fake_algod.requests
+    assert fake_algod.requests.count("boxes") == 2
+    for hashed_id, result in zip(queried, results):
+        n = registered.index(hashed_id) if hashed_id in registered else None
+        assert result["found"] is (n is not None)
+        assert result["decision"] == ("REJECT" if n is not None and n % 7 == 0 else "ALLOW")
+
+
+def test_screen_wallets_falls_back_when_listing_has_no_values(fake_algod) -> None:
+    fake_algod.supports_values = False
+    registered = [_hashed_id(n) for n in range(10)]
+    for hashed_id in registered:
+        _register(fake_algod, hashed_id, 80, True)
+
+    results = screen_wallets(fake_algod, fake_algod.app_id, registered, small_batch_threshold=2)
+
+    assert all(r["decision"] == "REJECT" for r in results)
+    assert fake_algod.requests.count("box") == 10
+
+
+def test_screen_wallets_serves_repeats_from_cache(fake_algod) -> None:
+    hashed_id = _hashed_id(1)
+    _register(fake_algod, hashed_id, 92, True)
+    cache = ProfileCache()
+
+    screen_wallets(fake_algod, fake_algod.app_id, [hashed_id, _hashed_id(2)], cache=cache)
+    fake_algod.requests.clear()
+    results = screen_wallets(fake_algod, fake_algod.app_id, [hashed_id, _hashed_id(2)], cache=cache)
+
+    assert fake_algod.requests == []
+    assert [r["decision"] for r in results] == ["REJECT", "ALLOW"]
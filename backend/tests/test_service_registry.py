@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+from service_registry import ServiceRegistry
+
+
+def test_warm_up_is_concurrent_and_bounded() -> None:
+    services = ServiceRegistry(timeout=0.2)
+
+    async def ready():
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def hangs():
+        await asyncio.sleep(60)
+
+    async def fails():
+        raise ConnectionError("connection refused")
+
+    services.register("ready", ready)
+    services.register("hangs", hangs)
+    services.register("fails", fails)
+
+    async def run():
+        started = time.monotonic()
+        services.start_all()
+        booted = time.monotonic() - started
+        await services.wait_all()
+        return booted, time.monotonic() - started
+
+    booted, settled = asyncio.run(run())
+    assert booted < 0.05
+    assert settled < 0.5
+
+    health = services.health()
+    assert health["status"] == "degraded"
+    assert health["services"]["ready"]["state"] == "ready"
+    assert health["services"]["hangs"]["error"] == "timed out after 0.2s"
+    assert health["services"]["fails"]["error"] == "connection refused"
+    assert services["ready"].value == "ok"
+
+
+def test_ensure_initializes_lazily_and_retries() -> None:
+    services = ServiceRegistry(retry_interval=0.0)
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ConnectionError("daemon not running")
+        return "up"
+
+    handle = services.register("ipfs", flaky)
+    assert services.health()["services"]["ipfs"]["state"] == "pending"
+
+    async def run():
+        first = await asyncio.gather(*(services.ensure("ipfs") for _ in range(5)))
+        return first, await services.ensure("ipfs"), await services.ensure("ipfs")
+
+    first, second, third = asyncio.run(run())
+    assert first == [False] * 5
+    assert second and third
+    assert len(calls) == 2
+    assert handle.status()["attempts"] == 2
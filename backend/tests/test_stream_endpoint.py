@@ -0,0 +1,110 @@
+import asyncio
+import importlib
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="module")
+def main(tmp_path_factory):
+    state = tmp_path_factory.mktemp("main")
+    with pytest.MonkeyPatch.context() as env:
+        env.setenv("FLAG_OUTBOX_PATH", str(state / "flag_outbox.db"))
+        env.setenv("EVIDENCE_CACHE_PATH", str(state / "evidence_cache.db"))
+        env.setenv("GRAPH_STORE_PATH", str(state / "last_graph.amlg"))
+        env.setenv("STREAM_BATCH_SIZE", "2")
+        yield importlib.import_module("main")
+
+
+def _ndjson(records: list) -> bytes:
+    return b"".join(
+        (record if isinstance(record, bytes) else json.dumps(record).encode()) + b"\n"
+        for record in records
+    )
+
+
+def _events(response) -> list:
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+RING = [
+    {"sender_id": "A", "receiver_id": "B", "amount": 5000, "timestamp": "2024-01-01T00:00:00Z"},
+    {"sender_id": "B", "receiver_id": "C", "amount": "5000.5", "timestamp": "2024-01-01T00:01:00Z"},
+    {"sender_id": "C", "receiver_id": "A", "amount": 4900, "timestamp": "2024-01-01T00:02:00Z"},
+]
+
+
+def test_bad_lines_get_error_events_and_the_rest_of_their_batch_is_analysed(main) -> None:
+    body = _ndjson([
+        RING[0],
+        {"sender_id": "X", "receiver_id": None, "amount": 1},
+        RING[1],
+        {"sender_id": "X", "receiver_id": "Y", "amount": "abc"},
+        b"not json",
+        {"sender_id": 7, "receiver_id": "Y", "amount": 1},
+        {"sender_id": "X", "receiver_id": "Y", "amount": True},
+        {"sender_id": "X", "receiver_id": "Y"},
+        RING[2],
+    ])
+    # Chunks that split lines mid-way
+    chunks = (body[i:i + 7] for i in range(0, len(body), 7))
+    response = TestClient(main.app).post("/stream/transactions?reset=true", content=chunks)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    events = _events(response)
+    assert [(event["line"], event["event"]) for event in events if "line" in event] == [
+        (2, "error"), (4, "error"), (5, "error"), (6, "error"), (7, "error"), (8, "error")
+    ]
+    rings = [event for event in events if event["event"] == "fraud_ring"]
+    assert [sorted(ring["member_accounts"]) for ring in rings] == [["A", "B", "C"]]
+    summary = events[-1]
+    assert summary["event"] == "summary"
+    assert summary["transactions_received"] == 3
+    assert summary["accounts"] == 3
+    assert main.analysis_session.G["B"]["C"]["amount"] == 5000.5
+
+
+def test_events_stream_back_while_the_request_body_is_still_being_read(main) -> None:
+    # DuplexStreamingResponse: the handler keeps receiving body messages after
+    # its first event went out, instead of a disconnect listener eating them
+    async def run():
+        inbox: asyncio.Queue = asyncio.Queue()
+        sent = []
+        first_event = asyncio.Event()
+
+        async def receive():
+            return await inbox.get()
+
+        async def send(message):
+            sent.append(message)
+            if message["type"] == "http.response.body" and message.get("body"):
+                first_event.set()
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "POST", "scheme": "http", "path": "/stream/transactions",
+            "raw_path": b"/stream/transactions", "root_path": "", "query_string": b"reset=true",
+            "headers": [(b"content-type", b"application/x-ndjson")],
+            "client": ("testclient", 50000), "server": ("testserver", 80),
+        }
+        app = asyncio.create_task(main.app(scope, receive, send))
+        await inbox.put({"type": "http.request", "body": b"not json\n", "more_body": True})
+        await asyncio.wait_for(first_event.wait(), timeout=5)
+        await inbox.put({"type": "http.request", "body": _ndjson(RING), "more_body": False})
+        await asyncio.wait_for(app, timeout=5)
+        return sent
+
+    sent = asyncio.run(run())
+    body = b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+    events = [json.loads(line) for line in body.splitlines()]
+    assert events[0] == {"event": "error", "line": 1, "detail": events[0]["detail"]}
+    assert events[-1]["event"] == "summary"
+    assert events[-1]["transactions_received"] == 3
+
+
+def test_lifespan_starts_and_joins_the_flag_worker(main) -> None:
+    with TestClient(main.app):
+        assert main.flag_worker._thread.is_alive()
+    assert not main.flag_worker._thread.is_alive()
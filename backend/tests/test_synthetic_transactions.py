@@ -0,0 +1,120 @@
+import os
+
+import networkx as nx
+
+import benchmark_analyzer
+import graph_analyzer
+from graph_analyzer import detect_mule_rings, detect_shell_networks, detect_smurfing
+from synthetic_transactions import generate_transactions, planted_mules, traps
+
+
+def _graph(df) -> nx.DiGraph:
+    return nx.from_pandas_edgelist(df, "sender_id", "receiver_id", create_using=nx.DiGraph)
+
+
+def test_generator_is_seeded() -> None:
+    first, truth = generate_transactions(2000, seed=3)
+    again, truth_again = generate_transactions(2000, seed=3)
+    other, _ = generate_transactions(2000, seed=4)
+
+    assert len(first) == 2000
+    assert list(first.columns) == ["transaction_id", "sender_id", "receiver_id", "amount", "timestamp"]
+    assert first.equals(again) and truth == truth_again
+    assert not first.equals(other)
+    assert (first["sender_id"] != first["receiver_id"]).all()
+    assert first["timestamp"].is_monotonic_increasing
+
+
+def test_planted_patterns_are_in_the_graph() -> None:
+    df, truth = generate_transactions(4000, seed=1)
+    G = _graph(df)
+
+    found_cycles = {frozenset(cycle) for cycle in detect_mule_rings(G)}
+    assert all(frozenset(ring) in found_cycles for ring in truth["cycles"])
+
+    smurfing = set(detect_smurfing(G))
+    assert {p["collector"] for p in truth["fan_ins"]} <= smurfing
+    assert {p["distributor"] for p in truth["fan_outs"]} <= smurfing
+    # Collectors and distributors also sit on a loop, cycle members on a shell chain
+    for p in truth["fan_ins"] + truth["fan_outs"]:
+        assert frozenset(p["ring"]) in found_cycles
+    chains = detect_shell_networks(G)
+    for ring in truth["cycles"]:
+        assert all(any(account in chain[1:] for chain in chains) for account in ring)
+    for chain in truth["shell_chains"]:
+        assert nx.is_path(G, chain)
+        assert all(G.degree(account) <= 3 for account in chain[1:-1])
+    for merchant in truth["merchants"]:
+        assert G.in_degree(merchant) >= 12
+    assert set(traps(truth)).isdisjoint(planted_mules(truth))
+
+
+def test_analysis_flags_every_planted_mule() -> None:
+    df, truth = generate_transactions(1000)
+    output, _ = graph_analyzer.analyze_transactions(df.to_csv(index=False).encode())
+
+    flagged = {account["account_id"] for account in output["suspicious_accounts"]}
+    assert set(planted_mules(truth)) <= flagged
+
+
+def test_stage_recorder_times_every_stage() -> None:
+    with open(os.path.join(os.path.dirname(__file__), "..", "sample_transactions.csv"), "rb") as f:
+        csv_data = f.read()
+
+    with benchmark_analyzer.record_stages() as stats:
+        output, _ = graph_analyzer.analyze_transactions(csv_data)
+
+    assert all(stats[stage]["calls"] >= 1 for stage in benchmark_analyzer.STAGES if stage != "calculate_risk_score")
+    assert stats["detect_mule_rings"]["calls"] == 1
+    # Wrappers are removed afterwards
+    assert graph_analyzer.detect_mule_rings is detect_mule_rings
+    assert "summary" in output
+
+
+def test_compare_flags_regressions() -> None:
+    baseline = {
+        "rows": 1000,
+        "total_seconds": 2.0,
+        "peak_mb": 100.0,
+        "stages": {"detect_mule_rings": {"seconds": 1.0}, "detect_smurfing": {"seconds": 0.001}},
+        "planted_flagged": 5,
+    }
+    same = dict(baseline, stages={"detect_mule_rings": {"seconds": 1.1}, "detect_smurfing": {"seconds": 0.01}})
+    assert benchmark_analyzer.compare([same], {"1000": baseline}) == []
+
+    slower = dict(
+        baseline,
+        total_seconds=3.0,
+        peak_mb=150.0,
+        stages={"detect_mule_rings": {"seconds": 2.0}, "detect_smurfing": {"seconds": 0.01}},
+        planted_flagged=4,
+    )
+    regressions = benchmark_analyzer.compare([slower], {"1000": baseline})
+    assert len(regressions) == 4
+    assert any("detect_mule_rings" in message for message in regressions)
+
+    timed_out = {"rows": 1000, "timed_out": True, "timeout_seconds": 60}
+    assert benchmark_analyzer.compare([timed_out], {"1000": baseline}) == ["1,000 rows: did not finish (timed out)"]
+    assert benchmark_analyzer.compare([slower], {}) == []
+
+
+def test_compare_gates_planted_mule_recall() -> None:
+    baseline = {"rows": 1000, "seed": 0, "total_seconds": 2.0, "stages": {}, "planted_mules": 6, "planted_flagged": 6}
+    assert benchmark_analyzer.compare([baseline], {"1000": baseline}) == []
+
+    missed = dict(baseline, planted_flagged=4)
+    assert benchmark_analyzer.compare([missed], {"1000": baseline}) == [
+        "1,000 rows: flagged 4 planted mules (baseline 6)",
+        "1,000 rows: flagged 4/6 planted mules (minimum recall 80%)",
+    ]
+    # Another seed plants other mules: only the recall floor applies
+    other_seed = dict(baseline, seed=3, planted_mules=5, planted_flagged=4)
+    assert benchmark_analyzer.compare([other_seed], {"1000": baseline}) == []
+    assert len(benchmark_analyzer.compare([other_seed], {"1000": baseline}, min_recall=0.9)) == 1
+
+
+def test_committed_baselines_detect_planted_mules() -> None:
+    baselines = benchmark_analyzer.load_baselines()
+    assert baselines
+    for rows, baseline in baselines.items():
+        assert baseline["planted_flagged"] >= benchmark_analyzer.MIN_PLANTED_RECALL * baseline["planted_mules"] > 0, rows
@@ -0,0 +1,42 @@
+import pandas as pd
+
+from windowed_graph import WindowedGraph
+
+HOUR = 3600.0
+
+
+def _add(graph: WindowedGraph, rows: list) -> tuple:
+    df = pd.DataFrame([{"sender_id": s, "receiver_id": r, "amount": a} for s, r, a, _ in rows])
+    new_edges = graph.add(df, [hours * HOUR for _, _, _, hours in rows])
+    return new_edges, graph.advance()
+
+
+def test_edge_totals_cover_the_window_only() -> None:
+    graph = WindowedGraph(window_seconds=24 * HOUR, buckets=24)
+    new_edges, expired = _add(graph, [("A", "B", 100.0, 1), ("A", "B", 50.0, 10), ("B", "C", 5.0, 11)])
+    assert new_edges == [("A", "B"), ("B", "C")] and expired == []
+
+    # Clock at hour 30: the hour-1 transfer has left the window, hour 10 has not
+    _, expired = _add(graph, [("C", "D", 1.0, 30)])
+    assert expired == []
+    assert graph.G["A"]["B"]["amount"] == 50.0 and graph.G["A"]["B"]["count"] == 1
+
+    _, expired = _add(graph, [("C", "D", 1.0, 36)])
+    assert expired == [("A", "B"), ("B", "C")]
+    assert graph.G.degree("B") == 0 and graph.G["C"]["D"]["count"] == 2
+    assert graph.expired_edges == 2
+
+
+def test_out_of_order_and_late_transactions() -> None:
+    graph = WindowedGraph(window_seconds=24 * HOUR, buckets=24)
+    _add(graph, [("A", "B", 1.0, 20)])
+    # Older than the edge's newest bucket but inside the window: kept, and it expires first
+    _add(graph, [("A", "B", 2.0, 5), ("X", "Y", 1.0, 21)])
+    assert [bucket[0] for bucket in graph.G["A"]["B"]["buckets"]] == [5, 20]
+
+    _add(graph, [("X", "Y", 1.0, 30)])
+    assert graph.G["A"]["B"]["amount"] == 1.0
+    # Already outside the window when it arrives
+    new_edges, _ = _add(graph, [("P", "Q", 1.0, 2)])
+    assert new_edges == [] and graph.late_transactions == 1
+    assert graph.G.number_of_edges() == 2
@@ -0,0 +1,149 @@
+"""
+Windowed Graph Module
+Transaction DiGraph over a sliding time window: per-edge bucketed amount and
+count aggregates that expire with the window, so degrees (velocity,
+smurfing) and edge totals describe recent activity only
+"""
+import heapq
+import math
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import networkx as nx
+import pandas as pd
+
+from graph_analyzer import transaction_columns, transaction_timestamps
+
+# Buckets per window: expiry is exact to window_seconds / WINDOW_BUCKETS
+WINDOW_BUCKETS = 24
+
+
+class WindowedGraph:
+    """
+    Sliding-window transaction graph
+
+    G is a plain nx.DiGraph, so every detector runs on it unchanged. Each edge
+    keeps its transactions as [bucket, amount, count] aggregates (at most
+    one per bucket, oldest first) and its 'amount' / 'count' attributes are
+    the sums over the live buckets. Time is the newest transaction timestamp
+    seen, so replayed history expires exactly as it would have live.
+
+    advance() drops the buckets that ended before the window start and
+    removes edges left without any; an expiry heap holds one live entry per
+    edge (its oldest bucket), so advancing costs only the expiring buckets.
+    Memory is bounded by the edges active within the window.
+    """
+
+    def __init__(self, window_seconds: float, buckets: int = WINDOW_BUCKETS):
+        self.G = nx.DiGraph()
+        self.window_seconds = float(window_seconds)
+        self.bucket_seconds = self.window_seconds / buckets
+        self.clock: Optional[float] = None
+        self.expired_edges = 0
+        self.late_transactions = 0
+        # (oldest bucket, sender, receiver); entries whose bucket no longer
+        # matches the edge's 'queued' bucket are stale and skipped
+        self._expiry: List[Tuple[int, str, str]] = []
+
+    @property
+    def first_live_bucket(self) -> Optional[int]:
+        """Buckets before this one have ended before the window start"""
+        if self.clock is None:
+            return None
+        return int((self.clock - self.window_seconds) // self.bucket_seconds)
+
+    def add(self, df: pd.DataFrame, timestamps: List[float]) -> List[Tuple[str, str]]:
+        """
+        Add transactions at the given epoch-second timestamps
+
+        Moves the clock to the newest timestamp first; rows that already fall
+        outside the window are counted in late_transactions and dropped.
+        Call advance() afterwards to expire what the clock moved past.
+
+        Returns:
+            The edges that did not exist before, in insertion order
+        """
+        if timestamps:
+            newest = max(timestamps)
+            self.clock = newest if self.clock is None else max(self.clock, newest)
+        first_live = self.first_live_bucket
+        new_edges = []
+        for from_acc, to_acc, amount, timestamp in zip(*transaction_columns(df), timestamps):
+            bucket = int(timestamp // self.bucket_seconds)
+            if bucket < first_live:
+                self.late_transactions += 1
+                continue
+
+            if self.G.has_edge(from_acc, to_acc):
+                data = self.G[from_acc][to_acc]
+                data['amount'] += amount
+                data['count'] += 1
+                data['last_seen'] = max(data['last_seen'], timestamp)
+                self._add_to_bucket(from_acc, to_acc, data, bucket, amount)
+            else:
+                self.G.add_edge(
+                    from_acc, to_acc, amount=amount, count=1, last_seen=timestamp,
+                    buckets=[[bucket, amount, 1]], queued=bucket
+                )
+                heapq.heappush(self._expiry, (bucket, from_acc, to_acc))
+                new_edges.append((from_acc, to_acc))
+        return new_edges
+
+    def _add_to_bucket(self, sender: str, receiver: str, data: Dict[str, Any], bucket: int, amount: float) -> None:
+        buckets = data['buckets']
+        if bucket > buckets[-1][0]:
+            buckets.append([bucket, amount, 1])
+            return
+        # Out-of-order transaction: find or insert its bucket (lists are short)
+        index = len(buckets) - 1
+        while index >= 0 and buckets[index][0] > bucket:
+            index -= 1
+        if index >= 0 and buckets[index][0] == bucket:
+            buckets[index][1] += amount
+            buckets[index][2] += 1
+            return
+        buckets.insert(index + 1, [bucket, amount, 1])
+        if bucket < data['queued']:
+            data['queued'] = bucket
+            heapq.heappush(self._expiry, (bucket, sender, receiver))
+
+    def advance(self) -> List[Tuple[str, str]]:
+        """
+        Expire the buckets that ended before the window start
+
+        Returns:
+            The edges removed because none of their buckets are live
+        """
+        first_live = self.first_live_bucket
+        expired = []
+        if first_live is None:
+            return expired
+        while self._expiry and self._expiry[0][0] < first_live:
+            bucket, sender, receiver = heapq.heappop(self._expiry)
+            if not self.G.has_edge(sender, receiver):
+                continue
+            data = self.G[sender][receiver]
+            if data['queued'] != bucket:
+                continue
+            buckets = data['buckets']
+            while buckets and buckets[0][0] < first_live:
+                _, amount, count = buckets.pop(0)
+                data['amount'] -= amount
+                data['count'] -= count
+            if buckets:
+                data['queued'] = buckets[0][0]
+                heapq.heappush(self._expiry, (buckets[0][0], sender, receiver))
+            else:
+                self.G.remove_edge(sender, receiver)
+                expired.append((sender, receiver))
+        self.expired_edges += len(expired)
+        return expired
+
+    @staticmethod
+    def timestamps(df: pd.DataFrame) -> List[float]:
+        """Epoch seconds per row (the timestamp column; now where missing or unparseable)"""
+        now = time.time()
+        parsed = transaction_timestamps(df)
+        if parsed is None:
+            return [now] * len(df)
+        return [now if math.isnan(timestamp) else timestamp for timestamp in parsed]
@@ -1,15 +1,76 @@
-from algopy import ARC4Contract, String, UInt64, Global, Bytes, op
+from algopy import ARC4Contract, String, UInt64, Global, Bytes, op, subroutine, urange
+from algopy import arc4
 from algopy.arc4 import abimethod, Struct
 
 
+# Max wallets per register_wallets_batch call: each wallet needs 1 box
+# reference (its profile box), and an app call may carry 8
+MAX_BATCH_SIZE = 8
+
+# Profile box = WalletRiskProfile (13 bytes) + the evidence CID as a raw
+# 34-byte sha2-256 multihash (zeros when there is no CID) = 47 bytes
+PROFILE_HEADER_SIZE = 13
+MULTIHASH_LENGTH = 34
+
+# risk_and_flag byte: bits 0-6 hold the 0-100 risk score, bit 7 is_flagged
+FLAG_BIT = 0x80
+RISK_MASK = 0x7F
+FLAG_THRESHOLD = 70
+UINT32_MAX = 0xFFFFFFFF
+
+
 class WalletRiskProfile(Struct):
-    """Risk profile for a wallet address stored on-chain with IPFS reference"""
-    risk_score: UInt64  # 0-100 scale
-    transaction_count: UInt64
-    flagged_connections: UInt64
-    last_updated: UInt64  # Timestamp
-    is_flagged: UInt64  # 0 = false, 1 = true (using UInt64 for storage)
-    ipfs_hash_length: UInt64  # Length of IPFS hash stored separately
+    """Compact risk profile for a wallet, followed in its box by the IPFS multihash"""
+    risk_and_flag: arc4.UInt8  # risk score (bits 0-6) | is_flagged (bit 7)
+    transaction_count: arc4.UInt32
+    flagged_connections: arc4.UInt32
+    last_updated: arc4.UInt32  # Timestamp (seconds, fits until 2106)
+
+
+@subroutine
+def _risk_and_flag(risk_score: UInt64, is_flagged: bool) -> arc4.UInt8:
+    assert risk_score <= 100, "Risk score must be between 0 and 100"
+    return arc4.UInt8((risk_score | FLAG_BIT) if is_flagged else risk_score)
+
+
+@subroutine
+def _profile_box(
+    risk_score: UInt64,
+    transaction_count: UInt64,
+    flagged_connections: UInt64,
+    ipfs_multihash: Bytes,
+) -> Bytes:
+    """Encode a wallet's profile box (struct + CID multihash)"""
+    assert transaction_count <= UINT32_MAX, "transaction_count must fit in uint32"
+    assert flagged_connections <= UINT32_MAX, "flagged_connections must fit in uint32"
+    profile = WalletRiskProfile(
+        risk_and_flag=_risk_and_flag(risk_score, risk_score >= FLAG_THRESHOLD),
+        transaction_count=arc4.UInt32(transaction_count),
+        flagged_connections=arc4.UInt32(flagged_connections),
+        last_updated=arc4.UInt32(Global.latest_timestamp),
+    )
+    return op.concat(profile.bytes, ipfs_multihash)
+
+
+@subroutine
+def _checked_multihash(ipfs_multihash: Bytes) -> Bytes:
+    """A 34-byte multihash, or zeros for "no CID" (empty argument)"""
+    if ipfs_multihash.length == 0:
+        return op.bzero(MULTIHASH_LENGTH)
+    assert ipfs_multihash.length == MULTIHASH_LENGTH, "IPFS hash must be a 34-byte multihash"
+    return ipfs_multihash
+
+
+@subroutine
+def _read_profile(hashed_id: Bytes) -> WalletRiskProfile:
+    profile_bytes, exists = op.Box.get(hashed_id)
+    assert exists, "Wallet not registered"
+    return WalletRiskProfile.from_bytes(op.extract(profile_bytes, 0, PROFILE_HEADER_SIZE))
+
+
+@subroutine
+def _write_profile(hashed_id: Bytes, profile: WalletRiskProfile) -> None:
+    op.Box.replace(hashed_id, 0, profile.bytes)
 
 
 class AmlRegistry(ARC4Contract):
@@ -26,7 +87,7 @@ class AmlRegistry(ARC4Contract):
         risk_score: UInt64,
         transaction_count: UInt64,
         flagged_connections: UInt64,
-        ipfs_hash: String,
+        ipfs_multihash: Bytes,
     ) -> String:
         """
         Register a new wallet with its risk profile and IPFS pointer
@@ -36,35 +97,59 @@ class AmlRegistry(ARC4Contract):
             risk_score: 0-100 risk score
             transaction_count: Number of transactions
             flagged_connections: Number of flagged connections
-            ipfs_hash: IPFS hash (CID) pointing to detailed mule data
+            ipfs_multihash: Raw multihash (34 bytes) of the IPFS CID pointing to
+                detailed mule data, or empty if there is none
         
         Blockchain stores: minimal flag + IPFS pointer (Soul Bound - immutable)
         IPFS stores: detailed transaction history, graph data, full analysis
         """
-        # Validate risk score is in range
-        assert risk_score <= 100, "Risk score must be between 0 and 100"
-        
-        # Create wallet risk profile
-        is_flagged_value = UInt64(1) if risk_score >= 70 else UInt64(0)
-        
-        profile = WalletRiskProfile(
-            risk_score=risk_score,
-            transaction_count=transaction_count,
-            flagged_connections=flagged_connections,
-            last_updated=Global.latest_timestamp,
-            is_flagged=is_flagged_value,
-            ipfs_hash_length=ipfs_hash.bytes.length,
+        # One box per wallet (key: hashed_id): profile + CID multihash
+        op.Box.put(
+            hashed_id,
+            _profile_box(risk_score, transaction_count, flagged_connections, _checked_multihash(ipfs_multihash)),
         )
         
-        # Store profile in box storage (key: hashed_id)
-        op.Box.put(hashed_id, profile.bytes)
-        
-        # Store IPFS hash in a separate box (key: hashed_id + "_ipfs")
-        ipfs_key = op.concat(hashed_id, Bytes(b"_ipfs"))
-        op.Box.put(ipfs_key, ipfs_hash.bytes)
-        
         return String("Wallet flagged - Soul Bound Token created with IPFS reference")
 
+    @abimethod
+    def register_wallets_batch(
+        self,
+        hashed_ids: arc4.DynamicArray[arc4.DynamicBytes],
+        risk_scores: arc4.DynamicArray[arc4.UInt64],
+        transaction_counts: arc4.DynamicArray[arc4.UInt64],
+        flagged_connections: arc4.DynamicArray[arc4.UInt64],
+        ipfs_multihash: Bytes,
+    ) -> String:
+        """
+        Register several wallets in one call, all pointing at the same evidence CID
+        
+        Args:
+            hashed_ids: SHA-256 hashes of the account IDs
+            risk_scores: 0-100 risk scores (same order as hashed_ids)
+            transaction_counts: Number of transactions (same order)
+            flagged_connections: Number of flagged connections (same order)
+            ipfs_multihash: Raw multihash of the batch's evidence bundle CID (or empty)
+        """
+        count = hashed_ids.length
+        assert count <= MAX_BATCH_SIZE, "Too many wallets for one batch call"
+        assert risk_scores.length == count, "risk_scores length mismatch"
+        assert transaction_counts.length == count, "transaction_counts length mismatch"
+        assert flagged_connections.length == count, "flagged_connections length mismatch"
+        
+        multihash = _checked_multihash(ipfs_multihash)
+        for i in urange(count):
+            op.Box.put(
+                hashed_ids[i].native,
+                _profile_box(
+                    risk_scores[i].native,
+                    transaction_counts[i].native,
+                    flagged_connections[i].native,
+                    multihash,
+                ),
+            )
+        
+        return String("Wallets flagged - Soul Bound Tokens created with shared IPFS reference")
+
     @abimethod
     def update_risk_score(
         self,
@@ -74,19 +159,14 @@ class AmlRegistry(ARC4Contract):
         """
         Update risk score for an existing wallet
         """
-        assert new_risk_score <= 100, "Risk score must be between 0 and 100"
-        
-        # Retrieve existing profile
-        profile_bytes, _exists = op.Box.get(hashed_id)
-        profile = WalletRiskProfile.from_bytes(profile_bytes)
+        profile = _read_profile(hashed_id)
         
         # Update risk score and flag status
-        profile.risk_score = new_risk_score
-        profile.is_flagged = UInt64(1) if new_risk_score >= 70 else UInt64(0)
-        profile.last_updated = Global.latest_timestamp
+        profile.risk_and_flag = _risk_and_flag(new_risk_score, new_risk_score >= FLAG_THRESHOLD)
+        profile.last_updated = arc4.UInt32(Global.latest_timestamp)
         
-        # Save updated profile
-        op.Box.put(hashed_id, profile.bytes)
+        # Save updated profile (the CID after it is left untouched)
+        _write_profile(hashed_id, profile)
         
         return String("Risk score updated")
 
@@ -95,38 +175,36 @@ class AmlRegistry(ARC4Contract):
         """
         Retrieve risk profile for a wallet by its hashed ID
         """
-        profile_bytes, _exists = op.Box.get(hashed_id)
-        return WalletRiskProfile.from_bytes(profile_bytes)
+        return _read_profile(hashed_id)
     
     @abimethod
-    def get_ipfs_hash(self, hashed_id: Bytes) -> String:
+    def get_ipfs_hash(self, hashed_id: Bytes) -> Bytes:
         """
-        Retrieve IPFS hash (CID) for detailed mule data
+        Retrieve the IPFS multihash for detailed mule data
         
-        Returns the IPFS hash where full transaction history and analysis are stored
+        Returns the raw 34-byte multihash of the CID where full transaction
+        history and analysis are stored (base58-encode it for the "Qm..." CID)
         Frontend can fetch this to display graph visualizations
         """
-        ipfs_key = op.concat(hashed_id, Bytes(b"_ipfs"))
-        ipfs_hash_bytes, _exists = op.Box.get(ipfs_key)
-        return String.from_bytes(ipfs_hash_bytes)
+        profile_bytes, exists = op.Box.get(hashed_id)
+        assert exists, "Wallet not registered"
+        return op.extract(profile_bytes, PROFILE_HEADER_SIZE, MULTIHASH_LENGTH)
 
     @abimethod
     def flag_wallet(self, hashed_id: Bytes) -> String:
         """
         Manually flag a wallet for suspicious activity
         """
-        profile_bytes, _exists = op.Box.get(hashed_id)
-        profile = WalletRiskProfile.from_bytes(profile_bytes)
-        
-        # Set flag to true
-        profile.is_flagged = UInt64(1)
-        profile.last_updated = Global.latest_timestamp
+        profile = _read_profile(hashed_id)
         
-        # If not already high risk, set to 70 (flagged threshold)
-        if profile.risk_score < 70:
-            profile.risk_score = UInt64(70)
+        # Set flag to true; if not already high risk, set to 70 (flagged threshold)
+        risk_score = profile.risk_and_flag.native & RISK_MASK
+        if risk_score < FLAG_THRESHOLD:
+            risk_score = UInt64(FLAG_THRESHOLD)
+        profile.risk_and_flag = _risk_and_flag(risk_score, True)
+        profile.last_updated = arc4.UInt32(Global.latest_timestamp)
         
-        op.Box.put(hashed_id, profile.bytes)
+        _write_profile(hashed_id, profile)
         
         return String("Wallet flagged for AML review")
 
@@ -136,18 +214,16 @@ class AmlRegistry(ARC4Contract):
         Check if a wallet is flagged (returns 1 for true, 0 for false)
         Used by Bank B to screen new customers
         """
-        profile_bytes, _exists = op.Box.get(hashed_id)
-        profile = WalletRiskProfile.from_bytes(profile_bytes)
-        return profile.is_flagged
+        profile = _read_profile(hashed_id)
+        return UInt64(1) if profile.risk_and_flag.native & FLAG_BIT else UInt64(0)
 
     @abimethod
     def get_risk_score(self, hashed_id: Bytes) -> UInt64:
         """
         Get just the risk score for a wallet (0-100)
         """
-        profile_bytes, _exists = op.Box.get(hashed_id)
-        profile = WalletRiskProfile.from_bytes(profile_bytes)
-        return profile.risk_score
+        profile = _read_profile(hashed_id)
+        return profile.risk_and_flag.native & RISK_MASK
 
     @abimethod
     def hello(self, name: String) -> String:
@@ -19,7 +19,7 @@ from algosdk.v2client.models import SimulateTraceConfig
 import algokit_utils
 from algokit_utils import AlgorandClient as _AlgoKitAlgorandClient
 
-_APP_SPEC_JSON = r"""{"arcs": [22, 28], "bareActions": {"call": [], "create": ["NoOp"]}, "methods": [{"actions": {"call": ["NoOp"], "create": []}, "args": [{"type": "byte[]", "desc": "SHA-256 hash of the account ID (or salted PAN)", "name": "hashed_id"}, {"type": "uint64", "desc": "0-100 risk score", "name": "risk_score"}, {"type": "uint64", "desc": "Number of transactions", "name": "transaction_count"}, {"type": "uint64", "desc": "Number of flagged connections", "name": "flagged_connections"}, {"type": "string", "desc": "IPFS hash (CID) pointing to detailed mule data", "name": "ipfs_hash"}], "name": "register_wallet", "returns": {"type": "string"}, "desc": "Register a new wallet with its risk profile and IPFS pointer", "events": [], "readonly": false, "recommendations": {}}, {"actions": {"call": ["NoOp"], "create": []}, "args": [{"type": "byte[]", "name": "hashed_id"}, {"type": "uint64", "name": "new_risk_score"}], "name": "update_risk_score", "returns": {"type": "string"}, "desc": "Update risk score for an existing wallet", "events": [], "readonly": false, "recommendations": {}}, {"actions": {"call": ["NoOp"], "create": []}, "args": [{"type": "byte[]", "name": "hashed_id"}], "name": "get_risk_profile", "returns": {"type": "(uint64,uint64,uint64,uint64,uint64,uint64)", "struct": "WalletRiskProfile"}, "desc": "Retrieve risk profile for a wallet by its hashed ID", "events": [], "readonly": false, "recommendations": {}}, {"actions": {"call": ["NoOp"], "create": []}, "args": [{"type": "byte[]", "name": "hashed_id"}], "name": "get_ipfs_hash", "returns": {"type": "string"}, "desc": "Retrieve IPFS hash (CID) for detailed mule data\nReturns the IPFS hash where full transaction history and analysis are stored Frontend can fetch this to display graph visualizations", "events": [], "readonly": false, "recommendations": {}}, {"actions": {"call": ["NoOp"], "create": []}, "args": [{"type": "byte[]", "name": "hashed_id"}], "name": "flag_wallet", "returns": {"type": "string"}, "desc": "Manually flag a wallet for suspicious activity", "events": [], "readonly": false, "recommendations": {}}, {"actions": {"call": ["NoOp"], "create": []}, "args": [{"type": "byte[]", "name": "hashed_id"}], "name": "is_wallet_flagged", "returns": {"type": "uint64"}, "desc": "Check if a wallet is flagged (returns 1 for true, 0 for false)\nUsed by Bank B to screen new customers", "events": [], "readonly": false, "recommendations": {}}, {"actions": {"call": ["NoOp"], "create": []}, "args": [{"type": "byte[]", "name": "hashed_id"}], "name": "get_risk_score", "returns": {"type": "uint64"}, "desc": "Get just the risk score for a wallet (0-100)", "events": [], "readonly": false, "recommendations": {}}, {"actions": {"call": ["NoOp"], "create": []}, "args": [{"type": "string", "name": "name"}], "name": "hello", "returns": {"type": "string"}, "desc": "Simple hello method for testing", "events": [], "readonly": false, "recommendations": {}}], "name": "AmlRegistry", "state": {"keys": {"box": {}, "global": {}, "local": {}}, "maps": {"box": {}, "global": {}, "local": {}}, "schema": {"global": {"bytes": 0, "ints": 0}, "local": {"bytes": 0, "ints": 0}}}, "structs": {"WalletRiskProfile": [{"name": "risk_score", "type": "uint64"}, {"name": "transaction_count", "type": "uint64"}, {"name": "flagged_connections", "type": "uint64"}, {"name": "last_updated", "type": "uint64"}, {"name": "is_flagged", "type": "uint64"}, {"name": "ipfs_hash_length", "type": "uint64"}]}, "byteCode": {"approval": "CyAEAAIBCCYCBBUffHUFX2lwZnMxG0EARzEZFEQxGESCCATaQ6gZBFS9zjAEWvbASgTRga2HBLkfY/0EQdN+QwTIhY2gBAK+zhE2GgCOCAAJALsBDAEkAUYBnAG3AdIAMRkUMRgUEEM2GgFJIlkjCEsBFRJEVwIANhoCSRUlEkQXNhoDSRUlEkQXNhoESRUlEkQXNhoFSSJZIwhLARUSRFcCAEsDgWQOREsDgUYPMgdLAhVPBhZPBhZQTwUWUE8CFlBPAhZQTBZQSwJMv0wpUEy/gEMVH3x1AD1XYWxsZXQgZmxhZ2dlZCAtIFNvdWwgQm91bmQgVG9rZW4gY3JlYXRlZCB3aXRoIElQRlMgcmVmZXJlbmNlsCRDNhoBSSJZIwhLARUSRFcCADYaAkkVJRJESRdJgWQOREsCvkhPAlwATIFGDxZcIDIHFlwYv4AYFR98dQASUmlzayBzY29yZSB1cGRhdGVksCRDNhoBSSJZIwhLARUSRFcCAL5IKExQsCRDNhoBSSJZIwhLARUSRFcCAClQvkhJFRZXBgJMUChMULAkQzYaAUkiWSMISwEVEkRXAgBJvkgkFlwgMgcWXBhJIluBRgxBAAWBRhZcAEsBTL+AIxUffHUAHVdhbGxldCBmbGFnZ2VkIGZvciBBTUwgcmV2aWV3sCRDNhoBSSJZIwhLARUSRFcCAL5IVyAIKExQsCRDNhoBSSJZIwhLARUSRFcCAL5IVwAIKExQsCRDNhoBSSJZIwhLARUSRFcCAIAHSGVsbG8sIExQSRUWVwYCTFAoTFCwJEM=", "clear": "C4EBQw=="}, "desc": "\n    Anti-Money Laundering Registry Smart Contract\n    Stores minimal flags on-chain with IPFS references to detailed data\n    Privacy-preserving: Uses SHA-256 hashed IDs + stores detailed data on IPFS\n    ", "events": [], "networks": {}, "source": {"approval": "I3ByYWdtYSB2ZXJzaW9uIDExCiNwcmFnbWEgdHlwZXRyYWNrIGZhbHNlCgovLyBhbGdvcHkuYXJjNC5BUkM0Q29udHJhY3QuYXBwcm92YWxfcHJvZ3JhbSgpIC0+IHVpbnQ2NDoKbWFpbjoKICAgIGludGNibG9jayAwIDIgMSA4CiAgICBieXRlY2Jsb2NrIDB4MTUxZjdjNzUgMHg1ZjY5NzA2NjczCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjE1CiAgICAvLyBjbGFzcyBBbWxSZWdpc3RyeShBUkM0Q29udHJhY3QpOgogICAgdHhuIE51bUFwcEFyZ3MKICAgIGJ6IG1haW5fX19hbGdvcHlfZGVmYXVsdF9jcmVhdGVAMTUKICAgIHR4biBPbkNvbXBsZXRpb24KICAgICEKICAgIGFzc2VydAogICAgdHhuIEFwcGxpY2F0aW9uSUQKICAgIGFzc2VydAogICAgcHVzaGJ5dGVzcyAweGRhNDNhODE5IDB4NTRiZGNlMzAgMHg1YWY2YzA0YSAweGQxODFhZDg3IDB4YjkxZjYzZmQgMHg0MWQzN2U0MyAweGM4ODU4ZGEwIDB4MDJiZWNlMTEgLy8gbWV0aG9kICJyZWdpc3Rlcl93YWxsZXQoYnl0ZVtdLHVpbnQ2NCx1aW50NjQsdWludDY0LHN0cmluZylzdHJpbmciLCBtZXRob2QgInVwZGF0ZV9yaXNrX3Njb3JlKGJ5dGVbXSx1aW50NjQpc3RyaW5nIiwgbWV0aG9kICJnZXRfcmlza19wcm9maWxlKGJ5dGVbXSkodWludDY0LHVpbnQ2NCx1aW50NjQsdWludDY0LHVpbnQ2NCx1aW50NjQpIiwgbWV0aG9kICJnZXRfaXBmc19oYXNoKGJ5dGVbXSlzdHJpbmciLCBtZXRob2QgImZsYWdfd2FsbGV0KGJ5dGVbXSlzdHJpbmciLCBtZXRob2QgImlzX3dhbGxldF9mbGFnZ2VkKGJ5dGVbXSl1aW50NjQiLCBtZXRob2QgImdldF9yaXNrX3Njb3JlKGJ5dGVbXSl1aW50NjQiLCBtZXRob2QgImhlbGxvKHN0cmluZylzdHJpbmciCiAgICB0eG5hIEFwcGxpY2F0aW9uQXJncyAwCiAgICBtYXRjaCByZWdpc3Rlcl93YWxsZXQgdXBkYXRlX3Jpc2tfc2NvcmUgZ2V0X3Jpc2tfcHJvZmlsZSBnZXRfaXBmc19oYXNoIGZsYWdfd2FsbGV0IGlzX3dhbGxldF9mbGFnZ2VkIGdldF9yaXNrX3Njb3JlIGhlbGxvCiAgICBlcnIKCm1haW5fX19hbGdvcHlfZGVmYXVsdF9jcmVhdGVAMTU6CiAgICB0eG4gT25Db21wbGV0aW9uCiAgICAhCiAgICB0eG4gQXBwbGljYXRpb25JRAogICAgIQogICAgJiYKICAgIHJldHVybgoKCi8vIHNtYXJ0X2NvbnRyYWN0cy5hbWxfcmVnaXN0cnkuY29udHJhY3QuQW1sUmVnaXN0cnkucmVnaXN0ZXJfd2FsbGV0W3JvdXRpbmddKCkgLT4gdm9pZDoKcmVnaXN0ZXJfd2FsbGV0OgogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToyMgogICAgLy8gQGFiaW1ldGhvZAogICAgdHhuYSBBcHBsaWNhdGlvbkFyZ3MgMQogICAgZHVwCiAgICBpbnRjXzAgLy8gMAogICAgZXh0cmFjdF91aW50MTYgLy8gb24gZXJyb3I6IGludmFsaWQgYXJyYXkgbGVuZ3RoIGhlYWRlcgogICAgaW50Y18xIC8vIDIKICAgICsKICAgIGRpZyAxCiAgICBsZW4KICAgID09CiAgICBhc3NlcnQgLy8gaW52YWxpZCBudW1iZXIgb2YgYnl0ZXMgZm9yIGFyYzQuZHluYW1pY19hcnJheTxhcmM0LnVpbnQ4PgogICAgZXh0cmFjdCAyIDAKICAgIHR4bmEgQXBwbGljYXRpb25BcmdzIDIKICAgIGR1cAogICAgbGVuCiAgICBpbnRjXzMgLy8gOAogICAgPT0KICAgIGFzc2VydCAvLyBpbnZhbGlkIG51bWJlciBvZiBieXRlcyBmb3IgYXJjNC51aW50NjQKICAgIGJ0b2kKICAgIHR4bmEgQXBwbGljYXRpb25BcmdzIDMKICAgIGR1cAogICAgbGVuCiAgICBpbnRjXzMgLy8gOAogICAgPT0KICAgIGFzc2VydCAvLyBpbnZhbGlkIG51bWJlciBvZiBieXRlcyBmb3IgYXJjNC51aW50NjQKICAgIGJ0b2kKICAgIHR4bmEgQXBwbGljYXRpb25BcmdzIDQKICAgIGR1cAogICAgbGVuCiAgICBpbnRjXzMgLy8gOAogICAgPT0KICAgIGFzc2VydCAvLyBpbnZhbGlkIG51bWJlciBvZiBieXRlcyBmb3IgYXJjNC51aW50NjQKICAgIGJ0b2kKICAgIHR4bmEgQXBwbGljYXRpb25BcmdzIDUKICAgIGR1cAogICAgaW50Y18wIC8vIDAKICAgIGV4dHJhY3RfdWludDE2IC8vIG9uIGVycm9yOiBpbnZhbGlkIGFycmF5IGxlbmd0aCBoZWFkZXIKICAgIGludGNfMSAvLyAyCiAgICArCiAgICBkaWcgMQogICAgbGVuCiAgICA9PQogICAgYXNzZXJ0IC8vIGludmFsaWQgbnVtYmVyIG9mIGJ5dGVzIGZvciBhcmM0LmR5bmFtaWNfYXJyYXk8YXJjNC51aW50OD4KICAgIGV4dHJhY3QgMiAwCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjQ0LTQ1CiAgICAvLyAjIFZhbGlkYXRlIHJpc2sgc2NvcmUgaXMgaW4gcmFuZ2UKICAgIC8vIGFzc2VydCByaXNrX3Njb3JlIDw9IDEwMCwgIlJpc2sgc2NvcmUgbXVzdCBiZSBiZXR3ZWVuIDAgYW5kIDEwMCIKICAgIGRpZyAzCiAgICBwdXNoaW50IDEwMAogICAgPD0KICAgIGFzc2VydCAvLyBSaXNrIHNjb3JlIG11c3QgYmUgYmV0d2VlbiAwIGFuZCAxMDAKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6NDctNDgKICAgIC8vICMgQ3JlYXRlIHdhbGxldCByaXNrIHByb2ZpbGUKICAgIC8vIGlzX2ZsYWdnZWRfdmFsdWUgPSBVSW50NjQoMSkgaWYgcmlza19zY29yZSA+PSA3MCBlbHNlIFVJbnQ2NCgwKQogICAgZGlnIDMKICAgIHB1c2hpbnQgNzAKICAgID49CiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjU0CiAgICAvLyBsYXN0X3VwZGF0ZWQ9R2xvYmFsLmxhdGVzdF90aW1lc3RhbXAsCiAgICBnbG9iYWwgTGF0ZXN0VGltZXN0YW1wCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjU2CiAgICAvLyBpcGZzX2hhc2hfbGVuZ3RoPWlwZnNfaGFzaC5ieXRlcy5sZW5ndGgsCiAgICBkaWcgMgogICAgbGVuCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjUwLTU3CiAgICAvLyBwcm9maWxlID0gV2FsbGV0Umlza1Byb2ZpbGUoCiAgICAvLyAgICAgcmlza19zY29yZT1yaXNrX3Njb3JlLAogICAgLy8gICAgIHRyYW5zYWN0aW9uX2NvdW50PXRyYW5zYWN0aW9uX2NvdW50LAogICAgLy8gICAgIGZsYWdnZWRfY29ubmVjdGlvbnM9ZmxhZ2dlZF9jb25uZWN0aW9ucywKICAgIC8vICAgICBsYXN0X3VwZGF0ZWQ9R2xvYmFsLmxhdGVzdF90aW1lc3RhbXAsCiAgICAvLyAgICAgaXNfZmxhZ2dlZD1pc19mbGFnZ2VkX3ZhbHVlLAogICAgLy8gICAgIGlwZnNfaGFzaF9sZW5ndGg9aXBmc19oYXNoLmJ5dGVzLmxlbmd0aCwKICAgIC8vICkKICAgIHVuY292ZXIgNgogICAgaXRvYgogICAgdW5jb3ZlciA2CiAgICBpdG9iCiAgICBjb25jYXQKICAgIHVuY292ZXIgNQogICAgaXRvYgogICAgY29uY2F0CiAgICB1bmNvdmVyIDIKICAgIGl0b2IKICAgIGNvbmNhdAogICAgdW5jb3ZlciAyCiAgICBpdG9iCiAgICBjb25jYXQKICAgIHN3YXAKICAgIGl0b2IKICAgIGNvbmNhdAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weTo1OS02MAogICAgLy8gIyBTdG9yZSBwcm9maWxlIGluIGJveCBzdG9yYWdlIChrZXk6IGhhc2hlZF9pZCkKICAgIC8vIG9wLkJveC5wdXQoaGFzaGVkX2lkLCBwcm9maWxlLmJ5dGVzKQogICAgZGlnIDIKICAgIHN3YXAKICAgIGJveF9wdXQKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6NjItNjMKICAgIC8vICMgU3RvcmUgSVBGUyBoYXNoIGluIGEgc2VwYXJhdGUgYm94IChrZXk6IGhhc2hlZF9pZCArICJfaXBmcyIpCiAgICAvLyBpcGZzX2tleSA9IG9wLmNvbmNhdChoYXNoZWRfaWQsIEJ5dGVzKGIiX2lwZnMiKSkKICAgIHN3YXAKICAgIGJ5dGVjXzEgLy8gMHg1ZjY5NzA2NjczCiAgICBjb25jYXQKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6NjQKICAgIC8vIG9wLkJveC5wdXQoaXBmc19rZXksIGlwZnNfaGFzaC5ieXRlcykKICAgIHN3YXAKICAgIGJveF9wdXQKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6MjIKICAgIC8vIEBhYmltZXRob2QKICAgIHB1c2hieXRlcyAweDE1MWY3Yzc1MDAzZDU3NjE2YzZjNjU3NDIwNjY2YzYxNjc2NzY1NjQyMDJkMjA1MzZmNzU2YzIwNDI2Zjc1NmU2NDIwNTQ2ZjZiNjU2ZTIwNjM3MjY1NjE3NDY1NjQyMDc3Njk3NDY4MjA0OTUwNDY1MzIwNzI2NTY2NjU3MjY1NmU2MzY1CiAgICBsb2cKICAgIGludGNfMiAvLyAxCiAgICByZXR1cm4KCgovLyBzbWFydF9jb250cmFjdHMuYW1sX3JlZ2lzdHJ5LmNvbnRyYWN0LkFtbFJlZ2lzdHJ5LnVwZGF0ZV9yaXNrX3Njb3JlW3JvdXRpbmddKCkgLT4gdm9pZDoKdXBkYXRlX3Jpc2tfc2NvcmU6CiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjY4CiAgICAvLyBAYWJpbWV0aG9kCiAgICB0eG5hIEFwcGxpY2F0aW9uQXJncyAxCiAgICBkdXAKICAgIGludGNfMCAvLyAwCiAgICBleHRyYWN0X3VpbnQxNiAvLyBvbiBlcnJvcjogaW52YWxpZCBhcnJheSBsZW5ndGggaGVhZGVyCiAgICBpbnRjXzEgLy8gMgogICAgKwogICAgZGlnIDEKICAgIGxlbgogICAgPT0KICAgIGFzc2VydCAvLyBpbnZhbGlkIG51bWJlciBvZiBieXRlcyBmb3IgYXJjNC5keW5hbWljX2FycmF5PGFyYzQudWludDg+CiAgICBleHRyYWN0IDIgMAogICAgdHhuYSBBcHBsaWNhdGlvbkFyZ3MgMgogICAgZHVwCiAgICBsZW4KICAgIGludGNfMyAvLyA4CiAgICA9PQogICAgYXNzZXJ0IC8vIGludmFsaWQgbnVtYmVyIG9mIGJ5dGVzIGZvciBhcmM0LnVpbnQ2NAogICAgZHVwCiAgICBidG9pCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5Ojc3CiAgICAvLyBhc3NlcnQgbmV3X3Jpc2tfc2NvcmUgPD0gMTAwLCAiUmlzayBzY29yZSBtdXN0IGJlIGJldHdlZW4gMCBhbmQgMTAwIgogICAgZHVwCiAgICBwdXNoaW50IDEwMAogICAgPD0KICAgIGFzc2VydCAvLyBSaXNrIHNjb3JlIG11c3QgYmUgYmV0d2VlbiAwIGFuZCAxMDAKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6NzktODAKICAgIC8vICMgUmV0cmlldmUgZXhpc3RpbmcgcHJvZmlsZQogICAgLy8gcHJvZmlsZV9ieXRlcywgX2V4aXN0cyA9IG9wLkJveC5nZXQoaGFzaGVkX2lkKQogICAgZGlnIDIKICAgIGJveF9nZXQKICAgIHBvcAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weTo4My04NAogICAgLy8gIyBVcGRhdGUgcmlzayBzY29yZSBhbmQgZmxhZyBzdGF0dXMKICAgIC8vIHByb2ZpbGUucmlza19zY29yZSA9IG5ld19yaXNrX3Njb3JlCiAgICB1bmNvdmVyIDIKICAgIHJlcGxhY2UyIDAKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6ODUKICAgIC8vIHByb2ZpbGUuaXNfZmxhZ2dlZCA9IFVJbnQ2NCgxKSBpZiBuZXdfcmlza19zY29yZSA+PSA3MCBlbHNlIFVJbnQ2NCgwKQogICAgc3dhcAogICAgcHVzaGludCA3MAogICAgPj0KICAgIGl0b2IKICAgIHJlcGxhY2UyIDMyCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5Ojg2CiAgICAvLyBwcm9maWxlLmxhc3RfdXBkYXRlZCA9IEdsb2JhbC5sYXRlc3RfdGltZXN0YW1wCiAgICBnbG9iYWwgTGF0ZXN0VGltZXN0YW1wCiAgICBpdG9iCiAgICByZXBsYWNlMiAyNAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weTo4OC04OQogICAgLy8gIyBTYXZlIHVwZGF0ZWQgcHJvZmlsZQogICAgLy8gb3AuQm94LnB1dChoYXNoZWRfaWQsIHByb2ZpbGUuYnl0ZXMpCiAgICBib3hfcHV0CiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjY4CiAgICAvLyBAYWJpbWV0aG9kCiAgICBwdXNoYnl0ZXMgMHgxNTFmN2M3NTAwMTI1MjY5NzM2YjIwNzM2MzZmNzI2NTIwNzU3MDY0NjE3NDY1NjQKICAgIGxvZwogICAgaW50Y18yIC8vIDEKICAgIHJldHVybgoKCi8vIHNtYXJ0X2NvbnRyYWN0cy5hbWxfcmVnaXN0cnkuY29udHJhY3QuQW1sUmVnaXN0cnkuZ2V0X3Jpc2tfcHJvZmlsZVtyb3V0aW5nXSgpIC0+IHZvaWQ6CmdldF9yaXNrX3Byb2ZpbGU6CiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjkzCiAgICAvLyBAYWJpbWV0aG9kCiAgICB0eG5hIEFwcGxpY2F0aW9uQXJncyAxCiAgICBkdXAKICAgIGludGNfMCAvLyAwCiAgICBleHRyYWN0X3VpbnQxNiAvLyBvbiBlcnJvcjogaW52YWxpZCBhcnJheSBsZW5ndGggaGVhZGVyCiAgICBpbnRjXzEgLy8gMgogICAgKwogICAgZGlnIDEKICAgIGxlbgogICAgPT0KICAgIGFzc2VydCAvLyBpbnZhbGlkIG51bWJlciBvZiBieXRlcyBmb3IgYXJjNC5keW5hbWljX2FycmF5PGFyYzQudWludDg+CiAgICBleHRyYWN0IDIgMAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weTo5OAogICAgLy8gcHJvZmlsZV9ieXRlcywgX2V4aXN0cyA9IG9wLkJveC5nZXQoaGFzaGVkX2lkKQogICAgYm94X2dldAogICAgcG9wCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjkzCiAgICAvLyBAYWJpbWV0aG9kCiAgICBieXRlY18wIC8vIDB4MTUxZjdjNzUKICAgIHN3YXAKICAgIGNvbmNhdAogICAgbG9nCiAgICBpbnRjXzIgLy8gMQogICAgcmV0dXJuCgoKLy8gc21hcnRfY29udHJhY3RzLmFtbF9yZWdpc3RyeS5jb250cmFjdC5BbWxSZWdpc3RyeS5nZXRfaXBmc19oYXNoW3JvdXRpbmddKCkgLT4gdm9pZDoKZ2V0X2lwZnNfaGFzaDoKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6MTAxCiAgICAvLyBAYWJpbWV0aG9kCiAgICB0eG5hIEFwcGxpY2F0aW9uQXJncyAxCiAgICBkdXAKICAgIGludGNfMCAvLyAwCiAgICBleHRyYWN0X3VpbnQxNiAvLyBvbiBlcnJvcjogaW52YWxpZCBhcnJheSBsZW5ndGggaGVhZGVyCiAgICBpbnRjXzEgLy8gMgogICAgKwogICAgZGlnIDEKICAgIGxlbgogICAgPT0KICAgIGFzc2VydCAvLyBpbnZhbGlkIG51bWJlciBvZiBieXRlcyBmb3IgYXJjNC5keW5hbWljX2FycmF5PGFyYzQudWludDg+CiAgICBleHRyYWN0IDIgMAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToxMDkKICAgIC8vIGlwZnNfa2V5ID0gb3AuY29uY2F0KGhhc2hlZF9pZCwgQnl0ZXMoYiJfaXBmcyIpKQogICAgYnl0ZWNfMSAvLyAweDVmNjk3MDY2NzMKICAgIGNvbmNhdAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToxMTAKICAgIC8vIGlwZnNfaGFzaF9ieXRlcywgX2V4aXN0cyA9IG9wLkJveC5nZXQoaXBmc19rZXkpCiAgICBib3hfZ2V0CiAgICBwb3AKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6MTAxCiAgICAvLyBAYWJpbWV0aG9kCiAgICBkdXAKICAgIGxlbgogICAgaXRvYgogICAgZXh0cmFjdCA2IDIKICAgIHN3YXAKICAgIGNvbmNhdAogICAgYnl0ZWNfMCAvLyAweDE1MWY3Yzc1CiAgICBzd2FwCiAgICBjb25jYXQKICAgIGxvZwogICAgaW50Y18yIC8vIDEKICAgIHJldHVybgoKCi8vIHNtYXJ0X2NvbnRyYWN0cy5hbWxfcmVnaXN0cnkuY29udHJhY3QuQW1sUmVnaXN0cnkuZmxhZ193YWxsZXRbcm91dGluZ10oKSAtPiB2b2lkOgpmbGFnX3dhbGxldDoKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6MTEzCiAgICAvLyBAYWJpbWV0aG9kCiAgICB0eG5hIEFwcGxpY2F0aW9uQXJncyAxCiAgICBkdXAKICAgIGludGNfMCAvLyAwCiAgICBleHRyYWN0X3VpbnQxNiAvLyBvbiBlcnJvcjogaW52YWxpZCBhcnJheSBsZW5ndGggaGVhZGVyCiAgICBpbnRjXzEgLy8gMgogICAgKwogICAgZGlnIDEKICAgIGxlbgogICAgPT0KICAgIGFzc2VydCAvLyBpbnZhbGlkIG51bWJlciBvZiBieXRlcyBmb3IgYXJjNC5keW5hbWljX2FycmF5PGFyYzQudWludDg+CiAgICBleHRyYWN0IDIgMAogICAgZHVwCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjExOAogICAgLy8gcHJvZmlsZV9ieXRlcywgX2V4aXN0cyA9IG9wLkJveC5nZXQoaGFzaGVkX2lkKQogICAgYm94X2dldAogICAgcG9wCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjEyMS0xMjIKICAgIC8vICMgU2V0IGZsYWcgdG8gdHJ1ZQogICAgLy8gcHJvZmlsZS5pc19mbGFnZ2VkID0gVUludDY0KDEpCiAgICBpbnRjXzIgLy8gMQogICAgaXRvYgogICAgcmVwbGFjZTIgMzIKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6MTIzCiAgICAvLyBwcm9maWxlLmxhc3RfdXBkYXRlZCA9IEdsb2JhbC5sYXRlc3RfdGltZXN0YW1wCiAgICBnbG9iYWwgTGF0ZXN0VGltZXN0YW1wCiAgICBpdG9iCiAgICByZXBsYWNlMiAyNAogICAgZHVwCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjEyNS0xMjYKICAgIC8vICMgSWYgbm90IGFscmVhZHkgaGlnaCByaXNrLCBzZXQgdG8gNzAgKGZsYWdnZWQgdGhyZXNob2xkKQogICAgLy8gaWYgcHJvZmlsZS5yaXNrX3Njb3JlIDwgNzA6CiAgICBpbnRjXzAgLy8gMAogICAgZXh0cmFjdF91aW50NjQKICAgIHB1c2hpbnQgNzAKICAgIDwKICAgIGJ6IGZsYWdfd2FsbGV0X2FmdGVyX2lmX2Vsc2VAMwogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToxMjcKICAgIC8vIHByb2ZpbGUucmlza19zY29yZSA9IFVJbnQ2NCg3MCkKICAgIHB1c2hpbnQgNzAKICAgIGl0b2IKICAgIHJlcGxhY2UyIDAKCmZsYWdfd2FsbGV0X2FmdGVyX2lmX2Vsc2VAMzoKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6MTI5CiAgICAvLyBvcC5Cb3gucHV0KGhhc2hlZF9pZCwgcHJvZmlsZS5ieXRlcykKICAgIGRpZyAxCiAgICBzd2FwCiAgICBib3hfcHV0CiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjExMwogICAgLy8gQGFiaW1ldGhvZAogICAgcHVzaGJ5dGVzIDB4MTUxZjdjNzUwMDFkNTc2MTZjNmM2NTc0MjA2NjZjNjE2NzY3NjU2NDIwNjY2ZjcyMjA0MTRkNGMyMDcyNjU3NjY5NjU3NwogICAgbG9nCiAgICBpbnRjXzIgLy8gMQogICAgcmV0dXJuCgoKLy8gc21hcnRfY29udHJhY3RzLmFtbF9yZWdpc3RyeS5jb250cmFjdC5BbWxSZWdpc3RyeS5pc193YWxsZXRfZmxhZ2dlZFtyb3V0aW5nXSgpIC0+IHZvaWQ6CmlzX3dhbGxldF9mbGFnZ2VkOgogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToxMzMKICAgIC8vIEBhYmltZXRob2QKICAgIHR4bmEgQXBwbGljYXRpb25BcmdzIDEKICAgIGR1cAogICAgaW50Y18wIC8vIDAKICAgIGV4dHJhY3RfdWludDE2IC8vIG9uIGVycm9yOiBpbnZhbGlkIGFycmF5IGxlbmd0aCBoZWFkZXIKICAgIGludGNfMSAvLyAyCiAgICArCiAgICBkaWcgMQogICAgbGVuCiAgICA9PQogICAgYXNzZXJ0IC8vIGludmFsaWQgbnVtYmVyIG9mIGJ5dGVzIGZvciBhcmM0LmR5bmFtaWNfYXJyYXk8YXJjNC51aW50OD4KICAgIGV4dHJhY3QgMiAwCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjEzOQogICAgLy8gcHJvZmlsZV9ieXRlcywgX2V4aXN0cyA9IG9wLkJveC5nZXQoaGFzaGVkX2lkKQogICAgYm94X2dldAogICAgcG9wCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjE0MQogICAgLy8gcmV0dXJuIHByb2ZpbGUuaXNfZmxhZ2dlZAogICAgZXh0cmFjdCAzMiA4CiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjEzMwogICAgLy8gQGFiaW1ldGhvZAogICAgYnl0ZWNfMCAvLyAweDE1MWY3Yzc1CiAgICBzd2FwCiAgICBjb25jYXQKICAgIGxvZwogICAgaW50Y18yIC8vIDEKICAgIHJldHVybgoKCi8vIHNtYXJ0X2NvbnRyYWN0cy5hbWxfcmVnaXN0cnkuY29udHJhY3QuQW1sUmVnaXN0cnkuZ2V0X3Jpc2tfc2NvcmVbcm91dGluZ10oKSAtPiB2b2lkOgpnZXRfcmlza19zY29yZToKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6MTQzCiAgICAvLyBAYWJpbWV0aG9kCiAgICB0eG5hIEFwcGxpY2F0aW9uQXJncyAxCiAgICBkdXAKICAgIGludGNfMCAvLyAwCiAgICBleHRyYWN0X3VpbnQxNiAvLyBvbiBlcnJvcjogaW52YWxpZCBhcnJheSBsZW5ndGggaGVhZGVyCiAgICBpbnRjXzEgLy8gMgogICAgKwogICAgZGlnIDEKICAgIGxlbgogICAgPT0KICAgIGFzc2VydCAvLyBpbnZhbGlkIG51bWJlciBvZiBieXRlcyBmb3IgYXJjNC5keW5hbWljX2FycmF5PGFyYzQudWludDg+CiAgICBleHRyYWN0IDIgMAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToxNDgKICAgIC8vIHByb2ZpbGVfYnl0ZXMsIF9leGlzdHMgPSBvcC5Cb3guZ2V0KGhhc2hlZF9pZCkKICAgIGJveF9nZXQKICAgIHBvcAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToxNTAKICAgIC8vIHJldHVybiBwcm9maWxlLnJpc2tfc2NvcmUKICAgIGV4dHJhY3QgMCA4CiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjE0MwogICAgLy8gQGFiaW1ldGhvZAogICAgYnl0ZWNfMCAvLyAweDE1MWY3Yzc1CiAgICBzd2FwCiAgICBjb25jYXQKICAgIGxvZwogICAgaW50Y18yIC8vIDEKICAgIHJldHVybgoKCi8vIHNtYXJ0X2NvbnRyYWN0cy5hbWxfcmVnaXN0cnkuY29udHJhY3QuQW1sUmVnaXN0cnkuaGVsbG9bcm91dGluZ10oKSAtPiB2b2lkOgpoZWxsbzoKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6MTUyCiAgICAvLyBAYWJpbWV0aG9kCiAgICB0eG5hIEFwcGxpY2F0aW9uQXJncyAxCiAgICBkdXAKICAgIGludGNfMCAvLyAwCiAgICBleHRyYWN0X3VpbnQxNiAvLyBvbiBlcnJvcjogaW52YWxpZCBhcnJheSBsZW5ndGggaGVhZGVyCiAgICBpbnRjXzEgLy8gMgogICAgKwogICAgZGlnIDEKICAgIGxlbgogICAgPT0KICAgIGFzc2VydCAvLyBpbnZhbGlkIG51bWJlciBvZiBieXRlcyBmb3IgYXJjNC5keW5hbWljX2FycmF5PGFyYzQudWludDg+CiAgICBleHRyYWN0IDIgMAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToxNTcKICAgIC8vIHJldHVybiBTdHJpbmcoIkhlbGxvLCAiKSArIG5hbWUKICAgIHB1c2hieXRlcyAiSGVsbG8sICIKICAgIHN3YXAKICAgIGNvbmNhdAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToxNTIKICAgIC8vIEBhYmltZXRob2QKICAgIGR1cAogICAgbGVuCiAgICBpdG9iCiAgICBleHRyYWN0IDYgMgogICAgc3dhcAogICAgY29uY2F0CiAgICBieXRlY18wIC8vIDB4MTUxZjdjNzUKICAgIHN3YXAKICAgIGNvbmNhdAogICAgbG9nCiAgICBpbnRjXzIgLy8gMQogICAgcmV0dXJuCg==", "clear": "I3ByYWdtYSB2ZXJzaW9uIDExCiNwcmFnbWEgdHlwZXRyYWNrIGZhbHNlCgovLyBhbGdvcHkuYXJjNC5BUkM0Q29udHJhY3QuY2xlYXJfc3RhdGVfcHJvZ3JhbSgpIC0+IHVpbnQ2NDoKbWFpbjoKICAgIHB1c2hpbnQgMQogICAgcmV0dXJuCg=="}, "sourceInfo": {"approval": {"pcOffsetMethod": "none", "sourceInfo": [{"pc": [168, 312], "errorMessage": "Risk score must be between 0 and 100"}, {"pc": [109, 152, 287, 368, 392, 426, 512, 539, 566], "errorMessage": "invalid array length header"}, {"pc": [116, 159, 294, 375, 399, 433, 519, 546, 573], "errorMessage": "invalid number of bytes for arc4.dynamic_array<arc4.uint8>"}, {"pc": [127, 136, 145, 305], "errorMessage": "invalid number of bytes for arc4.uint64"}]}, "clear": {"pcOffsetMethod": "none", "sourceInfo": []}}, "templateVariables": {}}"""
+_APP_SPEC_JSON = r"""{"arcs": [22, 28], "bareActions": {"call": [], "create": ["NoOp"]}, "methods": [{"actions": {"call": ["NoOp"], "create": []}, "args": [{"type": "byte[]", "desc": "SHA-256 hash of the account ID (or salted PAN)", "name": "hashed_id"}, {"type": "uint64", "desc": "0-100 risk score", "name": "risk_score"}, {"type": "uint64", "desc": "Number of transactions", "name": "transaction_count"}, {"type": "uint64", "desc": "Number of flagged connections", "name": "flagged_connections"}, {"type": "byte[]", "desc": "Raw multihash (34 bytes) of the IPFS CID pointing to detailed mule data, or empty if there is none", "name": "ipfs_multihash"}], "name": "register_wallet", "returns": {"type": "string"}, "desc": "Register a new wallet with its risk profile and IPFS pointer", "events": [], "readonly": false, "recommendations": {}}, {"actions": {"call": ["NoOp"], "create": []}, "args": [{"type": "byte[][]", "desc": "SHA-256 hashes of the account IDs", "name": "hashed_ids"}, {"type": "uint64[]", "desc": "0-100 risk scores (same order as hashed_ids)", "name": "risk_scores"}, {"type": "uint64[]", "desc": "Number of transactions (same order)", "name": "transaction_counts"}, {"type": "uint64[]", "desc": "Number of flagged connections (same order)", "name": "flagged_connections"}, {"type": "byte[]", "desc": "Raw multihash of the batch's evidence bundle CID (or empty)", "name": "ipfs_multihash"}], "name": "register_wallets_batch", "returns": {"type": "string"}, "desc": "Register several wallets in one call, all pointing at the same evidence CID", "events": [], "readonly": false, "recommendations": {}}, {"actions": {"call": ["NoOp"], "create": []}, "args": [{"type": "byte[]", "name": "hashed_id"}, {"type": "uint64", "name": "new_risk_score"}], "name": "update_risk_score", "returns": {"type": "string"}, "desc": "Update risk score for an existing wallet", "events": [], "readonly": false, "recommendations": {}}, {"actions": {"call": ["NoOp"], "create": []}, "args": [{"type": "byte[]", "name": "hashed_id"}], "name": "get_risk_profile", "returns": {"type": "(uint8,uint32,uint32,uint32)", "struct": "WalletRiskProfile"}, "desc": "Retrieve risk profile for a wallet by its hashed ID", "events": [], "readonly": false, "recommendations": {}}, {"actions": {"call": ["NoOp"], "create": []}, "args": [{"type": "byte[]", "name": "hashed_id"}], "name": "get_ipfs_hash", "returns": {"type": "byte[]"}, "desc": "Retrieve the IPFS multihash for detailed mule data\nReturns the raw 34-byte multihash of the CID where full transaction history and analysis are stored (base58-encode it for the \"Qm...\" CID) Frontend can fetch this to display graph visualizations", "events": [], "readonly": false, "recommendations": {}}, {"actions": {"call": ["NoOp"], "create": []}, "args": [{"type": "byte[]", "name": "hashed_id"}], "name": "flag_wallet", "returns": {"type": "string"}, "desc": "Manually flag a wallet for suspicious activity", "events": [], "readonly": false, "recommendations": {}}, {"actions": {"call": ["NoOp"], "create": []}, "args": [{"type": "byte[]", "name": "hashed_id"}], "name": "is_wallet_flagged", "returns": {"type": "uint64"}, "desc": "Check if a wallet is flagged (returns 1 for true, 0 for false)\nUsed by Bank B to screen new customers", "events": [], "readonly": false, "recommendations": {}}, {"actions": {"call": ["NoOp"], "create": []}, "args": [{"type": "byte[]", "name": "hashed_id"}], "name": "get_risk_score", "returns": {"type": "uint64"}, "desc": "Get just the risk score for a wallet (0-100)", "events": [], "readonly": false, "recommendations": {}}, {"actions": {"call": ["NoOp"], "create": []}, "args": [{"type": "string", "name": "name"}], "name": "hello", "returns": {"type": "string"}, "desc": "Simple hello method for testing", "events": [], "readonly": false, "recommendations": {}}], "name": "AmlRegistry", "state": {"keys": {"box": {}, "global": {}, "local": {}}, "maps": {"box": {}, "global": {}, "local": {}}, "schema": {"global": {"bytes": 0, "ints": 0}, "local": {"bytes": 0, "ints": 0}}}, "structs": {"WalletRiskProfile": [{"name": "risk_and_flag", "type": "uint8"}, {"name": "transaction_count", "type": "uint32"}, {"name": "flagged_connections", "type": "uint32"}, {"name": "last_updated", "type": "uint32"}]}, "byteCode": {"approval": "CyAFAAIBCP////8PJgEEFR98dTEbQQBOMRkURDEYRIIJBOVmwYsE+ngaRQRUvc4wBPCqtcEEdAOcrQS5H2P9BEHTfkMEyIWNoAQCvs4RNhoAjgkAkQEbAmoCxQLgAwIDbwOTA7QAMRkUMRgUEEOKAgGL/oFkDkSL/0EAEIv+gYABGRZJkyUORFcHAYmL/kL/8YoEAYv9IQQORIv+IQQORIv8gUYPi/xMiP/Di/0WSZOBIA5EVwQEi/4WSZOBIA5EVwQEMgcWSZOBIA5EVwQETwNPA1BPAlBMUIv/UImKAQGL/xVJQAAFgSKvTImLAIEiEkSL/0yJNhoBSSJZIwhLARUSRFcCADYaAkkVJRJEFzYaA0kVJRJEFzYaBEkVJRJEFzYaBUkiWSMISwEVEkRXAgCI/6mI/1q/gEMVH3x1AD1XYWxsZXQgZmxhZ2dlZCAtIFNvdWwgQm91bmQgVG9rZW4gY3JlYXRlZCB3aXRoIElQRlMgcmVmZXJlbmNlsCRDIkcDgABJNhoBSSJZSU4CIwtMSRVMVwIAIklLBQxBACRHAiMLSwNJTwJZSUsHSU4EEkRLARVSIlkjCAhFBSQIRQFC/9VLAyMISwMSRDYaAklFCkkiWUklCyMITwIVEkQ2GgNJRQpJIllJJQsjCE8CFRJENhoESUUOSSJZSSULIwhPAhUSRDYaBUkiWSMISwEVEkRXAgBLCEklDkRPBEsBEkRPA0sBEkRPAhJEiP6vRQoiRQZLBUsFDElFCEEAQEsGREsFSSMLSwNJTwJZSlkjCFhXAgBLClcCAEsCJQtMSwFbSwtXAgBLAltLD1cCAE8DW0sOiP4bvyQIRQZC/7WATBUffHUARldhbGxldHMgZmxhZ2dlZCAtIFNvdWwgQm91bmQgVG9rZW5zIGNyZWF0ZWQgd2l0aCBzaGFyZWQgSVBGUyByZWZlcmVuY2WwJEM2GgFJIlkjCEsBFRJEVwIANhoCSRUlEkQXSwG+RFcADUsBgUYPTwJMiP10XAAyBxZJk4EgDkRXBARcCSJMu4AYFR98dQASUmlzayBzY29yZSB1cGRhdGVksCRDNhoBSSJZIwhLARUSRFcCAL5EVwANKExQsCRDNhoBSSJZIwhLARUSRFcCAL5EVw0igAYVH3x1ACJMULAkQzYaAUkiWSMISwEVEkRXAgBJvkRXAA1JIlWBfxpJgUYMQQAEgUZFAUkkiPzbSwJMXAAyBxZJk4EgDkRXBARcCUsDIk8Cu4AjFR98dQAdV2FsbGV0IGZsYWdnZWQgZm9yIEFNTCByZXZpZXewJEM2GgFJIlkjCEsBFRJEVwIAvkRXAA0iVYGAARoiExYoTFCwJEM2GgFJIlkjCEsBFRJEVwIAvkRXAA0iVYF/GhYoTFCwJEM2GgFJIlkjCEsBFRJEVwIAgAdIZWxsbywgTFBJFRZXBgJMUChMULAkQw==", "clear": "C4EBQw=="}, "desc": "\n    Anti-Money Laundering Registry Smart Contract\n    Stores minimal flags on-chain with IPFS references to detailed data\n    Privacy-preserving: Uses SHA-256 hashed IDs + stores detailed data on IPFS\n    ", "events": [], "networks": {}, "source": {"approval": "I3ByYWdtYSB2ZXJzaW9uIDExCiNwcmFnbWEgdHlwZXRyYWNrIGZhbHNlCgovLyBhbGdvcHkuYXJjNC5BUkM0Q29udHJhY3QuYXBwcm92YWxfcHJvZ3JhbSgpIC0+IHVpbnQ2NDoKbWFpbjoKICAgIGludGNibG9jayAwIDIgMSA4IDQyOTQ5NjcyOTUKICAgIGJ5dGVjYmxvY2sgMHgxNTFmN2M3NQogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weTo3NgogICAgLy8gY2xhc3MgQW1sUmVnaXN0cnkoQVJDNENvbnRyYWN0KToKICAgIHR4biBOdW1BcHBBcmdzCiAgICBieiBtYWluX19fYWxnb3B5X2RlZmF1bHRfY3JlYXRlQDE2CiAgICB0eG4gT25Db21wbGV0aW9uCiAgICAhCiAgICBhc3NlcnQKICAgIHR4biBBcHBsaWNhdGlvbklECiAgICBhc3NlcnQKICAgIHB1c2hieXRlc3MgMHhlNTY2YzE4YiAweGZhNzgxYTQ1IDB4NTRiZGNlMzAgMHhmMGFhYjVjMSAweDc0MDM5Y2FkIDB4YjkxZjYzZmQgMHg0MWQzN2U0MyAweGM4ODU4ZGEwIDB4MDJiZWNlMTEgLy8gbWV0aG9kICJyZWdpc3Rlcl93YWxsZXQoYnl0ZVtdLHVpbnQ2NCx1aW50NjQsdWludDY0LGJ5dGVbXSlzdHJpbmciLCBtZXRob2QgInJlZ2lzdGVyX3dhbGxldHNfYmF0Y2goYnl0ZVtdW10sdWludDY0W10sdWludDY0W10sdWludDY0W10sYnl0ZVtdKXN0cmluZyIsIG1ldGhvZCAidXBkYXRlX3Jpc2tfc2NvcmUoYnl0ZVtdLHVpbnQ2NClzdHJpbmciLCBtZXRob2QgImdldF9yaXNrX3Byb2ZpbGUoYnl0ZVtdKSh1aW50OCx1aW50MzIsdWludDMyLHVpbnQzMikiLCBtZXRob2QgImdldF9pcGZzX2hhc2goYnl0ZVtdKWJ5dGVbXSIsIG1ldGhvZCAiZmxhZ193YWxsZXQoYnl0ZVtdKXN0cmluZyIsIG1ldGhvZCAiaXNfd2FsbGV0X2ZsYWdnZWQoYnl0ZVtdKXVpbnQ2NCIsIG1ldGhvZCAiZ2V0X3Jpc2tfc2NvcmUoYnl0ZVtdKXVpbnQ2NCIsIG1ldGhvZCAiaGVsbG8oc3RyaW5nKXN0cmluZyIKICAgIHR4bmEgQXBwbGljYXRpb25BcmdzIDAKICAgIG1hdGNoIHJlZ2lzdGVyX3dhbGxldCByZWdpc3Rlcl93YWxsZXRzX2JhdGNoIHVwZGF0ZV9yaXNrX3Njb3JlIGdldF9yaXNrX3Byb2ZpbGUgZ2V0X2lwZnNfaGFzaCBmbGFnX3dhbGxldCBpc193YWxsZXRfZmxhZ2dlZCBnZXRfcmlza19zY29yZSBoZWxsbwogICAgZXJyCgptYWluX19fYWxnb3B5X2RlZmF1bHRfY3JlYXRlQDE2OgogICAgdHhuIE9uQ29tcGxldGlvbgogICAgIQogICAgdHhuIEFwcGxpY2F0aW9uSUQKICAgICEKICAgICYmCiAgICByZXR1cm4KCgovLyBzbWFydF9jb250cmFjdHMuYW1sX3JlZ2lzdHJ5LmNvbnRyYWN0Ll9yaXNrX2FuZF9mbGFnKHJpc2tfc2NvcmU6IHVpbnQ2NCwgaXNfZmxhZ2dlZDogdWludDY0KSAtPiBieXRlczoKX3Jpc2tfYW5kX2ZsYWc6CiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjMwLTMxCiAgICAvLyBAc3Vicm91dGluZQogICAgLy8gZGVmIF9yaXNrX2FuZF9mbGFnKHJpc2tfc2NvcmU6IFVJbnQ2NCwgaXNfZmxhZ2dlZDogYm9vbCkgLT4gYXJjNC5VSW50ODoKICAgIHByb3RvIDIgMQogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weTozMgogICAgLy8gYXNzZXJ0IHJpc2tfc2NvcmUgPD0gMTAwLCAiUmlzayBzY29yZSBtdXN0IGJlIGJldHdlZW4gMCBhbmQgMTAwIgogICAgZnJhbWVfZGlnIC0yCiAgICBwdXNoaW50IDEwMAogICAgPD0KICAgIGFzc2VydCAvLyBSaXNrIHNjb3JlIG11c3QgYmUgYmV0d2VlbiAwIGFuZCAxMDAKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6MzMKICAgIC8vIHJldHVybiBhcmM0LlVJbnQ4KChyaXNrX3Njb3JlIHwgRkxBR19CSVQpIGlmIGlzX2ZsYWdnZWQgZWxzZSByaXNrX3Njb3JlKQogICAgZnJhbWVfZGlnIC0xCiAgICBieiBfcmlza19hbmRfZmxhZ190ZXJuYXJ5X2ZhbHNlQDIKICAgIGZyYW1lX2RpZyAtMgogICAgcHVzaGludCAxMjgKICAgIHwKCl9yaXNrX2FuZF9mbGFnX3Rlcm5hcnlfbWVyZ2VAMzoKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6MzMKICAgIC8vIHJldHVybiBhcmM0LlVJbnQ4KChyaXNrX3Njb3JlIHwgRkxBR19CSVQpIGlmIGlzX2ZsYWdnZWQgZWxzZSByaXNrX3Njb3JlKQogICAgaXRvYgogICAgZHVwCiAgICBiaXRsZW4KICAgIGludGNfMyAvLyA4CiAgICA8PQogICAgYXNzZXJ0IC8vIG92ZXJmbG93CiAgICBleHRyYWN0IDcgMQogICAgcmV0c3ViCgpfcmlza19hbmRfZmxhZ190ZXJuYXJ5X2ZhbHNlQDI6CiAgICBmcmFtZV9kaWcgLTIKICAgIGIgX3Jpc2tfYW5kX2ZsYWdfdGVybmFyeV9tZXJnZUAzCgoKLy8gc21hcnRfY29udHJhY3RzLmFtbF9yZWdpc3RyeS5jb250cmFjdC5fcHJvZmlsZV9ib3gocmlza19zY29yZTogdWludDY0LCB0cmFuc2FjdGlvbl9jb3VudDogdWludDY0LCBmbGFnZ2VkX2Nvbm5lY3Rpb25zOiB1aW50NjQsIGlwZnNfbXVsdGloYXNoOiBieXRlcykgLT4gYnl0ZXM6Cl9wcm9maWxlX2JveDoKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6MzYtNDIKICAgIC8vIEBzdWJyb3V0aW5lCiAgICAvLyBkZWYgX3Byb2ZpbGVfYm94KAogICAgLy8gICAgIHJpc2tfc2NvcmU6IFVJbnQ2NCwKICAgIC8vICAgICB0cmFuc2FjdGlvbl9jb3VudDogVUludDY0LAogICAgLy8gICAgIGZsYWdnZWRfY29ubmVjdGlvbnM6IFVJbnQ2NCwKICAgIC8vICAgICBpcGZzX211bHRpaGFzaDogQnl0ZXMsCiAgICAvLyApIC0+IEJ5dGVzOgogICAgcHJvdG8gNCAxCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjQ0CiAgICAvLyBhc3NlcnQgdHJhbnNhY3Rpb25fY291bnQgPD0gVUlOVDMyX01BWCwgInRyYW5zYWN0aW9uX2NvdW50IG11c3QgZml0IGluIHVpbnQzMiIKICAgIGZyYW1lX2RpZyAtMwogICAgaW50YyA0IC8vIDQyOTQ5NjcyOTUKICAgIDw9CiAgICBhc3NlcnQgLy8gdHJhbnNhY3Rpb25fY291bnQgbXVzdCBmaXQgaW4gdWludDMyCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjQ1CiAgICAvLyBhc3NlcnQgZmxhZ2dlZF9jb25uZWN0aW9ucyA8PSBVSU5UMzJfTUFYLCAiZmxhZ2dlZF9jb25uZWN0aW9ucyBtdXN0IGZpdCBpbiB1aW50MzIiCiAgICBmcmFtZV9kaWcgLTIKICAgIGludGMgNCAvLyA0Mjk0OTY3Mjk1CiAgICA8PQogICAgYXNzZXJ0IC8vIGZsYWdnZWRfY29ubmVjdGlvbnMgbXVzdCBmaXQgaW4gdWludDMyCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjQ3CiAgICAvLyByaXNrX2FuZF9mbGFnPV9yaXNrX2FuZF9mbGFnKHJpc2tfc2NvcmUsIHJpc2tfc2NvcmUgPj0gRkxBR19USFJFU0hPTEQpLAogICAgZnJhbWVfZGlnIC00CiAgICBwdXNoaW50IDcwCiAgICA+PQogICAgZnJhbWVfZGlnIC00CiAgICBzd2FwCiAgICBjYWxsc3ViIF9yaXNrX2FuZF9mbGFnCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjQ4CiAgICAvLyB0cmFuc2FjdGlvbl9jb3VudD1hcmM0LlVJbnQzMih0cmFuc2FjdGlvbl9jb3VudCksCiAgICBmcmFtZV9kaWcgLTMKICAgIGl0b2IKICAgIGR1cAogICAgYml0bGVuCiAgICBwdXNoaW50IDMyCiAgICA8PQogICAgYXNzZXJ0IC8vIG92ZXJmbG93CiAgICBleHRyYWN0IDQgNAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weTo0OQogICAgLy8gZmxhZ2dlZF9jb25uZWN0aW9ucz1hcmM0LlVJbnQzMihmbGFnZ2VkX2Nvbm5lY3Rpb25zKSwKICAgIGZyYW1lX2RpZyAtMgogICAgaXRvYgogICAgZHVwCiAgICBiaXRsZW4KICAgIHB1c2hpbnQgMzIKICAgIDw9CiAgICBhc3NlcnQgLy8gb3ZlcmZsb3cKICAgIGV4dHJhY3QgNCA0CiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjUwCiAgICAvLyBsYXN0X3VwZGF0ZWQ9YXJjNC5VSW50MzIoR2xvYmFsLmxhdGVzdF90aW1lc3RhbXApLAogICAgZ2xvYmFsIExhdGVzdFRpbWVzdGFtcAogICAgaXRvYgogICAgZHVwCiAgICBiaXRsZW4KICAgIHB1c2hpbnQgMzIKICAgIDw9CiAgICBhc3NlcnQgLy8gb3ZlcmZsb3cKICAgIGV4dHJhY3QgNCA0CiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjQ2LTUxCiAgICAvLyBwcm9maWxlID0gV2FsbGV0Umlza1Byb2ZpbGUoCiAgICAvLyAgICAgcmlza19hbmRfZmxhZz1fcmlza19hbmRfZmxhZyhyaXNrX3Njb3JlLCByaXNrX3Njb3JlID49IEZMQUdfVEhSRVNIT0xEKSwKICAgIC8vICAgICB0cmFuc2FjdGlvbl9jb3VudD1hcmM0LlVJbnQzMih0cmFuc2FjdGlvbl9jb3VudCksCiAgICAvLyAgICAgZmxhZ2dlZF9jb25uZWN0aW9ucz1hcmM0LlVJbnQzMihmbGFnZ2VkX2Nvbm5lY3Rpb25zKSwKICAgIC8vICAgICBsYXN0X3VwZGF0ZWQ9YXJjNC5VSW50MzIoR2xvYmFsLmxhdGVzdF90aW1lc3RhbXApLAogICAgLy8gKQogICAgdW5jb3ZlciAzCiAgICB1bmNvdmVyIDMKICAgIGNvbmNhdAogICAgdW5jb3ZlciAyCiAgICBjb25jYXQKICAgIHN3YXAKICAgIGNvbmNhdAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weTo1MgogICAgLy8gcmV0dXJuIG9wLmNvbmNhdChwcm9maWxlLmJ5dGVzLCBpcGZzX211bHRpaGFzaCkKICAgIGZyYW1lX2RpZyAtMQogICAgY29uY2F0CiAgICByZXRzdWIKCgovLyBzbWFydF9jb250cmFjdHMuYW1sX3JlZ2lzdHJ5LmNvbnRyYWN0Ll9jaGVja2VkX211bHRpaGFzaChpcGZzX211bHRpaGFzaDogYnl0ZXMpIC0+IGJ5dGVzOgpfY2hlY2tlZF9tdWx0aWhhc2g6CiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjU1LTU2CiAgICAvLyBAc3Vicm91dGluZQogICAgLy8gZGVmIF9jaGVja2VkX211bHRpaGFzaChpcGZzX211bHRpaGFzaDogQnl0ZXMpIC0+IEJ5dGVzOgogICAgcHJvdG8gMSAxCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjU4CiAgICAvLyBpZiBpcGZzX211bHRpaGFzaC5sZW5ndGggPT0gMDoKICAgIGZyYW1lX2RpZyAtMQogICAgbGVuCiAgICBkdXAKICAgIGJueiBfY2hlY2tlZF9tdWx0aWhhc2hfYWZ0ZXJfaWZfZWxzZUAyCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjU5CiAgICAvLyByZXR1cm4gb3AuYnplcm8oTVVMVElIQVNIX0xFTkdUSCkKICAgIHB1c2hpbnQgMzQKICAgIGJ6ZXJvCiAgICBzd2FwCiAgICByZXRzdWIKCl9jaGVja2VkX211bHRpaGFzaF9hZnRlcl9pZl9lbHNlQDI6CiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjYwCiAgICAvLyBhc3NlcnQgaXBmc19tdWx0aWhhc2gubGVuZ3RoID09IE1VTFRJSEFTSF9MRU5HVEgsICJJUEZTIGhhc2ggbXVzdCBiZSBhIDM0LWJ5dGUgbXVsdGloYXNoIgogICAgZnJhbWVfZGlnIDAKICAgIHB1c2hpbnQgMzQKICAgID09CiAgICBhc3NlcnQgLy8gSVBGUyBoYXNoIG11c3QgYmUgYSAzNC1ieXRlIG11bHRpaGFzaAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weTo2MQogICAgLy8gcmV0dXJuIGlwZnNfbXVsdGloYXNoCiAgICBmcmFtZV9kaWcgLTEKICAgIHN3YXAKICAgIHJldHN1YgoKCi8vIHNtYXJ0X2NvbnRyYWN0cy5hbWxfcmVnaXN0cnkuY29udHJhY3QuQW1sUmVnaXN0cnkucmVnaXN0ZXJfd2FsbGV0W3JvdXRpbmddKCkgLT4gdm9pZDoKcmVnaXN0ZXJfd2FsbGV0OgogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weTo4MwogICAgLy8gQGFiaW1ldGhvZAogICAgdHhuYSBBcHBsaWNhdGlvbkFyZ3MgMQogICAgZHVwCiAgICBpbnRjXzAgLy8gMAogICAgZXh0cmFjdF91aW50MTYgLy8gb24gZXJyb3I6IGludmFsaWQgYXJyYXkgbGVuZ3RoIGhlYWRlcgogICAgaW50Y18xIC8vIDIKICAgICsKICAgIGRpZyAxCiAgICBsZW4KICAgID09CiAgICBhc3NlcnQgLy8gaW52YWxpZCBudW1iZXIgb2YgYnl0ZXMgZm9yIGFyYzQuZHluYW1pY19hcnJheTxhcmM0LnVpbnQ4PgogICAgZXh0cmFjdCAyIDAKICAgIHR4bmEgQXBwbGljYXRpb25BcmdzIDIKICAgIGR1cAogICAgbGVuCiAgICBpbnRjXzMgLy8gOAogICAgPT0KICAgIGFzc2VydCAvLyBpbnZhbGlkIG51bWJlciBvZiBieXRlcyBmb3IgYXJjNC51aW50NjQKICAgIGJ0b2kKICAgIHR4bmEgQXBwbGljYXRpb25BcmdzIDMKICAgIGR1cAogICAgbGVuCiAgICBpbnRjXzMgLy8gOAogICAgPT0KICAgIGFzc2VydCAvLyBpbnZhbGlkIG51bWJlciBvZiBieXRlcyBmb3IgYXJjNC51aW50NjQKICAgIGJ0b2kKICAgIHR4bmEgQXBwbGljYXRpb25BcmdzIDQKICAgIGR1cAogICAgbGVuCiAgICBpbnRjXzMgLy8gOAogICAgPT0KICAgIGFzc2VydCAvLyBpbnZhbGlkIG51bWJlciBvZiBieXRlcyBmb3IgYXJjNC51aW50NjQKICAgIGJ0b2kKICAgIHR4bmEgQXBwbGljYXRpb25BcmdzIDUKICAgIGR1cAogICAgaW50Y18wIC8vIDAKICAgIGV4dHJhY3RfdWludDE2IC8vIG9uIGVycm9yOiBpbnZhbGlkIGFycmF5IGxlbmd0aCBoZWFkZXIKICAgIGludGNfMSAvLyAyCiAgICArCiAgICBkaWcgMQogICAgbGVuCiAgICA9PQogICAgYXNzZXJ0IC8vIGludmFsaWQgbnVtYmVyIG9mIGJ5dGVzIGZvciBhcmM0LmR5bmFtaWNfYXJyYXk8YXJjNC51aW50OD4KICAgIGV4dHJhY3QgMiAwCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjEwOQogICAgLy8gX3Byb2ZpbGVfYm94KHJpc2tfc2NvcmUsIHRyYW5zYWN0aW9uX2NvdW50LCBmbGFnZ2VkX2Nvbm5lY3Rpb25zLCBfY2hlY2tlZF9tdWx0aWhhc2goaXBmc19tdWx0aWhhc2gpKSwKICAgIGNhbGxzdWIgX2NoZWNrZWRfbXVsdGloYXNoCiAgICBjYWxsc3ViIF9wcm9maWxlX2JveAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToxMDYtMTEwCiAgICAvLyAjIE9uZSBib3ggcGVyIHdhbGxldCAoa2V5OiBoYXNoZWRfaWQpOiBwcm9maWxlICsgQ0lEIG11bHRpaGFzaAogICAgLy8gb3AuQm94LnB1dCgKICAgIC8vICAgICBoYXNoZWRfaWQsCiAgICAvLyAgICAgX3Byb2ZpbGVfYm94KHJpc2tfc2NvcmUsIHRyYW5zYWN0aW9uX2NvdW50LCBmbGFnZ2VkX2Nvbm5lY3Rpb25zLCBfY2hlY2tlZF9tdWx0aWhhc2goaXBmc19tdWx0aWhhc2gpKSwKICAgIC8vICkKICAgIGJveF9wdXQKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6ODMKICAgIC8vIEBhYmltZXRob2QKICAgIHB1c2hieXRlcyAweDE1MWY3Yzc1MDAzZDU3NjE2YzZjNjU3NDIwNjY2YzYxNjc2NzY1NjQyMDJkMjA1MzZmNzU2YzIwNDI2Zjc1NmU2NDIwNTQ2ZjZiNjU2ZTIwNjM3MjY1NjE3NDY1NjQyMDc3Njk3NDY4MjA0OTUwNDY1MzIwNzI2NTY2NjU3MjY1NmU2MzY1CiAgICBsb2cKICAgIGludGNfMiAvLyAxCiAgICByZXR1cm4KCgovLyBzbWFydF9jb250cmFjdHMuYW1sX3JlZ2lzdHJ5LmNvbnRyYWN0LkFtbFJlZ2lzdHJ5LnJlZ2lzdGVyX3dhbGxldHNfYmF0Y2hbcm91dGluZ10oKSAtPiB2b2lkOgpyZWdpc3Rlcl93YWxsZXRzX2JhdGNoOgogICAgaW50Y18wIC8vIDAKICAgIGR1cG4gMwogICAgcHVzaGJ5dGVzICIiCiAgICBkdXAKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6MTE0CiAgICAvLyBAYWJpbWV0aG9kCiAgICB0eG5hIEFwcGxpY2F0aW9uQXJncyAxCiAgICBkdXAKICAgIGludGNfMCAvLyAwCiAgICBleHRyYWN0X3VpbnQxNiAvLyBvbiBlcnJvcjogaW52YWxpZCBhcnJheSBsZW5ndGggaGVhZGVyCiAgICBkdXAKICAgIGNvdmVyIDIKICAgIGludGNfMSAvLyAyCiAgICAqCiAgICBzd2FwCiAgICBkdXAKICAgIGxlbgogICAgc3dhcAogICAgZXh0cmFjdCAyIDAKICAgIGludGNfMCAvLyAwCgpyZWdpc3Rlcl93YWxsZXRzX2JhdGNoX2Zvcl9oZWFkZXJAMToKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6MTE0CiAgICAvLyBAYWJpbWV0aG9kCiAgICBkdXAKICAgIGRpZyA1CiAgICA8CiAgICBieiByZWdpc3Rlcl93YWxsZXRzX2JhdGNoX2FmdGVyX2ZvckA0CiAgICBkdXBuIDIKICAgIGludGNfMSAvLyAyCiAgICAqCiAgICBkaWcgMwogICAgZHVwCiAgICB1bmNvdmVyIDIKICAgIGV4dHJhY3RfdWludDE2IC8vIG9uIGVycm9yOiBpbnZhbGlkIGFycmF5IGVuY29kaW5nCiAgICBkdXAKICAgIGRpZyA3CiAgICBkdXAKICAgIGNvdmVyIDQKICAgID09CiAgICBhc3NlcnQgLy8gaW52YWxpZCB0YWlsIHBvaW50ZXIgZm9yIChsZW4rKGxlbit1aW50OFtdKVtdKQogICAgZGlnIDEKICAgIGxlbgogICAgc3Vic3RyaW5nMwogICAgaW50Y18wIC8vIDAKICAgIGV4dHJhY3RfdWludDE2IC8vIG9uIGVycm9yOiBpbnZhbGlkIGFycmF5IGxlbmd0aCBoZWFkZXIKICAgIGludGNfMSAvLyAyCiAgICArCiAgICArCiAgICBidXJ5IDUKICAgIGludGNfMiAvLyAxCiAgICArCiAgICBidXJ5IDEKICAgIGIgcmVnaXN0ZXJfd2FsbGV0c19iYXRjaF9mb3JfaGVhZGVyQDEKCnJlZ2lzdGVyX3dhbGxldHNfYmF0Y2hfYWZ0ZXJfZm9yQDQ6CiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjExNAogICAgLy8gQGFiaW1ldGhvZAogICAgZGlnIDMKICAgIGludGNfMSAvLyAyCiAgICArCiAgICBkaWcgMwogICAgPT0KICAgIGFzc2VydCAvLyBpbnZhbGlkIG51bWJlciBvZiBieXRlcyBmb3IgYXJjNC5keW5hbWljX2FycmF5PGFyYzQuZHluYW1pY19hcnJheTxhcmM0LnVpbnQ4Pj4KICAgIHR4bmEgQXBwbGljYXRpb25BcmdzIDIKICAgIGR1cAogICAgYnVyeSAxMAogICAgZHVwCiAgICBpbnRjXzAgLy8gMAogICAgZXh0cmFjdF91aW50MTYgLy8gb24gZXJyb3I6IGludmFsaWQgYXJyYXkgbGVuZ3RoIGhlYWRlcgogICAgZHVwCiAgICBpbnRjXzMgLy8gOAogICAgKgogICAgaW50Y18xIC8vIDIKICAgICsKICAgIHVuY292ZXIgMgogICAgbGVuCiAgICA9PQogICAgYXNzZXJ0IC8vIGludmFsaWQgbnVtYmVyIG9mIGJ5dGVzIGZvciBhcmM0LmR5bmFtaWNfYXJyYXk8YXJjNC51aW50NjQ+CiAgICB0eG5hIEFwcGxpY2F0aW9uQXJncyAzCiAgICBkdXAKICAgIGJ1cnkgMTAKICAgIGR1cAogICAgaW50Y18wIC8vIDAKICAgIGV4dHJhY3RfdWludDE2IC8vIG9uIGVycm9yOiBpbnZhbGlkIGFycmF5IGxlbmd0aCBoZWFkZXIKICAgIGR1cAogICAgaW50Y18zIC8vIDgKICAgICoKICAgIGludGNfMSAvLyAyCiAgICArCiAgICB1bmNvdmVyIDIKICAgIGxlbgogICAgPT0KICAgIGFzc2VydCAvLyBpbnZhbGlkIG51bWJlciBvZiBieXRlcyBmb3IgYXJjNC5keW5hbWljX2FycmF5PGFyYzQudWludDY0PgogICAgdHhuYSBBcHBsaWNhdGlvbkFyZ3MgNAogICAgZHVwCiAgICBidXJ5IDE0CiAgICBkdXAKICAgIGludGNfMCAvLyAwCiAgICBleHRyYWN0X3VpbnQxNiAvLyBvbiBlcnJvcjogaW52YWxpZCBhcnJheSBsZW5ndGggaGVhZGVyCiAgICBkdXAKICAgIGludGNfMyAvLyA4CiAgICAqCiAgICBpbnRjXzEgLy8gMgogICAgKwogICAgdW5jb3ZlciAyCiAgICBsZW4KICAgID09CiAgICBhc3NlcnQgLy8gaW52YWxpZCBudW1iZXIgb2YgYnl0ZXMgZm9yIGFyYzQuZHluYW1pY19hcnJheTxhcmM0LnVpbnQ2ND4KICAgIHR4bmEgQXBwbGljYXRpb25BcmdzIDUKICAgIGR1cAogICAgaW50Y18wIC8vIDAKICAgIGV4dHJhY3RfdWludDE2IC8vIG9uIGVycm9yOiBpbnZhbGlkIGFycmF5IGxlbmd0aCBoZWFkZXIKICAgIGludGNfMSAvLyAyCiAgICArCiAgICBkaWcgMQogICAgbGVuCiAgICA9PQogICAgYXNzZXJ0IC8vIGludmFsaWQgbnVtYmVyIG9mIGJ5dGVzIGZvciBhcmM0LmR5bmFtaWNfYXJyYXk8YXJjNC51aW50OD4KICAgIGV4dHJhY3QgMiAwCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjEzNAogICAgLy8gYXNzZXJ0IGNvdW50IDw9IE1BWF9CQVRDSF9TSVpFLCAiVG9vIG1hbnkgd2FsbGV0cyBmb3Igb25lIGJhdGNoIGNhbGwiCiAgICBkaWcgOAogICAgZHVwCiAgICBpbnRjXzMgLy8gOAogICAgPD0KICAgIGFzc2VydCAvLyBUb28gbWFueSB3YWxsZXRzIGZvciBvbmUgYmF0Y2ggY2FsbAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToxMzUKICAgIC8vIGFzc2VydCByaXNrX3Njb3Jlcy5sZW5ndGggPT0gY291bnQsICJyaXNrX3Njb3JlcyBsZW5ndGggbWlzbWF0Y2giCiAgICB1bmNvdmVyIDQKICAgIGRpZyAxCiAgICA9PQogICAgYXNzZXJ0IC8vIHJpc2tfc2NvcmVzIGxlbmd0aCBtaXNtYXRjaAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToxMzYKICAgIC8vIGFzc2VydCB0cmFuc2FjdGlvbl9jb3VudHMubGVuZ3RoID09IGNvdW50LCAidHJhbnNhY3Rpb25fY291bnRzIGxlbmd0aCBtaXNtYXRjaCIKICAgIHVuY292ZXIgMwogICAgZGlnIDEKICAgID09CiAgICBhc3NlcnQgLy8gdHJhbnNhY3Rpb25fY291bnRzIGxlbmd0aCBtaXNtYXRjaAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToxMzcKICAgIC8vIGFzc2VydCBmbGFnZ2VkX2Nvbm5lY3Rpb25zLmxlbmd0aCA9PSBjb3VudCwgImZsYWdnZWRfY29ubmVjdGlvbnMgbGVuZ3RoIG1pc21hdGNoIgogICAgdW5jb3ZlciAyCiAgICA9PQogICAgYXNzZXJ0IC8vIGZsYWdnZWRfY29ubmVjdGlvbnMgbGVuZ3RoIG1pc21hdGNoCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjEzOQogICAgLy8gbXVsdGloYXNoID0gX2NoZWNrZWRfbXVsdGloYXNoKGlwZnNfbXVsdGloYXNoKQogICAgY2FsbHN1YiBfY2hlY2tlZF9tdWx0aWhhc2gKICAgIGJ1cnkgMTAKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6MTQwCiAgICAvLyBmb3IgaSBpbiB1cmFuZ2UoY291bnQpOgogICAgaW50Y18wIC8vIDAKICAgIGJ1cnkgNgoKcmVnaXN0ZXJfd2FsbGV0c19iYXRjaF9mb3JfaGVhZGVyQDY6CiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjE0MAogICAgLy8gZm9yIGkgaW4gdXJhbmdlKGNvdW50KToKICAgIGRpZyA1CiAgICBkaWcgNQogICAgPAogICAgZHVwCiAgICBidXJ5IDgKICAgIGJ6IHJlZ2lzdGVyX3dhbGxldHNfYmF0Y2hfYWZ0ZXJfZm9yQDkKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6MTQyCiAgICAvLyBoYXNoZWRfaWRzW2ldLm5hdGl2ZSwKICAgIGRpZyA2CiAgICBhc3NlcnQgLy8gaW5kZXggYWNjZXNzIGlzIG91dCBvZiBib3VuZHMKICAgIGRpZyA1CiAgICBkdXAKICAgIGludGNfMSAvLyAyCiAgICAqCiAgICBkaWcgMwogICAgZHVwCiAgICB1bmNvdmVyIDIKICAgIGV4dHJhY3RfdWludDE2CiAgICBkdXAyCiAgICBleHRyYWN0X3VpbnQxNgogICAgaW50Y18xIC8vIDIKICAgICsKICAgIGV4dHJhY3QzCiAgICBleHRyYWN0IDIgMAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToxNDQKICAgIC8vIHJpc2tfc2NvcmVzW2ldLm5hdGl2ZSwKICAgIGRpZyAxMAogICAgZXh0cmFjdCAyIDAKICAgIGRpZyAyCiAgICBpbnRjXzMgLy8gOAogICAgKgogICAgc3dhcAogICAgZGlnIDEKICAgIGV4dHJhY3RfdWludDY0CiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjE0NQogICAgLy8gdHJhbnNhY3Rpb25fY291bnRzW2ldLm5hdGl2ZSwKICAgIGRpZyAxMQogICAgZXh0cmFjdCAyIDAKICAgIGRpZyAyCiAgICBleHRyYWN0X3VpbnQ2NAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToxNDYKICAgIC8vIGZsYWdnZWRfY29ubmVjdGlvbnNbaV0ubmF0aXZlLAogICAgZGlnIDE1CiAgICBleHRyYWN0IDIgMAogICAgdW5jb3ZlciAzCiAgICBleHRyYWN0X3VpbnQ2NAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToxNDMtMTQ4CiAgICAvLyBfcHJvZmlsZV9ib3goCiAgICAvLyAgICAgcmlza19zY29yZXNbaV0ubmF0aXZlLAogICAgLy8gICAgIHRyYW5zYWN0aW9uX2NvdW50c1tpXS5uYXRpdmUsCiAgICAvLyAgICAgZmxhZ2dlZF9jb25uZWN0aW9uc1tpXS5uYXRpdmUsCiAgICAvLyAgICAgbXVsdGloYXNoLAogICAgLy8gKSwKICAgIGRpZyAxNAogICAgY2FsbHN1YiBfcHJvZmlsZV9ib3gKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6MTQxLTE0OQogICAgLy8gb3AuQm94LnB1dCgKICAgIC8vICAgICBoYXNoZWRfaWRzW2ldLm5hdGl2ZSwKICAgIC8vICAgICBfcHJvZmlsZV9ib3goCiAgICAvLyAgICAgICAgIHJpc2tfc2NvcmVzW2ldLm5hdGl2ZSwKICAgIC8vICAgICAgICAgdHJhbnNhY3Rpb25fY291bnRzW2ldLm5hdGl2ZSwKICAgIC8vICAgICAgICAgZmxhZ2dlZF9jb25uZWN0aW9uc1tpXS5uYXRpdmUsCiAgICAvLyAgICAgICAgIG11bHRpaGFzaCwKICAgIC8vICAgICApLAogICAgLy8gKQogICAgYm94X3B1dAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToxNDAKICAgIC8vIGZvciBpIGluIHVyYW5nZShjb3VudCk6CiAgICBpbnRjXzIgLy8gMQogICAgKwogICAgYnVyeSA2CiAgICBiIHJlZ2lzdGVyX3dhbGxldHNfYmF0Y2hfZm9yX2hlYWRlckA2CgpyZWdpc3Rlcl93YWxsZXRzX2JhdGNoX2FmdGVyX2ZvckA5OgogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToxMTQKICAgIC8vIEBhYmltZXRob2QKICAgIHB1c2hieXRlcyAweDE1MWY3Yzc1MDA0NjU3NjE2YzZjNjU3NDczMjA2NjZjNjE2NzY3NjU2NDIwMmQyMDUzNmY3NTZjMjA0MjZmNzU2ZTY0MjA1NDZmNmI2NTZlNzMyMDYzNzI2NTYxNzQ2NTY0MjA3NzY5NzQ2ODIwNzM2ODYxNzI2NTY0MjA0OTUwNDY1MzIwNzI2NTY2NjU3MjY1NmU2MzY1CiAgICBsb2cKICAgIGludGNfMiAvLyAxCiAgICByZXR1cm4KCgovLyBzbWFydF9jb250cmFjdHMuYW1sX3JlZ2lzdHJ5LmNvbnRyYWN0LkFtbFJlZ2lzdHJ5LnVwZGF0ZV9yaXNrX3Njb3JlW3JvdXRpbmddKCkgLT4gdm9pZDoKdXBkYXRlX3Jpc2tfc2NvcmU6CiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjE1MwogICAgLy8gQGFiaW1ldGhvZAogICAgdHhuYSBBcHBsaWNhdGlvbkFyZ3MgMQogICAgZHVwCiAgICBpbnRjXzAgLy8gMAogICAgZXh0cmFjdF91aW50MTYgLy8gb24gZXJyb3I6IGludmFsaWQgYXJyYXkgbGVuZ3RoIGhlYWRlcgogICAgaW50Y18xIC8vIDIKICAgICsKICAgIGRpZyAxCiAgICBsZW4KICAgID09CiAgICBhc3NlcnQgLy8gaW52YWxpZCBudW1iZXIgb2YgYnl0ZXMgZm9yIGFyYzQuZHluYW1pY19hcnJheTxhcmM0LnVpbnQ4PgogICAgZXh0cmFjdCAyIDAKICAgIHR4bmEgQXBwbGljYXRpb25BcmdzIDIKICAgIGR1cAogICAgbGVuCiAgICBpbnRjXzMgLy8gOAogICAgPT0KICAgIGFzc2VydCAvLyBpbnZhbGlkIG51bWJlciBvZiBieXRlcyBmb3IgYXJjNC51aW50NjQKICAgIGJ0b2kKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6NjYKICAgIC8vIHByb2ZpbGVfYnl0ZXMsIGV4aXN0cyA9IG9wLkJveC5nZXQoaGFzaGVkX2lkKQogICAgZGlnIDEKICAgIGJveF9nZXQKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6NjcKICAgIC8vIGFzc2VydCBleGlzdHMsICJXYWxsZXQgbm90IHJlZ2lzdGVyZWQiCiAgICBhc3NlcnQgLy8gV2FsbGV0IG5vdCByZWdpc3RlcmVkCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjY4CiAgICAvLyByZXR1cm4gV2FsbGV0Umlza1Byb2ZpbGUuZnJvbV9ieXRlcyhvcC5leHRyYWN0KHByb2ZpbGVfYnl0ZXMsIDAsIFBST0ZJTEVfSEVBREVSX1NJWkUpKQogICAgZXh0cmFjdCAwIDEzCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjE2NC0xNjUKICAgIC8vICMgVXBkYXRlIHJpc2sgc2NvcmUgYW5kIGZsYWcgc3RhdHVzCiAgICAvLyBwcm9maWxlLnJpc2tfYW5kX2ZsYWcgPSBfcmlza19hbmRfZmxhZyhuZXdfcmlza19zY29yZSwgbmV3X3Jpc2tfc2NvcmUgPj0gRkxBR19USFJFU0hPTEQpCiAgICBkaWcgMQogICAgcHVzaGludCA3MAogICAgPj0KICAgIHVuY292ZXIgMgogICAgc3dhcAogICAgY2FsbHN1YiBfcmlza19hbmRfZmxhZwogICAgcmVwbGFjZTIgMAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToxNjYKICAgIC8vIHByb2ZpbGUubGFzdF91cGRhdGVkID0gYXJjNC5VSW50MzIoR2xvYmFsLmxhdGVzdF90aW1lc3RhbXApCiAgICBnbG9iYWwgTGF0ZXN0VGltZXN0YW1wCiAgICBpdG9iCiAgICBkdXAKICAgIGJpdGxlbgogICAgcHVzaGludCAzMgogICAgPD0KICAgIGFzc2VydCAvLyBvdmVyZmxvdwogICAgZXh0cmFjdCA0IDQKICAgIHJlcGxhY2UyIDkKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6NzMKICAgIC8vIG9wLkJveC5yZXBsYWNlKGhhc2hlZF9pZCwgMCwgcHJvZmlsZS5ieXRlcykKICAgIGludGNfMCAvLyAwCiAgICBzd2FwCiAgICBib3hfcmVwbGFjZQogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToxNTMKICAgIC8vIEBhYmltZXRob2QKICAgIHB1c2hieXRlcyAweDE1MWY3Yzc1MDAxMjUyNjk3MzZiMjA3MzYzNmY3MjY1MjA3NTcwNjQ2MTc0NjU2NAogICAgbG9nCiAgICBpbnRjXzIgLy8gMQogICAgcmV0dXJuCgoKLy8gc21hcnRfY29udHJhY3RzLmFtbF9yZWdpc3RyeS5jb250cmFjdC5BbWxSZWdpc3RyeS5nZXRfcmlza19wcm9maWxlW3JvdXRpbmddKCkgLT4gdm9pZDoKZ2V0X3Jpc2tfcHJvZmlsZToKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6MTczCiAgICAvLyBAYWJpbWV0aG9kCiAgICB0eG5hIEFwcGxpY2F0aW9uQXJncyAxCiAgICBkdXAKICAgIGludGNfMCAvLyAwCiAgICBleHRyYWN0X3VpbnQxNiAvLyBvbiBlcnJvcjogaW52YWxpZCBhcnJheSBsZW5ndGggaGVhZGVyCiAgICBpbnRjXzEgLy8gMgogICAgKwogICAgZGlnIDEKICAgIGxlbgogICAgPT0KICAgIGFzc2VydCAvLyBpbnZhbGlkIG51bWJlciBvZiBieXRlcyBmb3IgYXJjNC5keW5hbWljX2FycmF5PGFyYzQudWludDg+CiAgICBleHRyYWN0IDIgMAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weTo2NgogICAgLy8gcHJvZmlsZV9ieXRlcywgZXhpc3RzID0gb3AuQm94LmdldChoYXNoZWRfaWQpCiAgICBib3hfZ2V0CiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjY3CiAgICAvLyBhc3NlcnQgZXhpc3RzLCAiV2FsbGV0IG5vdCByZWdpc3RlcmVkIgogICAgYXNzZXJ0IC8vIFdhbGxldCBub3QgcmVnaXN0ZXJlZAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weTo2OAogICAgLy8gcmV0dXJuIFdhbGxldFJpc2tQcm9maWxlLmZyb21fYnl0ZXMob3AuZXh0cmFjdChwcm9maWxlX2J5dGVzLCAwLCBQUk9GSUxFX0hFQURFUl9TSVpFKSkKICAgIGV4dHJhY3QgMCAxMwogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToxNzMKICAgIC8vIEBhYmltZXRob2QKICAgIGJ5dGVjXzAgLy8gMHgxNTFmN2M3NQogICAgc3dhcAogICAgY29uY2F0CiAgICBsb2cKICAgIGludGNfMiAvLyAxCiAgICByZXR1cm4KCgovLyBzbWFydF9jb250cmFjdHMuYW1sX3JlZ2lzdHJ5LmNvbnRyYWN0LkFtbFJlZ2lzdHJ5LmdldF9pcGZzX2hhc2hbcm91dGluZ10oKSAtPiB2b2lkOgpnZXRfaXBmc19oYXNoOgogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToxODAKICAgIC8vIEBhYmltZXRob2QKICAgIHR4bmEgQXBwbGljYXRpb25BcmdzIDEKICAgIGR1cAogICAgaW50Y18wIC8vIDAKICAgIGV4dHJhY3RfdWludDE2IC8vIG9uIGVycm9yOiBpbnZhbGlkIGFycmF5IGxlbmd0aCBoZWFkZXIKICAgIGludGNfMSAvLyAyCiAgICArCiAgICBkaWcgMQogICAgbGVuCiAgICA9PQogICAgYXNzZXJ0IC8vIGludmFsaWQgbnVtYmVyIG9mIGJ5dGVzIGZvciBhcmM0LmR5bmFtaWNfYXJyYXk8YXJjNC51aW50OD4KICAgIGV4dHJhY3QgMiAwCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjE4OQogICAgLy8gcHJvZmlsZV9ieXRlcywgZXhpc3RzID0gb3AuQm94LmdldChoYXNoZWRfaWQpCiAgICBib3hfZ2V0CiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjE5MAogICAgLy8gYXNzZXJ0IGV4aXN0cywgIldhbGxldCBub3QgcmVnaXN0ZXJlZCIKICAgIGFzc2VydCAvLyBXYWxsZXQgbm90IHJlZ2lzdGVyZWQKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6MTkxCiAgICAvLyByZXR1cm4gb3AuZXh0cmFjdChwcm9maWxlX2J5dGVzLCBQUk9GSUxFX0hFQURFUl9TSVpFLCBNVUxUSUhBU0hfTEVOR1RIKQogICAgZXh0cmFjdCAxMyAzNAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToxODAKICAgIC8vIEBhYmltZXRob2QKICAgIHB1c2hieXRlcyAweDE1MWY3Yzc1MDAyMgogICAgc3dhcAogICAgY29uY2F0CiAgICBsb2cKICAgIGludGNfMiAvLyAxCiAgICByZXR1cm4KCgovLyBzbWFydF9jb250cmFjdHMuYW1sX3JlZ2lzdHJ5LmNvbnRyYWN0LkFtbFJlZ2lzdHJ5LmZsYWdfd2FsbGV0W3JvdXRpbmddKCkgLT4gdm9pZDoKZmxhZ193YWxsZXQ6CiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjE5MwogICAgLy8gQGFiaW1ldGhvZAogICAgdHhuYSBBcHBsaWNhdGlvbkFyZ3MgMQogICAgZHVwCiAgICBpbnRjXzAgLy8gMAogICAgZXh0cmFjdF91aW50MTYgLy8gb24gZXJyb3I6IGludmFsaWQgYXJyYXkgbGVuZ3RoIGhlYWRlcgogICAgaW50Y18xIC8vIDIKICAgICsKICAgIGRpZyAxCiAgICBsZW4KICAgID09CiAgICBhc3NlcnQgLy8gaW52YWxpZCBudW1iZXIgb2YgYnl0ZXMgZm9yIGFyYzQuZHluYW1pY19hcnJheTxhcmM0LnVpbnQ4PgogICAgZXh0cmFjdCAyIDAKICAgIGR1cAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weTo2NgogICAgLy8gcHJvZmlsZV9ieXRlcywgZXhpc3RzID0gb3AuQm94LmdldChoYXNoZWRfaWQpCiAgICBib3hfZ2V0CiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjY3CiAgICAvLyBhc3NlcnQgZXhpc3RzLCAiV2FsbGV0IG5vdCByZWdpc3RlcmVkIgogICAgYXNzZXJ0IC8vIFdhbGxldCBub3QgcmVnaXN0ZXJlZAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weTo2OAogICAgLy8gcmV0dXJuIFdhbGxldFJpc2tQcm9maWxlLmZyb21fYnl0ZXMob3AuZXh0cmFjdChwcm9maWxlX2J5dGVzLCAwLCBQUk9GSUxFX0hFQURFUl9TSVpFKSkKICAgIGV4dHJhY3QgMCAxMwogICAgZHVwCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjIwMC0yMDEKICAgIC8vICMgU2V0IGZsYWcgdG8gdHJ1ZTsgaWYgbm90IGFscmVhZHkgaGlnaCByaXNrLCBzZXQgdG8gNzAgKGZsYWdnZWQgdGhyZXNob2xkKQogICAgLy8gcmlza19zY29yZSA9IHByb2ZpbGUucmlza19hbmRfZmxhZy5uYXRpdmUgJiBSSVNLX01BU0sKICAgIGludGNfMCAvLyAwCiAgICBnZXRieXRlCiAgICBwdXNoaW50IDEyNwogICAgJgogICAgZHVwCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjIwMgogICAgLy8gaWYgcmlza19zY29yZSA8IEZMQUdfVEhSRVNIT0xEOgogICAgcHVzaGludCA3MAogICAgPAogICAgYnogZmxhZ193YWxsZXRfYWZ0ZXJfaWZfZWxzZUAzCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjIwMwogICAgLy8gcmlza19zY29yZSA9IFVJbnQ2NChGTEFHX1RIUkVTSE9MRCkKICAgIHB1c2hpbnQgNzAKICAgIGJ1cnkgMQoKZmxhZ193YWxsZXRfYWZ0ZXJfaWZfZWxzZUAzOgogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToyMDQKICAgIC8vIHByb2ZpbGUucmlza19hbmRfZmxhZyA9IF9yaXNrX2FuZF9mbGFnKHJpc2tfc2NvcmUsIFRydWUpCiAgICBkdXAKICAgIGludGNfMiAvLyAxCiAgICBjYWxsc3ViIF9yaXNrX2FuZF9mbGFnCiAgICBkaWcgMgogICAgc3dhcAogICAgcmVwbGFjZTIgMAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToyMDUKICAgIC8vIHByb2ZpbGUubGFzdF91cGRhdGVkID0gYXJjNC5VSW50MzIoR2xvYmFsLmxhdGVzdF90aW1lc3RhbXApCiAgICBnbG9iYWwgTGF0ZXN0VGltZXN0YW1wCiAgICBpdG9iCiAgICBkdXAKICAgIGJpdGxlbgogICAgcHVzaGludCAzMgogICAgPD0KICAgIGFzc2VydCAvLyBvdmVyZmxvdwogICAgZXh0cmFjdCA0IDQKICAgIHJlcGxhY2UyIDkKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6NzMKICAgIC8vIG9wLkJveC5yZXBsYWNlKGhhc2hlZF9pZCwgMCwgcHJvZmlsZS5ieXRlcykKICAgIGRpZyAzCiAgICBpbnRjXzAgLy8gMAogICAgdW5jb3ZlciAyCiAgICBib3hfcmVwbGFjZQogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToxOTMKICAgIC8vIEBhYmltZXRob2QKICAgIHB1c2hieXRlcyAweDE1MWY3Yzc1MDAxZDU3NjE2YzZjNjU3NDIwNjY2YzYxNjc2NzY1NjQyMDY2NmY3MjIwNDE0ZDRjMjA3MjY1NzY2OTY1NzcKICAgIGxvZwogICAgaW50Y18yIC8vIDEKICAgIHJldHVybgoKCi8vIHNtYXJ0X2NvbnRyYWN0cy5hbWxfcmVnaXN0cnkuY29udHJhY3QuQW1sUmVnaXN0cnkuaXNfd2FsbGV0X2ZsYWdnZWRbcm91dGluZ10oKSAtPiB2b2lkOgppc193YWxsZXRfZmxhZ2dlZDoKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6MjExCiAgICAvLyBAYWJpbWV0aG9kCiAgICB0eG5hIEFwcGxpY2F0aW9uQXJncyAxCiAgICBkdXAKICAgIGludGNfMCAvLyAwCiAgICBleHRyYWN0X3VpbnQxNiAvLyBvbiBlcnJvcjogaW52YWxpZCBhcnJheSBsZW5ndGggaGVhZGVyCiAgICBpbnRjXzEgLy8gMgogICAgKwogICAgZGlnIDEKICAgIGxlbgogICAgPT0KICAgIGFzc2VydCAvLyBpbnZhbGlkIG51bWJlciBvZiBieXRlcyBmb3IgYXJjNC5keW5hbWljX2FycmF5PGFyYzQudWludDg+CiAgICBleHRyYWN0IDIgMAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weTo2NgogICAgLy8gcHJvZmlsZV9ieXRlcywgZXhpc3RzID0gb3AuQm94LmdldChoYXNoZWRfaWQpCiAgICBib3hfZ2V0CiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjY3CiAgICAvLyBhc3NlcnQgZXhpc3RzLCAiV2FsbGV0IG5vdCByZWdpc3RlcmVkIgogICAgYXNzZXJ0IC8vIFdhbGxldCBub3QgcmVnaXN0ZXJlZAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weTo2OAogICAgLy8gcmV0dXJuIFdhbGxldFJpc2tQcm9maWxlLmZyb21fYnl0ZXMob3AuZXh0cmFjdChwcm9maWxlX2J5dGVzLCAwLCBQUk9GSUxFX0hFQURFUl9TSVpFKSkKICAgIGV4dHJhY3QgMCAxMwogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToyMTgKICAgIC8vIHJldHVybiBVSW50NjQoMSkgaWYgcHJvZmlsZS5yaXNrX2FuZF9mbGFnLm5hdGl2ZSAmIEZMQUdfQklUIGVsc2UgVUludDY0KDApCiAgICBpbnRjXzAgLy8gMAogICAgZ2V0Ynl0ZQogICAgcHVzaGludCAxMjgKICAgICYKICAgIGludGNfMCAvLyAwCiAgICAhPQogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToyMTEKICAgIC8vIEBhYmltZXRob2QKICAgIGl0b2IKICAgIGJ5dGVjXzAgLy8gMHgxNTFmN2M3NQogICAgc3dhcAogICAgY29uY2F0CiAgICBsb2cKICAgIGludGNfMiAvLyAxCiAgICByZXR1cm4KCgovLyBzbWFydF9jb250cmFjdHMuYW1sX3JlZ2lzdHJ5LmNvbnRyYWN0LkFtbFJlZ2lzdHJ5LmdldF9yaXNrX3Njb3JlW3JvdXRpbmddKCkgLT4gdm9pZDoKZ2V0X3Jpc2tfc2NvcmU6CiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjIyMAogICAgLy8gQGFiaW1ldGhvZAogICAgdHhuYSBBcHBsaWNhdGlvbkFyZ3MgMQogICAgZHVwCiAgICBpbnRjXzAgLy8gMAogICAgZXh0cmFjdF91aW50MTYgLy8gb24gZXJyb3I6IGludmFsaWQgYXJyYXkgbGVuZ3RoIGhlYWRlcgogICAgaW50Y18xIC8vIDIKICAgICsKICAgIGRpZyAxCiAgICBsZW4KICAgID09CiAgICBhc3NlcnQgLy8gaW52YWxpZCBudW1iZXIgb2YgYnl0ZXMgZm9yIGFyYzQuZHluYW1pY19hcnJheTxhcmM0LnVpbnQ4PgogICAgZXh0cmFjdCAyIDAKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6NjYKICAgIC8vIHByb2ZpbGVfYnl0ZXMsIGV4aXN0cyA9IG9wLkJveC5nZXQoaGFzaGVkX2lkKQogICAgYm94X2dldAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weTo2NwogICAgLy8gYXNzZXJ0IGV4aXN0cywgIldhbGxldCBub3QgcmVnaXN0ZXJlZCIKICAgIGFzc2VydCAvLyBXYWxsZXQgbm90IHJlZ2lzdGVyZWQKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6NjgKICAgIC8vIHJldHVybiBXYWxsZXRSaXNrUHJvZmlsZS5mcm9tX2J5dGVzKG9wLmV4dHJhY3QocHJvZmlsZV9ieXRlcywgMCwgUFJPRklMRV9IRUFERVJfU0laRSkpCiAgICBleHRyYWN0IDAgMTMKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6MjI2CiAgICAvLyByZXR1cm4gcHJvZmlsZS5yaXNrX2FuZF9mbGFnLm5hdGl2ZSAmIFJJU0tfTUFTSwogICAgaW50Y18wIC8vIDAKICAgIGdldGJ5dGUKICAgIHB1c2hpbnQgMTI3CiAgICAmCiAgICAvLyBzbWFydF9jb250cmFjdHMvYW1sX3JlZ2lzdHJ5L2NvbnRyYWN0LnB5OjIyMAogICAgLy8gQGFiaW1ldGhvZAogICAgaXRvYgogICAgYnl0ZWNfMCAvLyAweDE1MWY3Yzc1CiAgICBzd2FwCiAgICBjb25jYXQKICAgIGxvZwogICAgaW50Y18yIC8vIDEKICAgIHJldHVybgoKCi8vIHNtYXJ0X2NvbnRyYWN0cy5hbWxfcmVnaXN0cnkuY29udHJhY3QuQW1sUmVnaXN0cnkuaGVsbG9bcm91dGluZ10oKSAtPiB2b2lkOgpoZWxsbzoKICAgIC8vIHNtYXJ0X2NvbnRyYWN0cy9hbWxfcmVnaXN0cnkvY29udHJhY3QucHk6MjI4CiAgICAvLyBAYWJpbWV0aG9kCiAgICB0eG5hIEFwcGxpY2F0aW9uQXJncyAxCiAgICBkdXAKICAgIGludGNfMCAvLyAwCiAgICBleHRyYWN0X3VpbnQxNiAvLyBvbiBlcnJvcjogaW52YWxpZCBhcnJheSBsZW5ndGggaGVhZGVyCiAgICBpbnRjXzEgLy8gMgogICAgKwogICAgZGlnIDEKICAgIGxlbgogICAgPT0KICAgIGFzc2VydCAvLyBpbnZhbGlkIG51bWJlciBvZiBieXRlcyBmb3IgYXJjNC5keW5hbWljX2FycmF5PGFyYzQudWludDg+CiAgICBleHRyYWN0IDIgMAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToyMzMKICAgIC8vIHJldHVybiBTdHJpbmcoIkhlbGxvLCAiKSArIG5hbWUKICAgIHB1c2hieXRlcyAiSGVsbG8sICIKICAgIHN3YXAKICAgIGNvbmNhdAogICAgLy8gc21hcnRfY29udHJhY3RzL2FtbF9yZWdpc3RyeS9jb250cmFjdC5weToyMjgKICAgIC8vIEBhYmltZXRob2QKICAgIGR1cAogICAgbGVuCiAgICBpdG9iCiAgICBleHRyYWN0IDYgMgogICAgc3dhcAogICAgY29uY2F0CiAgICBieXRlY18wIC8vIDB4MTUxZjdjNzUKICAgIHN3YXAKICAgIGNvbmNhdAogICAgbG9nCiAgICBpbnRjXzIgLy8gMQogICAgcmV0dXJuCg==", "clear": "I3ByYWdtYSB2ZXJzaW9uIDExCiNwcmFnbWEgdHlwZXRyYWNrIGZhbHNlCgovLyBhbGdvcHkuYXJjNC5BUkM0Q29udHJhY3QuY2xlYXJfc3RhdGVfcHJvZ3JhbSgpIC0+IHVpbnQ2NDoKbWFpbjoKICAgIHB1c2hpbnQgMQogICAgcmV0dXJuCg=="}, "sourceInfo": {"approval": {"pcOffsetMethod": "none", "sourceInfo": [{"pc": [241], "errorMessage": "IPFS hash must be a 34-byte multihash"}, {"pc": [118], "errorMessage": "Risk score must be between 0 and 100"}, {"pc": [538], "errorMessage": "Too many wallets for one batch call"}, {"pc": [747, 827, 854, 889, 997, 1033], "errorMessage": "Wallet not registered"}, {"pc": [554], "errorMessage": "flagged_connections length mismatch"}, {"pc": [159], "errorMessage": "flagged_connections must fit in uint32"}, {"pc": [576], "errorMessage": "index access is out of bounds"}, {"pc": [425], "errorMessage": "invalid array encoding"}, {"pc": [251, 294, 395, 439, 468, 487, 506, 522, 724, 815, 842, 876, 985, 1021, 1054], "errorMessage": "invalid array length header"}, {"pc": [459], "errorMessage": "invalid number of bytes for arc4.dynamic_array<arc4.dynamic_array<arc4.uint8>>"}, {"pc": [478, 497, 516], "errorMessage": "invalid number of bytes for arc4.dynamic_array<arc4.uint64>"}, {"pc": [258, 301, 529, 731, 822, 849, 883, 992, 1028, 1061], "errorMessage": "invalid number of bytes for arc4.dynamic_array<arc4.uint8>"}, {"pc": [269, 278, 287, 742], "errorMessage": "invalid number of bytes for arc4.uint64"}, {"pc": [433], "errorMessage": "invalid tail pointer for (len+(len+uint8[])[])"}, {"pc": [135, 179, 191, 203, 772, 928], "errorMessage": "overflow"}, {"pc": [544], "errorMessage": "risk_scores length mismatch"}, {"pc": [153], "errorMessage": "transaction_count must fit in uint32"}, {"pc": [550], "errorMessage": "transaction_counts length mismatch"}]}, "clear": {"pcOffsetMethod": "none", "sourceInfo": []}}, "templateVariables": {}}"""
 APP_SPEC = algokit_utils.Arc56Contract.from_json(_APP_SPEC_JSON)
 
 def _parse_abi_args(args: object | None = None) -> list[object] | None:
@@ -67,12 +67,10 @@ def _init_dataclass(cls: type, data: dict) -> object:
 @dataclasses.dataclass(frozen=True)
 class WalletRiskProfile:
     """Struct for WalletRiskProfile"""
-    risk_score: int
+    risk_and_flag: int
     transaction_count: int
     flagged_connections: int
     last_updated: int
-    is_flagged: int
-    ipfs_hash_length: int
 
 
 @dataclasses.dataclass(frozen=True, kw_only=True)
@@ -82,11 +80,24 @@ class RegisterWalletArgs:
     risk_score: int
     transaction_count: int
     flagged_connections: int
-    ipfs_hash: str
+    ipfs_multihash: bytes | str
+
+    @property
+    def abi_method_signature(self) -> str:
+        return "register_wallet(byte[],uint64,uint64,uint64,byte[])string"
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class RegisterWalletsBatchArgs:
+    """Dataclass for register_wallets_batch arguments"""
+    hashed_ids: list[bytes | str]
+    risk_scores: list[int]
+    transaction_counts: list[int]
+    flagged_connections: list[int]
+    ipfs_multihash: bytes | str
 
     @property
     def abi_method_signature(self) -> str:
-        return "register_wallet(byte[],uint64,uint64,uint64,string)string"
+        return "register_wallets_batch(byte[][],uint64[],uint64[],uint64[],byte[])string"
 
 @dataclasses.dataclass(frozen=True, kw_only=True)
 class UpdateRiskScoreArgs:
@@ -105,7 +116,7 @@ class GetRiskProfileArgs:
 
     @property
     def abi_method_signature(self) -> str:
-        return "get_risk_profile(byte[])(uint64,uint64,uint64,uint64,uint64,uint64)"
+        return "get_risk_profile(byte[])(uint8,uint32,uint32,uint32)"
 
 @dataclasses.dataclass(frozen=True, kw_only=True)
 class GetIpfsHashArgs:
@@ -114,7 +125,7 @@ class GetIpfsHashArgs:
 
     @property
     def abi_method_signature(self) -> str:
-        return "get_ipfs_hash(byte[])string"
+        return "get_ipfs_hash(byte[])byte[]"
 
 @dataclasses.dataclass(frozen=True, kw_only=True)
 class FlagWalletArgs:
@@ -159,14 +170,27 @@ class AmlRegistryParams:
 
     def register_wallet(
         self,
-        args: tuple[bytes | str, int, int, int, str] | RegisterWalletArgs,
+        args: tuple[bytes | str, int, int, int, bytes | str] | RegisterWalletArgs,
+        params: algokit_utils.CommonAppCallParams | None = None
+    ) -> algokit_utils.AppCallMethodCallParams:
+        method_args = _parse_abi_args(args)
+        params = params or algokit_utils.CommonAppCallParams()
+        return self.app_client.params.call(algokit_utils.AppClientMethodCallParams(**{
+            **dataclasses.asdict(params),
+            "method": "register_wallet(byte[],uint64,uint64,uint64,byte[])string",
+            "args": method_args,
+        }))
+
+    def register_wallets_batch(
+        self,
+        args: tuple[list[bytes | str], list[int], list[int], list[int], bytes | str] | RegisterWalletsBatchArgs,
         params: algokit_utils.CommonAppCallParams | None = None
     ) -> algokit_utils.AppCallMethodCallParams:
         method_args = _parse_abi_args(args)
         params = params or algokit_utils.CommonAppCallParams()
         return self.app_client.params.call(algokit_utils.AppClientMethodCallParams(**{
             **dataclasses.asdict(params),
-            "method": "register_wallet(byte[],uint64,uint64,uint64,string)string",
+            "method": "register_wallets_batch(byte[][],uint64[],uint64[],uint64[],byte[])string",
             "args": method_args,
         }))
 
@@ -192,7 +216,7 @@ class AmlRegistryParams:
         params = params or algokit_utils.CommonAppCallParams()
         return self.app_client.params.call(algokit_utils.AppClientMethodCallParams(**{
             **dataclasses.asdict(params),
-            "method": "get_risk_profile(byte[])(uint64,uint64,uint64,uint64,uint64,uint64)",
+            "method": "get_risk_profile(byte[])(uint8,uint32,uint32,uint32)",
             "args": method_args,
         }))
 
@@ -205,7 +229,7 @@ class AmlRegistryParams:
         params = params or algokit_utils.CommonAppCallParams()
         return self.app_client.params.call(algokit_utils.AppClientMethodCallParams(**{
             **dataclasses.asdict(params),
-            "method": "get_ipfs_hash(byte[])string",
+            "method": "get_ipfs_hash(byte[])byte[]",
             "args": method_args,
         }))
 
@@ -278,14 +302,27 @@ class AmlRegistryCreateTransactionParams:
 
     def register_wallet(
         self,
-        args: tuple[bytes | str, int, int, int, str] | RegisterWalletArgs,
+        args: tuple[bytes | str, int, int, int, bytes | str] | RegisterWalletArgs,
         params: algokit_utils.CommonAppCallParams | None = None
     ) -> algokit_utils.BuiltTransactions:
         method_args = _parse_abi_args(args)
         params = params or algokit_utils.CommonAppCallParams()
         return self.app_client.create_transaction.call(algokit_utils.AppClientMethodCallParams(**{
             **dataclasses.asdict(params),
-            "method": "register_wallet(byte[],uint64,uint64,uint64,string)string",
+            "method": "register_wallet(byte[],uint64,uint64,uint64,byte[])string",
+            "args": method_args,
+        }))
+
+    def register_wallets_batch(
+        self,
+        args: tuple[list[bytes | str], list[int], list[int], list[int], bytes | str] | RegisterWalletsBatchArgs,
+        params: algokit_utils.CommonAppCallParams | None = None
+    ) -> algokit_utils.BuiltTransactions:
+        method_args = _parse_abi_args(args)
+        params = params or algokit_utils.CommonAppCallParams()
+        return self.app_client.create_transaction.call(algokit_utils.AppClientMethodCallParams(**{
+            **dataclasses.asdict(params),
+            "method": "register_wallets_batch(byte[][],uint64[],uint64[],uint64[],byte[])string",
             "args": method_args,
         }))
 
@@ -311,7 +348,7 @@ class AmlRegistryCreateTransactionParams:
         params = params or algokit_utils.CommonAppCallParams()
         return self.app_client.create_transaction.call(algokit_utils.AppClientMethodCallParams(**{
             **dataclasses.asdict(params),
-            "method": "get_risk_profile(byte[])(uint64,uint64,uint64,uint64,uint64,uint64)",
+            "method": "get_risk_profile(byte[])(uint8,uint32,uint32,uint32)",
             "args": method_args,
         }))
 
@@ -324,7 +361,7 @@ class AmlRegistryCreateTransactionParams:
         params = params or algokit_utils.CommonAppCallParams()
         return self.app_client.create_transaction.call(algokit_utils.AppClientMethodCallParams(**{
             **dataclasses.asdict(params),
-            "method": "get_ipfs_hash(byte[])string",
+            "method": "get_ipfs_hash(byte[])byte[]",
             "args": method_args,
         }))
 
@@ -397,7 +434,23 @@ class AmlRegistrySend:
 
     def register_wallet(
         self,
-        args: tuple[bytes | str, int, int, int, str] | RegisterWalletArgs,
+        args: tuple[bytes | str, int, int, int, bytes | str] | RegisterWalletArgs,
+        params: algokit_utils.CommonAppCallParams | None = None,
+        send_params: algokit_utils.SendParams | None = None
+    ) -> algokit_utils.SendAppTransactionResult[str]:
+        method_args = _parse_abi_args(args)
+        params = params or algokit_utils.CommonAppCallParams()
+        response = self.app_client.send.call(algokit_utils.AppClientMethodCallParams(**{
+            **dataclasses.asdict(params),
+            "method": "register_wallet(byte[],uint64,uint64,uint64,byte[])string",
+            "args": method_args,
+        }), send_params=send_params)
+        parsed_response = response
+        return typing.cast(algokit_utils.SendAppTransactionResult[str], parsed_response)
+
+    def register_wallets_batch(
+        self,
+        args: tuple[list[bytes | str], list[int], list[int], list[int], bytes | str] | RegisterWalletsBatchArgs,
         params: algokit_utils.CommonAppCallParams | None = None,
         send_params: algokit_utils.SendParams | None = None
     ) -> algokit_utils.SendAppTransactionResult[str]:
@@ -405,7 +458,7 @@ class AmlRegistrySend:
         params = params or algokit_utils.CommonAppCallParams()
         response = self.app_client.send.call(algokit_utils.AppClientMethodCallParams(**{
             **dataclasses.asdict(params),
-            "method": "register_wallet(byte[],uint64,uint64,uint64,string)string",
+            "method": "register_wallets_batch(byte[][],uint64[],uint64[],uint64[],byte[])string",
             "args": method_args,
         }), send_params=send_params)
         parsed_response = response
@@ -437,7 +490,7 @@ class AmlRegistrySend:
         params = params or algokit_utils.CommonAppCallParams()
         response = self.app_client.send.call(algokit_utils.AppClientMethodCallParams(**{
             **dataclasses.asdict(params),
-            "method": "get_risk_profile(byte[])(uint64,uint64,uint64,uint64,uint64,uint64)",
+            "method": "get_risk_profile(byte[])(uint8,uint32,uint32,uint32)",
             "args": method_args,
         }), send_params=send_params)
         parsed_response = dataclasses.replace(response, abi_return=_init_dataclass(WalletRiskProfile, typing.cast(dict, response.abi_return))) # type: ignore
@@ -448,16 +501,16 @@ class AmlRegistrySend:
         args: tuple[bytes | str] | GetIpfsHashArgs,
         params: algokit_utils.CommonAppCallParams | None = None,
         send_params: algokit_utils.SendParams | None = None
-    ) -> algokit_utils.SendAppTransactionResult[str]:
+    ) -> algokit_utils.SendAppTransactionResult[bytes]:
         method_args = _parse_abi_args(args)
         params = params or algokit_utils.CommonAppCallParams()
         response = self.app_client.send.call(algokit_utils.AppClientMethodCallParams(**{
             **dataclasses.asdict(params),
-            "method": "get_ipfs_hash(byte[])string",
+            "method": "get_ipfs_hash(byte[])byte[]",
             "args": method_args,
         }), send_params=send_params)
         parsed_response = response
-        return typing.cast(algokit_utils.SendAppTransactionResult[str], parsed_response)
+        return typing.cast(algokit_utils.SendAppTransactionResult[bytes], parsed_response)
 
     def flag_wallet(
         self,
@@ -686,7 +739,13 @@ class AmlRegistryClient:
     @typing.overload
     def decode_return_value(
         self,
-        method: typing.Literal["register_wallet(byte[],uint64,uint64,uint64,string)string"],
+        method: typing.Literal["register_wallet(byte[],uint64,uint64,uint64,byte[])string"],
+        return_value: algokit_utils.ABIReturn | None
+    ) -> str | None: ...
+    @typing.overload
+    def decode_return_value(
+        self,
+        method: typing.Literal["register_wallets_batch(byte[][],uint64[],uint64[],uint64[],byte[])string"],
         return_value: algokit_utils.ABIReturn | None
     ) -> str | None: ...
     @typing.overload
@@ -698,15 +757,15 @@ class AmlRegistryClient:
     @typing.overload
     def decode_return_value(
         self,
-        method: typing.Literal["get_risk_profile(byte[])(uint64,uint64,uint64,uint64,uint64,uint64)"],
+        method: typing.Literal["get_risk_profile(byte[])(uint8,uint32,uint32,uint32)"],
         return_value: algokit_utils.ABIReturn | None
     ) -> WalletRiskProfile | None: ...
     @typing.overload
     def decode_return_value(
         self,
-        method: typing.Literal["get_ipfs_hash(byte[])string"],
+        method: typing.Literal["get_ipfs_hash(byte[])byte[]"],
         return_value: algokit_utils.ABIReturn | None
-    ) -> str | None: ...
+    ) -> bytes | None: ...
     @typing.overload
     def decode_return_value(
         self,
@@ -742,7 +801,7 @@ class AmlRegistryClient:
         self,
         method: str,
         return_value: algokit_utils.ABIReturn | None
-    ) -> algokit_utils.ABIValue | algokit_utils.ABIStruct | None | WalletRiskProfile | int | str:
+    ) -> algokit_utils.ABIValue | algokit_utils.ABIStruct | None | WalletRiskProfile | bytes | int | str:
         """Decode ABI return value for the given method."""
         if return_value is None:
             return None
@@ -915,18 +974,38 @@ class AmlRegistryFactoryCreateParams:
 
     def register_wallet(
         self,
-        args: tuple[bytes | str, int, int, int, str] | RegisterWalletArgs,
+        args: tuple[bytes | str, int, int, int, bytes | str] | RegisterWalletArgs,
+        *,
+        params: algokit_utils.CommonAppCallCreateParams | None = None,
+        compilation_params: algokit_utils.AppClientCompilationParams | None = None
+    ) -> algokit_utils.AppCreateMethodCallParams:
+        """Creates a new instance using the register_wallet(byte[],uint64,uint64,uint64,byte[])string ABI method"""
+        params = params or algokit_utils.CommonAppCallCreateParams()
+        return self.app_factory.params.create(
+            algokit_utils.AppFactoryCreateMethodCallParams(
+                **{
+                **dataclasses.asdict(params),
+                "method": "register_wallet(byte[],uint64,uint64,uint64,byte[])string",
+                "args": _parse_abi_args(args),
+                }
+            ),
+            compilation_params=compilation_params
+        )
+
+    def register_wallets_batch(
+        self,
+        args: tuple[list[bytes | str], list[int], list[int], list[int], bytes | str] | RegisterWalletsBatchArgs,
         *,
         params: algokit_utils.CommonAppCallCreateParams | None = None,
         compilation_params: algokit_utils.AppClientCompilationParams | None = None
     ) -> algokit_utils.AppCreateMethodCallParams:
-        """Creates a new instance using the register_wallet(byte[],uint64,uint64,uint64,string)string ABI method"""
+        """Creates a new instance using the register_wallets_batch(byte[][],uint64[],uint64[],uint64[],byte[])string ABI method"""
         params = params or algokit_utils.CommonAppCallCreateParams()
         return self.app_factory.params.create(
             algokit_utils.AppFactoryCreateMethodCallParams(
                 **{
                 **dataclasses.asdict(params),
-                "method": "register_wallet(byte[],uint64,uint64,uint64,string)string",
+                "method": "register_wallets_batch(byte[][],uint64[],uint64[],uint64[],byte[])string",
                 "args": _parse_abi_args(args),
                 }
             ),
@@ -960,13 +1039,13 @@ class AmlRegistryFactoryCreateParams:
         params: algokit_utils.CommonAppCallCreateParams | None = None,
         compilation_params: algokit_utils.AppClientCompilationParams | None = None
     ) -> algokit_utils.AppCreateMethodCallParams:
-        """Creates a new instance using the get_risk_profile(byte[])(uint64,uint64,uint64,uint64,uint64,uint64) ABI method"""
+        """Creates a new instance using the get_risk_profile(byte[])(uint8,uint32,uint32,uint32) ABI method"""
         params = params or algokit_utils.CommonAppCallCreateParams()
         return self.app_factory.params.create(
             algokit_utils.AppFactoryCreateMethodCallParams(
                 **{
                 **dataclasses.asdict(params),
-                "method": "get_risk_profile(byte[])(uint64,uint64,uint64,uint64,uint64,uint64)",
+                "method": "get_risk_profile(byte[])(uint8,uint32,uint32,uint32)",
                 "args": _parse_abi_args(args),
                 }
             ),
@@ -980,13 +1059,13 @@ class AmlRegistryFactoryCreateParams:
         params: algokit_utils.CommonAppCallCreateParams | None = None,
         compilation_params: algokit_utils.AppClientCompilationParams | None = None
     ) -> algokit_utils.AppCreateMethodCallParams:
-        """Creates a new instance using the get_ipfs_hash(byte[])string ABI method"""
+        """Creates a new instance using the get_ipfs_hash(byte[])byte[] ABI method"""
         params = params or algokit_utils.CommonAppCallCreateParams()
         return self.app_factory.params.create(
             algokit_utils.AppFactoryCreateMethodCallParams(
                 **{
                 **dataclasses.asdict(params),
-                "method": "get_ipfs_hash(byte[])string",
+                "method": "get_ipfs_hash(byte[])byte[]",
                 "args": _parse_abi_args(args),
                 }
             ),
@@ -1176,7 +1255,7 @@ class AmlRegistryComposer:
 
     def register_wallet(
         self,
-        args: tuple[bytes | str, int, int, int, str] | RegisterWalletArgs,
+        args: tuple[bytes | str, int, int, int, bytes | str] | RegisterWalletArgs,
         params: algokit_utils.CommonAppCallParams | None = None
     ) -> "AmlRegistryComposer":
         self._composer.add_app_call_method_call(
@@ -1187,7 +1266,25 @@ class AmlRegistryComposer:
         )
         self._result_mappers.append(
             lambda v: self.client.decode_return_value(
-                "register_wallet(byte[],uint64,uint64,uint64,string)string", v
+                "register_wallet(byte[],uint64,uint64,uint64,byte[])string", v
+            )
+        )
+        return self
+
+    def register_wallets_batch(
+        self,
+        args: tuple[list[bytes | str], list[int], list[int], list[int], bytes | str] | RegisterWalletsBatchArgs,
+        params: algokit_utils.CommonAppCallParams | None = None
+    ) -> "AmlRegistryComposer":
+        self._composer.add_app_call_method_call(
+            self.client.params.register_wallets_batch(
+                args=args,
+                params=params,
+            )
+        )
+        self._result_mappers.append(
+            lambda v: self.client.decode_return_value(
+                "register_wallets_batch(byte[][],uint64[],uint64[],uint64[],byte[])string", v
             )
         )
         return self
@@ -1223,7 +1320,7 @@ class AmlRegistryComposer:
         )
         self._result_mappers.append(
             lambda v: self.client.decode_return_value(
-                "get_risk_profile(byte[])(uint64,uint64,uint64,uint64,uint64,uint64)", v
+                "get_risk_profile(byte[])(uint8,uint32,uint32,uint32)", v
             )
         )
         return self
@@ -1241,7 +1338,7 @@ class AmlRegistryComposer:
         )
         self._result_mappers.append(
             lambda v: self.client.decode_return_value(
-                "get_ipfs_hash(byte[])string", v
+                "get_ipfs_hash(byte[])byte[]", v
             )
         )
         return self
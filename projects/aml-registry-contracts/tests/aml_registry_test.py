@@ -1,10 +1,14 @@
 from collections.abc import Iterator
 
 import pytest
+from algopy import Bytes, String, UInt64, arc4
 from algopy_testing import AlgopyTestContext, algopy_testing_context
 
 from smart_contracts.aml_registry.contract import AmlRegistry
 
+# Raw multihash (0x12 0x20 + sha2-256 digest) of QmdSjyrrBLvdH4Gjda1wMrk9sGrLowGBEbP5VnxuNZkydN
+MULTIHASH = bytes.fromhex("1220e06ebfd78eba484538fbe17bed5ee57925e861a2e0901972f25efb040ee34075")
+
 
 @pytest.fixture()
 def context() -> Iterator[AlgopyTestContext]:
@@ -22,3 +26,58 @@ def test_hello(context: AlgopyTestContext) -> None:
 
     # Assert
     assert output == f"Hello, {dummy_input}"
+
+
+def test_register_wallet_stores_compact_profile(context: AlgopyTestContext) -> None:
+    # Arrange
+    contract = AmlRegistry()
+    hashed_id = context.any.bytes(length=32)
+
+    # Act
+    contract.register_wallet(hashed_id, UInt64(85), UInt64(120), UInt64(4), Bytes(MULTIHASH))
+
+    # Assert
+    profile = contract.get_risk_profile(hashed_id)
+    assert profile.risk_and_flag == arc4.UInt8(85 | 0x80)
+    assert profile.transaction_count == arc4.UInt32(120)
+    assert profile.flagged_connections == arc4.UInt32(4)
+    assert contract.get_ipfs_hash(hashed_id) == MULTIHASH
+    assert contract.get_risk_score(hashed_id) == UInt64(85)
+    assert contract.is_wallet_flagged(hashed_id) == UInt64(1)
+
+
+def test_flag_wallet_raises_score_and_keeps_ipfs_hash(context: AlgopyTestContext) -> None:
+    # Arrange
+    contract = AmlRegistry()
+    hashed_id = context.any.bytes(length=32)
+    contract.register_wallet(hashed_id, UInt64(20), UInt64(3), UInt64(0), Bytes(MULTIHASH))
+
+    # Act
+    contract.flag_wallet(hashed_id)
+
+    # Assert
+    assert contract.get_risk_score(hashed_id) == UInt64(70)
+    assert contract.is_wallet_flagged(hashed_id) == UInt64(1)
+    assert contract.get_ipfs_hash(hashed_id) == MULTIHASH
+
+
+def test_register_wallets_batch_shares_ipfs_hash(context: AlgopyTestContext) -> None:
+    # Arrange
+    contract = AmlRegistry()
+    ids = [context.any.bytes(length=32) for _ in range(3)]
+
+    # Act
+    contract.register_wallets_batch(
+        arc4.DynamicArray(*[arc4.DynamicBytes(hashed_id) for hashed_id in ids]),
+        arc4.DynamicArray(arc4.UInt64(90), arc4.UInt64(40), arc4.UInt64(70)),
+        arc4.DynamicArray(arc4.UInt64(5), arc4.UInt64(6), arc4.UInt64(7)),
+        arc4.DynamicArray(arc4.UInt64(1), arc4.UInt64(2), arc4.UInt64(3)),
+        Bytes(MULTIHASH),
+    )
+
+    # Assert
+    for hashed_id in ids:
+        assert contract.get_ipfs_hash(hashed_id) == MULTIHASH
+    assert contract.is_wallet_flagged(ids[0]) == UInt64(1)
+    assert contract.is_wallet_flagged(ids[1]) == UInt64(0)
+    assert contract.get_risk_score(ids[2]) == UInt64(70)